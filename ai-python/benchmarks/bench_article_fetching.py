@@ -0,0 +1,134 @@
+"""
+Competitor article fetching for SEO article generation: the sites fetched and parsed one after
+another on the event loop, as `ArticleFetcher.fetch_article_content_beautifulsoup` did, against the
+concurrent fetch with parsing in the pool of ARTICLE_PARSE_WORKERS processes.
+
+Starts BENCH_SITES local sites, each answering after its own delay of up to BENCH_MAX_DELAY
+seconds with a BENCH_PAGE_KB KB article, checks both paths build the same prompt content and
+reports wall time and the longest event loop stall.
+
+    cd ai-python && python -m benchmarks.bench_article_fetching
+"""
+import asyncio
+import os
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+import aiohttp
+import tiktoken
+from src.chatflow_langchain.service.pro_agent.seo_optimizer.article_parsing import page_content
+from src.chatflow_langchain.service.pro_agent.seo_optimizer.scraper_articles import ArticleFetcher, _pool
+from src.chatflow_langchain.utils.user_agents import get_user_agents
+
+SITES = int(os.environ.get("BENCH_SITES", 10))
+MAX_DELAY = float(os.environ.get("BENCH_MAX_DELAY", 0.5))
+PAGE_KB = int(os.environ.get("BENCH_PAGE_KB", 300))
+ROUNDS = int(os.environ.get("BENCH_ROUNDS", 3))
+MAX_CONTENT_LENGTH = 100000
+
+
+def article_html(site: int) -> bytes:
+    paragraph = (f"<p class='body' style='margin:0'>Site {site} compares keyword research tools, "
+                 f"<a href='/tools/{site}'>pricing</a> and <strong>search volume</strong> accuracy.</p>")
+    paragraphs = paragraph * (PAGE_KB * 1024 // len(paragraph))
+    return (f"<html><head><title>Article {site}</title><meta name='description' content='Review {site}'>"
+            f"<script>var tracking = {site};</script></head><body><nav>Menu</nav><h1>Article {site}</h1>"
+            f"{paragraphs}<footer>Footer</footer></body></html>").encode("utf-8")
+
+
+def site_handler(site: int):
+    page = article_html(site)
+    delay = MAX_DELAY * (site + 1) / SITES
+
+    class ArticleHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(page)))
+            self.end_headers()
+            self.wfile.write(page)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ArticleHandler
+
+
+async def sequential(urls: List[str]) -> str:
+    """The fetch as it was: one site at a time, a session per attempt, parsed on the loop."""
+    formatted_articles = []
+    combined_tokens = 0
+    encoding = tiktoken.get_encoding("cl100k_base")
+    for url in urls:
+        content = f"Source: {url}\nError: All User-Agents failed\n\n"
+        for headers in get_user_agents():
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url, headers=headers, timeout=30) as response:
+                    if response.status == 200 and response.headers.get('Content-Type', '').startswith('text/html'):
+                        content = page_content(url, await response.text())
+                        break
+        content_tokens = len(encoding.encode(content))
+        if combined_tokens + content_tokens <= MAX_CONTENT_LENGTH:
+            formatted_articles.append(content)
+            combined_tokens += content_tokens
+    return "\n".join(formatted_articles).replace("{", "{{").replace("}", "}}")
+
+
+async def concurrent(urls: List[str]) -> str:
+    fetcher = ArticleFetcher()
+    fetcher.top_articles = urls
+    return await fetcher.fetch_article_content_beautifulsoup()
+
+
+async def max_loop_lag(stop: asyncio.Event) -> float:
+    lag = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        lag = max(lag, time.perf_counter() - start - 0.01)
+    return lag
+
+
+async def timed(urls: List[str], fetch):
+    timings, lags, content = [], [], None
+    for _ in range(ROUNDS):
+        stop = asyncio.Event()
+        probe = asyncio.create_task(max_loop_lag(stop))
+        start = time.perf_counter()
+        content = await fetch(urls)
+        timings.append(time.perf_counter() - start)
+        stop.set()
+        lags.append(await probe)
+    return statistics.median(timings), max(lags), content
+
+
+async def run(urls: List[str]):
+    print(f"{SITES} sites, {PAGE_KB} KB pages, delays up to {MAX_DELAY}s")
+    print(f"{'path':>12} | {'seconds':>8} | {'loop stall ms':>13} | {'speedup':>7}")
+    # Starts the parse pool outside the timing, a gateway worker keeps it across generations
+    await concurrent(urls[:1])
+    reference, reference_lag, expected = await timed(urls, sequential)
+    print(f"{'sequential':>12} | {reference:>8.2f} | {reference_lag * 1000:>13.0f} | {1:>7.1f}")
+    elapsed, lag, content = await timed(urls, concurrent)
+    assert content == expected, "concurrent fetch built different prompt content"
+    print(f"{'concurrent':>12} | {elapsed:>8.2f} | {lag * 1000:>13.0f} | {reference / elapsed:>7.1f}")
+
+
+def main():
+    servers = [ThreadingHTTPServer(("127.0.0.1", 0), site_handler(site)) for site in range(SITES)]
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{server.server_port}/blog/article-{site}" for site, server in enumerate(servers)]
+    try:
+        asyncio.run(run(urls))
+    finally:
+        _pool.reset()
+        for server in servers:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+crawl4ai page throughput: a Chromium launch per crawl, as `CrawlerService` did, against the
+browsers of `CrawlerPool` kept across crawls.
+
+Serves BENCH_PAGES static pages from a local HTTP server and crawls each of them once per round,
+BENCH_CONCURRENCY at a time. Needs crawl4ai with its Playwright Chromium installed.
+
+    cd ai-python && python -m benchmarks.bench_crawler_pool
+"""
+import asyncio
+import functools
+import os
+import statistics
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
+from src.chatflow_langchain.utils.crawler_pool import CrawlerPool
+
+PAGES = int(os.environ.get("BENCH_PAGES", 40))
+CONCURRENCY = int(os.environ.get("BENCH_CONCURRENCY", 4))
+ROUNDS = int(os.environ.get("BENCH_ROUNDS", 3))
+POOL_SIZES = (1, 2, 4)
+CONFIG = CrawlerRunConfig(word_count_threshold=10, excluded_tags=["img", "script", "style"], cache_mode=CacheMode.BYPASS)
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def write_site(directory: str) -> None:
+    for index in range(PAGES):
+        paragraphs = "".join(f"<p>Page {index} paragraph {line} about browser pools and crawl throughput.</p>" for line in range(50))
+        with open(os.path.join(directory, f"page_{index}.html"), "w") as page:
+            page.write(f"<html><head><title>Page {index}</title></head><body><h1>Page {index}</h1>{paragraphs}</body></html>")
+
+
+def serve(directory: str) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(QuietHandler, directory=directory))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def crawl_all(urls: List[str], crawl) -> None:
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def crawl_one(url: str):
+        async with semaphore:
+            result = await crawl(url)
+            assert result.success and result.markdown, url
+
+    await asyncio.gather(*[crawl_one(url) for url in urls])
+
+
+async def launch_per_call(url: str):
+    async with AsyncWebCrawler() as crawler:
+        return await crawler.arun(url=url, config=CONFIG)
+
+
+async def timed(urls: List[str], crawl) -> float:
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        await crawl_all(urls, crawl)
+        timings.append(time.perf_counter() - start)
+    return len(urls) / statistics.median(timings)
+
+
+async def run(urls: List[str]):
+    print(f"{PAGES} pages, {CONCURRENCY} concurrent crawls")
+    print(f"{'browsers':>18} | {'pages/s':>8} | {'speedup':>7}")
+    reference = await timed(urls, launch_per_call)
+    print(f"{'launch per call':>18} | {reference:>8.1f} | {1:>7.1f}")
+    for size in POOL_SIZES:
+        pool = CrawlerPool(size=size)
+
+        async def pooled(url: str):
+            async with pool.crawler() as crawler:
+                return await crawler.arun(url=url, config=CONFIG)
+
+        # Starts the pool's browsers outside the timing, a worker keeps them across tasks
+        await crawl_all(urls[:size], pooled)
+        throughput = await timed(urls, pooled)
+        print(f"{f'pool of {size}':>18} | {throughput:>8.1f} | {throughput / reference:>7.1f}")
+        await pool.aclose()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        write_site(directory)
+        server = serve(directory)
+        urls = [f"http://127.0.0.1:{server.server_port}/page_{index}.html" for index in range(PAGES)]
+        try:
+            asyncio.run(run(urls))
+        finally:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Multi-file retrieval latency: one retriever per file merged with MergerRetriever, against
+MultiFileRetriever (one query embedding, one batched Qdrant search).
+
+Runs against an in-memory Qdrant collection. The embedder only simulates the round trip of a
+remote embedding API, set EMBED_LATENCY to the p50 observed in production.
+
+    cd ai-python && python -m benchmarks.bench_multi_file_retrieval
+"""
+import os
+import random
+import statistics
+import time
+from typing import List
+from langchain.retrievers import MergerRetriever
+from langchain_core.embeddings import Embeddings
+from langchain_qdrant import QdrantVectorStore
+from qdrant_client import QdrantClient, models
+from src.vector_store.qdrant.langchain_lib.multi_file_retriever import MultiFileRetriever, FileSearch, file_filter
+
+DIMENSIONS = 256
+CHUNKS_PER_FILE = 200
+TOP_K = 10
+ROUNDS = int(os.environ.get("BENCH_ROUNDS", 20))
+EMBED_LATENCY = float(os.environ.get("EMBED_LATENCY", 0.05))
+FILE_COUNTS = (1, 2, 4, 8, 16, 32)
+COLLECTION = "bench_multi_file"
+NAMESPACE = "bench"
+
+
+class LatencyEmbeddings(Embeddings):
+    def _vector(self, text: str) -> List[float]:
+        rng = random.Random(text)
+        return [rng.uniform(-1, 1) for _ in range(DIMENSIONS)]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        time.sleep(EMBED_LATENCY)
+        return self._vector(text)
+
+
+def build_collection(client: QdrantClient, embedder: Embeddings, files: int) -> List[str]:
+    if client.collection_exists(COLLECTION):
+        client.delete_collection(COLLECTION)
+    client.create_collection(
+        COLLECTION, vectors_config=models.VectorParams(size=DIMENSIONS, distance=models.Distance.COSINE)
+    )
+    tags = [f"file-{index}.pdf" for index in range(files)]
+    points = []
+    for tag in tags:
+        for chunk in range(CHUNKS_PER_FILE):
+            text = f"chunk:{chunk}: {tag} content {chunk}"
+            points.append(models.PointStruct(
+                id=len(points), vector=embedder._vector(text),
+                payload={"text": text, "brain_id": NAMESPACE, "tag": tag, "metadata": {}}
+            ))
+    client.upsert(COLLECTION, points=points)
+    return tags
+
+
+def merger_retriever(client: QdrantClient, embedder: Embeddings, tags: List[str]) -> MergerRetriever:
+    retrievers = []
+    for tag in tags:
+        vectorstore = QdrantVectorStore(client, collection_name=COLLECTION, embedding=embedder, content_payload_key="text")
+        retrievers.append(vectorstore.as_retriever(search_kwargs={"k": TOP_K, "filter": file_filter(NAMESPACE, tag)}))
+    return MergerRetriever(retrievers=retrievers)
+
+
+def multi_file_retriever(client: QdrantClient, embedder: Embeddings, tags: List[str]) -> MultiFileRetriever:
+    return MultiFileRetriever(
+        client=client, collection_name=COLLECTION, embedder=embedder,
+        sources=[FileSearch(filter=file_filter(NAMESPACE, tag), k=TOP_K) for tag in tags]
+    )
+
+
+def measure(retriever) -> List[float]:
+    timings = []
+    for round_index in range(ROUNDS):
+        start = time.perf_counter()
+        retriever.invoke(f"question {round_index}")
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    client = QdrantClient(":memory:")
+    embedder = LatencyEmbeddings()
+    print(f"{'files':>5} | {'merger p50 ms':>13} | {'batched p50 ms':>14} | {'speedup':>7}")
+    for files in FILE_COUNTS:
+        tags = build_collection(client, embedder, files)
+        merger = statistics.median(measure(merger_retriever(client, embedder, tags))) * 1000
+        batched = statistics.median(measure(multi_file_retriever(client, embedder, tags))) * 1000
+        print(f"{files:>5} | {merger:>13.1f} | {batched:>14.1f} | {merger / batched:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
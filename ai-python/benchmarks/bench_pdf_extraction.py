@@ -0,0 +1,92 @@
+"""
+PDF text extraction with links: the sequential word x link scan the extractors used, against the
+banded link index and the page-sharded process pool of `extract_pdf_pages`.
+
+Generates a link-heavy document of BENCH_PAGES pages (BENCH_LINKS_PER_PAGE links each) and checks
+that both paths return the same text before timing them.
+
+    cd ai-python && python -m benchmarks.bench_pdf_extraction
+"""
+import os
+import statistics
+import time
+from typing import List
+import pymupdf
+import src.content_extraction.text.pdf_extractor as pdf_extractor
+from src.content_extraction.text.pdf_pages import page_text
+
+PAGES = int(os.environ.get("BENCH_PAGES", 400))
+LINKS_PER_PAGE = int(os.environ.get("BENCH_LINKS_PER_PAGE", 60))
+ROUNDS = int(os.environ.get("BENCH_ROUNDS", 3))
+WORKER_COUNTS = (1, 2, 4, 8)
+
+
+def generate_pdf() -> bytes:
+    doc = pymupdf.open()
+    for page_number in range(PAGES):
+        page = doc.new_page()
+        for line in range(LINKS_PER_PAGE):
+            y = 40 + line * 12
+            words = " ".join(f"word{page_number}_{line}_{index}" for index in range(8))
+            page.insert_text((40, y), words, fontsize=8)
+            page.insert_link({"kind": pymupdf.LINK_URI, "from": pymupdf.Rect(40, y - 8, 120, y + 2), "uri": f"https://example.com/{page_number}/{line}"})
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def scan_all_links(data: bytes) -> List[str]:
+    doc = pymupdf.open(stream=data, filetype="pdf")
+    result_pages = []
+    for page in doc:
+        links = page.get_links()
+        texts = []
+        for word in page.get_text("words"):
+            word_rect = pymupdf.Rect(word[:4])
+            text = word[4]
+            for link in links:
+                if 'uri' in link and word_rect.intersects(link['from']):
+                    text = f"{text}({link['uri']})"
+                    break
+            texts.append(text)
+        result_pages.append(" ".join(texts))
+    doc.close()
+    return result_pages
+
+
+def banded_in_process(data: bytes) -> List[str]:
+    with pymupdf.open(stream=data, filetype="pdf") as doc:
+        return [page_text(page) for page in doc]
+
+
+def timed(extract, data: bytes) -> float:
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        extract(data)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    data = generate_pdf()
+    baseline = scan_all_links(data)
+    assert banded_in_process(data) == baseline
+    print(f"{PAGES} pages, {LINKS_PER_PAGE} links per page")
+    print(f"{'extraction':>22} | {'p50 s':>7} | {'speedup':>7}")
+    reference = timed(scan_all_links, data)
+    print(f"{'word x link scan':>22} | {reference:>7.2f} | {1:>7.1f}")
+    banded = timed(banded_in_process, data)
+    print(f"{'link index':>22} | {banded:>7.2f} | {reference / banded:>7.1f}")
+    for workers in WORKER_COUNTS:
+        pdf_extractor._pool.reset()
+        pdf_extractor.PDF_EXTRACTION_WORKERS = workers
+        # Starts the pool's processes outside the timing, a worker keeps its pool across tasks
+        assert pdf_extractor.extract_pdf_pages(data) == baseline
+        pooled = timed(pdf_extractor.extract_pdf_pages, data)
+        print(f"{f'link index, {workers} procs':>22} | {pooled:>7.2f} | {reference / pooled:>7.1f}")
+    pdf_extractor._pool.reset()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Ray Serve HuggingFace embedding throughput against the deployment's max batch size, with JSON
+and float32 responses.
+
+Starts a local CPU-only Ray Serve instance with the ray_serve_app deployment and a small model,
+then sends BENCH_REQUESTS concurrent requests of BENCH_TEXTS_PER_REQUEST texts for each batch
+size. max_batch_size=1 is what the replica did before batching: one request per model call.
+Needs the ray_serve_app requirements (ray[serve], sentence-transformers).
+
+    cd ai-python && python -m benchmarks.bench_ray_embedding_batching
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+
+RAY_SERVE_APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "ray_serve_app")
+sys.path.insert(0, RAY_SERVE_APP)
+
+import ray
+from ray import serve
+from model_deployment.embedding.hugging_face.model_deployment_v4 import ModelDeploymentHeadEMbedHF
+
+MODEL_NAME = os.environ.get("BENCH_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+REQUESTS = int(os.environ.get("BENCH_REQUESTS", 256))
+TEXTS_PER_REQUEST = int(os.environ.get("BENCH_TEXTS_PER_REQUEST", 8))
+CONCURRENCY = int(os.environ.get("BENCH_CONCURRENCY", 32))
+PORT = int(os.environ.get("BENCH_PORT", 8765))
+BATCH_SIZES = (1, 4, 16, 32)
+URL = f"http://127.0.0.1:{PORT}/model"
+
+
+def payload(index: int, encoding: str) -> dict:
+    texts = [f"document {index} chunk {chunk} about vector search and batching" * 4 for chunk in range(TEXTS_PER_REQUEST)]
+    return {"input": texts, "model_name": MODEL_NAME, "encoding": encoding}
+
+
+def send(session: requests.Session, index: int, encoding: str) -> int:
+    response = session.post(URL, json=payload(index, encoding), timeout=300)
+    response.raise_for_status()
+    return len(response.content)
+
+
+def measure(encoding: str):
+    session = requests.Session()
+    # Loads the model before timing
+    send(session, -1, encoding)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as executor:
+        sizes = list(executor.map(lambda index: send(session, index, encoding), range(REQUESTS)))
+    elapsed = time.perf_counter() - start
+    return REQUESTS * TEXTS_PER_REQUEST / elapsed, sum(sizes) / len(sizes)
+
+
+def main():
+    ray.init(num_gpus=0, runtime_env={"env_vars": {"PYTHONPATH": RAY_SERVE_APP}})
+    serve.start(http_options={"host": "127.0.0.1", "port": PORT})
+    print(f"{'max batch':>9} | {'encoding':>8} | {'texts/s':>8} | {'response KB':>11}")
+    for max_batch_size in BATCH_SIZES:
+        deployment = ModelDeploymentHeadEMbedHF.options(
+            ray_actor_options={"num_cpus": 1, "num_gpus": 0},
+            autoscaling_config={"min_replicas": 1, "max_replicas": 1},
+            user_config={"max_batch_size": max_batch_size},
+        )
+        serve.run(deployment.bind(), route_prefix="/model")
+        for encoding in ("json", "float32"):
+            throughput, response_size = measure(encoding)
+            print(f"{max_batch_size:>9} | {encoding:>8} | {throughput:>8.0f} | {response_size / 1024:>11.1f}")
+    serve.shutdown()
+    ray.shutdown()
+
+
+if __name__ == "__main__":
+    main()
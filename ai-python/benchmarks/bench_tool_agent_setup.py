@@ -0,0 +1,78 @@
+"""
+Per-request setup of the OpenAI tool agent: listing MCP tools and compiling the LangGraph graph
+on every request, against the MCP tool schema cache and the compiled graph cache.
+
+The MCP server round trip is simulated, set MCP_LIST_LATENCY to the p50 of `tools/list` observed
+in production and MCP_TOOL_COUNT to the number of tools the server exposes. Imports the tool
+service, run it with the service environment (.env) loaded.
+
+    cd ai-python && python -m benchmarks.bench_tool_agent_setup
+"""
+import asyncio
+import os
+import statistics
+import time
+from typing import List
+from langgraph.prebuilt import ToolNode
+from mcp.types import Tool as MCPTool
+import src.MCP.tool_cache as tool_cache
+from src.MCP.tool_cache import MCPToolCache
+from src.MCP.utils import create_mcp_client
+from src.chatflow_langchain.utils.graph_cache import CompiledGraphCache, tool_set_signature
+from src.chatflow_langchain.service.openai.tool_functions.tool_service import OpenAIToolServiceOpenai, image_generate
+from src.chatflow_langchain.service.openai.tool_functions.tools import website_analysis, get_current_time
+from src.db.redis_invalidation import InvalidationListener
+
+ROUNDS = int(os.environ.get("BENCH_ROUNDS", 50))
+MCP_LIST_LATENCY = float(os.environ.get("MCP_LIST_LATENCY", 0.08))
+MCP_TOOL_COUNT = int(os.environ.get("MCP_TOOL_COUNT", 60))
+SELECTED_TOOLS = {"SLACK": ["slack_list_channels,slack_send_message"], "GITHUB": ["get_git_commits"]}
+
+
+def server_tools() -> List[MCPTool]:
+    schema = {"type": "object", "properties": {"limit": {"type": "integer"}, "mcp_data": {"type": "string"}}}
+    return [MCPTool(name=f"tool_{index}", description=f"MCP tool {index}", inputSchema=schema) for index in range(MCP_TOOL_COUNT)]
+
+
+async def simulated_listing(connection: dict) -> List[MCPTool]:
+    await asyncio.sleep(MCP_LIST_LATENCY)
+    return server_tools()
+
+
+async def setup(cache: MCPToolCache, graphs: CompiledGraphCache, user_id: str) -> None:
+    client = create_mcp_client("jwt bench", "http://localhost")
+    tools = [website_analysis, image_generate, get_current_time]
+    tools.extend(await cache.get_tools(user_id=user_id, mcp_tools=SELECTED_TOOLS, client=client))
+    ToolNode(tools)
+    graphs.get_or_compile(("openai_tool_agent", tool_set_signature(tools)), OpenAIToolServiceOpenai._compile_graph)
+
+
+async def measure(cached: bool) -> List[float]:
+    timings = []
+    cache, graphs = MCPToolCache(), CompiledGraphCache()
+    for round_index in range(ROUNDS):
+        if not cached:
+            # What every request paid before: a fresh listing and a fresh compile
+            cache.invalidate()
+            graphs.clear()
+        start = time.perf_counter()
+        await setup(cache, graphs, user_id="bench-user")
+        timings.append(time.perf_counter() - start)
+    # The first cached round is the miss that fills both caches
+    return timings[1:] if cached else timings
+
+
+async def main():
+    tool_cache._list_server_tools = simulated_listing
+    # The invalidation listener needs Redis, the benchmark only measures lookups
+    InvalidationListener.ensure_started = lambda self: None
+    uncached = statistics.median(await measure(cached=False)) * 1000
+    cached = statistics.median(await measure(cached=True)) * 1000
+    print(f"{'setup':>8} | {'p50 ms':>8}")
+    print(f"{'uncached':>8} | {uncached:>8.2f}")
+    print(f"{'cached':>8} | {cached:>8.2f}")
+    print(f"speedup {uncached / cached:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
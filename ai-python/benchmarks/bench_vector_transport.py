@@ -0,0 +1,85 @@
+"""
+Embedding -> Qdrant insertion handoff: embedded nodes sent as a JSON task argument, against the
+float32/msgpack batch parked in Redis with only its reference in the task message.
+
+Both paths go through the Redis at VECTOR_BLOB_REDIS_URL (CELERY_BROKEN_URL by default), the JSON
+payload is written and read back the way the broker carries a task message. Points are upserted
+into an in-memory Qdrant collection. Run it with the service environment (.env) loaded.
+
+    cd ai-python && python -m benchmarks.bench_vector_transport
+"""
+import json
+import os
+import random
+import statistics
+import time
+import uuid
+from typing import List
+from qdrant_client import QdrantClient, models
+from src.celery_service.qdrant.vector_transport import redis_client, store_vector_nodes, load_vector_nodes, release_vector_nodes
+
+DIMENSIONS = int(os.environ.get("BENCH_DIMENSIONS", 1536))
+BATCH_SIZES = (50, 400)
+ROUNDS = int(os.environ.get("BENCH_ROUNDS", 10))
+COLLECTION = "bench_vector_transport"
+BROKER_KEY = "bench_vector_transport:message"
+
+
+def embedded_nodes(count: int) -> List[dict]:
+    rng = random.Random(count)
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "vector": [rng.uniform(-1, 1) for _ in range(DIMENSIONS)],
+            "payload": {"text": "lorem ipsum dolor sit amet " * 30, "file_id": "bench", "tag": "bench", "brain_id": "bench"},
+        }
+        for _ in range(count)
+    ]
+
+
+def insert(client: QdrantClient, nodes: List[dict]) -> None:
+    points = [models.PointStruct(id=node["id"], vector=node["vector"], payload=node["payload"]) for node in nodes]
+    client.upsert(collection_name=COLLECTION, points=points)
+
+
+def json_handoff(client: QdrantClient, nodes: List[dict]) -> int:
+    message = json.dumps([nodes]).encode("utf-8")
+    redis_client.set(BROKER_KEY, message)
+    insert(client, json.loads(redis_client.get(BROKER_KEY))[0])
+    return len(message)
+
+
+def binary_handoff(client: QdrantClient, nodes: List[dict]) -> int:
+    reference = store_vector_nodes(nodes)
+    message = json.dumps([reference]).encode("utf-8")
+    redis_client.set(BROKER_KEY, message)
+    reference = json.loads(redis_client.get(BROKER_KEY))[0]
+    insert(client, load_vector_nodes(reference))
+    blob_size = redis_client.strlen(reference["vector_blob"])
+    release_vector_nodes(reference)
+    return len(message) + blob_size
+
+
+def measure(handoff, client: QdrantClient, nodes: List[dict]):
+    timings, size = [], 0
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        size = handoff(client, nodes)
+        timings.append(time.perf_counter() - start)
+    return size, statistics.median(timings)
+
+
+def main():
+    client = QdrantClient(":memory:")
+    client.create_collection(COLLECTION, vectors_config=models.VectorParams(size=DIMENSIONS, distance=models.Distance.COSINE))
+    print(f"{'batch':>6} | {'path':>6} | {'redis KB':>9} | {'p50 ms':>8} | {'nodes/s':>8}")
+    for batch_size in BATCH_SIZES:
+        nodes = embedded_nodes(batch_size)
+        for name, handoff in (("json", json_handoff), ("binary", binary_handoff)):
+            size, median = measure(handoff, client, nodes)
+            print(f"{batch_size:>6} | {name:>6} | {size / 1024:>9.1f} | {median * 1000:>8.1f} | {batch_size / median:>8.0f}")
+    redis_client.delete(BROKER_KEY)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
+import asyncio
 import sys
 import os
+import time
+import pytest
 from dotenv import load_dotenv
 
 # Add the src directory to the sys.path
@@ -7,3 +10,24 @@ from dotenv import load_dotenv
 
 # Load environment variables from .env_local
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '.env_enterprise_local'))
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def max_loop_lag():
+    """
+    Coroutine measuring the longest event loop stall until the event it is given is set.
+    """
+    async def measure(stop: asyncio.Event) -> float:
+        lag = 0.0
+        while not stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lag = max(lag, time.perf_counter() - start - 0.01)
+        return lag
+
+    return measure
@@ -0,0 +1,104 @@
+import os
+from typing import Any, Dict, Optional, Tuple
+from dotenv import load_dotenv
+from src.chatflow_langchain.utils.ttl_cache import SingleFlight, TTLCache
+from src.crypto_hub.utils.crypto_utils import MessageDecryptor
+from src.db.redis_invalidation import INVALIDATE_ALL, InvalidationListener
+from src.gateway.jwt_decode import get_user_by_id
+from src.logger.default_logger import logger
+from src.MCP.tool_cache import MCP_TOOLS_INVALIDATION_CHANNEL
+
+load_dotenv()
+
+# Seconds a user's integration credentials are reused without reading the user again
+MCP_CREDENTIAL_CACHE_TTL = float(os.environ.get("MCP_CREDENTIAL_CACHE_TTL", 300))
+MCP_CREDENTIAL_CACHE_MAX_ENTRIES = int(os.environ.get("MCP_CREDENTIAL_CACHE_MAX_ENTRIES", 4096))
+
+key = os.getenv("SECURITY_KEY").encode("utf-8")
+decryptor = MessageDecryptor(key)
+
+
+class IntegrationCredentialsNotFound(Exception):
+    """Raised when a user has not connected the integration a tool needs."""
+
+
+class _CachedCredentials:
+    __slots__ = ("mcpdata", "access_token")
+
+    def __init__(self, mcpdata: Dict[str, Any]):
+        self.mcpdata = mcpdata
+        self.access_token: Optional[str] = None
+
+
+class IntegrationCredentialCache:
+    """
+    TTL cache of the `mcpdata` of each (user id, integration) and its decrypted access token.
+
+    Every MCP tool call used to read the user from Mongo and AES-decrypt the token. Entries are
+    dropped when their TTL expires, when the integration answers that the token is no longer valid
+    (`invalidate_token`), when a Google token is refreshed (`invalidate`) and when the Node API
+    publishes the user on MCP_TOOLS_INVALIDATION_CHANNEL because their `mcpdata` changed.
+    """
+
+    def __init__(self, ttl: float = MCP_CREDENTIAL_CACHE_TTL, max_entries: int = MCP_CREDENTIAL_CACHE_MAX_ENTRIES):
+        self._entries: "TTLCache[Tuple[str, str], _CachedCredentials]" = TTLCache(ttl, max_entries)
+        # Concurrent tool calls of a user read the user once
+        self._loading: "SingleFlight[Tuple[str, str], _CachedCredentials]" = SingleFlight("Integration credential lookup was cancelled")
+        self._listener = InvalidationListener(MCP_TOOLS_INVALIDATION_CHANNEL, self.invalidate, "mcp-credential-invalidation")
+
+    async def _read(self, cache_key: Tuple[str, str]) -> _CachedCredentials:
+        user_id, integration = cache_key
+        generation = self._entries.generation
+        user = await get_user_by_id(user_id)
+        mcpdata = (user.get("mcpdata") or {}).get(integration)
+        if not mcpdata:
+            raise IntegrationCredentialsNotFound(f"{integration} is not connected for user {user_id}")
+        entry = _CachedCredentials(mcpdata)
+        self._entries.set(cache_key, entry, generation)
+        return entry
+
+    async def _load(self, user_id: str, integration: str) -> _CachedCredentials:
+        self._listener.ensure_started()
+        cache_key = (str(user_id), integration)
+        entry = self._entries.get(cache_key)
+        if entry is not None:
+            return entry
+        return await self._loading.run(cache_key, lambda: self._read(cache_key))
+
+    async def get_mcpdata(self, user_id: str, integration: str) -> Dict[str, Any]:
+        """
+        The user's stored data for an integration, as saved in `user.mcpdata.<integration>`.
+        """
+        return (await self._load(user_id, integration)).mcpdata
+
+    async def get_access_token(self, user_id: str, integration: str) -> str:
+        """
+        The decrypted access token of an integration, decrypted once per cache entry.
+        """
+        entry = await self._load(user_id, integration)
+        if entry.access_token is None:
+            entry.access_token = decryptor.decrypt(entry.mcpdata["access_token"])
+        return entry.access_token
+
+    def invalidate(self, user_id: Optional[str] = None, integration: Optional[str] = None) -> None:
+        """
+        Drop one integration of a user, every integration of a user, or everything.
+        """
+        if user_id is None or user_id == INVALIDATE_ALL:
+            self._entries.clear()
+        else:
+            self._entries.discard(lambda cache_key, entry: cache_key[0] == str(user_id) and integration in (None, cache_key[1]))
+
+    def invalidate_token(self, access_token: str) -> None:
+        """
+        Drop the entries holding a token the integration rejected, the next call reads the user again.
+        """
+        stale = self._entries.discard(lambda cache_key, entry: entry.access_token == access_token)
+        if stale:
+            logger.info(
+                f"Dropped {stale} rejected integration credentials",
+                extra={"tags": {"method": "IntegrationCredentialCache.invalidate_token"}}
+            )
+
+
+integration_credentials = IntegrationCredentialCache()
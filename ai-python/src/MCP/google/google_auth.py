@@ -6,14 +6,14 @@ import logging
 import os
 
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any
 from src.MCP.utils import save_tokens
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
 from google.auth.exceptions import RefreshError
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from src.gateway.jwt_decode import get_user_by_id
+from src.MCP.credential_cache import IntegrationCredentialsNotFound, integration_credentials
 from src.crypto_hub.utils.crypto_utils import MessageDecryptor
 key = os.getenv("SECURITY_KEY").encode("utf-8")
 decryptor = MessageDecryptor(key)
@@ -44,7 +44,8 @@ def create_credentials_from_mcp_data(mcp_data: Dict[str, Any]) -> Optional[Crede
 def get_credentials(
     mcp_data: Dict[str, Any],
     required_scopes: List[str],
-    provider: str
+    provider: str,
+    on_refresh: Optional[Callable[[], None]] = None
 ) -> Optional[Credentials]:
     """
     Retrieves credentials from MCP data or session cache. Refreshes if necessary.
@@ -53,6 +54,7 @@ def get_credentials(
         mcp_data: Dictionary containing Google credentials data
         required_scopes: List of scopes the credentials must have
         session_id: Optional MCP session ID
+        on_refresh: Called once a refreshed token is saved, drops the cached MCP data
 
     Returns:
         Valid Credentials object or None
@@ -85,6 +87,8 @@ def get_credentials(
                 access_token=credentials.token,
                 expiry=credentials.expiry
             )
+            if on_refresh is not None:
+                on_refresh()
             return credentials
         except RefreshError as e:
             logger.warning(f"[get_credentials] RefreshError - token expired/revoked: {e}")
@@ -141,8 +145,10 @@ async def get_authenticated_google_service(
         raise GoogleAuthenticationError(error_msg)
 
     # Fetch MCP data using user_id
-    mcp_data = await get_user_by_id(user_id)
-    mcp_data = mcp_data['mcpdata']['G']
+    try:
+        mcp_data = await integration_credentials.get_mcpdata(user_id, "G")
+    except IntegrationCredentialsNotFound:
+        mcp_data = None
     if not mcp_data:
         error_msg = f"No MCP data found for user ID: {user_id}"
         logger.error(f"[{tool_name}] {error_msg}")
@@ -152,7 +158,8 @@ async def get_authenticated_google_service(
         get_credentials,
         mcp_data=mcp_data,
         required_scopes=required_scopes,
-        provider="G"
+        provider="G",
+        on_refresh=lambda: integration_credentials.invalidate(user_id, "G")
     )
 
     try:
@@ -206,8 +213,10 @@ async def get_authenticated_google_service_gmail(
         raise GoogleAuthenticationError(error_msg)
 
     # Fetch MCP data using user_id
-    mcp_data = await get_user_by_id(user_id)
-    mcp_data = mcp_data['mcpdata']['GMAIL']
+    try:
+        mcp_data = await integration_credentials.get_mcpdata(user_id, "GMAIL")
+    except IntegrationCredentialsNotFound:
+        mcp_data = None
     if not mcp_data:
         error_msg = f"No MCP data found for user ID: {user_id}"
         logger.error(f"[{tool_name}] {error_msg}")
@@ -217,7 +226,8 @@ async def get_authenticated_google_service_gmail(
         get_credentials,
         mcp_data=mcp_data,
         required_scopes=required_scopes,
-        provider="GMAIL"
+        provider="GMAIL",
+        on_refresh=lambda: integration_credentials.invalidate(user_id, "GMAIL")
     )
 
     try:
@@ -271,8 +281,10 @@ async def get_authenticated_google_service_drive(
         raise GoogleAuthenticationError(error_msg)
 
     # Fetch MCP data using user_id
-    mcp_data = await get_user_by_id(user_id)
-    mcp_data = mcp_data['mcpdata']['GOOGLE_DRIVE']
+    try:
+        mcp_data = await integration_credentials.get_mcpdata(user_id, "GOOGLE_DRIVE")
+    except IntegrationCredentialsNotFound:
+        mcp_data = None
     if not mcp_data:
         error_msg = f"No MCP data found for user ID: {user_id}"
         logger.error(f"[{tool_name}] {error_msg}")
@@ -282,7 +294,8 @@ async def get_authenticated_google_service_drive(
         get_credentials,
         mcp_data=mcp_data,
         required_scopes=required_scopes,
-        provider="GOOGLE_DRIVE"
+        provider="GOOGLE_DRIVE",
+        on_refresh=lambda: integration_credentials.invalidate(user_id, "GOOGLE_DRIVE")
     )
 
     try:
@@ -336,8 +349,10 @@ async def get_authenticated_google_service_calendar(
         raise GoogleAuthenticationError(error_msg)
 
     # Fetch MCP data using user_id
-    mcp_data = await get_user_by_id(user_id)
-    mcp_data = mcp_data['mcpdata']['GOOGLE_CALENDAR']
+    try:
+        mcp_data = await integration_credentials.get_mcpdata(user_id, "GOOGLE_CALENDAR")
+    except IntegrationCredentialsNotFound:
+        mcp_data = None
     if not mcp_data:
         error_msg = f"No MCP data found for user ID: {user_id}"
         logger.error(f"[{tool_name}] {error_msg}")
@@ -347,7 +362,8 @@ async def get_authenticated_google_service_calendar(
         get_credentials,
         mcp_data=mcp_data,
         required_scopes=required_scopes,
-        provider="GOOGLE_CALENDAR"
+        provider="GOOGLE_CALENDAR",
+        on_refresh=lambda: integration_credentials.invalidate(user_id, "GOOGLE_CALENDAR")
     )
 
     try:
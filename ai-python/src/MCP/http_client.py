@@ -0,0 +1,143 @@
+import asyncio
+import os
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict
+import httpx
+from dotenv import load_dotenv
+from src.logger.default_logger import logger
+
+load_dotenv()
+
+MCP_HTTP_TIMEOUT = float(os.environ.get("MCP_HTTP_TIMEOUT", 30))
+MCP_HTTP_MAX_CONNECTIONS = int(os.environ.get("MCP_HTTP_MAX_CONNECTIONS", 50))
+MCP_HTTP_MAX_KEEPALIVE = int(os.environ.get("MCP_HTTP_MAX_KEEPALIVE", 20))
+MCP_HTTP_KEEPALIVE_EXPIRY = float(os.environ.get("MCP_HTTP_KEEPALIVE_EXPIRY", 60))
+# In-flight requests per integration, MCP_CONCURRENCY_<INTEGRATION> overrides it for one integration
+MCP_INTEGRATION_CONCURRENCY = int(os.environ.get("MCP_INTEGRATION_CONCURRENCY", 8))
+MCP_RETRY_MAX_ATTEMPTS = int(os.environ.get("MCP_RETRY_MAX_ATTEMPTS", 3))
+# Longest wait honoured between attempts, a longer Retry-After is returned to the tool as is
+MCP_RETRY_MAX_DELAY = float(os.environ.get("MCP_RETRY_MAX_DELAY", 30))
+MCP_RETRY_BASE_DELAY = float(os.environ.get("MCP_RETRY_BASE_DELAY", 0.5))
+
+# Gateway errors can come back after the upstream applied the request, only idempotent ones are retried
+_UNAVAILABLE_STATUSES = {502, 503, 504}
+_IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+def retry_delay(response: httpx.Response, attempt: int) -> float:
+    """
+    Seconds to wait before retrying a rate-limited or unavailable response.
+
+    Uses Retry-After (seconds or HTTP date) when present, then the `x-ratelimit-reset` epoch
+    GitHub sends with an exhausted quota, then exponential backoff with jitter.
+    """
+    retry_after = response.headers.get("retry-after")
+    if retry_after:
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            try:
+                return max(parsedate_to_datetime(retry_after).timestamp() - time.time(), 0.0)
+            except (TypeError, ValueError):
+                pass
+    if response.headers.get("x-ratelimit-remaining") == "0" and response.headers.get("x-ratelimit-reset"):
+        try:
+            return max(float(response.headers["x-ratelimit-reset"]) - time.time(), 0.0)
+        except ValueError:
+            pass
+    return MCP_RETRY_BASE_DELAY * (2 ** attempt) * (0.5 + random.random())
+
+
+def is_rate_limited(response: httpx.Response) -> bool:
+    if response.status_code == 429:
+        return True
+    # GitHub reports primary and secondary rate limits as 403
+    return response.status_code == 403 and (
+        response.headers.get("x-ratelimit-remaining") == "0" or "retry-after" in response.headers
+    )
+
+
+def is_retryable(method: str, response: httpx.Response) -> bool:
+    """
+    Whether `response` to a `method` request can be retried without applying the request twice:
+    rate limits always, gateway errors for idempotent methods only.
+    """
+    return is_rate_limited(response) or (response.status_code in _UNAVAILABLE_STATUSES and method in _IDEMPOTENT_METHODS)
+
+
+class IntegrationHTTPClients:
+    """
+    One long-lived HTTP/2 client per integration base URL, shared by every tool call.
+
+    Keep-alive connections are reused across the calls of an agent loop instead of paying a TCP
+    and TLS handshake per call, and each integration gets a semaphore bounding its in-flight
+    requests so one busy user cannot exhaust an integration's rate limit for everybody.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def client(self, base_url: str) -> httpx.AsyncClient:
+        client = self._clients.get(base_url)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=True,
+                timeout=MCP_HTTP_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=MCP_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=MCP_HTTP_MAX_KEEPALIVE,
+                    keepalive_expiry=MCP_HTTP_KEEPALIVE_EXPIRY,
+                ),
+            )
+            self._clients[base_url] = client
+        return client
+
+    def semaphore(self, integration: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(integration)
+        if semaphore is None:
+            limit = int(os.environ.get(f"MCP_CONCURRENCY_{integration}", MCP_INTEGRATION_CONCURRENCY))
+            semaphore = self._semaphores[integration] = asyncio.Semaphore(limit)
+        return semaphore
+
+    async def request(self, integration: str, base_url: str, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request through the integration's pooled client, retrying rate-limited responses and,
+        for idempotent methods, unavailable ones. The last response is returned, callers keep their
+        own status handling.
+        """
+        method = method.upper()
+        client = self.client(base_url)
+        attempt = 0
+        while True:
+            try:
+                async with self.semaphore(integration):
+                    response = await client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                # A request that may have been applied is not sent twice
+                if method not in _IDEMPOTENT_METHODS or attempt + 1 >= MCP_RETRY_MAX_ATTEMPTS:
+                    raise
+                delay = MCP_RETRY_BASE_DELAY * (2 ** attempt) * (0.5 + random.random())
+                logger.warning(f"{integration} request failed ({e}), retrying in {delay:.2f}s",
+                               extra={"tags": {"method": "IntegrationHTTPClients.request"}})
+            else:
+                if not is_retryable(method, response) or attempt + 1 >= MCP_RETRY_MAX_ATTEMPTS:
+                    return response
+                delay = retry_delay(response, attempt)
+                if delay > MCP_RETRY_MAX_DELAY:
+                    return response
+                logger.warning(f"{integration} answered {response.status_code}, retrying in {delay:.2f}s",
+                               extra={"tags": {"method": "IntegrationHTTPClients.request"}})
+            attempt += 1
+            # The semaphore is released while waiting, other users' calls keep flowing
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+integration_http = IntegrationHTTPClients()
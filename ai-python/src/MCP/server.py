@@ -4,7 +4,7 @@ import argparse
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 from fastapi import FastAPI
-from src.gateway.jwt_decode import get_user_by_id
+from src.MCP.credential_cache import integration_credentials
 from src.logger.default_logger import logger
 from typing import Dict, Any, List, Optional
 from src.MCP.tools.slack.slack_tools import (
@@ -36,10 +36,7 @@ from src.MCP.tools.asana.asana_tools import (
 from fastapi import Request
 from fastapi.responses import JSONResponse, StreamingResponse
 import aiohttp
-from src.crypto_hub.utils.crypto_utils import MessageDecryptor
 from langchain_mcp_adapters.client import MultiServerMCPClient
-key = os.getenv("SECURITY_KEY").encode("utf-8")
-decryptor = MessageDecryptor(key)
 # Load environment variables
 load_dotenv()
 
@@ -63,8 +60,8 @@ async def slack_list_channels(limit: int = 100,mcp_data:str=None) -> str:
     Args:
         limit: Maximum number of channels to return (default 100, max 1000)
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await list_slack_channels(decryptor.decrypt(user_data['mcpdata']['SLACK']['access_token']), limit)
+    access_token = await integration_credentials.get_access_token(mcp_data, "SLACK")
+    return await list_slack_channels(access_token, limit)
 
 
 @mcp.tool()
@@ -75,8 +72,8 @@ async def slack_send_message(channel_id: str, text: str,mcp_data:str=None) -> st
         channel_id: The ID of the channel to send the message to
         text: The message text to send
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await send_slack_message(decryptor.decrypt(user_data['mcpdata']['SLACK']['access_token']), channel_id, text)
+    access_token = await integration_credentials.get_access_token(mcp_data, "SLACK")
+    return await send_slack_message(access_token, channel_id, text)
 
 @mcp.tool()
 async def get_channel_id(channel_name: str=None,mcp_data:str=None):
@@ -86,8 +83,8 @@ async def get_channel_id(channel_name: str=None,mcp_data:str=None):
         channel_id: The ID of the channel to get messages from
         limit: Maximum number of messages to return (default 50, max 1000)
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await get_channel_id_by_name(decryptor.decrypt(user_data['mcpdata']['SLACK']['access_token']), channel_name)
+    access_token = await integration_credentials.get_access_token(mcp_data, "SLACK")
+    return await get_channel_id_by_name(access_token, channel_name)
 
 @mcp.tool()
 async def slack_get_messages(channel_id: str, limit: int = 50,mcp_data:str=None) -> str:
@@ -97,8 +94,8 @@ async def slack_get_messages(channel_id: str, limit: int = 50,mcp_data:str=None)
         channel_id: The ID of the channel to get messages from
         limit: Maximum number of messages to return (default 50, max 1000)
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await get_channel_messages(decryptor.decrypt(user_data['mcpdata']['SLACK']['access_token']), channel_id, limit)
+    access_token = await integration_credentials.get_access_token(mcp_data, "SLACK")
+    return await get_channel_messages(access_token, channel_id, limit)
 
 
 @mcp.tool()
@@ -109,8 +106,8 @@ async def slack_list_users(limit: int = 200, include_locale: bool = False,mcp_da
         limit: Maximum number of users to return per page (default 200, max 200)
         include_locale: Whether to include user locale information
     """
-    user_data = await get_user_by_id(mcp_data)    
-    return await list_workspace_users(decryptor.decrypt(user_data['mcpdata']['SLACK']['access_token']), limit, include_locale)
+    access_token = await integration_credentials.get_access_token(mcp_data, "SLACK")    
+    return await list_workspace_users(access_token, limit, include_locale)
 
 
 @mcp.tool()
@@ -120,8 +117,8 @@ async def slack_get_user_info(user_id: str,mcp_data:str=None) -> str:
     Args:
         user_id: The ID of the user to get information about
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await get_user_info(decryptor.decrypt(user_data['mcpdata']['SLACK']['access_token']), user_id)
+    access_token = await integration_credentials.get_access_token(mcp_data, "SLACK")
+    return await get_user_info(access_token, user_id)
 
 
 @mcp.tool()
@@ -131,8 +128,8 @@ async def slack_get_user_profile(user_id: str,mcp_data:str=None) -> str:
     Args:
         user_id: The ID of the user to get profile for
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await get_user_profile(decryptor.decrypt(user_data['mcpdata']['SLACK']['access_token']), user_id)
+    access_token = await integration_credentials.get_access_token(mcp_data, "SLACK")
+    return await get_user_profile(access_token, user_id)
 
 
 @mcp.tool()
@@ -143,8 +140,8 @@ async def slack_get_channel_members(channel_id: str, limit: int = 200,mcp_data:s
         channel_id: The ID of the channel
         limit: Maximum number of members to return per page
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await get_channel_members(decryptor.decrypt(user_data['mcpdata']['SLACK']['access_token']), channel_id, limit)
+    access_token = await integration_credentials.get_access_token(mcp_data, "SLACK")
+    return await get_channel_members(access_token, channel_id, limit)
 
 
 @mcp.tool()
@@ -154,8 +151,8 @@ async def slack_open_dm(user_ids: list[str],mcp_data:str=None) -> str:
     Args:
         user_ids: List of user IDs (1 for DM, multiple for MPIM)
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await open_direct_message(decryptor.decrypt(user_data['mcpdata']['SLACK']['access_token']), user_ids)
+    access_token = await integration_credentials.get_access_token(mcp_data, "SLACK")
+    return await open_direct_message(access_token, user_ids)
 
 
 @mcp.tool()
@@ -166,8 +163,8 @@ async def slack_send_dm(user_id: str, text: str,mcp_data:str=None) -> str:
         user_id: The ID of the user to send DM to
         text: The message text to send
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await send_direct_message(decryptor.decrypt(user_data['mcpdata']['SLACK']['access_token']), user_id, text)
+    access_token = await integration_credentials.get_access_token(mcp_data, "SLACK")
+    return await send_direct_message(access_token, user_id, text)
 
 
 @mcp.tool()
@@ -179,8 +176,8 @@ async def slack_send_ephemeral_message(channel_id: str, user_id: str, text: str,
         user_id: The ID of the user who will see the message
         text: The message text to send
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await send_ephemeral_message(decryptor.decrypt(user_data['mcpdata']['SLACK']['access_token']), channel_id, user_id, text)
+    access_token = await integration_credentials.get_access_token(mcp_data, "SLACK")
+    return await send_ephemeral_message(access_token, channel_id, user_id, text)
 
 
 # =============================================================================
@@ -205,9 +202,9 @@ async def slack_create_channel(
         purpose: Optional purpose description for the channel
         initial_members: Optional list of user IDs to invite to the channel
     """
-    user_data = await get_user_by_id(mcp_data)
+    access_token = await integration_credentials.get_access_token(mcp_data, "SLACK")
     return await create_slack_channel(
-        decryptor.decrypt(user_data['mcpdata']['SLACK']['access_token']), 
+        access_token, 
         channel_name, 
         is_private, 
         topic, 
@@ -224,8 +221,8 @@ async def slack_set_channel_topic(channel_id: str, topic: str,mcp_data:str=None)
         channel_id: The ID of the channel
         topic: New topic for the channel
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await set_channel_topic(decryptor.decrypt(user_data['mcpdata']['SLACK']['access_token']), channel_id, topic)
+    access_token = await integration_credentials.get_access_token(mcp_data, "SLACK")
+    return await set_channel_topic(access_token, channel_id, topic)
 
 
 @mcp.tool()
@@ -236,8 +233,8 @@ async def slack_set_channel_purpose(channel_id: str, purpose: str,mcp_data:str=N
         channel_id: The ID of the channel
         purpose: New purpose for the channel
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await set_channel_purpose(mcp['SLACK']['access_token'], channel_id, purpose)
+    access_token = await integration_credentials.get_access_token(mcp_data, "SLACK")
+    return await set_channel_purpose(access_token, channel_id, purpose)
 
 
 @mcp.tool()
@@ -247,8 +244,8 @@ async def slack_archive_channel(channel_id: str,mcp_data:str=None) -> str:
     Args:
         channel_id: The ID of the channel to archive
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await archive_channel(decryptor.decrypt(user_data['mcpdata']['SLACK']['access_token']), channel_id)
+    access_token = await integration_credentials.get_access_token(mcp_data, "SLACK")
+    return await archive_channel(access_token, channel_id)
 
 
 @mcp.tool()
@@ -259,8 +256,8 @@ async def slack_invite_users_to_channel(channel_id: str, user_ids: list[str],mcp
         channel_id: The ID of the channel
         user_ids: List of user IDs to invite
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await invite_users_to_channel(decryptor.decrypt(user_data['mcpdata']['SLACK']['access_token']), channel_id, user_ids)
+    access_token = await integration_credentials.get_access_token(mcp_data, "SLACK")
+    return await invite_users_to_channel(access_token, channel_id, user_ids)
 
 
 @mcp.tool()
@@ -271,8 +268,8 @@ async def slack_kick_user_from_channel(channel_id: str, user_id: str,mcp_data:st
         channel_id: The ID of the channel
         user_id: The ID of the user to remove
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await kick_user_from_channel(decryptor.decrypt(user_data['mcpdata']['SLACK']['access_token']), channel_id, user_id)
+    access_token = await integration_credentials.get_access_token(mcp_data, "SLACK")
+    return await kick_user_from_channel(access_token, channel_id, user_id)
 
 
 
@@ -290,8 +287,8 @@ async def slack_reply_to_thread(channel_id: str, thread_ts: str, text: str,mcp_d
         thread_ts: The timestamp of the parent message (thread identifier)
         text: The reply text to send
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await reply_to_thread(decryptor.decrypt(user_data['mcpdata']['SLACK']['access_token']), channel_id, thread_ts, text)
+    access_token = await integration_credentials.get_access_token(mcp_data, "SLACK")
+    return await reply_to_thread(access_token, channel_id, thread_ts, text)
 
 
 @mcp.tool()
@@ -303,8 +300,8 @@ async def slack_get_thread_replies(channel_id: str, thread_ts: str, limit: int =
         thread_ts: The timestamp of the parent message (thread identifier)
         limit: Maximum number of replies to return (default 100, max 1000)
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await get_thread_replies(decryptor.decrypt(user_data['mcpdata']['SLACK']['access_token']), channel_id, thread_ts, limit)
+    access_token = await integration_credentials.get_access_token(mcp_data, "SLACK")
+    return await get_thread_replies(access_token, channel_id, thread_ts, limit)
 
 
 @mcp.tool()
@@ -316,8 +313,8 @@ async def slack_start_thread(channel_id: str, text: str, broadcast: bool = False
         text: The message text to send
         broadcast: Whether to broadcast the thread reply to the channel (default: False)
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await start_thread_with_message(decryptor.decrypt(user_data['mcpdata']['SLACK']['access_token']), channel_id, text, broadcast)
+    access_token = await integration_credentials.get_access_token(mcp_data, "SLACK")
+    return await start_thread_with_message(access_token, channel_id, text, broadcast)
 
 
 @mcp.tool()
@@ -329,8 +326,8 @@ async def slack_reply_to_thread_with_broadcast(channel_id: str, thread_ts: str,
         thread_ts: The timestamp of the parent message (thread identifier)
         text: The reply text to send
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await reply_to_thread_with_broadcast(decryptor.decrypt(user_data['mcpdata']['SLACK']['access_token']), channel_id, thread_ts, text)
+    access_token = await integration_credentials.get_access_token(mcp_data, "SLACK")
+    return await reply_to_thread_with_broadcast(access_token, channel_id, thread_ts, text)
 
 
 @mcp.tool()
@@ -341,8 +338,8 @@ async def slack_get_thread_info(channel_id: str, thread_ts: str,mcp_data:str=Non
         channel_id: The ID of the channel containing the thread
         thread_ts: The timestamp of the parent message (thread identifier)
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await get_thread_info(decryptor.decrypt(user_data['mcpdata']['SLACK']['access_token']), channel_id, thread_ts)
+    access_token = await integration_credentials.get_access_token(mcp_data, "SLACK")
+    return await get_thread_info(access_token, channel_id, thread_ts)
 
 
 @mcp.tool()
@@ -353,8 +350,8 @@ async def slack_find_threads_in_channel(channel_id: str, limit: int = 50,mcp_dat
         channel_id: The ID of the channel to search
         limit: Maximum number of messages to check (default 50, max 1000)
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await find_threads_in_channel(decryptor.decrypt(user_data['mcpdata']['SLACK']['access_token']), channel_id, limit)
+    access_token = await integration_credentials.get_access_token(mcp_data, "SLACK")
+    return await find_threads_in_channel(access_token, channel_id, limit)
 
 # =============================================================================
 # GITHUB TOOLS
@@ -370,8 +367,8 @@ async def github_get_commits(owner: str, repo: str, branch: str, hours_back: int
         branch: Branch name to get commits from
         hours_back: Number of hours back to look for commits (default 24)
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await get_git_commits(decryptor.decrypt(user_data['mcpdata']['GITHUB']['access_token']), owner, repo, branch, hours_back)
+    access_token = await integration_credentials.get_access_token(mcp_data, "GITHUB")
+    return await get_git_commits(access_token, owner, repo, branch, hours_back)
 
 @mcp.tool()
 async def github_get_user_info(mcp_data:str=None) -> str:
@@ -380,8 +377,8 @@ async def github_get_user_info(mcp_data:str=None) -> str:
     Args:
         
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await get_user_info(decryptor.decrypt(user_data['mcpdata']['GITHUB']['access_token']))
+    access_token = await integration_credentials.get_access_token(mcp_data, "GITHUB")
+    return await get_user_info(access_token)
 
 
 @mcp.tool()
@@ -393,8 +390,8 @@ async def github_get_repositories(owner: str, sort: str,mcp_data:str=None) -> st
         branch: Branch name to get commits from
         hours_back: Number of hours back to look for commits (default 24)
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await get_github_repositories(owner, decryptor.decrypt(user_data['mcpdata']['GITHUB']['access_token']), sort)
+    access_token = await integration_credentials.get_access_token(mcp_data, "GITHUB")
+    return await get_github_repositories(owner, access_token, sort)
 
 
 
@@ -412,8 +409,8 @@ async def github_get_repository_info(owner: str, repo: str,mcp_data:str=None) ->
     
     # Combine owner and repo into the format expected by the original function
     repo_path = f"{owner}/{repo}"
-    user_data = await get_user_by_id(mcp_data)
-    return await get_github_repository_info(repo_path, decryptor.decrypt(user_data['mcpdata']['GITHUB']['access_token']))
+    access_token = await integration_credentials.get_access_token(mcp_data, "GITHUB")
+    return await get_github_repository_info(repo_path, access_token)
 
 
 
@@ -433,8 +430,8 @@ async def github_create_branch(owner: str, repo: str, new_branch: str, base_bran
     
     # Combine owner and repo into the format expected by the original function
     repo_path = f"{owner}/{repo}"
-    user_data = await get_user_by_id(mcp_data)
-    return await create_github_branch(repo_path, new_branch, decryptor.decrypt(user_data['mcpdata']['GITHUB']['access_token']), base_branch)
+    access_token = await integration_credentials.get_access_token(mcp_data, "GITHUB")
+    return await create_github_branch(repo_path, new_branch, access_token, base_branch)
 
 
 
@@ -454,8 +451,8 @@ async def github_get_repository_branches(owner: str, repo: str, page: int = 1, p
     
     # Combine owner and repo into the format expected by the original function
     repo_path = f"{owner}/{repo}"
-    user_data = await get_user_by_id(mcp_data)
-    return await get_repository_branches(repo_path, decryptor.decrypt(user_data['mcpdata']['GITHUB']['access_token']), page, per_page)
+    access_token = await integration_credentials.get_access_token(mcp_data, "GITHUB")
+    return await get_repository_branches(repo_path, access_token, page, per_page)
 
 
 @mcp.tool()
@@ -475,8 +472,8 @@ async def github_get_repository_issues(owner: str, repo: str, state: str = "open
     
     # Combine owner and repo into the format expected by the original function
     repo_path = f"{owner}/{repo}"
-    user_data = await get_user_by_id(mcp_data)
-    return await get_repository_issues(repo_path, decryptor.decrypt(user_data['mcpdata']['GITHUB']['access_token']), state, page, per_page)
+    access_token = await integration_credentials.get_access_token(mcp_data, "GITHUB")
+    return await get_repository_issues(repo_path, access_token, state, page, per_page)
 
 
 
@@ -506,8 +503,8 @@ async def github_create_pull_request(
     
     # Combine owner and repo into the format expected by the original function
     repo_path = f"{owner}/{repo}"
-    user_data = await get_user_by_id(mcp_data)
-    return await create_pull_request(repo_path, target_branch, base_branch, title, body, decryptor.decrypt(user_data['mcpdata']['GITHUB']['access_token']))
+    access_token = await integration_credentials.get_access_token(mcp_data, "GITHUB")
+    return await create_pull_request(repo_path, target_branch, base_branch, title, body, access_token)
 
 
 @mcp.tool()
@@ -525,8 +522,8 @@ async def github_get_pull_request_details(owner: str, repo: str, pull_number: in
     
     # Combine owner and repo into the format expected by the original function
     repo_path = f"{owner}/{repo}"
-    user_data = await get_user_by_id(mcp_data)
-    return await get_pull_request_details(repo_path, pull_number, decryptor.decrypt(user_data['mcpdata']['GITHUB']['access_token']))
+    access_token = await integration_credentials.get_access_token(mcp_data, "GITHUB")
+    return await get_pull_request_details(repo_path, pull_number, access_token)
 
 
 @mcp.tool()
@@ -557,8 +554,8 @@ async def github_get_pull_requests(
     
     # Combine owner and repo into the format expected by the original function
     repo_path = f"{owner}/{repo}"
-    user_data = await get_user_by_id(mcp_data)
-    return await get_pull_requests(repo_path, decryptor.decrypt(user_data['mcpdata']['GITHUB']['access_token']), state, sort, direction, page, per_page)
+    access_token = await integration_credentials.get_access_token(mcp_data, "GITHUB")
+    return await get_pull_requests(repo_path, access_token, state, sort, direction, page, per_page)
 
 
 @mcp.tool()
@@ -585,8 +582,8 @@ async def github_get_tags_or_branches(
     
     # Combine owner and repo into the format expected by the original function
     repo_path = f"{owner}/{repo}"
-    user_data = await get_user_by_id(mcp_data)
-    return await get_tags_or_branches(repo_path, resource_type, decryptor.decrypt(user_data['mcpdata']['GITHUB']['access_token']), page, per_page)
+    access_token = await integration_credentials.get_access_token(mcp_data, "GITHUB")
+    return await get_tags_or_branches(repo_path, resource_type, access_token, page, per_page)
 
 
 @mcp.tool()
@@ -608,8 +605,8 @@ async def github_global_search(
     Returns:
         Formatted string containing search results or error message
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await global_search(search_type, query, decryptor.decrypt(user_data['mcpdata']['GITHUB']['access_token']), page, per_page)
+    access_token = await integration_credentials.get_access_token(mcp_data, "GITHUB")
+    return await global_search(search_type, query, access_token, page, per_page)
 
 # =============================================================================
 # NOTION TOOLS
@@ -627,8 +624,8 @@ async def notion_search(query: str = None, sort: dict = None, filter_params: dic
         start_cursor: Pagination cursor
         page_size: Number of results per page (max 100)
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await search_notion(decryptor.decrypt(user_data['mcpdata']['NOTION']['access_token']), query, sort, filter_params, start_cursor, page_size)
+    access_token = await integration_credentials.get_access_token(mcp_data, "NOTION")
+    return await search_notion(access_token, query, sort, filter_params, start_cursor, page_size)
 
 @mcp.tool()
 async def notion_get_databases_id(query: str = None, sort: dict = None, filter_params: dict = None, 
@@ -637,8 +634,8 @@ async def notion_get_databases_id(query: str = None, sort: dict = None, filter_p
     Returns:
         A list of database IDs.
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await get_databases_id(decryptor.decrypt(user_data['mcpdata']['NOTION']['access_token']),query, sort, filter_params, start_cursor, page_size)
+    access_token = await integration_credentials.get_access_token(mcp_data, "NOTION")
+    return await get_databases_id(access_token,query, sort, filter_params, start_cursor, page_size)
 
 @mcp.tool()
 async def notion_get_pages_id(query: str = None, sort: dict = None, filter_params: dict = None, 
@@ -647,8 +644,8 @@ async def notion_get_pages_id(query: str = None, sort: dict = None, filter_param
     Returns:
         A list of pages IDs.
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await get_pages_id(decryptor.decrypt(user_data['mcpdata']['NOTION']['access_token']),query, sort, filter_params, start_cursor, page_size)
+    access_token = await integration_credentials.get_access_token(mcp_data, "NOTION")
+    return await get_pages_id(access_token,query, sort, filter_params, start_cursor, page_size)
 
 @mcp.tool()
 async def notion_get_page(page_id: str, mcp_data:str=None) -> str:
@@ -657,8 +654,8 @@ async def notion_get_page(page_id: str, mcp_data:str=None) -> str:
     Args:
         page_id: ID of the page to retrieve
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await get_notion_page(decryptor.decrypt(user_data['mcpdata']['NOTION']['access_token']), page_id)
+    access_token = await integration_credentials.get_access_token(mcp_data, "NOTION")
+    return await get_notion_page(access_token, page_id)
 
 @mcp.tool()
 async def notion_create_database(page_id: str, title: List[Dict[str, Any]], properties: dict,
@@ -671,8 +668,8 @@ async def notion_create_database(page_id: str, title: List[Dict[str, Any]], prop
         parent_type: Type of parent (defaults to 'page_id')
         mcp_data: User data for authentication
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await create_notion_database(decryptor.decrypt(user_data['mcpdata']['NOTION']['access_token']), page_id, title, properties, parent_type)
+    access_token = await integration_credentials.get_access_token(mcp_data, "NOTION")
+    return await create_notion_database(access_token, page_id, title, properties, parent_type)
 
 
 @mcp.tool()
@@ -686,8 +683,8 @@ async def notion_create_page(database_id: str, parent_type: str = "database_id",
         properties: Page properties (required for database pages)
         content: Content blocks for the page
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await create_notion_page(decryptor.decrypt(user_data['mcpdata']['NOTION']['access_token']), database_id, parent_type, properties, content)
+    access_token = await integration_credentials.get_access_token(mcp_data, "NOTION")
+    return await create_notion_page(access_token, database_id, parent_type, properties, content)
 
 @mcp.tool()
 async def notion_update_page(page_id: str, properties: dict, mcp_data:str=None) -> str:
@@ -697,8 +694,8 @@ async def notion_update_page(page_id: str, properties: dict, mcp_data:str=None)
         page_id: ID of the page to update
         properties: Updated properties
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await update_notion_page(decryptor.decrypt(user_data['mcpdata']['NOTION']['access_token']), page_id, properties)
+    access_token = await integration_credentials.get_access_token(mcp_data, "NOTION")
+    return await update_notion_page(access_token, page_id, properties)
 
 @mcp.tool()
 async def notion_get_database(database_id: str, mcp_data:str=None) -> str:
@@ -707,8 +704,8 @@ async def notion_get_database(database_id: str, mcp_data:str=None) -> str:
     Args:
         database_id: ID of the database to retrieve
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await get_notion_database(decryptor.decrypt(user_data['mcpdata']['NOTION']['access_token']), database_id)
+    access_token = await integration_credentials.get_access_token(mcp_data, "NOTION")
+    return await get_notion_database(access_token, database_id)
 
 @mcp.tool()
 async def notion_query_database(database_id: str, filter_params: dict = None, 
@@ -723,8 +720,8 @@ async def notion_query_database(database_id: str, filter_params: dict = None,
         start_cursor: Pagination cursor
         page_size: Number of results per page (max 100)
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await query_notion_database(decryptor.decrypt(user_data['mcpdata']['NOTION']['access_token']), database_id, filter_params, sorts, start_cursor, page_size)
+    access_token = await integration_credentials.get_access_token(mcp_data, "NOTION")
+    return await query_notion_database(access_token, database_id, filter_params, sorts, start_cursor, page_size)
 
 @mcp.tool()
 async def notion_get_block(block_id: str, mcp_data:str=None) -> str:
@@ -733,8 +730,8 @@ async def notion_get_block(block_id: str, mcp_data:str=None) -> str:
     Args:
         block_id: ID of the block to retrieve
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await get_notion_block(decryptor.decrypt(user_data['mcpdata']['NOTION']['access_token']), block_id)
+    access_token = await integration_credentials.get_access_token(mcp_data, "NOTION")
+    return await get_notion_block(access_token, block_id)
 
 @mcp.tool()
 async def notion_get_block_children(block_id: str, start_cursor: str = None, 
@@ -746,8 +743,8 @@ async def notion_get_block_children(block_id: str, start_cursor: str = None,
         start_cursor: Pagination cursor
         page_size: Number of results per page (max 100)
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await get_block_children(decryptor.decrypt(user_data['mcpdata']['NOTION']['access_token']), block_id, start_cursor, page_size)
+    access_token = await integration_credentials.get_access_token(mcp_data, "NOTION")
+    return await get_block_children(access_token, block_id, start_cursor, page_size)
 
 @mcp.tool()
 async def notion_append_blocks(block_id: str, blocks: list[Dict[str, Any]], mcp_data:str=None) -> str:
@@ -757,8 +754,8 @@ async def notion_append_blocks(block_id: str, blocks: list[Dict[str, Any]], mcp_
         block_id: ID of the parent block
         blocks: List of block objects to append
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await append_notion_blocks(decryptor.decrypt(user_data['mcpdata']['NOTION']['access_token']), block_id, blocks)
+    access_token = await integration_credentials.get_access_token(mcp_data, "NOTION")
+    return await append_notion_blocks(access_token, block_id, blocks)
 
 @mcp.tool()
 async def notion_create_comment(page_id: str, parent_type: str, comment_text: str, 
@@ -771,8 +768,8 @@ async def notion_create_comment(page_id: str, parent_type: str, comment_text: st
         comment_text: Text content of the comment
         discussion_id: Optional ID of an existing discussion thread
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await create_notion_comment(decryptor.decrypt(user_data['mcpdata']['NOTION']['access_token']), page_id, parent_type, comment_text, discussion_id)
+    access_token = await integration_credentials.get_access_token(mcp_data, "NOTION")
+    return await create_notion_comment(access_token, page_id, parent_type, comment_text, discussion_id)
 
 @mcp.tool()
 async def notion_get_comment(comment_id: str, mcp_data:str=None) -> str:
@@ -781,8 +778,8 @@ async def notion_get_comment(comment_id: str, mcp_data:str=None) -> str:
     Args:
         comment_id: ID of the comment to retrieve
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await get_notion_comment(decryptor.decrypt(user_data['mcpdata']['NOTION']['access_token']), comment_id)
+    access_token = await integration_credentials.get_access_token(mcp_data, "NOTION")
+    return await get_notion_comment(access_token, comment_id)
 
 # =============================================================================
 # ASANA TOOLS
@@ -808,10 +805,10 @@ async def asana_create_project(
         workspace_id: workspace ID
         team_id: team ID (required if workspace is an organization)
     """
-    user_data = await get_user_by_id(mcp_data)
+    access_token = await integration_credentials.get_access_token(mcp_data, "ASANA")
     return await create_project(
         name,
-        decryptor.decrypt(user_data['mcpdata']['ASANA']['access_token']),
+        access_token,
         notes,
         color,
         is_public,
@@ -830,9 +827,9 @@ async def asana_list_projects(
     Args:
         workspace_id: workspace ID
     """
-    user_data = await get_user_by_id(mcp_data)
+    access_token = await integration_credentials.get_access_token(mcp_data, "ASANA")
     return await list_projects(
-        decryptor.decrypt(user_data['mcpdata']['ASANA']['access_token']),
+        access_token,
         workspace_id
     )
 
@@ -847,10 +844,10 @@ async def asana_get_project(
     Args:
         project_id: The ID of the project
     """
-    user_data = await get_user_by_id(mcp_data)
+    access_token = await integration_credentials.get_access_token(mcp_data, "ASANA")
     return await get_project(
         project_id,
-        decryptor.decrypt(user_data['mcpdata']['ASANA']['access_token'])
+        access_token
     )
 
 
@@ -866,11 +863,11 @@ async def asana_update_project(
         project_id: The ID of the project to update
         updated_fields: Fields to update (name, notes, color, etc.)
     """
-    user_data = await get_user_by_id(mcp_data)
+    access_token = await integration_credentials.get_access_token(mcp_data, "ASANA")
     return await update_project(
         project_id,
         updated_fields,
-        decryptor.decrypt(user_data['mcpdata']['ASANA']['access_token'])
+        access_token
     )
 
 
@@ -894,10 +891,10 @@ async def asana_create_task(
         project_id: project ID to add the task to
         workspace_id: workspace ID
     """
-    user_data = await get_user_by_id(mcp_data)
+    access_token = await integration_credentials.get_access_token(mcp_data, "ASANA")
     return await create_task(
         name,
-        decryptor.decrypt(user_data['mcpdata']['ASANA']['access_token']),
+        access_token,
         notes,
         assignee,
         due_on,
@@ -922,13 +919,13 @@ async def asana_list_tasks(
         assignee: Optional filter by assignee email or ID
         completed_since: Optional filter for tasks completed since a date (YYYY-MM-DD)
     """
-    user_data = await get_user_by_id(mcp_data)
+    access_token = await integration_credentials.get_access_token(mcp_data, "ASANA")
     return await list_tasks(
         project_id,
         workspace_id,
         assignee,
         completed_since,
-        decryptor.decrypt(user_data['mcpdata']['ASANA']['access_token'])
+        access_token
     )
 
 
@@ -944,11 +941,11 @@ async def asana_update_task(
         task_id: The ID of the task to update
         updated_fields: Fields to update (name, notes, assignee, due_on, etc.)
     """
-    user_data = await get_user_by_id(mcp_data)
+    access_token = await integration_credentials.get_access_token(mcp_data, "ASANA")
     return await update_task(
         task_id,
         updated_fields,
-        decryptor.decrypt(user_data['mcpdata']['ASANA']['access_token'])
+        access_token
     )
 
 
@@ -962,10 +959,10 @@ async def asana_complete_task(
     Args:
         task_id: The ID of the task to complete
     """
-    user_data = await get_user_by_id(mcp_data)
+    access_token = await integration_credentials.get_access_token(mcp_data, "ASANA")
     return await complete_task(
         task_id,
-        decryptor.decrypt(user_data['mcpdata']['ASANA']['access_token'])
+        access_token
     )
 
 
@@ -981,11 +978,11 @@ async def asana_create_section(
         name: The name of the section
         project_id: The ID of the project to add the section to
     """
-    user_data = await get_user_by_id(mcp_data)
+    access_token = await integration_credentials.get_access_token(mcp_data, "ASANA")
     return await create_section(
         name,
         project_id,
-        decryptor.decrypt(user_data['mcpdata']['ASANA']['access_token'])
+        access_token
     )
 
 
@@ -999,10 +996,10 @@ async def asana_list_sections(
     Args:
         project_id: The ID of the project
     """
-    user_data = await get_user_by_id(mcp_data)
+    access_token = await integration_credentials.get_access_token(mcp_data, "ASANA")
     return await list_sections(
         project_id,
-        decryptor.decrypt(user_data['mcpdata']['ASANA']['access_token'])
+        access_token
     )
 
 
@@ -1018,11 +1015,11 @@ async def asana_add_task_to_section(
         task_id: The ID of the task
         section_id: The ID of the section
     """
-    user_data = await get_user_by_id(mcp_data)
+    access_token = await integration_credentials.get_access_token(mcp_data, "ASANA")
     return await add_task_to_section(
         task_id,
         section_id,
-        decryptor.decrypt(user_data['mcpdata']['ASANA']['access_token'])
+        access_token
     )
 
 
@@ -1039,11 +1036,11 @@ async def asana_add_dependencies_to_task(
         task_id: The ID of the task
         dependency_ids: List of task IDs that the task depends on
     """
-    user_data = await get_user_by_id(mcp_data)
+    access_token = await integration_credentials.get_access_token(mcp_data, "ASANA")
     return await add_dependencies_to_task(
         task_id,
         dependency_ids,
-        decryptor.decrypt(user_data['mcpdata']['ASANA']['access_token'])
+        access_token
     )
 
 
@@ -1058,10 +1055,10 @@ async def asana_get_task_dependencies(
     Args:
         task_id: The ID of the task
     """
-    user_data = await get_user_by_id(mcp_data)
+    access_token = await integration_credentials.get_access_token(mcp_data, "ASANA")
     return await get_task_dependencies(
         task_id,
-        decryptor.decrypt(user_data['mcpdata']['ASANA']['access_token'])
+        access_token
     )
 
 @mcp.tool()
@@ -1071,8 +1068,8 @@ async def asana_get_user_info(mcp_data:Optional[str]=None) -> str:
     Args:
         mcp_data: asana token data from mcp
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await get_user_info_asana(decryptor.decrypt(user_data['mcpdata']['ASANA']['access_token']))
+    access_token = await integration_credentials.get_access_token(mcp_data, "ASANA")
+    return await get_user_info_asana(access_token)
 
 @mcp.tool()
 async def asana_get_workspace_id(mcp_data:Optional[str]=None) -> str:
@@ -1081,8 +1078,8 @@ async def asana_get_workspace_id(mcp_data:Optional[str]=None) -> str:
     Args:
         mcp_data: asana token data from mcp
     """
-    user_data = await get_user_by_id(mcp_data)
-    return await get_workspace_id(decryptor.decrypt(user_data['mcpdata']['ASANA']['access_token']))
+    access_token = await integration_credentials.get_access_token(mcp_data, "ASANA")
+    return await get_workspace_id(access_token)
 
 @mcp.tool()
 async def asana_create_team(
@@ -1100,11 +1097,11 @@ async def asana_create_team(
         description: Optional plain text description of the team
         html_description: Optional HTML-formatted description of the team
     """
-    user_data = await get_user_by_id(mcp_data)
+    access_token = await integration_credentials.get_access_token(mcp_data, "ASANA")
     return await create_team(
         name,
         workspace_id,
-        decryptor.decrypt(user_data['mcpdata']['ASANA']['access_token']),
+        access_token,
         description,
         html_description
     )
@@ -1119,10 +1116,10 @@ async def asana_list_teams(
     Args:
         workspace_id: Workspace ID
     """
-    user_data = await get_user_by_id(mcp_data)
+    access_token = await integration_credentials.get_access_token(mcp_data, "ASANA")
     return await list_teams(
         workspace_id,
-        decryptor.decrypt(user_data['mcpdata']['ASANA']['access_token'])
+        access_token
     )
 
 @mcp.tool()
@@ -1135,10 +1132,10 @@ async def asana_list_team_ids(
     Args:
         workspace_id: Workspace ID
     """
-    user_data = await get_user_by_id(mcp_data)
+    access_token = await integration_credentials.get_access_token(mcp_data, "ASANA")
     return await list_team_ids(
         workspace_id,
-        decryptor.decrypt(user_data['mcpdata']['ASANA']['access_token']),
+        access_token,
     )
 
 @mcp.tool()
@@ -1151,8 +1148,8 @@ async def asana_get_team(
     Args:
         team_id: The ID of the team
     """
-    user_data = await get_user_by_id(mcp_data)
+    access_token = await integration_credentials.get_access_token(mcp_data, "ASANA")
     return await get_team(
         team_id,
-        decryptor.decrypt(user_data['mcpdata']['ASANA']['access_token'])
+        access_token
     )
\ No newline at end of file
@@ -0,0 +1,103 @@
+import asyncio
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+from langchain_core.tools import BaseTool
+from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.sessions import create_session
+from langchain_mcp_adapters.tools import convert_mcp_tool_to_langchain_tool
+from mcp.types import Tool as MCPTool
+from src.chatflow_langchain.utils.ttl_cache import SingleFlight, TTLCache
+from src.db.redis_invalidation import INVALIDATE_ALL, InvalidationListener
+
+load_dotenv()
+
+# Seconds discovered tool schemas are reused without listing the MCP servers again
+MCP_TOOL_CACHE_TTL = float(os.environ.get("MCP_TOOL_CACHE_TTL", 600))
+MCP_TOOL_CACHE_MAX_ENTRIES = int(os.environ.get("MCP_TOOL_CACHE_MAX_ENTRIES", 2048))
+# The Node API publishes a user id here when the user's integrations change, "*" when the ids are not known
+MCP_TOOLS_INVALIDATION_CHANNEL = os.environ.get("MCP_TOOLS_INVALIDATION_CHANNEL", "mcp:tools:invalidate")
+
+
+def integration_config_hash(mcp_tools: Optional[dict], connections: dict) -> str:
+    """
+    Hash of the user's selected integrations and the MCP servers they are served from.
+    """
+    selected = {integration: sorted(",".join(tools).split(",")) for integration, tools in (mcp_tools or {}).items()}
+    servers = {name: connection.get("url") for name, connection in connections.items()}
+    payload = json.dumps({"integrations": selected, "servers": servers}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def _list_server_tools(connection: dict) -> List[MCPTool]:
+    async with create_session(connection) as session:
+        await session.initialize()
+        tools, cursor = [], None
+        while True:
+            page = await session.list_tools(cursor=cursor)
+            tools.extend(page.tools)
+            cursor = page.nextCursor
+            if not cursor:
+                return tools
+
+
+class MCPToolCache:
+    """
+    Process-wide cache of the tool schemas MCP servers list for a user, keyed by
+    (user id, integration config hash).
+
+    Only schemas are cached. LangChain tools are rebuilt for every request from the request's own
+    client connection, so calls always carry the caller's headers. Entries live for MCP_TOOL_CACHE_TTL
+    and are dropped when an invalidation for their user is received on MCP_TOOLS_INVALIDATION_CHANNEL.
+    """
+
+    def __init__(self, ttl: float = MCP_TOOL_CACHE_TTL, max_entries: int = MCP_TOOL_CACHE_MAX_ENTRIES):
+        self._entries: "TTLCache[Tuple[str, str], Dict[str, List[MCPTool]]]" = TTLCache(ttl, max_entries)
+        # Concurrent first requests of a user share one listing
+        self._discovering: "SingleFlight[Tuple[str, str], Dict[str, List[MCPTool]]]" = SingleFlight("MCP tool discovery was cancelled")
+        self._listener = InvalidationListener(MCP_TOOLS_INVALIDATION_CHANNEL, self.invalidate, "mcp-tool-invalidation")
+
+    async def _discover(self, key: Tuple[str, str], connections: dict) -> Dict[str, List[MCPTool]]:
+        # A listing started before an invalidation is returned but not cached
+        generation = self._entries.generation
+        names = list(connections)
+        listed = await asyncio.gather(*(_list_server_tools(connections[name]) for name in names))
+        schemas = dict(zip(names, listed))
+        self._entries.set(key, schemas, generation)
+        return schemas
+
+    async def get_tools(self, user_id: str, mcp_tools: Optional[dict], client: MultiServerMCPClient) -> List[BaseTool]:
+        """
+        Tools of every server of `client`, listing the servers only when the user has no fresh entry.
+        """
+        self._listener.ensure_started()
+        connections = client.connections
+        key = (str(user_id), integration_config_hash(mcp_tools, connections))
+        schemas = self._entries.get(key)
+        if schemas is None:
+            schemas = await self._discovering.run(key, lambda: self._discover(key, connections))
+        return [
+            convert_mcp_tool_to_langchain_tool(None, tool, connection=connections[server_name])
+            for server_name, tools in schemas.items()
+            for tool in tools
+        ]
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """
+        Drop every entry of one user, or the whole cache when no id is given.
+        """
+        if user_id is None or user_id == INVALIDATE_ALL:
+            self._entries.clear()
+        else:
+            self._entries.discard(lambda key, schemas: key[0] == str(user_id))
+
+    def publish_invalidation(self, user_id: Optional[str] = None) -> None:
+        """
+        Invalidate locally and in every other process subscribed to the channel.
+        """
+        self.invalidate(user_id)
+        self._listener.publish(user_id)
+
+mcp_tool_cache = MCPToolCache()
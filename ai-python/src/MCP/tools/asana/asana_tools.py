@@ -3,6 +3,8 @@ from typing import Any, List, Optional, Dict
 from datetime import datetime
 import httpx
 from src.logger.default_logger import logger
+from src.MCP.credential_cache import integration_credentials
+from src.MCP.http_client import integration_http
 import os
 
 # Load environment variables
@@ -29,33 +31,34 @@ async def make_asana_request(endpoint: str, access_token: str = None, params: di
     }
     url = f"{ASANA_API_BASE}/{endpoint}"
     
-    async with httpx.AsyncClient() as client:
+    try:
+        if method == "GET":
+            response = await integration_http.request("ASANA", ASANA_API_BASE, "GET", url, headers=headers, params=params)
+        else:  # POST, PUT, DELETE
+            if method == "PUT":
+                response = await integration_http.request("ASANA", ASANA_API_BASE, "PUT", url, headers=headers, json=json_data)
+            elif method == "DELETE":
+                response = await integration_http.request("ASANA", ASANA_API_BASE, "DELETE", url, headers=headers)
+            else:  # POST
+                response = await integration_http.request("ASANA", ASANA_API_BASE, "POST", url, headers=headers, json=json_data)
+
+        response.raise_for_status()
+
+        logger.debug(f"Successfully received response from Asana API: {endpoint}")
+        return response.json()
+    except httpx.HTTPStatusError as e:
+        logger.error(f"HTTP error making request to Asana API: {endpoint} - Status: {e.response.status_code} - Error: {str(e)}")
+        if e.response.status_code == 401:
+            integration_credentials.invalidate_token(access_token)
+        # Try to parse error response
         try:
-            if method == "GET":
-                response = await client.get(url, headers=headers, params=params, timeout=30.0)
-            else:  # POST, PUT, DELETE
-                if method == "PUT":
-                    response = await client.put(url, headers=headers, json=json_data, timeout=30.0)
-                elif method == "DELETE":
-                    response = await client.delete(url, headers=headers, timeout=30.0)
-                else:  # POST
-                    response = await client.post(url, headers=headers, json=json_data, timeout=30.0)
-            
-            response.raise_for_status()
-            
-            logger.debug(f"Successfully received response from Asana API: {endpoint}")
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error making request to Asana API: {endpoint} - Status: {e.response.status_code} - Error: {str(e)}")
-            # Try to parse error response
-            try:
-                error_data = e.response.json()
-                return error_data
-            except Exception:
-                return {"errors": [{"message": f"HTTP error: {e.response.status_code}"}]}
-        except Exception as e:
-            logger.error(f"Error making request to Asana API: {endpoint} - Error: {str(e)}")
-            return None
+            error_data = e.response.json()
+            return error_data
+        except Exception:
+            return {"errors": [{"message": f"HTTP error: {e.response.status_code}"}]}
+    except Exception as e:
+        logger.error(f"Error making request to Asana API: {endpoint} - Error: {str(e)}")
+        return None
 
 
 # =============================================================================
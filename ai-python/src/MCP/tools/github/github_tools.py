@@ -3,6 +3,8 @@ from typing import Any, Optional
 from datetime import datetime, timedelta
 import httpx
 from src.logger.default_logger import logger
+from src.MCP.credential_cache import integration_credentials
+from src.MCP.http_client import integration_http
 import os 
 
 GITHUB_API_BASE = os.environ.get("GITHUB_API_BASE", "https://api.github.com")
@@ -20,21 +22,24 @@ async def make_github_request(endpoint: str, github_token: str, params: dict = N
     }
     url = f"{GITHUB_API_BASE}/{endpoint}"
     
-    async with httpx.AsyncClient() as client:
-        try:
-            
-            if method == "GET":
-                response = await client.get(url, headers=headers, params=params, timeout=30.0)
-            else:  # POST
-                response = await client.post(url, headers=headers, json=json_data, timeout=30.0)
-            response.raise_for_status()
-            
-            logger.info(f"Response of the request: {response}")
-            logger.debug(f"Successfully received response from GitHub API: {endpoint}")
-            return response.json()
-        except Exception as e:
-            logger.error(f"Error making request to GitHub API: {endpoint} - Error: {str(e)}")
-            return None
+    try:
+        if method == "GET":
+            response = await integration_http.request("GITHUB", GITHUB_API_BASE, "GET", url, headers=headers, params=params)
+        else:  # POST
+            response = await integration_http.request("GITHUB", GITHUB_API_BASE, "POST", url, headers=headers, json=json_data)
+        response.raise_for_status()
+
+        logger.info(f"Response of the request: {response}")
+        logger.debug(f"Successfully received response from GitHub API: {endpoint}")
+        return response.json()
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 401:
+            integration_credentials.invalidate_token(github_token)
+        logger.error(f"Error making request to GitHub API: {endpoint} - Error: {str(e)}")
+        return None
+    except Exception as e:
+        logger.error(f"Error making request to GitHub API: {endpoint} - Error: {str(e)}")
+        return None
         
 
 
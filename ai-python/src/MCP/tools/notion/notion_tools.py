@@ -3,6 +3,8 @@ from typing import Any, Dict, List, Optional
 import httpx
 import json
 from src.logger.default_logger import logger
+from src.MCP.credential_cache import integration_credentials
+from src.MCP.http_client import integration_http
 import os
 
 NOTION_API_BASE = os.environ.get("NOTION_API_BASE", "https://api.notion.com")
@@ -16,20 +18,24 @@ async def make_notion_request(endpoint: str, api_key: str, params: dict = None,
         "Content-Type": "application/json"
     }
     url = f"{NOTION_API_BASE}{endpoint}"
-    async with httpx.AsyncClient() as client:
-        try:
-            if method == "GET":
-                response = await client.get(url, headers=headers, params=params, timeout=30.0)
-            else:  # POST, PATCH, DELETE
-                response = await client.request(method, url, headers=headers, json=json_data, timeout=30.0)
-            
-            response.raise_for_status()
-            logger.debug(f"Successfully received response from Notion API: {endpoint}")
-            return response.json()
-            
-        except Exception as e:
-            logger.error(f"Error making request to Notion API: {endpoint} - Error: {str(e)}")
-            return None
+    try:
+        if method == "GET":
+            response = await integration_http.request("NOTION", NOTION_API_BASE, "GET", url, headers=headers, params=params)
+        else:  # POST, PATCH, DELETE
+            response = await integration_http.request("NOTION", NOTION_API_BASE, method, url, headers=headers, json=json_data)
+
+        response.raise_for_status()
+        logger.debug(f"Successfully received response from Notion API: {endpoint}")
+        return response.json()
+
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 401:
+            integration_credentials.invalidate_token(api_key)
+        logger.error(f"Error making request to Notion API: {endpoint} - Error: {str(e)}")
+        return None
+    except Exception as e:
+        logger.error(f"Error making request to Notion API: {endpoint} - Error: {str(e)}")
+        return None
 
 # =============================================================================
 # SEARCH FUNCTIONS
@@ -1,10 +1,14 @@
 """Slack-related MCP tools."""
 from typing import Any, List, Optional
 from datetime import datetime
-import httpx
 from src.logger.default_logger import logger
+from src.MCP.credential_cache import integration_credentials
+from src.MCP.http_client import integration_http
 import os 
 SLACK_API_BASE = os.environ.get("SLACK_API_BASE", "https://slack.com/api")
+# Slack answers 200 with these errors when the stored token can no longer be used
+SLACK_REJECTED_TOKEN_ERRORS = {"invalid_auth", "token_revoked", "token_expired", "account_inactive"}
+
 async def make_slack_request(endpoint: str, bot_token: str, params: dict = None, json_data: dict = None, method: str = "GET") -> dict[str, Any] | None:
     """Make a request to the Slack API with proper error handling."""
     logger.debug(f"Making {method} request to Slack API: {endpoint}")
@@ -14,18 +18,20 @@ async def make_slack_request(endpoint: str, bot_token: str, params: dict = None,
     }
     url = f"{SLACK_API_BASE}/{endpoint}"
     
-    async with httpx.AsyncClient() as client:
-        try:
-            if method == "GET":
-                response = await client.get(url, headers=headers, params=params, timeout=30.0)
-            else:  # POST
-                response = await client.post(url, headers=headers, json=json_data, timeout=30.0)
-            response.raise_for_status()
-            logger.debug(f"Successfully received response from Slack API: {endpoint}")
-            return response.json()
-        except Exception as e:
-            logger.error(f"Error making request to Slack API: {endpoint} - Error: {str(e)}")
-            return None
+    try:
+        if method == "GET":
+            response = await integration_http.request("SLACK", SLACK_API_BASE, "GET", url, headers=headers, params=params)
+        else:  # POST
+            response = await integration_http.request("SLACK", SLACK_API_BASE, "POST", url, headers=headers, json=json_data)
+        response.raise_for_status()
+        logger.debug(f"Successfully received response from Slack API: {endpoint}")
+        data = response.json()
+        if data.get("error") in SLACK_REJECTED_TOKEN_ERRORS:
+            integration_credentials.invalidate_token(bot_token)
+        return data
+    except Exception as e:
+        logger.error(f"Error making request to Slack API: {endpoint} - Error: {str(e)}")
+        return None
 
 # =============================================================================
 # EXISTING FUNCTIONS (keeping as-is)
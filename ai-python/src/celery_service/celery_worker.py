@@ -30,6 +30,7 @@ celery_app.autodiscover_tasks([
     "src.celery_service.openai.excel_agent",
     "src.celery_service.qdrant.embed_task",
     "src.celery_service.qdrant.insertion_task",
+    "src.celery_service.ingestion_job",
 ],force=True)
 
 celery_app.conf.task_routes = {
@@ -41,6 +42,7 @@ celery_app.conf.task_routes = {
     "src.celery_service.openai.excel_agent":{"queue":"excel_agent"},
     "src.celery_service.qdrant.embed_task":{"queue":"openai_embedding"},
     "src.celery_service.qdrant.insertion_task":{"queue":"qdrant_insertion"},
+    "src.celery_service.ingestion_job":{"queue":"log_task"},
 }
 
 celery_app.conf.update(
@@ -0,0 +1,172 @@
+import asyncio
+import json
+import os
+from typing import Dict, List, Optional
+from bson.objectid import ObjectId
+from celery import shared_task
+from celery.result import GroupResult
+from dotenv import load_dotenv
+import redis
+from src.db.async_config import async_db_instance
+from src.logger.default_logger import logger
+
+load_dotenv()
+
+redis_url = os.environ.get("CELERY_BROKEN_URL")
+redis_client = redis.StrictRedis.from_url(redis_url)
+
+INGESTION_JOB_TTL = int(os.environ.get("INGESTION_JOB_TTL", 86400))
+INGESTION_JOB_POLL_INTERVAL = float(os.environ.get("INGESTION_JOB_POLL_INTERVAL", 1.0))
+INGESTION_JOB_STREAM_TIMEOUT = float(os.environ.get("INGESTION_JOB_STREAM_TIMEOUT", 1800))
+
+# Terminal values written by log_task_status from the extraction/embedding/insertion tasks.
+TERMINAL_FILE_STATUSES = {"SUCCESS", "FAILURE"}
+
+
+def get_ingestion_job_key(job_id: str) -> str:
+    """
+    Helper function to construct the Redis key holding an ingestion job record.
+    """
+    return f"ingestion-job-{job_id}"
+
+
+def register_ingestion_job(job_id: str, group_id: str, file_ids: List[str], collection: str = "file") -> str:
+    """
+    Persist the group and the files an ingestion job covers so the job can be tracked from any gateway worker.
+
+    :param job_id: The job id, passed to the chord callbacks.
+    :param group_id: Id of the Celery group of the extract -> prepare -> embed chains.
+    :param file_ids: Mongo ids of the files being ingested, in request order.
+    :param collection: Collection holding the per-file `tasks` status written by `log_task_status`.
+    :return: The job id.
+    """
+    job = {"job_id": job_id, "group_id": group_id, "file_ids": file_ids, "collection": collection, "status": "PENDING"}
+    redis_client.set(get_ingestion_job_key(job_id), json.dumps(job), ex=INGESTION_JOB_TTL)
+    return job_id
+
+
+def get_ingestion_job(job_id: str) -> Optional[Dict]:
+    value = redis_client.get(get_ingestion_job_key(job_id))
+    return json.loads(value) if value else None
+
+
+def _save_ingestion_job(job: Dict) -> None:
+    redis_client.set(get_ingestion_job_key(job["job_id"]), json.dumps(job), ex=INGESTION_JOB_TTL)
+
+
+def _release_group(job_id: str, errors: Optional[List[str]] = None) -> None:
+    """
+    Record the outcome of the job's chains and release the Celery group, the same cleanup the
+    blocking endpoint did after join().
+    """
+    job = get_ingestion_job(job_id)
+    if job is None:
+        return
+    group_result = GroupResult.restore(job["group_id"])
+    if group_result is not None:
+        if errors is not None:
+            errors = [str(res.result) for res in group_result.results if res.state == 'FAILURE'] or errors
+        group_result.forget()
+        group_result.delete()
+
+    job.update({"group_ready": True, "errors": errors or []})
+    _save_ingestion_job(job)
+    logger.info(
+        "Ingestion job chains finished",
+        extra={"tags": {"method": "ingestion_job._release_group", "job_id": job_id, "failed": bool(errors)}}
+    )
+
+
+@shared_task(queue='log_task')
+def finalize_ingestion_job(job_id: str):
+    """
+    Chord callback of the ingestion chains, run once every chain has succeeded.
+    """
+    _release_group(job_id)
+
+
+@shared_task(queue='log_task')
+def fail_ingestion_job(*args, job_id: str = None):
+    """
+    Error callback of the chord, run once every chain is done and one of them failed.
+
+    Called with `(request, exc, traceback)` by a worker that has this task registered, and queued
+    with the failed task id by one that has not (the extraction worker), so the errors are read
+    from the group rather than from the arguments.
+    """
+    exc = args[1] if len(args) > 1 else None
+    _release_group(job_id, errors=[str(exc) if exc is not None else "Ingestion chain failed"])
+
+
+async def get_ingestion_job_status(job_id: str) -> Optional[Dict]:
+    """
+    Build a progress snapshot for an ingestion job from the `log_task_status` records of its files.
+
+    :return: The snapshot, or None if the job is unknown or expired.
+    """
+    job = await asyncio.to_thread(get_ingestion_job, job_id)
+    if job is None:
+        return None
+
+    file_ids = job["file_ids"]
+    collection = async_db_instance.get_collection(job.get("collection", "file"))
+    cursor = collection.find({"_id": {"$in": [ObjectId(file_id) for file_id in file_ids]}}, {"tasks": 1})
+    records = {str(doc["_id"]): doc.get("tasks") or {} for doc in await cursor.to_list(length=len(file_ids))}
+
+    files = []
+    for file_id in file_ids:
+        tasks = records.get(file_id, {})
+        files.append({
+            "file_id": file_id,
+            "task_id": tasks.get("task_id"),
+            "status": tasks.get("status", "PENDING"),
+            "progress": tasks.get("progress", "QUEUE"),
+        })
+
+    status = job.get("status", "PENDING")
+    if status not in TERMINAL_FILE_STATUSES:
+        # group_ready and errors are recorded by the chord callbacks once every chain is done
+        files_done = all(file["status"] in TERMINAL_FILE_STATUSES for file in files)
+        if job.get("group_ready") and (files_done or job.get("errors")):
+            file_failed = any(file["status"] == "FAILURE" for file in files)
+            status = "FAILURE" if job.get("errors") or file_failed else "SUCCESS"
+            job["status"] = status
+            await asyncio.to_thread(_save_ingestion_job, job)
+            logger.info(
+                f"Ingestion job finished with status {status}",
+                extra={"tags": {"method": "ingestion_job.get_ingestion_job_status", "job_id": job_id}}
+            )
+        elif any(file["status"] != "PENDING" for file in files):
+            status = "STARTED"
+
+    completed = sum(1 for file in files if file["status"] in TERMINAL_FILE_STATUSES)
+    return {
+        "job_id": job_id,
+        "status": status,
+        "completed": completed,
+        "total": len(files),
+        "errors": job.get("errors", []),
+        "files": files,
+    }
+
+
+async def stream_ingestion_job_status(job_id: str):
+    """
+    Yield SSE frames with the job snapshot whenever it changes, until the job reaches a terminal status.
+    """
+    last_snapshot = None
+    deadline = asyncio.get_running_loop().time() + INGESTION_JOB_STREAM_TIMEOUT
+    while True:
+        snapshot = await get_ingestion_job_status(job_id)
+        if snapshot is None:
+            yield f"event: error\ndata: {json.dumps({'job_id': job_id, 'detail': 'Ingestion job not found'})}\n\n", 200
+            return
+        if snapshot != last_snapshot:
+            yield f"data: {json.dumps(snapshot)}\n\n", 200
+            last_snapshot = snapshot
+        if snapshot["status"] in TERMINAL_FILE_STATUSES:
+            return
+        if asyncio.get_running_loop().time() >= deadline:
+            yield f"event: timeout\ndata: {json.dumps({'job_id': job_id})}\n\n", 200
+            return
+        await asyncio.sleep(INGESTION_JOB_POLL_INTERVAL)
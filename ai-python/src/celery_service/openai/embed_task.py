@@ -11,7 +11,9 @@ from src.logger.default_logger import logger
 from src.crypto_hub.services.openai.embedding_api_key_decryption import EmbeddingAPIKeyDecryptionHandler
 from src.custom_lib.langchain.callbacks.openai.cost_embedding.count_embed_tokens import CostEmbedding
 from src.chatflow_langchain.repositories.file_repository import FileRepository
-embedding_apikey_decrypt_service = EmbeddingAPIKeyDecryptionHandler()
+from src.chatflow_langchain.utils.request_context import RequestScoped
+from src.celery_service.qdrant.vector_transport import store_vector_nodes
+embedding_apikey_decrypt_service = RequestScoped(EmbeddingAPIKeyDecryptionHandler)
 
 
 @celery_app.task(
@@ -83,7 +85,7 @@ def start_embedding_openai(
     - dimensions (int): Number of dimensions for the embedding, defaults to 1536.
 
     Returns:
-    - list: The result of the embedding process.
+    - dict: Reference to the embedded nodes, parked in binary form for `insert_into_vector_db`.
 
     Raises:
     - HTTPException: Raises an error with status code 500 if embedding fails.
@@ -119,7 +121,7 @@ def start_embedding_openai(
             "Task successfully executed",
             extra={"tags": {"task_function": "start_embedding_openai"}}
         )
-        return embedded_nodes
+        return store_vector_nodes(embedded_nodes)
     except Exception as e:
         logger.error(
             f"Error executing task: {e}",
@@ -0,0 +1,275 @@
+import hashlib
+import json
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+import requests
+from dotenv import load_dotenv
+from pyarrow import ArrowException
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from src.logger.default_logger import logger
+
+load_dotenv()
+
+# Cleaned sheets are written here as parquet, shared by the worker processes of the host's user.
+# Only used when the directory is private to that user
+EXCEL_WORKBOOK_CACHE_DIR = os.environ.get("EXCEL_WORKBOOK_CACHE_DIR", os.path.join(tempfile.gettempdir(), f"excel_workbook_cache-{os.getuid()}"))
+# Workbooks kept on disk, the least recently used are removed first
+EXCEL_WORKBOOK_CACHE_MAX_WORKBOOKS = int(os.environ.get("EXCEL_WORKBOOK_CACHE_MAX_WORKBOOKS", 200))
+# Parsed workbooks kept in the memory of each worker process
+EXCEL_WORKBOOK_CACHE_MAX_ENTRIES = int(os.environ.get("EXCEL_WORKBOOK_CACHE_MAX_ENTRIES", 8))
+EXCEL_WORKBOOK_HEAD_TIMEOUT = float(os.environ.get("EXCEL_WORKBOOK_HEAD_TIMEOUT", 10))
+_MANIFEST = "manifest.json"
+_RELEVANCE = "relevance.json"
+_SHEET_VECTORS = "sheet_vectors.npz"
+
+
+def workbook_version(file_path: str) -> Optional[str]:
+    """
+    ETag of a remote workbook (Last-Modified and size when the store sends no ETag), mtime and size
+    of a local one. None when the version cannot be told, such workbooks are never cached.
+    """
+    try:
+        if not file_path.startswith(("http://", "https://")):
+            stat = os.stat(file_path)
+            return f"{stat.st_mtime_ns}-{stat.st_size}"
+        response = requests.head(file_path, allow_redirects=True, timeout=EXCEL_WORKBOOK_HEAD_TIMEOUT)
+        response.raise_for_status()
+    except (OSError, requests.RequestException) as e:
+        logger.warning(f"Could not read the version of {file_path}: {e}", extra={"tags": {"method": "workbook_version"}})
+        return None
+    if response.headers.get("ETag"):
+        return response.headers["ETag"]
+    if response.headers.get("Last-Modified") and response.headers.get("Content-Length"):
+        return f"{response.headers['Last-Modified']}-{response.headers['Content-Length']}"
+    return None
+
+
+def sheet_relevance_text(sheet_name: str, df: pd.DataFrame) -> str:
+    headers = ' '.join(df.columns.astype(str))
+    sample_data = ' '.join(df.head(10).astype(str).values.flatten())
+    sheet_name_text = sheet_name.replace("_", " ").replace("-", " ")
+    # Give more weight to headers and sheet name
+    return (sheet_name_text + " ") * 3 + (headers + " ") * 2 + sample_data
+
+
+class ParsedWorkbook:
+    """
+    Cleaned sheets of a workbook, in workbook order, with a TF-IDF model fitted once over the sheets'
+    names, headers and first rows to rank them against questions.
+    """
+
+    def __init__(self, file_type: str, sheets: Dict[str, pd.DataFrame], vectorizer: Optional[TfidfVectorizer] = None, sheet_vectors=None):
+        self.file_type = file_type
+        self.sheets = sheets
+        if vectorizer is None and len(sheets) > 1:
+            vectorizer, sheet_vectors = self._fit(sheets)
+        self.vectorizer = vectorizer
+        self.sheet_vectors = sheet_vectors
+
+    @staticmethod
+    def _fit(sheets: Dict[str, pd.DataFrame]):
+        vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1, 2))
+        try:
+            sheet_vectors = vectorizer.fit_transform([sheet_relevance_text(name, df) for name, df in sheets.items()])
+        except ValueError:
+            # Nothing but stop words: every sheet scores on its name alone
+            return None, None
+        return vectorizer, sheet_vectors
+
+    def relevance_scores(self, query: str) -> Dict[str, float]:
+        names = list(self.sheets)
+        if self.vectorizer is not None:
+            similarities = cosine_similarity(self.vectorizer.transform([query]), self.sheet_vectors)[0]
+        else:
+            similarities = [0.0] * len(names)
+        query_words = query.lower().split()
+        scores = {}
+        for name, similarity in zip(names, similarities):
+            sheet_name_text = name.replace("_", " ").replace("-", " ").lower()
+            # Also boost score if query words appear in sheet name
+            scores[name] = float(similarity) + (0.15 if any(word in sheet_name_text for word in query_words) else 0.0)
+        return scores
+
+
+def _private_directory(directory: str) -> bool:
+    """
+    Creates `directory` if needed and tells whether it is a real directory owned by this user that
+    nobody else can write to or read from.
+    """
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        info = os.lstat(directory)
+    except OSError as e:
+        logger.warning(f"Could not create the workbook cache directory {directory}: {e}", extra={"tags": {"method": "_private_directory"}})
+        return False
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        logger.warning(f"Workbook cache directory {directory} is not private to this user, workbooks are cached in memory only",
+                       extra={"tags": {"method": "_private_directory"}})
+        return False
+    return True
+
+
+def _json_labels(columns: pd.Index) -> Optional[list]:
+    # Labels JSON gives back as they are, others (tuples, timestamps, NaN) keep the sheet out of the disk cache
+    labels = columns.tolist()
+    if not all(type(label) in (str, int, float, bool) for label in labels):
+        return None
+    try:
+        return labels if json.loads(json.dumps(labels, allow_nan=False)) == labels else None
+    except ValueError:
+        return None
+
+
+def _write_sheet(df: pd.DataFrame, directory: str, index: int) -> Optional[Dict]:
+    """
+    Writes `df` as parquet under positional column names, its own labels go to the manifest.
+    None when the sheet cannot be stored so, e.g. a column mixing numbers and text.
+    """
+    labels = _json_labels(df.columns)
+    if labels is None:
+        return None
+    file_name = f"sheet_{index}.parquet"
+    stored = df.set_axis([str(position) for position in range(len(labels))], axis=1)
+    try:
+        stored.to_parquet(os.path.join(directory, file_name), engine="pyarrow", index=True)
+    except (ValueError, TypeError, ArrowException):
+        return None
+    return {"file": file_name, "columns": labels, "columns_dtype": str(df.columns.dtype)}
+
+
+def _read_sheet(directory: str, sheet: Dict) -> pd.DataFrame:
+    df = pd.read_parquet(os.path.join(directory, sheet["file"]), engine="pyarrow")
+    return df.set_axis(pd.Index(sheet["columns"], dtype=sheet["columns_dtype"]), axis=1)
+
+
+def _write_relevance(directory: str, vectorizer: TfidfVectorizer, sheet_vectors) -> None:
+    relevance = {"vocabulary": {term: int(column) for term, column in vectorizer.vocabulary_.items()}, "idf": vectorizer.idf_.tolist()}
+    with open(os.path.join(directory, _RELEVANCE), "w") as relevance_file:
+        json.dump(relevance, relevance_file)
+    sparse.save_npz(os.path.join(directory, _SHEET_VECTORS), sparse.csr_matrix(sheet_vectors))
+
+
+def _read_relevance(directory: str) -> Tuple[TfidfVectorizer, sparse.csr_matrix]:
+    with open(os.path.join(directory, _RELEVANCE)) as relevance_file:
+        relevance = json.load(relevance_file)
+    # Same settings as ParsedWorkbook._fit, with the fitted vocabulary and weights
+    vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1, 2), vocabulary=relevance["vocabulary"])
+    vectorizer.idf_ = np.asarray(relevance["idf"], dtype=np.float64)
+    return vectorizer, sparse.load_npz(os.path.join(directory, _SHEET_VECTORS))
+
+
+class WorkbookCache:
+    """
+    Parsed and cleaned workbooks keyed by (file path, version), in process memory and on local disk.
+
+    A question on a cached workbook costs a HEAD request for its version instead of a download,
+    a parse and the cleaning of every sheet. A new upload under the same path has a new version
+    and is parsed again.
+    """
+
+    def __init__(self, directory: str = EXCEL_WORKBOOK_CACHE_DIR, max_workbooks: int = EXCEL_WORKBOOK_CACHE_MAX_WORKBOOKS,
+                 max_entries: int = EXCEL_WORKBOOK_CACHE_MAX_ENTRIES):
+        self.directory = directory
+        self.max_workbooks = max_workbooks
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, ParsedWorkbook]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._on_disk: Optional[bool] = None
+
+    def get(self, file_path: str, parse: Callable[[], Tuple[str, Dict[str, pd.DataFrame]]]) -> ParsedWorkbook:
+        """
+        The cached workbook of `file_path`, `parse` returns (file type, cleaned sheets) on a miss.
+        """
+        version = workbook_version(file_path)
+        if version is None:
+            return ParsedWorkbook(*parse())
+        key = hashlib.sha256(f"{file_path}\0{version}".encode("utf-8")).hexdigest()
+        with self._lock:
+            workbook = self._entries.get(key)
+            if workbook is not None:
+                self._entries.move_to_end(key)
+                return workbook
+        on_disk = self._disk_available()
+        workbook = self._read(key) if on_disk else None
+        if workbook is None:
+            workbook = ParsedWorkbook(*parse())
+            if on_disk:
+                self._write(key, workbook)
+        with self._lock:
+            self._entries[key] = workbook
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return workbook
+
+    def _disk_available(self) -> bool:
+        if self._on_disk is None:
+            self._on_disk = _private_directory(self.directory)
+        return self._on_disk
+
+    def _read(self, key: str) -> Optional[ParsedWorkbook]:
+        directory = os.path.join(self.directory, key)
+        try:
+            with open(os.path.join(directory, _MANIFEST)) as manifest_file:
+                manifest = json.load(manifest_file)
+            sheets = {sheet["name"]: _read_sheet(directory, sheet) for sheet in manifest["sheets"]}
+            vectorizer, sheet_vectors = None, None
+            if manifest.get("relevance"):
+                vectorizer, sheet_vectors = _read_relevance(directory)
+            # Marks the workbook as recently used for pruning
+            os.utime(directory)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cached workbook {key}: {e}", extra={"tags": {"method": "WorkbookCache._read"}})
+            shutil.rmtree(directory, ignore_errors=True)
+            return None
+        return ParsedWorkbook(manifest["file_type"], sheets, vectorizer, sheet_vectors)
+
+    def _write(self, key: str, workbook: ParsedWorkbook) -> None:
+        staging = os.path.join(self.directory, f".{key}.{uuid.uuid4().hex}")
+        try:
+            os.makedirs(staging)
+            sheets = []
+            for index, (name, df) in enumerate(workbook.sheets.items()):
+                sheet = _write_sheet(df, staging, index)
+                if sheet is None:
+                    # Kept in memory only, parsed again by the other worker processes
+                    return
+                sheets.append({"name": name, **sheet})
+            if workbook.vectorizer is not None:
+                _write_relevance(staging, workbook.vectorizer, workbook.sheet_vectors)
+            with open(os.path.join(staging, _MANIFEST), "w") as manifest_file:
+                json.dump({"file_type": workbook.file_type, "sheets": sheets, "relevance": workbook.vectorizer is not None}, manifest_file)
+            # Another process may have cached the same version meanwhile, its copy is kept
+            os.rename(staging, os.path.join(self.directory, key))
+        except OSError as e:
+            if not os.path.isdir(os.path.join(self.directory, key)):
+                logger.warning(f"Failed to cache workbook {key}: {e}", extra={"tags": {"method": "WorkbookCache._write"}})
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        self._prune()
+
+    def _prune(self) -> None:
+        try:
+            cached = [entry for entry in os.scandir(self.directory) if entry.is_dir() and not entry.name.startswith(".")]
+        except OSError:
+            return
+        if len(cached) <= self.max_workbooks:
+            return
+        cached.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in cached[:len(cached) - self.max_workbooks]:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+workbook_cache = WorkbookCache()
@@ -15,8 +15,10 @@ from src.celery_service.qdrant.localstack_backup import upload_df_embed_to_local
 from src.chatflow_langchain.repositories.file_repository import FileRepository
 from src.db.qdrant_config import qdrant_url,qdrant_client
 from qdrant_client.models import PointStruct
+from src.chatflow_langchain.utils.request_context import RequestScoped
+from src.celery_service.qdrant.vector_transport import store_vector_nodes
 CHUNK_SIZE = 400
-embedding_apikey_decrypt_service = EmbeddingAPIKeyDecryptionHandler()
+embedding_apikey_decrypt_service = RequestScoped(EmbeddingAPIKeyDecryptionHandler)
 
 
 store_bucket_dict={
@@ -161,7 +163,7 @@ def start_embedding_openai(
                 vector_nodes = result.get("embedded_nodes", [])
                 if vector_nodes:
                     s3_key = f"{kwargs.get('company_id')}/{kwargs.get('namespace')}/{kwargs.get('tag')}_{i}.parquet"
-                    store_bucket_dict[bucket_type].apply_async(kwargs={'data_list': vector_nodes, 's3_key': s3_key})
+                    store_bucket_dict[bucket_type].apply_async(kwargs={'data_list': store_vector_nodes(vector_nodes), 's3_key': s3_key})
                     vector_nodes= [PointStruct(id=node['id'], vector=node['vector'], payload=node['payload']) for node in vector_nodes]
                     qdrant_client_instance.upsert(collection_name=company_id,points=vector_nodes)
 
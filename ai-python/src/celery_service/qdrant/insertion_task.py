@@ -1,10 +1,11 @@
 from src.celery_service.celery_worker import celery_app
 from fastapi import HTTPException
 import redis
-from typing import List
+from typing import Dict, List, Union
 from src.celery_service.mongodb.task_status import log_task_status
 from src.logger.default_logger import logger
 from src.celery_service.utils import delete_all_success_tasks_in_redis
+from src.celery_service.qdrant.vector_transport import load_vector_nodes
 from src.celery_service.qdrant.localstack_backup import upload_df_embed_to_localstack,upload_df_embed_to_s3,upload_df_embed_to_minio
 from src.chatflow_langchain.repositories.settings_repository import SettingRepository
 from qdrant_client import QdrantClient
@@ -26,12 +27,12 @@ store_bucket_dict={
 }
 
 @celery_app.task(bind=True, autoretry_for=(Exception,), retry_kwargs={'max_retries': 0, 'countdown': 0},queue="qdrant_insertion")
-def insert_into_vector_db(self,vector_nodes: List, **kwargs):
+def insert_into_vector_db(self,vector_nodes: Union[List, Dict], **kwargs):
     """
     Inserts the given vector nodes into a vector database.
 
     Parameters:
-    - vector_nodes (List): The list of vector nodes to be inserted.
+    - vector_nodes (Union[List, Dict]): The vector nodes to be inserted, or the reference returned by the embedding task.
     
     Keyword Arguments:
     - environment (str): Specifies the environment for Qdrant.
@@ -55,8 +56,10 @@ def insert_into_vector_db(self,vector_nodes: List, **kwargs):
 
         bucket_type = os.environ.get("BUCKET_TYPE", "MINIO")
 
+        nodes = load_vector_nodes(vector_nodes)
+        # The backup task receives the reference and deletes the parked batch once uploaded
         store_bucket_dict[bucket_type].apply_async(kwargs={'data_list': vector_nodes, 's3_key': s3_file_key})
-        vector_nodes= [PointStruct(id=node['id'], vector=node['vector'], payload=node['payload']) for node in vector_nodes]
+        vector_nodes= [PointStruct(id=node['id'], vector=node['vector'], payload=node['payload']) for node in nodes]
         
         
     
@@ -75,7 +78,7 @@ def insert_into_vector_db(self,vector_nodes: List, **kwargs):
         raise HTTPException(status_code=400, detail=f"Failed to executing task: {e}")
     finally:
          # Optimized cleanup: iterate over a list of variables and delete them if defined.
-        for var in ['initializer',"vector_nodes","api_key","s3_file_key"]:
+        for var in ['initializer',"vector_nodes","nodes","api_key","s3_file_key"]:
             if var in locals():
                 del locals()[var]
 
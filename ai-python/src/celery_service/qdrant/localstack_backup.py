@@ -4,13 +4,15 @@ from src.logger.default_logger import logger
 from botocore.exceptions import NoCredentialsError
 from src.aws.storageClient_service import ClientService
 import pandas as pd
+from typing import Union
 import json
+from src.celery_service.qdrant.vector_transport import load_vector_nodes, release_vector_nodes
 
 @celery_app.task
-def upload_df_embed_to_localstack(data_list: list, s3_key: str):
+def upload_df_embed_to_localstack(data_list: Union[list, dict], s3_key: str):
     """
     Upload a DataFrame directly to S3 in Parquet format without a local buffer.
-    :param data: List of dictionaries to be converted to DataFrame.
+    :param data_list: Vector nodes, or the reference of a batch parked by `store_vector_nodes`.
     :param s3_bucket_name: The name of the S3 bucket.
     :param s3_key: The key (path) in the S3 bucket.
     """
@@ -21,7 +23,7 @@ def upload_df_embed_to_localstack(data_list: list, s3_key: str):
             'vector': node['vector'],
             'payload': json.dumps(node['payload'])  # Convert dict to JSON string
         }
-        for node in data_list
+        for node in load_vector_nodes(data_list)
     ]
 
     # Create DataFrame
@@ -54,13 +56,15 @@ def upload_df_embed_to_localstack(data_list: list, s3_key: str):
     except Exception as e:
         logger.error(f"Failed to upload DataFrame: {e}")
         return f"Failed to upload DataFrame: {e}"
+    finally:
+        release_vector_nodes(data_list)
     
 
 @celery_app.task
-def upload_df_embed_to_minio(data_list: list, s3_key: str):
+def upload_df_embed_to_minio(data_list: Union[list, dict], s3_key: str):
     """
     Upload a DataFrame directly to S3 in Parquet format without a local buffer.
-    :param data: List of dictionaries to be converted to DataFrame.
+    :param data_list: Vector nodes, or the reference of a batch parked by `store_vector_nodes`.
     :param s3_bucket_name: The name of the S3 bucket.
     :param s3_key: The key (path) in the S3 bucket.
     """
@@ -71,7 +75,7 @@ def upload_df_embed_to_minio(data_list: list, s3_key: str):
             'vector': node['vector'],
             'payload': json.dumps(node['payload'])  # Convert dict to JSON string
         }
-        for node in data_list
+        for node in load_vector_nodes(data_list)
     ]
 
     # Create DataFrame
@@ -104,13 +108,15 @@ def upload_df_embed_to_minio(data_list: list, s3_key: str):
     except Exception as e:
         logger.error(f"Failed to upload DataFrame: {e}")
         return f"Failed to upload DataFrame: {e}"
+    finally:
+        release_vector_nodes(data_list)
     
 
 @celery_app.task
-def upload_df_embed_to_s3(data_list: list, s3_key: str):
+def upload_df_embed_to_s3(data_list: Union[list, dict], s3_key: str):
     """
     Upload a DataFrame directly to S3 in Parquet format without a local buffer.
-    :param data: List of dictionaries to be converted to DataFrame.
+    :param data_list: Vector nodes, or the reference of a batch parked by `store_vector_nodes`.
     :param s3_bucket_name: The name of the S3 bucket.
     :param s3_key: The key (path) in the S3 bucket.
     """
@@ -122,7 +128,7 @@ def upload_df_embed_to_s3(data_list: list, s3_key: str):
             'vector': node['vector'],
             'payload': json.dumps(node['payload'])  # Convert dict to JSON string
         }
-        for node in data_list
+        for node in load_vector_nodes(data_list)
     ]
 
     # Create DataFrame
@@ -158,4 +164,6 @@ def upload_df_embed_to_s3(data_list: list, s3_key: str):
         return "AWS credentials not found!"
     except Exception as e:
         logger.error(f"Failed to upload DataFrame: {e}")
-        return f"Failed to upload DataFrame: {e}"
\ No newline at end of file
+        return f"Failed to upload DataFrame: {e}"
+    finally:
+        release_vector_nodes(data_list)
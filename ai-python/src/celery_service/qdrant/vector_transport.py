@@ -0,0 +1,97 @@
+import os
+import sys
+import uuid
+from array import array
+from typing import Dict, List, Union
+import msgpack
+import redis
+from dotenv import load_dotenv
+from src.logger.default_logger import logger
+
+load_dotenv()
+
+# Embedded batches are parked here and only a reference travels through the broker
+VECTOR_BLOB_REDIS_URL = os.environ.get("VECTOR_BLOB_REDIS_URL", os.environ.get("CELERY_BROKEN_URL"))
+# Seconds a parked batch survives when its consumer never runs (task lost, chain revoked)
+VECTOR_BLOB_TTL = int(os.environ.get("VECTOR_BLOB_TTL", 3600))
+VECTOR_BLOB_PREFIX = "vector_blob:"
+VECTOR_BLOB_FORMAT = 1
+
+redis_client = redis.StrictRedis.from_url(VECTOR_BLOB_REDIS_URL)
+
+VectorNodes = List[Dict]
+VectorNodesRef = Dict[str, Union[str, int]]
+
+
+def pack_vector_nodes(vector_nodes: VectorNodes) -> bytes:
+    """
+    Encode `{"id", "vector", "payload"}` nodes as msgpack with every vector in one little-endian
+    float32 buffer, about a fifth of the JSON size of the same vectors.
+    """
+    vectors = array("f")
+    for node in vector_nodes:
+        vectors.extend(node["vector"])
+    if sys.byteorder != "little":
+        vectors.byteswap()
+    return msgpack.packb({
+        "format": VECTOR_BLOB_FORMAT,
+        "dimensions": len(vector_nodes[0]["vector"]) if vector_nodes else 0,
+        "ids": [node["id"] for node in vector_nodes],
+        "payloads": [node["payload"] for node in vector_nodes],
+        "vectors": vectors.tobytes(),
+    }, use_bin_type=True)
+
+
+def unpack_vector_nodes(blob: bytes) -> VectorNodes:
+    """
+    Decode a `pack_vector_nodes` blob back to `{"id", "vector", "payload"}` nodes.
+    """
+    data = msgpack.unpackb(blob, raw=False)
+    if data.get("format") != VECTOR_BLOB_FORMAT:
+        raise ValueError(f"Unsupported vector blob format: {data.get('format')}")
+    vectors = array("f")
+    vectors.frombytes(data["vectors"])
+    if sys.byteorder != "little":
+        vectors.byteswap()
+    values, dimensions = vectors.tolist(), data["dimensions"]
+    return [
+        {"id": node_id, "vector": values[index * dimensions:(index + 1) * dimensions], "payload": payload}
+        for index, (node_id, payload) in enumerate(zip(data["ids"], data["payloads"]))
+    ]
+
+
+def store_vector_nodes(vector_nodes: VectorNodes) -> VectorNodesRef:
+    """
+    Park an embedded batch and return the reference to hand to the next task.
+    """
+    key = f"{VECTOR_BLOB_PREFIX}{uuid.uuid4().hex}"
+    redis_client.set(key, pack_vector_nodes(vector_nodes), ex=VECTOR_BLOB_TTL)
+    return {"vector_blob": key, "count": len(vector_nodes)}
+
+
+def load_vector_nodes(vector_nodes: Union[VectorNodes, VectorNodesRef]) -> VectorNodes:
+    """
+    Nodes of a reference returned by `store_vector_nodes`. Plain node lists, as sent before the
+    binary transport and still found in queued messages, are returned unchanged.
+    """
+    if not isinstance(vector_nodes, dict):
+        return vector_nodes
+    blob = redis_client.get(vector_nodes["vector_blob"])
+    if blob is None:
+        raise KeyError(f"Vector blob {vector_nodes['vector_blob']} expired or was already consumed")
+    return unpack_vector_nodes(blob)
+
+
+def release_vector_nodes(vector_nodes: Union[VectorNodes, VectorNodesRef]) -> None:
+    """
+    Delete a parked batch once its last consumer is done with it.
+    """
+    if not isinstance(vector_nodes, dict):
+        return
+    try:
+        redis_client.delete(vector_nodes["vector_blob"])
+    except redis.RedisError as e:
+        logger.warning(
+            f"Failed to delete vector blob, it expires after {VECTOR_BLOB_TTL}s: {e}",
+            extra={"tags": {"method": "release_vector_nodes"}}
+        )
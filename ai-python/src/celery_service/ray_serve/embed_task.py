@@ -6,6 +6,7 @@ from src.embedder.ray_serve_embedder.pinecone_node import NodeTextEmbedderRaySer
 from src.embedder.helper_pack.utils_embedder import get_default_key_url
 from src.celery_service.mongodb.task_status import log_task_status
 from src.logger.default_logger import logger
+from src.celery_service.qdrant.vector_transport import store_vector_nodes
 
 
 @celery_app.task(
@@ -34,7 +35,7 @@ def start_embedding_ray_serve(
     - dimensions (int): Number of dimensions for the embedding, defaults to 1536.
 
     Returns:
-    - list: The result of the embedding process.
+    - dict: Reference to the embedded nodes, parked in binary form for `insert_into_vector_db`.
 
     Raises:
     - HTTPException: Raises an error with status code 500 if embedding fails.
@@ -60,7 +61,7 @@ def start_embedding_ray_serve(
             "Task successfully executed",
             extra={"tags": {"task_function": "start_embedding_ray_serve"}}
         )
-        return embedded_nodes
+        return store_vector_nodes(embedded_nodes)
     except Exception as e:
         logger.error(
             f"Error executing task: {e}",
@@ -86,12 +86,12 @@ def extract_and_transform_anthropic(self,config, conversation, chat_id, import_i
             "promptT": 0,
             "completion": 0,
             "totalUsed": 0,
-            "totalCost": "$0.0",
+            "totalCost": 0.0,
             "summary": {
                 "promptT": 0,
                 "completion": 0,
                 "totalUsed": 0,
-                "totalCost": "$0.0"
+                "totalCost": 0.0
             }
         }
 
@@ -128,7 +128,7 @@ def extract_and_transform_anthropic(self,config, conversation, chat_id, import_i
 
                 total_imported_tokens += tokens["totalUsed"]
                 # Calculate the total cost for all tokens used
-                tokens["totalCost"] = f"${tokens['totalUsed'] * 0.00001:.6f}"
+                tokens["totalCost"] = round(tokens["totalUsed"] * 0.00001, 6)
                 total_completion_tokens +=tokens['completion']
                 summarized_history = ''
 
@@ -155,7 +155,7 @@ def extract_and_transform_anthropic(self,config, conversation, chat_id, import_i
                         tokens["summary"]["totalUsed"] = cb.total_tokens
                         tokens["summary"]["promptT"] = cb.prompt_tokens
                         tokens["summary"]["completion"] = cb.completion_tokens
-                        tokens["summary"]["totalCost"] = f"${cb.total_cost}"
+                        tokens["summary"]["totalCost"] = cb.total_cost
                         total_summary_tokens += tokens["summary"]["totalUsed"]
                         total_summary_prompt += tokens["summary"]["promptT"]
                         total_summary_completion += tokens["summary"]["completion"]
@@ -102,12 +102,12 @@ def extract_and_transform_openai(self,config, conversation, chat_id, import_id,c
                 "promptT": 0,
                 "completion": 0,
                 "totalUsed": 0,
-                "totalCost": "$0.0",
+                "totalCost": 0.0,
                 "summary": {
                     "promptT": 0,
                     "completion": 0,
                     "totalUsed": 0,
-                    "totalCost": "$0.0"
+                    "totalCost": 0.0
                 }
             }
 
@@ -146,7 +146,7 @@ def extract_and_transform_openai(self,config, conversation, chat_id, import_id,c
                 # Save both user query and assistant response in a single document
                 tokens["totalUsed"] = tokens["promptT"] + tokens["completion"]
                 total_imported_tokens += tokens["totalUsed"]
-                tokens["totalCost"] = f"${tokens['totalUsed'] * 0.00001:.6f}"    
+                tokens["totalCost"] = round(tokens["totalUsed"] * 0.00001, 6)    
                 
 
 
@@ -172,7 +172,7 @@ def extract_and_transform_openai(self,config, conversation, chat_id, import_id,c
                         tokens["summary"]["totalUsed"] = cb.total_tokens
                         tokens["summary"]["promptT"] = cb.prompt_tokens
                         tokens["summary"]["completion"] = cb.completion_tokens
-                        tokens["summary"]["totalCost"] = f"${cb.total_cost}"
+                        tokens["summary"]["totalCost"] = cb.total_cost
                         total_summary_tokens += tokens["summary"]["totalUsed"]
                         total_summary_prompt += tokens["summary"]["promptT"]
                         total_summary_completion += tokens["summary"]["completion"]
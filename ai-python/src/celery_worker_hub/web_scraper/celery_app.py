@@ -1,6 +1,7 @@
 import os
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_shutdown
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -9,6 +10,8 @@ CELERY_RESULT_BACKEND = os.environ.get("CELERY_RESULT_BACKEND")
 SCHEDULER_TIME = int(os.environ.get("SCHEDULER_TIME", 50))
 DEFAULT_CELERY_TASK_EXP = os.environ.get("DEFAULT_CELERY_TASK_EXP", 86400)
 CELERY_TASK_ALWAYS_EAGER = os.environ.get("CELERY_TASK_ALWAYS_EAGER", False)
+# Child processes keep their browsers between tasks, the crawler pool restarts them after a number of pages
+SCRAPER_MAX_TASKS_PER_CHILD = int(os.environ.get("SCRAPER_MAX_TASKS_PER_CHILD", 50))
 
 #create Celery instance
 celery_app = Celery("web_scraper", broker=CELERY_BROKEN_URL, backend=CELERY_RESULT_BACKEND)
@@ -34,10 +37,18 @@ celery_app.conf.update(
     CELERY_TASK_ALWAYS_EAGER=CELERY_TASK_ALWAYS_EAGER,
     CELERY_TASK_REJECT_ON_WORKER_LOST = True,
     worker_prefetch_multiplier=3,
-    worker_max_tasks_per_child=3,
+    worker_max_tasks_per_child=SCRAPER_MAX_TASKS_PER_CHILD,
     broker_transport_options={'visibility_timeout': 300}
 )
 
+
+
+@worker_process_shutdown.connect
+def close_crawlers(**kwargs):
+    from src.celery_worker_hub.web_scraper.utils.worker_loop import close_worker_loop
+    close_worker_loop()
+
+
 celery_app.conf.beat_schedule = {
     'update-failed-tasks-ttl-every-night': {
         'task': 'src.celery_worker_hub.web_scraper.periodic_task.update_failed_ttl.update_failed_tasks_ttl',
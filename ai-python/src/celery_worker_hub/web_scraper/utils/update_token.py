@@ -1,7 +1,10 @@
+from src.chatflow_langchain.repositories.accounting_sink import parse_cost
+
+
 def update_tokens(summary_data: dict, existing_doc: dict) -> dict:
     if existing_doc:
         tokens_old = existing_doc.get('tokens', {})
-        total_old_cost = float(tokens_old.get('totalCost', "0").replace("$", ""))
+        total_old_cost = parse_cost(tokens_old.get('totalCost'))
         prompt_t = tokens_old.get('promptT', 0)
         total_used = tokens_old.get("totalUsed", 0)
         total_completion_token = tokens_old.get("completion", 0)
@@ -16,7 +19,7 @@ def update_tokens(summary_data: dict, existing_doc: dict) -> dict:
     cal_total_used = summary_data['$set']['tokens.totalUsed'] + total_used
     cal_total_completion_token = summary_data['$set']['tokens.completion'] + total_completion_token
 
-    summary_data['$set']['tokens.totalCost'] = f"${cal_cost}"
+    summary_data['$set']['tokens.totalCost'] = cal_cost
     summary_data['$set']['tokens.promptT'] = cal_promptT
     summary_data['$set']['tokens.totalUsed'] = cal_total_used
     summary_data['$set']['tokens.completion'] = cal_total_completion_token
@@ -25,7 +28,7 @@ def update_tokens(summary_data: dict, existing_doc: dict) -> dict:
 
 
 def update_child_tokens(summary_data: dict) -> dict:
-    summary_data['$set']['tokens.totalCost'] = f"$0.000"
+    summary_data['$set']['tokens.totalCost'] = 0.0
     summary_data['$set']['tokens.promptT'] = 0
     summary_data['$set']['tokens.totalUsed'] = 0
     summary_data['$set']['tokens.completion'] = 0
@@ -0,0 +1,48 @@
+import asyncio
+import os
+import threading
+from typing import Awaitable, Optional, TypeVar
+from src.chatflow_langchain.utils.crawler_pool import crawler_pool
+from src.logger.default_logger import logger
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+def _worker_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _loop_pid
+    with _lock:
+        # A forked child inherits the parent's loop object but not its thread
+        if _loop is None or _loop_pid != os.getpid():
+            _loop = asyncio.new_event_loop()
+            _loop_pid = os.getpid()
+            threading.Thread(target=_loop.run_forever, name="scraper-worker-loop", daemon=True).start()
+        return _loop
+
+
+def run_in_worker_loop(coro: Awaitable[T]) -> T:
+    """
+    Runs `coro` on the event loop of this worker process and waits for its result.
+
+    The loop lives as long as the process, so browsers and sessions started by one task are reused
+    by the next instead of being bound to a loop thrown away at the end of the task.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _worker_loop()).result()
+
+
+def close_worker_loop() -> None:
+    """
+    Closes the crawler pool of this process and stops its loop, at worker process shutdown.
+    """
+    global _loop
+    if _loop is None or _loop_pid != os.getpid():
+        return
+    try:
+        run_in_worker_loop(crawler_pool.aclose())
+    except Exception as e:
+        logger.warning(f"Failed to close the crawler pool: {e}", extra={"tags": {"method": "close_worker_loop"}})
+    _loop.call_soon_threadsafe(_loop.stop)
+    _loop = None
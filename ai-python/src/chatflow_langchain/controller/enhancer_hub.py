@@ -2,8 +2,9 @@ from fastapi import HTTPException
 from src.logger.default_logger import logger
 from src.chatflow_langchain.service.openai.enhancement.enhancer import OpenAIQueryEnhancerService
 from src.crypto_hub.services.huggingface.llm_api_key_decryption import LLMAPIKeyDecryptionHandler
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
 class EnhanceController:
     def __init__(self):
         self.managers = {
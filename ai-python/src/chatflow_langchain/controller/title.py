@@ -10,7 +10,8 @@ from src.crypto_hub.services.huggingface.llm_api_key_decryption import LLMAPIKey
 from src.chatflow_langchain.service.multimodal_router.title.title_generator import RouterTitleGenerationService
 from src.chatflow_langchain.service.weam_router.deepseek.title.title_generator import WeamDeepSeekTitleGenerationService
 from src.chatflow_langchain.service.weam_router.llama.title.title_generator import WeamLlamaTitleGenerationService
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
+from src.chatflow_langchain.utils.request_context import RequestScoped
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
 class TitleController:
     def __init__(self):
         self.managers = {
@@ -0,0 +1,226 @@
+import asyncio
+import atexit
+import os
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from bson.objectid import ObjectId
+from dotenv import load_dotenv
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+from src.db.async_config import async_db_instance
+from src.db.config import db_instance
+from src.logger.default_logger import logger
+
+load_dotenv()
+
+# Maximum time a buffered counter waits before it is written
+ACCOUNTING_FLUSH_INTERVAL = float(os.environ.get("ACCOUNTING_FLUSH_INTERVAL", 0.5))
+# Documents pending before a flush is started without waiting for the interval
+ACCOUNTING_FLUSH_BATCH_SIZE = int(os.environ.get("ACCOUNTING_FLUSH_BATCH_SIZE", 200))
+
+# Cost fields written as "$0.0123" strings before they were made numeric
+LEGACY_COST_FIELDS = (
+    "tokens.totalCost",
+    "tokens.webCost",
+    "tokens.summary.totalCost",
+    "tokens.cache_tokens.totalCost",
+)
+_TYPE_MISMATCH = 14
+
+
+def parse_cost(value: Any) -> float:
+    """
+    Numeric value of a cost field, legacy documents store it as a "$"-prefixed string.
+    """
+    if value is None:
+        return 0.0
+    if isinstance(value, str):
+        value = value.replace("$", "").strip() or 0
+    return float(value)
+
+
+def numeric_cost_expression(field: str) -> dict:
+    """
+    Aggregation expression reading `field` as a number, whether it is missing, numeric or a legacy "$" string.
+    """
+    return {
+        "$convert": {
+            # "$ " must be a $literal, a bare string starting with "$" is read as a field path
+            "input": {"$ltrim": {"input": {"$toString": {"$ifNull": [f"${field}", 0]}}, "chars": {"$literal": "$ "}}},
+            "to": "double",
+            "onError": 0,
+            "onNull": 0,
+        }
+    }
+
+
+def _legacy_pipeline(inc: Dict[str, float], set_fields: Dict[str, Any]) -> List[dict]:
+    # Same update as UpdateOne($inc, $set) for a document that still holds string costs,
+    # only the legacy cost fields are converted, other counters are added to as they are
+    added = {
+        field: {"$add": [numeric_cost_expression(field) if field in LEGACY_COST_FIELDS else {"$ifNull": [f"${field}", 0]}, amount]}
+        for field, amount in inc.items()
+    }
+    constants = {field: {"$literal": value} for field, value in set_fields.items()}
+    return [{"$set": {**added, **constants}}]
+
+
+class _PendingUpdate:
+    __slots__ = ("inc", "set")
+
+    def __init__(self):
+        self.inc: Dict[str, float] = defaultdict(int)
+        self.set: Dict[str, Any] = {}
+
+    def merge(self, inc: Optional[Dict[str, float]], set_fields: Optional[Dict[str, Any]]) -> None:
+        for field, value in (set_fields or {}).items():
+            # A later $set overrides increments buffered for the same field
+            self.inc.pop(field, None)
+            self.set[field] = value
+        for field, amount in (inc or {}).items():
+            if field in self.set and isinstance(self.set[field], (int, float)):
+                self.set[field] += amount
+            else:
+                self.inc[field] += amount
+
+    def update(self) -> dict:
+        update = {}
+        if self.inc:
+            update["$inc"] = dict(self.inc)
+        if self.set:
+            update["$set"] = dict(self.set)
+        return update
+
+
+class AccountingSink:
+    """
+    Write-behind buffer for the token, cost and credit counters of chat turns.
+
+    Counters are coalesced per document, so everything a turn adds to its thread, company and
+    user documents becomes one update per document, and the pending updates of every turn are
+    written as one unordered `bulk_write` per collection of atomic `$inc`/`$set` operations.
+    On the event loop the flush runs through motor at most ACCOUNTING_FLUSH_INTERVAL after the
+    first buffered counter; callers without a running loop (Celery tasks, worker threads) flush
+    synchronously.
+    """
+
+    def __init__(self):
+        self._pending: Dict[Tuple[str, Any], _PendingUpdate] = {}
+        self._lock = threading.Lock()
+        self._flush_tasks: Dict[asyncio.AbstractEventLoop, asyncio.Task] = {}
+
+    def add(self, collection_name: str, document_id: Any, inc: Optional[Dict[str, float]] = None,
+            set_fields: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Buffer counters (`$inc`) and values (`$set`) for one document.
+        """
+        if not inc and not set_fields:
+            return
+        key = (collection_name, ObjectId(document_id) if isinstance(document_id, str) else document_id)
+        with self._lock:
+            self._pending.setdefault(key, _PendingUpdate()).merge(inc, set_fields)
+            full = len(self._pending) >= ACCOUNTING_FLUSH_BATCH_SIZE
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush_sync()
+            return
+        if full:
+            loop.create_task(self.flush())
+        else:
+            self._schedule_flush(loop)
+
+    def _take(self) -> Dict[Tuple[str, Any], _PendingUpdate]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def _restore(self, pending: Dict[Tuple[str, Any], _PendingUpdate]) -> None:
+        with self._lock:
+            for key, update in pending.items():
+                self._pending.setdefault(key, _PendingUpdate()).merge(update.inc, update.set)
+
+    @staticmethod
+    def _requests(pending: Dict[Tuple[str, Any], _PendingUpdate]):
+        by_collection: Dict[str, List[Tuple[Any, _PendingUpdate]]] = defaultdict(list)
+        for (collection_name, document_id), update in pending.items():
+            by_collection[collection_name].append((document_id, update))
+        return by_collection
+
+    @staticmethod
+    def _legacy_retries(error: BulkWriteError, updates: List[Tuple[Any, _PendingUpdate]]) -> List[UpdateOne]:
+        retries = []
+        for write_error in error.details.get("writeErrors", []):
+            document_id, update = updates[write_error["index"]]
+            if write_error.get("code") == _TYPE_MISMATCH:
+                retries.append(UpdateOne({"_id": document_id}, _legacy_pipeline(update.inc, update.set)))
+            else:
+                logger.error(
+                    f"Failed to write accounting update: {write_error.get('errmsg')}",
+                    extra={"tags": {"method": "AccountingSink.flush", "document_id": str(document_id)}}
+                )
+        return retries
+
+    def _failed(self, collection_name: str, updates: List[Tuple[Any, _PendingUpdate]], error: PyMongoError, method: str) -> None:
+        if isinstance(error, BulkWriteError):
+            # Partially applied, restoring would count the written updates twice
+            logger.error(f"Failed to write accounting updates: {error.details.get('writeErrors')}",
+                         extra={"tags": {"method": method}})
+            return
+        self._restore({(collection_name, document_id): update for document_id, update in updates})
+        logger.error(f"Failed to flush accounting updates: {error}", extra={"tags": {"method": method}})
+
+    async def flush(self) -> None:
+        pending = self._take()
+        for collection_name, updates in self._requests(pending).items():
+            collection = async_db_instance[collection_name]
+            requests = [UpdateOne({"_id": document_id}, update.update()) for document_id, update in updates]
+            try:
+                try:
+                    await collection.bulk_write(requests, ordered=False)
+                except BulkWriteError as e:
+                    # $inc on a legacy string cost fails with TypeMismatch, those documents are converted in place
+                    retries = self._legacy_retries(e, updates)
+                    if retries:
+                        await collection.bulk_write(retries, ordered=False)
+            except PyMongoError as e:
+                self._failed(collection_name, updates, e, "AccountingSink.flush")
+
+    def flush_sync(self) -> None:
+        pending = self._take()
+        for collection_name, updates in self._requests(pending).items():
+            collection = db_instance.get_collection(collection_name)
+            requests = [UpdateOne({"_id": document_id}, update.update()) for document_id, update in updates]
+            try:
+                try:
+                    collection.bulk_write(requests, ordered=False)
+                except BulkWriteError as e:
+                    retries = self._legacy_retries(e, updates)
+                    if retries:
+                        collection.bulk_write(retries, ordered=False)
+            except PyMongoError as e:
+                self._failed(collection_name, updates, e, "AccountingSink.flush_sync")
+
+    def _schedule_flush(self, loop: asyncio.AbstractEventLoop) -> None:
+        task = self._flush_tasks.get(loop)
+        if task is None or task.done():
+            for stale in [stale for stale in self._flush_tasks if stale.is_closed()]:
+                self._flush_tasks.pop(stale, None)
+            self._flush_tasks[loop] = loop.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self) -> None:
+        await asyncio.sleep(ACCOUNTING_FLUSH_INTERVAL)
+        await self.flush()
+
+
+accounting_sink = AccountingSink()
+# Counters buffered when the process exits are written synchronously
+atexit.register(accounting_sink.flush_sync)
+
+
+async def flush_accounting() -> None:
+    """
+    Write every buffered accounting update, used on shutdown.
+    """
+    await accounting_sink.flush()
@@ -2,6 +2,7 @@ from bson.objectid import ObjectId
 from pymongo.errors import PyMongoError
 from src.db.config import db_instance
 from src.logger.default_logger import logger
+from src.chatflow_langchain.repositories.accounting_sink import accounting_sink
 from src.chat.repositories.abstract_company_repo import CompanyAbstractRepository
 from src.chatflow_langchain.repositories.openai_error_messages_config import OPENAI_MESSAGES_CONFIG,HF_ERROR_MESSAGES_CONFIG,GENAI_ERROR_MESSAGES_CONFIG,ANTHROPIC_ERROR_MESSAGES_CONFIG, WEAM_ROUTER_MESSAGES_CONFIG
 
@@ -27,7 +28,18 @@ class CompanyRepostiory(CompanyAbstractRepository):
         self.company_id = company_id
         self.instance = self.db_instance.get_collection(collection_name)
         self.result = self._fetch_company_data()
-        
+
+    def initialization_for_update(self, company_id: str, collection_name: str):
+        """
+        Initialize the repository for updates only, without fetching the company.
+
+        Args:
+            company_id (str | ObjectId | None): The ID of the company, None when the thread has none.
+            collection_name (str): The name of the collection.
+        """
+        self.company_id = company_id
+        self.instance = self.db_instance.get_collection(collection_name)
+
 
     def _fetch_company_data(self):
         """Fetch data related to the thread model."""
@@ -60,14 +72,11 @@ class CompanyRepostiory(CompanyAbstractRepository):
         Args:
             model_code:code for model to increase message for
         """
-        query = {'_id': ObjectId(self.company_id)}
-        update = {'$inc': {f'usedFreeMessages.{model_code}': 1}}
-        try:
-            self.instance.update_one(query, update)
-        except PyMongoError as e:
-            logger.error(
-                f"An error occurred while updating the collection fields: {e}",
-                extra={"tags": {
-                    "method": "CompanyRepostiory.update_free_messages",
-                    "company_id": self.company_id
-                }})
\ No newline at end of file
+        if self.company_id is None:
+            # The thread lost its company, the rest of the turn is still accounted
+            logger.warning(
+                "Skipping free message update without a company id",
+                extra={"tags": {"method": "CompanyRepostiory.update_free_messages", "model_code": model_code}}
+            )
+            return
+        accounting_sink.add(self.instance.name, self.company_id, inc={f'usedFreeMessages.{model_code}': 1})
@@ -28,7 +28,7 @@ class EnhanceRepostiory():
         self.chat_id=ObjectId(chat_id),
         self.brain_id=ObjectId(brain_id)
         self.instance = self.db_instance.get_collection(collection_name)
-        self.default_token_dict={"totalCost":"$0.000","promptT":0,"completion":0,"totalUsed":0}
+        self.default_token_dict={"totalCost":0.0,"promptT":0,"completion":0,"totalUsed":0}
 
 
     async def fetch_max_version(self):
@@ -0,0 +1,102 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+HISTORY_CACHE_MAX_SESSIONS = int(os.environ.get("HISTORY_CACHE_MAX_SESSIONS", 1024))
+HISTORY_CACHE_TTL = float(os.environ.get("HISTORY_CACHE_TTL", 300))
+
+# Encrypted fields of a history row, a row is only served from the cache while they are unchanged
+HISTORY_CONTENT_FIELDS = ("system", "media", "img_gen_prompt", "message", "ai")
+
+
+class _SessionRows:
+    __slots__ = ("rows", "expires_at")
+
+    def __init__(self, expires_at: float):
+        self.rows: Dict[str, Tuple[int, List[Dict]]] = {}
+        self.expires_at = expires_at
+
+
+class DecryptedHistoryCache:
+    """
+    Process-wide LRU of decrypted history rows.
+
+    Entries are keyed by (chat_session_id, sumhistory_checkpoint) and hold the decrypted message
+    dicts of every thread row loaded under that checkpoint, so a history that only grew by new
+    threads is served from the cache up to its last thread id and only the new rows are decrypted.
+    Rows are also fingerprinted on their encrypted fields, so writes from other workers are never served stale.
+    Message objects are rebuilt from the dicts on every read, callers are free to mutate them.
+    """
+
+    def __init__(self, max_sessions: int = HISTORY_CACHE_MAX_SESSIONS, ttl: float = HISTORY_CACHE_TTL):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._entries: "OrderedDict[tuple, _SessionRows]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_entry(self, key: tuple, create: bool = False) -> Optional[_SessionRows]:
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= now:
+            del self._entries[key]
+            entry = None
+        if entry is None and create:
+            entry = _SessionRows(now + self.ttl)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_sessions:
+                self._entries.popitem(last=False)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def get_row(self, chat_session_id: str, checkpoint, thread_id: str, fingerprint: int) -> Optional[List[Dict]]:
+        with self._lock:
+            entry = self._get_entry((str(chat_session_id), checkpoint))
+            row = entry.rows.get(thread_id) if entry is not None else None
+            return row[1] if row is not None and row[0] == fingerprint else None
+
+    def put_row(self, chat_session_id: str, checkpoint, thread_id: str, fingerprint: int, messages: List[Dict]) -> None:
+        with self._lock:
+            self._get_entry((str(chat_session_id), checkpoint), create=True).rows[thread_id] = (fingerprint, messages)
+
+    def invalidate(self, chat_session_id: str, thread_id: str = None) -> None:
+        """
+        Drop a thread row of a session, or every entry of the session when no thread id is given.
+        """
+        chat_session_id = str(chat_session_id)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == chat_session_id]:
+                if thread_id is None:
+                    del self._entries[key]
+                else:
+                    self._entries[key].rows.pop(str(thread_id), None)
+
+    def decrypt_rows(self, history, result_list: List[Dict]) -> List[Dict]:
+        """
+        Return the decrypted message dicts of the history rows, decrypting only rows not cached yet.
+
+        Args:
+            history: The chat message history repository, providing `_extract_messages` and `_decrypt_messages`.
+            result_list (List[Dict]): History rows as returned by the history pipelines.
+        """
+        messages = []
+        for res in result_list:
+            thread_id = str(res.get("_id"))
+            checkpoint = res.get("sumhistory_checkpoint")
+            fingerprint = hash(tuple(str(res.get(field)) for field in HISTORY_CONTENT_FIELDS))
+            cached = self.get_row(history.chat_session_id, checkpoint, thread_id, fingerprint)
+            if cached is None:
+                cached = history._decrypt_messages(history._extract_messages([res]))
+                self.put_row(history.chat_session_id, checkpoint, thread_id, fingerprint, cached)
+            elif checkpoint is not None:
+                history.summary_checkpoint = checkpoint
+            messages.extend(cached)
+        return messages
+
+
+decrypted_history_cache = DecryptedHistoryCache()
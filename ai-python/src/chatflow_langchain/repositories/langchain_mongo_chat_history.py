@@ -7,11 +7,12 @@ from bson.objectid import ObjectId
 from src.chat.repositories.abstract_mongodb_chat_history import AbstractChatMessageHistory
 import os
 from src.chatflow_langchain.utils.hash_generator import generate_unique_number
-from src.chatflow_langchain.utils.pipeline_query import get_pipeline_v2,get_latest_checkpoint,retrieve_thread_checkpoint,regenerate_history_pipeline
+from src.chatflow_langchain.utils.pipeline_query import load_history_since_checkpoint,retrieve_thread_checkpoint,regenerate_history_pipeline
 from src.db.config import db_instance
 from src.crypto_hub.utils.crypto_utils import MessageEncryptor,MessageDecryptor
 from dotenv import load_dotenv
 from src.chatflow_langchain.repositories.config import HistoryConfig
+from src.chatflow_langchain.repositories.history_cache import decrypted_history_cache
 # Default database and collection names
 DEFAULT_DBNAME = "customai"
 DEFAULT_COLLECTION_NAME = "messages"
@@ -46,17 +47,12 @@ class CustomAIMongoDBChatMessageHistory(AbstractChatMessageHistory):
             logger.error(f"Connection to MongoDB failed: {error}")
 
     def _retrieve_messages_from_db(self) -> List[Dict]:
-        latest_checkpoint = get_latest_checkpoint(self.chat_session_id, self.db)
-        pipeline = get_pipeline_v2(self.chat_session_id, latest_checkpoint=latest_checkpoint)
-        
         try:
-            cursor = self.collection.aggregate(pipeline)
-
-            return list(cursor)
+            return load_history_since_checkpoint(self.collection, self.chat_session_id)
         except errors.OperationFailure as error:
             logger.error(f"Failed to retrieve messages: {error}")
             return []
-    
+        
     def _retrieve_messages_for_regeneration(self) -> List[Dict]:
         latest_checkpoint,createdAt = retrieve_thread_checkpoint(self.thread_id, self.db)
         pipeline = regenerate_history_pipeline(self.chat_session_id, latest_checkpoint=latest_checkpoint,createdAt=createdAt)
@@ -85,9 +81,13 @@ class CustomAIMongoDBChatMessageHistory(AbstractChatMessageHistory):
             messages.extend(list(res.values()))
         return messages
 
-    def _parse_messages(self, messages: List[Dict]) -> List[BaseMessage]:
+    def _decrypt_messages(self, messages: List[str]) -> List[Dict]:
+        return [json.loads(decryptor.decrypt(msg)) for msg in messages]
+
+    def _parse_messages(self, result_list: List[Dict]) -> List[BaseMessage]:
         try:
-            messages = [json.loads(decryptor.decrypt(msg)) for msg in messages]
+            # Rows already decrypted for this session and checkpoint are served from the cache
+            messages = decrypted_history_cache.decrypt_rows(self, result_list)
             return messages_from_dict(messages)
         except (json.JSONDecodeError, KeyError) as error:
             logger.error(f"Failed to parse messages: {error}")
@@ -114,8 +114,7 @@ class CustomAIMongoDBChatMessageHistory(AbstractChatMessageHistory):
         if not result_list:
             return []
 
-        raw_messages = self._extract_messages(result_list)
-        parsed_messages = self._parse_messages(raw_messages)
+        parsed_messages = self._parse_messages(result_list)
         return self._filter_system_messages(parsed_messages)
 
     def add_message(self, message: Union[BaseMessage, str], thread_id: str, message_type: str) -> None:
@@ -149,6 +148,7 @@ class CustomAIMongoDBChatMessageHistory(AbstractChatMessageHistory):
                     upsert_update["$set"]["sumhistory_checkpoint"] = generate_unique_number(msg_dict['data']['content'])
 
             self.collection.update_one(upsert_query, upsert_update, upsert=True)
+            decrypted_history_cache.invalidate(self.chat_session_id, None if message_type == "system" else thread_id)
         except errors.WriteError as err:
             logger.error(f"Failed to add {message_type} message: {err}")
 
@@ -219,6 +219,7 @@ class CustomAIMongoDBChatMessageHistory(AbstractChatMessageHistory):
                     upsert_update["$set"]["sumhistory_checkpoint"] = generate_unique_number(msg_dict['data']['content'])
 
             self.collection.update_one(upsert_query, upsert_update, upsert=True)
+            decrypted_history_cache.invalidate(self.chat_session_id, None if message_type == "system" else thread_id)
         except errors.WriteError as err:
             logger.error(f"Failed to add {message_type} message: {err}")
 
@@ -2,6 +2,7 @@ from bson.objectid import ObjectId
 from pymongo.errors import PyMongoError
 from src.db.config import db_instance
 from src.logger.default_logger import logger
+from src.chatflow_langchain.repositories.accounting_sink import accounting_sink
 from src.chat.repositories.thread_abstract_repository import ThreadAbstractRepository
 from src.chatflow_langchain.repositories.openai_error_messages_config import OPENAI_MESSAGES_CONFIG,HF_ERROR_MESSAGES_CONFIG,GENAI_ERROR_MESSAGES_CONFIG,ANTHROPIC_ERROR_MESSAGES_CONFIG, WEAM_ROUTER_MESSAGES_CONFIG
 
@@ -27,7 +28,7 @@ class SeoRepo(ThreadAbstractRepository):
             thread_id (str): Stores the provided thread ID.
             instance: The database collection instance retrieved using the collection name.
             default_token_dict (dict): A dictionary containing default token-related values:
-                - "totalCost" (str): The total cost initialized to "$0.000".
+                - "totalCost" (float): The total cost initialized to 0.0.
                 - "promptT" (int): The prompt token count initialized to 0.
                 - "completion" (int): The completion token count initialized to 0.
                 - "totalUsed" (int): The total token usage initialized to 0.
@@ -36,7 +37,7 @@ class SeoRepo(ThreadAbstractRepository):
         self.thread_id = thread_id
         self.instance = self.db_instance.get_collection(collection_name)
         self.result=self._safe_fetch_thread_data()
-        self.default_token_dict={"totalCost":"$0.000","promptT":0,"completion":0,"totalUsed":0}
+        self.default_token_dict={"totalCost":0.0,"promptT":0,"completion":0,"totalUsed":0}
 
     def initialization(self, thread_id: str, collection_name: str):
         """
@@ -49,7 +50,7 @@ class SeoRepo(ThreadAbstractRepository):
         self.thread_id = thread_id
         self.instance = self.db_instance.get_collection(collection_name)
         self.result = self._fetch_thread_model_data()
-        self.default_token_dict={"totalCost":"$0.000","promptT":0,"completion":0,"totalUsed":0}
+        self.default_token_dict={"totalCost":0.0,"promptT":0,"completion":0,"totalUsed":0}
         
 
     def _fetch_thread_model_data(self):
@@ -195,65 +196,39 @@ class SeoRepo(ThreadAbstractRepository):
         cb : Callback
             The callback object containing token usage information.
         """
-        token_data = {
-            "$set": {
-                "tokens.totalUsed": cb.total_tokens,
-                "tokens.promptT": cb.prompt_tokens,
-                "tokens.completion": cb.completion_tokens,
-                "tokens.totalCost": f"${cb.total_cost}"
-            }
-        }
-        self.update_token_fields(token_data)
+        accounting_sink.add(self.instance.name, self.thread_id, set_fields={
+            "tokens.totalUsed": cb.total_tokens,
+            "tokens.promptT": cb.prompt_tokens,
+            "tokens.completion": cb.completion_tokens,
+            "tokens.totalCost": cb.total_cost
+        })
         
     def update_token_usage(self, cb, tokens_old=None):
         """
-        Updates the token usage data in the repository.
+        Adds the token usage of a callback to the summary.
 
         Parameters
         ----------
         cb : Callback
             The callback object containing token usage information.
         tokens_old : dict
-            The old token usage data.
+            Unused, counters are incremented atomically. Kept for existing callers.
         """
-        if tokens_old is None:
-            tokens_old=self.result.get('tokens',self.default_token_dict)
-            if 'totalCost' not in tokens_old:
-                tokens_old = self.default_token_dict
-        
-        total_old_cost = float(tokens_old['totalCost'].replace("$", ""))
-        total_new_cost = total_old_cost + cb.total_cost
-
-        token_data = {
-            "$set": {
-                "tokens.totalUsed": tokens_old['totalUsed'] + cb.total_tokens,
-                "tokens.promptT": tokens_old['promptT'] + cb.prompt_tokens,
-                "tokens.completion": tokens_old['completion'] + cb.completion_tokens,
-                "tokens.totalCost": f"${total_new_cost}"
-            }
-        }
-        self.update_token_fields(token_data)
+        accounting_sink.add(self.instance.name, self.thread_id, inc={
+            "tokens.totalUsed": cb.total_tokens,
+            "tokens.promptT": cb.prompt_tokens,
+            "tokens.completion": cb.completion_tokens,
+            "tokens.totalCost": cb.total_cost
+        })
 
     def update_tools_token_data(self,token_data,tokens_old=None,additional_data:dict=None):
-        if tokens_old is None:
-            tokens_old=self.result.get('tokens',self.default_token_dict)
-            if 'totalCost' not in tokens_old:
-                tokens_old = self.default_token_dict
-
-        total_old_cost = float(tokens_old['totalCost'].replace("$", ""))
-        total_new_cost = total_old_cost + token_data['totalCost']
-        token_usage_dict = {
-                "tokens.totalUsed": tokens_old['totalUsed'] + token_data["totalUsed"],
-                "tokens.promptT": tokens_old['promptT'] + token_data["promptT"],
-                "tokens.completion": tokens_old['completion'] + token_data["completion"],
-                "tokens.totalCost": f"${total_new_cost}",
-                "tokens.imageT": tokens_old.get('imageT',0) + additional_data['imageT'],
-                "isMedia":additional_data['isMedia']
-            }
-        token_data = {
-            "$set": token_usage_dict    
-        }
-        self.update_token_fields(token_data)
+        accounting_sink.add(self.instance.name, self.thread_id, inc={
+            "tokens.totalUsed": token_data["totalUsed"],
+            "tokens.promptT": token_data["promptT"],
+            "tokens.completion": token_data["completion"],
+            "tokens.totalCost": token_data['totalCost'],
+            "tokens.imageT": additional_data['imageT'],
+        }, set_fields={"isMedia": additional_data['isMedia']})
 
     def update_token_usage_summary(self, cb, tokens_old=None):
         """
@@ -266,17 +241,12 @@ class SeoRepo(ThreadAbstractRepository):
         tokens_old : dict
             The old token usage data.
         """
-        
-
-        token_data = {
-            "$set": {
-                "tokens.summary.totalUsed":cb.total_tokens,
-                "tokens.summary.promptT": cb.prompt_tokens,
-                "tokens.summary.completion": cb.completion_tokens,
-                "tokens.summary.totalCost": f"${cb.total_cost}"
-            }
-        }
-        self.update_token_fields(token_data)
+        accounting_sink.add(self.instance.name, self.thread_id, set_fields={
+            "tokens.summary.totalUsed":cb.total_tokens,
+            "tokens.summary.promptT": cb.prompt_tokens,
+            "tokens.summary.completion": cb.completion_tokens,
+            "tokens.summary.totalCost": cb.total_cost
+        })
 
     def update_img_gen_prompt(self,gen_prompt=''):
         img_gen_prompt={"$set":{"img_gen_prompt":gen_prompt}}
@@ -2,6 +2,7 @@ from bson.objectid import ObjectId
 from pymongo.errors import PyMongoError
 from src.db.config import db_instance
 from src.logger.default_logger import logger
+from src.chatflow_langchain.repositories.accounting_sink import accounting_sink
 from src.chat.repositories.thread_abstract_repository import ThreadAbstractRepository
 from src.chatflow_langchain.repositories.openai_error_messages_config import OPENAI_MESSAGES_CONFIG,HF_ERROR_MESSAGES_CONFIG,GENAI_ERROR_MESSAGES_CONFIG,ANTHROPIC_ERROR_MESSAGES_CONFIG, WEAM_ROUTER_MESSAGES_CONFIG
 
@@ -27,7 +28,7 @@ class ThreadRepostiory(ThreadAbstractRepository):
             thread_id (str): Stores the provided thread ID.
             instance: The database collection instance retrieved using the collection name.
             default_token_dict (dict): A dictionary containing default token-related values:
-                - "totalCost" (str): The total cost initialized to "$0.000".
+                - "totalCost" (float): The total cost initialized to 0.0.
                 - "promptT" (int): The prompt token count initialized to 0.
                 - "completion" (int): The completion token count initialized to 0.
                 - "totalUsed" (int): The total token usage initialized to 0.
@@ -36,7 +37,7 @@ class ThreadRepostiory(ThreadAbstractRepository):
         self.thread_id = thread_id
         self.instance = self.db_instance.get_collection(collection_name)
         self.result=self._safe_fetch_thread_data()
-        self.default_token_dict={"totalCost":"$0.000","promptT":0,"completion":0,"totalUsed":0}
+        self.default_token_dict={"totalCost":0.0,"promptT":0,"completion":0,"totalUsed":0}
 
     def initialization(self, thread_id: str, collection_name: str):
         """
@@ -49,8 +50,20 @@ class ThreadRepostiory(ThreadAbstractRepository):
         self.thread_id = thread_id
         self.instance = self.db_instance.get_collection(collection_name)
         self.result = self._fetch_thread_model_data()
-        self.default_token_dict={"totalCost":"$0.000","promptT":0,"completion":0,"totalUsed":0}
-        
+        self.default_token_dict={"totalCost":0.0,"promptT":0,"completion":0,"totalUsed":0}
+
+    def initialization_for_update(self, thread_id: str, collection_name: str):
+        """
+        Initialize the repository for updates only, without fetching the thread.
+
+        Args:
+            thread_id (str): The ID of the thread.
+            collection_name (str): The name of the collection.
+        """
+        self.thread_id = thread_id
+        self.instance = self.db_instance.get_collection(collection_name)
+        self.default_token_dict={"totalCost":0.0,"promptT":0,"completion":0,"totalUsed":0}
+
 
     def _fetch_thread_model_data(self):
         """Fetch data related to the thread model."""
@@ -186,6 +199,12 @@ class ThreadRepostiory(ThreadAbstractRepository):
                 }}
             )
 
+    def _add_token_usage(self, inc: dict = None, set_fields: dict = None):
+        """
+        Buffer atomic token/cost counters for the thread, written by the accounting sink.
+        """
+        accounting_sink.add(self.instance.name, self.thread_id, inc=inc, set_fields=set_fields)
+
     def overwrite_token_usage(self,cb):
         """
         Overwrites the token usage data in the repository.
@@ -195,15 +214,12 @@ class ThreadRepostiory(ThreadAbstractRepository):
         cb : Callback
             The callback object containing token usage information.
         """
-        token_data = {
-            "$set": {
-                "tokens.totalUsed": cb.total_tokens,
-                "tokens.promptT": cb.prompt_tokens,
-                "tokens.completion": cb.completion_tokens,
-                "tokens.totalCost": f"${cb.total_cost}"
-            }
-        }
-        self.update_token_fields(token_data)
+        self._add_token_usage(set_fields={
+            "tokens.totalUsed": cb.total_tokens,
+            "tokens.promptT": cb.prompt_tokens,
+            "tokens.completion": cb.completion_tokens,
+            "tokens.totalCost": cb.total_cost
+        })
 
     def token_usage_dict(self,token_usage:dict):
         """
@@ -219,69 +235,49 @@ class ThreadRepostiory(ThreadAbstractRepository):
         dict
             A dictionary with token usage data.
         """
-        token_data =  {
-            "$set": {
-                "tokens.totalUsed": token_usage['total_tokens'],
-                "tokens.promptT": token_usage['prompt_tokens'],
-                "tokens.completion": token_usage['completion_tokens'],
-                "tokens.totalCost": f"${token_usage['total_cost']}"
-            }
-        }
-        self.update_token_fields(token_data)
+        self._add_token_usage(set_fields={
+            "tokens.totalUsed": token_usage['total_tokens'],
+            "tokens.promptT": token_usage['prompt_tokens'],
+            "tokens.completion": token_usage['completion_tokens'],
+            "tokens.totalCost": token_usage['total_cost']
+        })
 
         
     def update_token_usage(self, cb, tokens_old=None):
         """
-        Updates the token usage data in the repository.
+        Adds the token usage of a callback to the thread.
 
         Parameters
         ----------
         cb : Callback
             The callback object containing token usage information.
         tokens_old : dict
-            The old token usage data.
+            Unused, counters are incremented atomically. Kept for existing callers.
         """
-        if tokens_old is None:
-            tokens_old=self.result.get('tokens',self.default_token_dict)
-            if 'totalCost' not in tokens_old:
-                tokens_old = self.default_token_dict
-        
-        total_old_cost = float(tokens_old['totalCost'].replace("$", ""))
-        total_new_cost = total_old_cost + cb.total_cost
-
-        token_data = {
-            "$set": {
-                "tokens.totalUsed": tokens_old['totalUsed'] + cb.total_tokens,
-                "tokens.promptT": tokens_old['promptT'] + cb.prompt_tokens,
-                "tokens.completion": tokens_old['completion'] + cb.completion_tokens,
-                "tokens.totalCost": f"${total_new_cost}"
-            }
-        }
-        self.update_token_fields(token_data)
+        self._add_token_usage(inc={
+            "tokens.totalUsed": cb.total_tokens,
+            "tokens.promptT": cb.prompt_tokens,
+            "tokens.completion": cb.completion_tokens,
+            "tokens.totalCost": cb.total_cost
+        })
 
     def update_tools_token_data(self,token_data,tokens_old=None,additional_data:dict=None):
-        if tokens_old is None:
-            tokens_old=self.result.get('tokens',self.default_token_dict)
-            if 'totalCost' not in tokens_old:
-                tokens_old = self.default_token_dict
-
-        total_old_cost = float(tokens_old['totalCost'].replace("$", ""))
-        total_web_cost = float(tokens_old.get('webCost',"0").replace("$", ""))
-        total_web_cost = total_web_cost + additional_data.get('webCost',0)
-        total_new_cost = total_old_cost + token_data['totalCost']
-        token_usage_dict = {
-                "tokens.totalUsed": tokens_old['totalUsed'] + token_data["totalUsed"],
-                "tokens.promptT": tokens_old['promptT'] + token_data["promptT"],
-                "tokens.completion": tokens_old['completion'] + token_data["completion"],
-                "tokens.totalCost": f"${total_new_cost}",
-                "tokens.imageT": tokens_old.get('imageT',0) + additional_data['imageT'],
-                "tokens.webCost": f"${total_web_cost}",
-                "isMedia":additional_data['isMedia']
-            }
-        token_data = {
-            "$set": token_usage_dict    
+        additional_data = additional_data or {}
+        inc = {
+            "tokens.totalUsed": token_data["totalUsed"],
+            "tokens.promptT": token_data["promptT"],
+            "tokens.completion": token_data["completion"],
+            "tokens.totalCost": token_data['totalCost'],
+            "tokens.imageT": additional_data.get('imageT', 0),
+            "tokens.webCost": additional_data.get('webCost', 0),
         }
-        self.update_token_fields(token_data)
+        if embedding_cache := additional_data.get('embeddingCache'):
+            inc.update({
+                "tokens.embeddingCache.hits": embedding_cache['hits'],
+                "tokens.embeddingCache.misses": embedding_cache['misses'],
+                "tokens.embeddingCache.savedTokens": embedding_cache['savedTokens'],
+            })
+        self._add_token_usage(inc=inc, set_fields={"isMedia": additional_data.get('isMedia', False)})
 
     def update_token_usage_summary(self, cb, tokens_old=None):
         """
@@ -294,17 +290,12 @@ class ThreadRepostiory(ThreadAbstractRepository):
         tokens_old : dict
             The old token usage data.
         """
-        
-
-        token_data = {
-            "$set": {
-                "tokens.summary.totalUsed":cb.total_tokens,
-                "tokens.summary.promptT": cb.prompt_tokens,
-                "tokens.summary.completion": cb.completion_tokens,
-                "tokens.summary.totalCost": f"${cb.total_cost}"
-            }
-        }
-        self.update_token_fields(token_data)
+        self._add_token_usage(set_fields={
+            "tokens.summary.totalUsed":cb.total_tokens,
+            "tokens.summary.promptT": cb.prompt_tokens,
+            "tokens.summary.completion": cb.completion_tokens,
+            "tokens.summary.totalCost": cb.total_cost
+        })
     
 
 
@@ -318,31 +309,12 @@ class ThreadRepostiory(ThreadAbstractRepository):
             A dictionary containing cache token usage information.
         Notes
         -----
-        This method updates the cache token usage fields in the database. If `tokens_old` is not provided,
-        it defaults to the current token data in the result or the default token dictionary.
+        The cache token cost and prompt tokens are incremented atomically, `tokens_old` is unused.
         """
-        if tokens_old is None:
-            tokens_old = self.result.get('tokens', self.default_token_dict)
-            if 'totalCost' not in tokens_old.get('cache_tokens', {}):
-                tokens_old['cache_tokens'] = self.default_token_dict.get('cache_tokens', {})
-
-        # Parse old total cost
-        total_old_cost = float(tokens_old.get('cache_tokens', {}).get('totalCost', "$0").replace("$", ""))
-        total_new_cost = total_old_cost + cache_tokens_dict.get("cache_total_cost", 0)
-
-        # Parse old prompt tokens
-        old_prompt_tokens = tokens_old.get('cache_tokens', {}).get('promptT', 0)
-        new_prompt_tokens = old_prompt_tokens + cache_tokens_dict.get("cache_prompt_tokens", 0)
-
-        # Update both total cost and prompt tokens
-        token_data = {
-            "$set": {
-                "tokens.cache_tokens.totalCost": f"${total_new_cost}",
-                "tokens.cache_tokens.promptT": new_prompt_tokens,
-            }
-        }
-
-        self.update_token_fields(token_data)
+        self._add_token_usage(inc={
+            "tokens.cache_tokens.totalCost": cache_tokens_dict.get("cache_total_cost", 0),
+            "tokens.cache_tokens.promptT": cache_tokens_dict.get("cache_prompt_tokens", 0),
+        })
    
 
     def update_img_gen_prompt(self,gen_prompt=''):
@@ -604,22 +576,24 @@ class ThreadRepostiory(ThreadAbstractRepository):
         Args:
             msgCredit: The credit to increment.
         """
-        query = {'_id': ObjectId(self.thread_id)}
-        data = {
-            "$inc": {
-            "usedCredit": msgCredit
-            }
-        }
+        self._add_token_usage(inc={"usedCredit": msgCredit})
+
+    def get_company_id(self):
+        """
+        Fetch only the company id of the thread, for updates that do not need the whole document.
+        """
         try:
-            self.instance.update_one(query, data)
+            result = self.instance.find_one({'_id': ObjectId(self.thread_id)}, {'companyId': 1})
+            return result['companyId'] if result else None
         except PyMongoError as e:
             logger.error(
-            f"An error occurred while updating the usedCredit field: {e}",
-            extra={"tags": {
-                "method": "ThreadRepostiory.update_credits",
-                "thread_id": self.thread_id
-            }}
+                f"An error occurred while fetching the company id: {e}",
+                extra={"tags": {
+                    "method": "ThreadRepostiory.get_company_id",
+                    "thread_id": self.thread_id
+                }}
             )
+
     def update_fields_insert(self, data):
         """ 
         Updates or inserts fields in the thread model.
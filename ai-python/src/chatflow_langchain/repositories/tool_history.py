@@ -7,11 +7,12 @@ from langchain_core.messages import BaseMessage, SystemMessage, HumanMessage, AI
 from bson.objectid import ObjectId
 import os
 from src.chatflow_langchain.utils.hash_generator import generate_unique_number
-from src.chatflow_langchain.utils.tool_pipeline_query import get_pipeline_v2,get_latest_checkpoint,regenerate_history_pipeline,retrieve_thread_checkpoint
+from src.chatflow_langchain.utils.tool_pipeline_query import load_tool_history_since_checkpoint,regenerate_history_pipeline,retrieve_thread_checkpoint
 from src.db.config import db_instance
 from src.crypto_hub.utils.crypto_utils import MessageEncryptor,MessageDecryptor
 from dotenv import load_dotenv
 from src.chatflow_langchain.repositories.config import HistoryConfig
+from src.chatflow_langchain.repositories.history_cache import decrypted_history_cache
 
 load_dotenv()
 
@@ -51,18 +52,10 @@ class CustomAIMongoDBChatMessageHistory(BaseChatMessageHistory):
             logger.error(f"Connection to MongoDB failed: {error}")
 
     def _retrieve_messages_from_db(self) -> List[Dict]:
-        latest_checkpoint = get_latest_checkpoint(self.chat_session_id, self.db)
-        if latest_checkpoint is not None:
-            pipeline = get_pipeline_v2(self.chat_session_id, latest_checkpoint=latest_checkpoint)
-        
-            try:
-                
-                cursor = self.collection.aggregate(pipeline)
-                return list(cursor)
-            except errors.OperationFailure as error:
-                logger.error(f"Failed to retrieve messages: {error}")
-                return []
-        else:
+        try:
+            return load_tool_history_since_checkpoint(self.collection, self.chat_session_id)
+        except errors.OperationFailure as error:
+            logger.error(f"Failed to retrieve messages: {error}")
             return []
         
     def _retrieve_messages_for_regeneration(self) -> List[Dict]:
@@ -108,9 +101,13 @@ class CustomAIMongoDBChatMessageHistory(BaseChatMessageHistory):
             logger.error(f"Failed to extract messages: {error}")
             return []
 
-    def _parse_messages(self, messages: List[Dict]) -> List[BaseMessage]:
+    def _decrypt_messages(self, messages: List[str]) -> List[Dict]:
+        return [json.loads(decryptor.decrypt(msg)) for msg in messages]
+
+    def _parse_messages(self, result_list: List[Dict]) -> List[BaseMessage]:
         try:
-            messages = [json.loads(decryptor.decrypt(msg)) for msg in messages]
+            # Rows already decrypted for this session and checkpoint are served from the cache
+            messages = decrypted_history_cache.decrypt_rows(self, result_list)
             return messages_from_dict(messages)
         except (json.JSONDecodeError, KeyError) as error:
             logger.error(f"Failed to parse messages: {error}")
@@ -146,8 +143,7 @@ class CustomAIMongoDBChatMessageHistory(BaseChatMessageHistory):
         if not result_list:
             return []
 
-        raw_messages = self._extract_messages(result_list)
-        parsed_messages = self._parse_messages(raw_messages)
+        parsed_messages = self._parse_messages(result_list)
         return self._filter_system_messages(parsed_messages)
 
     def add_message(self, message: Union[BaseMessage, str], thread_id: str, message_type: str) -> None:
@@ -181,6 +177,7 @@ class CustomAIMongoDBChatMessageHistory(BaseChatMessageHistory):
                     upsert_update["$set"]["sumhistory_checkpoint"] = generate_unique_number(msg_dict['data']['content'])
 
             self.collection.update_one(upsert_query, upsert_update, upsert=False)
+            decrypted_history_cache.invalidate(self.chat_session_id, None if message_type == "system" else thread_id)
         except errors.WriteError as err:
             logger.error(f"Failed to add {message_type} message: {err}")
 
@@ -215,6 +212,7 @@ class CustomAIMongoDBChatMessageHistory(BaseChatMessageHistory):
                     upsert_update["$set"]["sumhistory_checkpoint"] = generate_unique_number(msg_dict['data']['content'])
 
             self.collection.update_one(upsert_query, upsert_update, upsert=False)
+            decrypted_history_cache.invalidate(self.chat_session_id, None if message_type == "system" else thread_id)
         except errors.WriteError as err:
             logger.error(f"Failed to add {message_type} message: {err}")
 
@@ -16,7 +16,6 @@ from src.chatflow_langchain.repositories.custom_gpt_repository import CustomGPTR
 from fastapi import HTTPException, status
 from src.chatflow_langchain.service.anthropic.canvas.config import CanvasConfig
 from src.chatflow_langchain.service.config.model_config_openai import OutSideDefaultGPTTextModelRepository
-import gc
 from src.custom_lib.langchain.chat_models.anthropic.chatanthropic_cache import MyChatAnthropic as ChatAnthropic
 from src.chatflow_langchain.service.anthropic.canvas.utils import extract_anthropic_error_message,extract_languages,get_word_boundary_substring,regex_replace,regex_replace_v2
 from src.chatflow_langchain.repositories.openai_error_messages_config import ANTHROPIC_ERROR_MESSAGES_CONFIG,DEV_MESSAGES_CONFIG
@@ -30,14 +29,15 @@ from src.chatflow_langchain.repositories.chatdocs_repo import ChatDocsRepository
 from src.chatflow_langchain.repositories.company_repository import CompanyRepostiory
 from src.round_robin.llm_key_manager import APIKeySelectorService,APIKeyUsageService
 from src.chatflow_langchain.service.config.model_config_anthropic import Functionality
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-chat_docs = ChatDocsRepository()
-company_repo = CompanyRepostiory()
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-thread_repo = ThreadRepostiory()
-new_thread_repo = ThreadRepostiory()
-qdrant_vector_store= QdrantVectorStoreService()
-custom_gpt_repo = CustomGPTRepository()
+chat_docs = RequestScoped(ChatDocsRepository)
+company_repo = RequestScoped(CompanyRepostiory)
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+thread_repo = RequestScoped(ThreadRepostiory)
+new_thread_repo = RequestScoped(ThreadRepostiory)
+qdrant_vector_store= RequestScoped(QdrantVectorStoreService)
+custom_gpt_repo = RequestScoped(CustomGPTRepository)
 
 load_dotenv()
 
@@ -124,7 +124,7 @@ class AnthropicCanvasService():
                 streaming=False,
                 verbose=False
             )
-            self.default_token_dict={"totalCost":"$0.000","promptT":0,"completion":0,"totalUsed":0}
+            self.default_token_dict={"totalCost":0.0,"promptT":0,"completion":0,"totalUsed":0}
         except Exception as e:
             logger.error(f"Failed to initialize LLM: {e}",
                          extra={"tags": {"method": "CanvasService.initialize_llm"}})
@@ -440,22 +440,9 @@ class AnthropicCanvasService():
         cb : Callback
             The callback object containing token usage information.
         tokens_old : dict
-            The old token usage data.
+            Unused, the thread counters are incremented atomically.
         """
-        if 'totalCost' not in tokens_old:
-            tokens_old = self.default_token_dict
-        total_old_cost = float(tokens_old['totalCost'].replace("$", ""))
-        total_new_cost = total_old_cost + cb.total_cost
-
-        token_data = {
-            "$set": {
-                "tokens.totalUsed": tokens_old['totalUsed'] + cb.total_tokens,
-                "tokens.promptT": tokens_old['promptT'] + cb.prompt_tokens,
-                "tokens.completion": tokens_old['completion'] + cb.completion_tokens,
-                "tokens.totalCost": f"${total_new_cost}"
-            }
-        }
-        new_thread_repo.update_token_fields(token_data)
+        new_thread_repo.update_token_usage(cb)
     
        # Separate async function to handle repository updates and history logging
     async def async_initialize_and_update(self, chat_session_id, chat_collection_name, new_thread_id, collection_name, cb, final_answer,msgCredit,is_paid_user):
@@ -728,7 +715,6 @@ class AnthropicCanvasService():
                     delattr(self, attr)  # Deletes the attribute from the instance
                     cleaned_up.append(attr)  # Adds the attribute name to the cleaned_up list
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
@@ -5,8 +5,9 @@ from src.chatflow_langchain.service.anthropic.custom_gpt.simple_chat.system_conv
 from src.chatflow_langchain.repositories.custom_gpt_repository import CustomGPTRepository
 from src.chatflow_langchain.service.anthropic.custom_gpt.simple_chat.system_conversation_tool import AnthropicCustomGPTStreamingSimpleChatServiceTool
 from src.chatflow_langchain.service.anthropic.custom_gpt.doc.rag_conversation_tool import AnthropicCustomGPTStreamingDocChatServiceTool
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-custom_gpt_repo = CustomGPTRepository()
+custom_gpt_repo = RequestScoped(CustomGPTRepository)
 
 class AnthropicCustomGPTManager():
     def __init__(self):
@@ -21,18 +21,18 @@ from src.chatflow_langchain.service.anthropic.custom_gpt.config import CustomGpt
 from src.chatflow_langchain.utils.fill_additional_prompt import fill_template
 from src.chatflow_langchain.service.config.model_config_anthropic import DefaultAnthropicModelRepository
 from src.chatflow_langchain.utils.fill_additional_prompt import fill_template, format_website_summary_pairs
-import gc
 from src.chatflow_langchain.repositories.openai_error_messages_config import ANTHROPIC_ERROR_MESSAGES_CONFIG,DEV_MESSAGES_CONFIG
 from src.chatflow_langchain.service.anthropic.custom_gpt.simple_chat.utils import extract_anthropic_error_message
 from src.custom_lib.langchain.chat_models.anthropic.chatanthropic_cache import MyChatAnthropic as ChatAnthropic
 from anthropic._exceptions import (AnthropicError,APIError,APIStatusError,APIConnectionError,
     APITimeoutError, AuthenticationError, PermissionDeniedError,NotFoundError,RateLimitError)
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-thread_repo = ThreadRepostiory()
-prompt_repo = PromptRepository()
-custom_gpt_repo = CustomGPTRepository()
-user_custom_prompt = UserCustomGPTPrompt()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+thread_repo = RequestScoped(ThreadRepostiory)
+prompt_repo = RequestScoped(PromptRepository)
+custom_gpt_repo = RequestScoped(CustomGPTRepository)
+user_custom_prompt = RequestScoped(UserCustomGPTPrompt)
 
 class AnthropicCustomGPTStreamingSimpleChatService(AbstractConversationService):
     def Initilization_custom_gpt(self,custom_gpt_id:str=None,customgptmodel:str=None):
@@ -482,7 +482,6 @@ class AnthropicCustomGPTStreamingSimpleChatService(AbstractConversationService):
                     delattr(self, attr)  # Deletes the attribute from the instance
                     cleaned_up.append(attr)  # Adds the attribute name to the cleaned_up list
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
@@ -21,7 +21,6 @@ from src.chatflow_langchain.service.anthropic.custom_gpt.config import CustomGpt
 from src.chatflow_langchain.utils.fill_additional_prompt import fill_template
 from src.chatflow_langchain.service.config.model_config_anthropic import DefaultAnthropicModelRepository
 from src.chatflow_langchain.utils.fill_additional_prompt import fill_template, format_website_summary_pairs
-import gc
 from src.chatflow_langchain.repositories.openai_error_messages_config import ANTHROPIC_ERROR_MESSAGES_CONFIG,DEV_MESSAGES_CONFIG
 from src.chatflow_langchain.service.anthropic.custom_gpt.simple_chat.utils import extract_anthropic_error_message
 from src.custom_lib.langchain.chat_models.anthropic.chatanthropic_cache import MyChatAnthropic as ChatAnthropic
@@ -37,12 +36,13 @@ import re
 from langchain.chains import LLMChain
 from src.chatflow_langchain.service.anthropic.config.anthropic_tool_description import ToolServiceDescription
 from src.round_robin.llm_key_manager import APIKeyUsageService
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-thread_repo = ThreadRepostiory()
-prompt_repo = PromptRepository()
-custom_gpt_repo = CustomGPTRepository()
-user_custom_prompt = UserCustomGPTPrompt()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+thread_repo = RequestScoped(ThreadRepostiory)
+prompt_repo = RequestScoped(PromptRepository)
+custom_gpt_repo = RequestScoped(CustomGPTRepository)
+user_custom_prompt = RequestScoped(UserCustomGPTPrompt)
 
 class AnthropicCustomGPTStreamingSimpleChatServiceTool(AbstractConversationService):
     def Initilization_custom_gpt(self,custom_gpt_id:str=None,customgptmodel:str=None):
@@ -918,7 +918,6 @@ class AnthropicCustomGPTStreamingSimpleChatServiceTool(AbstractConversationServi
                     delattr(self, attr)  # Deletes the attribute from the instance
                     cleaned_up.append(attr)  # Adds the attribute name to the cleaned_up list
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
@@ -29,10 +29,11 @@ import base64
 import requests
 from anthropic._exceptions import (AnthropicError,APIError,APIStatusError,APIConnectionError,
     APITimeoutError, AuthenticationError, PermissionDeniedError,NotFoundError,RateLimitError)
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-thread_repo = ThreadRepostiory()
-cost_callback = CostCalculator()
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
+thread_repo = RequestScoped(ThreadRepostiory)
+cost_callback = RequestScoped(CostCalculator)
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
 
 async_handler = async_streaming_handler()
 
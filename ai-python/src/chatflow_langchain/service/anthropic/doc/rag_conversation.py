@@ -23,20 +23,20 @@ from src.chatflow_langchain.service.anthropic.doc.config import DocConfig
 from src.chatflow_langchain.utils.fill_additional_prompt import fill_template, format_website_summary_pairs
 from src.chatflow_langchain.service.config.model_config_anthropic import ANTHROPICMODEL
 from fastapi import HTTPException, status
-import gc
 from src.chatflow_langchain.repositories.openai_error_messages_config import DEV_MESSAGES_CONFIG, ANTHROPIC_ERROR_MESSAGES_CONFIG
 from src.chatflow_langchain.service.anthropic.doc.utils import extract_anthropic_error_message
 from src.chatflow_langchain.service.config.model_config_openai import DefaultGPTTextModelRepository
 from src.custom_lib.langchain.chat_models.anthropic.chatanthropic_cache import MyChatAnthropic as ChatAnthropic
 from anthropic._exceptions import (AnthropicError, APIError, APIStatusError, APIConnectionError, APITimeoutError,
     AuthenticationError, PermissionDeniedError, NotFoundError, RateLimitError)
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-thread_repo = ThreadRepostiory()
-qdrant_vector_store= QdrantVectorStoreService()
-prompt_repo = PromptRepository()
-file_repo = FileRepository()
-chat_docs = ChatDocsRepository()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+thread_repo = RequestScoped(ThreadRepostiory)
+qdrant_vector_store= RequestScoped(QdrantVectorStoreService)
+prompt_repo = RequestScoped(PromptRepository)
+file_repo = RequestScoped(FileRepository)
+chat_docs = RequestScoped(ChatDocsRepository)
 
 class AnthropicStreamingDocumentedChatService(AbstractConversationService):
     def initialize_llm(self, api_key_id: str = None, companymodel: str = None,thread_id:str=None,thread_model:str=None):
@@ -569,7 +569,6 @@ class AnthropicStreamingDocumentedChatService(AbstractConversationService):
             if cleaned_up:
                 logger.info(f"Successfully cleaned up: {', '.join(cleaned_up)}.")
             
-            gc.collect()  # Force garbage collection to free memory
 
         except Exception as e:
             logger.error(
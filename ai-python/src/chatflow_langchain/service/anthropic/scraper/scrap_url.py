@@ -9,14 +9,14 @@ from src.celery_worker_hub.web_scraper.tasks.notify import on_task_success,on_ta
 from celery import chain 
 from src.chatflow_langchain.service.anthropic.scraper.config import ScraperConfig
 from src.chatflow_langchain.service.config.model_config_anthropic import DefaultAnthropicModelRepository
-import gc
 from src.chatflow_langchain.service.anthropic.image.utils import extract_anthropic_error_message
 from src.chatflow_langchain.repositories.openai_error_messages_config import ANTHROPIC_ERROR_MESSAGES_CONFIG,DEV_MESSAGES_CONFIG
 from src.custom_lib.langchain.chat_models.anthropic.chatanthropic_cache import MyChatAnthropic as ChatAnthropic
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
 # Initialize your repositories and services
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-prompt_repo = PromptRepository()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+prompt_repo = RequestScoped(PromptRepository)
 
 class AnthropicScrapUrlService():
 
@@ -148,7 +148,6 @@ class AnthropicScrapUrlService():
                     delattr(self, attr)  # Deletes the attribute from the instance
                     cleaned_up.append(attr)  # Adds the attribute name to the cleaned_up list
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
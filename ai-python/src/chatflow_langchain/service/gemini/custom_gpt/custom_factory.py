@@ -5,8 +5,9 @@ from src.chatflow_langchain.service.gemini.custom_gpt.simple_chat.system_convers
 from src.chatflow_langchain.service.gemini.custom_gpt.simple_chat.system_conversation_tool import GeminiCustomGPTStreamingSimpleChatServiceTool
 from src.chatflow_langchain.service.gemini.custom_gpt.doc.rag_conversation_tool import GeminiCustomGPTStreamingDocChatServiceTool
 from src.chatflow_langchain.repositories.custom_gpt_repository import CustomGPTRepository
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-custom_gpt_repo=CustomGPTRepository()
+custom_gpt_repo=RequestScoped(CustomGPTRepository)
 
 class GeminiCustomGPTManager():
     def __init__(self):
@@ -22,21 +22,21 @@ from src.chatflow_langchain.service.gemini.custom_gpt.config import CustomGptDoc
 from src.chatflow_langchain.utils.fill_additional_prompt import fill_template
 from src.chatflow_langchain.service.config.model_config_gemini import DefaultGeminiModelRepository
 from src.chatflow_langchain.utils.fill_additional_prompt import fill_template, format_website_summary_pairs
-import gc
 from src.chatflow_langchain.repositories.openai_error_messages_config import GENAI_ERROR_MESSAGES_CONFIG,DEV_MESSAGES_CONFIG
 from src.chatflow_langchain.service.gemini.custom_gpt.doc.utils import extract_google_error_message,extract_google_genai_error_message
 from langchain_google_genai._common import GoogleGenerativeAIError
 from google.api_core.exceptions import GoogleAPIError, ResourceExhausted, GoogleAPICallError
-from langchain_google_genai import ChatGoogleGenerativeAI
+from src.custom_lib.langchain.chat_models.gemini.chatgemini_cache import MyChatGoogleGenerativeAI as ChatGoogleGenerativeAI
 from src.chatflow_langchain.repositories.chatdocs_repo import ChatDocsRepository
 from src.chatflow_langchain.service.config.model_config_openai import DefaultGPTTextModelRepository
-chat_docs = ChatDocsRepository()
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-thread_repo = ThreadRepostiory()
-qdrant_vector_store= QdrantVectorStoreService()
-prompt_repo = PromptRepository()
-custom_gpt_repo = CustomGPTRepository()
-user_custom_prompt = UserCustomGPTPrompt()
+from src.chatflow_langchain.utils.request_context import RequestScoped
+chat_docs = RequestScoped(ChatDocsRepository)
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+thread_repo = RequestScoped(ThreadRepostiory)
+qdrant_vector_store= RequestScoped(QdrantVectorStoreService)
+prompt_repo = RequestScoped(PromptRepository)
+custom_gpt_repo = RequestScoped(CustomGPTRepository)
+user_custom_prompt = RequestScoped(UserCustomGPTPrompt)
 
 class GeminiCustomGPTStreamingDocChatService(AbstractConversationService):
     def Initilization_custom_gpt(self,custom_gpt_id:str=None,customgptmodel:str=None):
@@ -485,7 +485,6 @@ class GeminiCustomGPTStreamingDocChatService(AbstractConversationService):
                     delattr(self, attr)  # Deletes the attribute from the instance
                     cleaned_up.append(attr)  # Adds the attribute name to the cleaned_up list
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
@@ -22,7 +22,6 @@ from src.custom_lib.langchain.callbacks.gemini.mongodb.context_manager import ge
 from src.custom_lib.langchain.callbacks.gemini.streaming.custom_stream_async_handler import CustomAsyncIteratorCallbackHandler
 from src.chatflow_langchain.service.gemini.custom_gpt.config import CustomGptDocConfig,GetLLMkey
 from src.chatflow_langchain.utils.fill_additional_prompt import fill_template, format_website_summary_pairs
-import gc
 from src.chatflow_langchain.repositories.openai_error_messages_config import GENAI_ERROR_MESSAGES_CONFIG,DEV_MESSAGES_CONFIG
 from src.chatflow_langchain.service.gemini.custom_gpt.simple_chat.utils import extract_google_genai_error_message,extract_google_error_message
 from src.chatflow_langchain.repositories.chatdocs_repo import ChatDocsRepository
@@ -31,20 +30,21 @@ from langchain_core.messages import SystemMessage, HumanMessage
 from src.chatflow_langchain.service.config.model_config_gemini import GEMINIMODEL,Functionality
 from src.chatflow_langchain.service.config.model_config_openai import DefaultGPTTextModelRepository
 from langchain.chains import LLMChain
-from langchain_google_genai import ChatGoogleGenerativeAI
+from src.custom_lib.langchain.chat_models.gemini.chatgemini_cache import MyChatGoogleGenerativeAI as ChatGoogleGenerativeAI
 from google.api_core.exceptions import GoogleAPIError, ResourceExhausted, GoogleAPICallError
 from langchain_google_genai._common import GoogleGenerativeAIError
 import re
 from src.chatflow_langchain.service.gemini.config.gemini_tool_description import ToolServiceDescription
 from src.round_robin.llm_key_manager import APIKeyUsageService
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-thread_repo = ThreadRepostiory()
-qdrant_vector_store= QdrantVectorStoreService()
-prompt_repo = PromptRepository()
-custom_gpt_repo = CustomGPTRepository()
-user_custom_prompt = UserCustomGPTPrompt()
-chat_docs = ChatDocsRepository()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+thread_repo = RequestScoped(ThreadRepostiory)
+qdrant_vector_store= RequestScoped(QdrantVectorStoreService)
+prompt_repo = RequestScoped(PromptRepository)
+custom_gpt_repo = RequestScoped(CustomGPTRepository)
+user_custom_prompt = RequestScoped(UserCustomGPTPrompt)
+chat_docs = RequestScoped(ChatDocsRepository)
 
 class GeminiCustomGPTStreamingDocChatServiceTool(AbstractConversationService):
     def Initilization_custom_gpt(self,custom_gpt_id:str=None,customgptmodel:str=None):
@@ -831,7 +831,6 @@ class GeminiCustomGPTStreamingDocChatServiceTool(AbstractConversationService):
                     delattr(self, attr)  # Deletes the attribute from the instance
                     cleaned_up.append(attr)  # Adds the attribute name to the cleaned_up list
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
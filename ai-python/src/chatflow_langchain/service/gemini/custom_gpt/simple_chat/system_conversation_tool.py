@@ -19,7 +19,6 @@ from src.custom_lib.langchain.chain.custom_conversation_chain import CustomConve
 from fastapi import HTTPException, status
 from src.chatflow_langchain.service.gemini.custom_gpt.config import CustomGptChatConfig,GetLLMkey
 from src.chatflow_langchain.utils.fill_additional_prompt import fill_template, format_website_summary_pairs
-import gc
 from src.chatflow_langchain.repositories.openai_error_messages_config import GENAI_ERROR_MESSAGES_CONFIG,DEV_MESSAGES_CONFIG
 from src.chatflow_langchain.service.gemini.custom_gpt.simple_chat.utils import extract_google_genai_error_message,extract_google_error_message
 from src.celery_worker_hub.web_scraper.tasks.scraping_sitemap import crawler_scraper_task
@@ -27,18 +26,19 @@ from langchain_core.tools import tool
 from langchain.chains import LLMChain
 from langchain_core.messages import SystemMessage, HumanMessage
 from src.chatflow_langchain.service.config.model_config_gemini import GEMINIMODEL,Functionality
-from langchain_google_genai import ChatGoogleGenerativeAI
+from src.custom_lib.langchain.chat_models.gemini.chatgemini_cache import MyChatGoogleGenerativeAI as ChatGoogleGenerativeAI
 from google.api_core.exceptions import GoogleAPIError, ResourceExhausted, GoogleAPICallError
 from langchain_google_genai._common import GoogleGenerativeAIError
 import re
 from src.chatflow_langchain.service.gemini.config.gemini_tool_description import ToolServiceDescription
 from src.round_robin.llm_key_manager import APIKeyUsageService
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-thread_repo = ThreadRepostiory()
-prompt_repo = PromptRepository()
-custom_gpt_repo = CustomGPTRepository()
-user_custom_prompt = UserCustomGPTPrompt()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+thread_repo = RequestScoped(ThreadRepostiory)
+prompt_repo = RequestScoped(PromptRepository)
+custom_gpt_repo = RequestScoped(CustomGPTRepository)
+user_custom_prompt = RequestScoped(UserCustomGPTPrompt)
 
 class GeminiCustomGPTStreamingSimpleChatServiceTool(AbstractConversationService):
     def Initilization_custom_gpt(self,custom_gpt_id:str=None,customgptmodel:str=None):
@@ -739,7 +739,6 @@ class GeminiCustomGPTStreamingSimpleChatServiceTool(AbstractConversationService)
                     delattr(self, attr)  # Deletes the attribute from the instance
                     cleaned_up.append(attr)  # Adds the attribute name to the cleaned_up list
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
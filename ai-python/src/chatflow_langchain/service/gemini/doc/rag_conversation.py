@@ -21,21 +21,21 @@ from src.custom_lib.langchain.callbacks.gemini.streaming.custom_stream_async_han
 from src.chatflow_langchain.service.gemini.doc.config import DocConfig
 from src.chatflow_langchain.utils.fill_additional_prompt import fill_template, format_website_summary_pairs
 from fastapi import status, HTTPException
-import gc
 from src.chatflow_langchain.repositories.openai_error_messages_config import DEV_MESSAGES_CONFIG, GENAI_ERROR_MESSAGES_CONFIG
 from src.chatflow_langchain.service.gemini.doc.utils import extract_google_error_message,extract_google_genai_error_message
 from src.chatflow_langchain.service.config.model_config_openai import DefaultGPTTextModelRepository
 from src.chatflow_langchain.service.config.model_config_gemini import GEMINIMODEL
 from langchain_google_genai._common import GoogleGenerativeAIError
 from google.api_core.exceptions import GoogleAPIError, ResourceExhausted, GoogleAPICallError
-from langchain_google_genai import ChatGoogleGenerativeAI
-
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-thread_repo = ThreadRepostiory()
-qdrant_vector_store= QdrantVectorStoreService()
-prompt_repo = PromptRepository()
-file_repo = FileRepository()
-chat_docs = ChatDocsRepository()
+from src.custom_lib.langchain.chat_models.gemini.chatgemini_cache import MyChatGoogleGenerativeAI as ChatGoogleGenerativeAI
+from src.chatflow_langchain.utils.request_context import RequestScoped
+
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+thread_repo = RequestScoped(ThreadRepostiory)
+qdrant_vector_store= RequestScoped(QdrantVectorStoreService)
+prompt_repo = RequestScoped(PromptRepository)
+file_repo = RequestScoped(FileRepository)
+chat_docs = RequestScoped(ChatDocsRepository)
       
 class GeminiStreamingDocumentedChatService(AbstractConversationService):
     def initialize_llm(self, api_key_id: str = None, companymodel: str = None,thread_id:str=None,thread_model:str=None):
@@ -494,7 +494,6 @@ class GeminiStreamingDocumentedChatService(AbstractConversationService):
             if cleaned_up:
                 logger.info(f"Successfully cleaned up: {', '.join(cleaned_up)}.")
             
-            gc.collect()  # Force garbage collection to free memory
 
         except Exception as e:
             logger.error(
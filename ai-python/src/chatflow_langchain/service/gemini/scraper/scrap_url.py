@@ -9,13 +9,13 @@ from src.celery_worker_hub.web_scraper.tasks.notify import on_task_success,on_ta
 from celery import chain 
 from src.chatflow_langchain.service.gemini.scraper.config import ScraperConfig
 from src.chatflow_langchain.service.gemini.config.model_config import DefaultSonnet35ModelRepository
-import gc
 from src.chatflow_langchain.service.gemini.image.utils import extract_google_error_message
 from src.chatflow_langchain.repositories.openai_error_messages_config import GENAI_ERROR_MESSAGES_CONFIG,DEV_MESSAGES_CONFIG
 from src.custom_lib.langchain.chat_models.anthropic.chatanthropic_cache import MyChatAnthropic as ChatAnthropic
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-prompt_repo = PromptRepository()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+prompt_repo = RequestScoped(PromptRepository)
 
 class GeminiScrapUrlService():
 
@@ -147,7 +147,6 @@ class GeminiScrapUrlService():
                     delattr(self, attr)  # Deletes the attribute from the instance
                     cleaned_up.append(attr)  # Adds the attribute name to the cleaned_up list
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
@@ -5,7 +5,7 @@ from src.chatflow_langchain.service.gemini.title.chat_prompt_factory import crea
 from src.chatflow_langchain.service.gemini.title.chat_prompt_factory import prompt_title_without_answer
 from src.chatflow_langchain.service.gemini.title.custom_parser import TitleOutputParser
 from src.custom_lib.langchain.callbacks.gemini.cost.context_manager import gemini_sync_cost_handler
-from langchain_google_genai import ChatGoogleGenerativeAI
+from src.custom_lib.langchain.chat_models.gemini.chatgemini_cache import MyChatGoogleGenerativeAI as ChatGoogleGenerativeAI
 from src.logger.default_logger import logger
 
 ## Custom Library Imports
@@ -16,7 +16,6 @@ from src.chatflow_langchain.repositories.chat_member_repository import ChatMembe
 from src.chatflow_langchain.service.gemini.title.config import REFORMED_QUERY
 from src.chatflow_langchain.service.config.model_config_gemini import GEMINIMODEL
 from fastapi import HTTPException, status
-import gc
 from src.chatflow_langchain.service.gemini.title.utils import extract_google_error_message,extract_google_genai_error_message, get_default_title
 from src.chatflow_langchain.repositories.openai_error_messages_config import DEV_MESSAGES_CONFIG
 from src.crypto_hub.utils.crypto_utils import MessageEncryptor,MessageDecryptor
@@ -26,11 +25,12 @@ from langchain_google_genai._common import GoogleGenerativeAIError
 from google.api_core.exceptions import GoogleAPIError, ResourceExhausted, GoogleAPICallError
 from src.round_robin.llm_key_manager import APIKeySelectorService,APIKeyUsageService
 from src.chatflow_langchain.service.config.model_config_gemini import Functionality
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-thread_repo = ThreadRepostiory()
-chat_repo = ChatSessionRepository()
-chat_member_repo = ChatMemberRepository()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+thread_repo = RequestScoped(ThreadRepostiory)
+chat_repo = RequestScoped(ChatSessionRepository)
+chat_member_repo = RequestScoped(ChatMemberRepository)
 
 load_dotenv()
 
@@ -84,7 +84,7 @@ class GeminiTitleGenerationService(AbstractTitleGeneration):
                 verbose=False,
                 max_tokens=35)
             
-            self.default_token_dict={"totalCost":"$0.000","promptT":0,"completion":0,"totalUsed":0}
+            self.default_token_dict={"totalCost":0.0,"promptT":0,"completion":0,"totalUsed":0}
         except Exception as e:
             logger.error(f"Failed to initialize LLM: {e}",
                          extra={"tags": {"method": "GeminiTitleGenerationService.initialize_llm"}})
@@ -178,20 +178,7 @@ class GeminiTitleGenerationService(AbstractTitleGeneration):
             The old token usage data.
         """
         
-        if 'totalCost' not in tokens_old:
-            tokens_old = self.default_token_dict
-        total_old_cost = float(tokens_old['totalCost'].replace("$", ""))
-        total_new_cost = total_old_cost + cb.total_cost
-
-        token_data = {
-            "$set": {
-                "tokens.totalUsed": tokens_old['totalUsed'] + cb.total_tokens,
-                "tokens.promptT": tokens_old['promptT'] + cb.prompt_tokens,
-                "tokens.completion": tokens_old['completion'] + cb.completion_tokens,
-                "tokens.totalCost": f"${total_new_cost}"
-            }
-        }
-        thread_repo.update_token_fields(token_data)
+        thread_repo.update_token_usage(cb)
 
     def run_chain(self, chat_session_id: str = None, collection_name: str = None, collection_chatmember: str = None):
         """
@@ -369,7 +356,6 @@ class GeminiTitleGenerationService(AbstractTitleGeneration):
                     delattr(self, attr)  # Deletes the attribute from the instance
                     cleaned_up.append(attr)  # Adds the attribute name to the cleaned_up list
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
@@ -19,10 +19,9 @@ from src.custom_lib.langchain.callbacks.openai.cost.cost_calc_handler import Cos
 from src.celery_worker_hub.extraction.utils import map_file_url, validate_file_url
 from src.chatflow_langchain.utils.fill_additional_prompt import fill_template,format_website_summary_pairs
 from src.chatflow_langchain.service.gemini.tool_functions.tools import simple_chat_v2,website_analysis
-import gc
 from src.chatflow_langchain.service.gemini.tool_functions.utils import extract_google_genai_error_message,extract_google_error_message
 from src.chatflow_langchain.repositories.openai_error_messages_config import DEV_MESSAGES_CONFIG, GENAI_ERROR_MESSAGES_CONFIG
-from langchain_google_genai import ChatGoogleGenerativeAI
+from src.custom_lib.langchain.chat_models.gemini.chatgemini_cache import MyChatGoogleGenerativeAI as ChatGoogleGenerativeAI
 from langchain_google_genai._common import GoogleGenerativeAIError
 from google.api_core.exceptions import GoogleAPIError, ResourceExhausted, GoogleAPICallError
 from src.round_robin.llm_key_manager import APIKeyUsageService
@@ -41,16 +40,18 @@ from langchain_mcp_adapters.client import MultiServerMCPClient
 from dotenv import load_dotenv
 import os
 from src.MCP.utils import create_mcp_client
+from src.MCP.tool_cache import mcp_tool_cache
 from src.chatflow_langchain.service.openai.tool_functions.utils import encode_image_to_base64
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
 load_dotenv()
 mcp_url = os.getenv("MCP_URL", "http://mcp:8000/sse")
 
 # Service Initilization
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-thread_repo = ThreadRepostiory()
-prompt_repo = PromptRepository()
-cost_callback = CostCalculator()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+thread_repo = RequestScoped(ThreadRepostiory)
+prompt_repo = RequestScoped(PromptRepository)
+cost_callback = RequestScoped(CostCalculator)
 
 
 class GeminiToolService(AbstractConversationService):
@@ -91,7 +92,7 @@ class GeminiToolService(AbstractConversationService):
                 self.client = create_mcp_client(self.jwt_token, self.origin)
                 # Get tools directly without using context manager
                 try:
-                    self.mcp_tools_list = await self.client.get_tools()
+                    self.mcp_tools_list = await mcp_tool_cache.get_tools(user_id=self.mcp_data or self.jwt_token, mcp_tools=mcp_tools, client=self.client)
                     logger.info(f"MCP tools loaded successfully: {self.mcp_tools_list}")
                     # Add MCP tools to the existing tools list
                     if self.mcp_tools_list:
@@ -653,7 +654,6 @@ class GeminiToolService(AbstractConversationService):
                     # Adds the attribute name to the cleaned_up list
                     cleaned_up.append(attr)
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
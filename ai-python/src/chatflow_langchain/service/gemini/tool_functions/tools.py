@@ -28,13 +28,14 @@ from src.chatflow_langchain.repositories.openai_error_messages_config import GEN
 from src.crypto_hub.services.openai.llm_api_key_decryption import LLMAPIKeyDecryptionHandler
 from langchain_google_genai._common import GoogleGenerativeAIError
 from google.api_core.exceptions import GoogleAPIError, ResourceExhausted, GoogleAPICallError
-from langchain_google_genai import ChatGoogleGenerativeAI
+from src.custom_lib.langchain.chat_models.gemini.chatgemini_cache import MyChatGoogleGenerativeAI as ChatGoogleGenerativeAI
 from src.round_robin.llm_key_manager import APIKeyUsageService
 from src.chatflow_langchain.service.config.model_config_gemini import Functionality
 from datetime import datetime
-thread_repo = ThreadRepostiory()
-cost_callback = CostCalculator()
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
+from src.chatflow_langchain.utils.request_context import RequestScoped
+thread_repo = RequestScoped(ThreadRepostiory)
+cost_callback = RequestScoped(CostCalculator)
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
 
 async_handler = async_streaming_handler()
 
@@ -16,7 +16,6 @@ from src.chatflow_langchain.repositories.custom_gpt_repository import CustomGPTR
 from fastapi import HTTPException, status
 from src.chatflow_langchain.service.huggingface.canvas.config import CanvasConfig
 from src.chatflow_langchain.service.config.model_config_openai import OutSideDefaultGPTTextModelRepository
-import gc
 from src.chatflow_langchain.service.huggingface.canvas.utils import extract_error_message,regex_replace_v2,extract_languages,get_word_boundary_substring,regex_replace
 from src.chatflow_langchain.repositories.openai_error_messages_config import DEV_MESSAGES_CONFIG, HF_ERROR_MESSAGES_CONFIG
 from src.crypto_hub.utils.crypto_utils import MessageEncryptor,MessageDecryptor
@@ -27,14 +26,15 @@ from requests.exceptions import HTTPError
 from huggingface_hub.utils import HfHubHTTPError, EntryNotFoundError, BadRequestError
 from src.chatflow_langchain.repositories.chatdocs_repo import ChatDocsRepository
 from src.chatflow_langchain.repositories.company_repository import CompanyRepostiory
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-chat_docs=ChatDocsRepository()
-company_repo=CompanyRepostiory()
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-thread_repo = ThreadRepostiory()
-new_thread_repo = ThreadRepostiory()
-custom_gpt_repo=CustomGPTRepository()
-qdrant_vector_store= QdrantVectorStoreService()
+chat_docs=RequestScoped(ChatDocsRepository)
+company_repo=RequestScoped(CompanyRepostiory)
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+thread_repo = RequestScoped(ThreadRepostiory)
+new_thread_repo = RequestScoped(ThreadRepostiory)
+custom_gpt_repo=RequestScoped(CustomGPTRepository)
+qdrant_vector_store= RequestScoped(QdrantVectorStoreService)
 
 load_dotenv()
 
@@ -133,7 +133,7 @@ class HFCanvasService():
                         response_format=['json']
                     )
             self.llm_sum_memory=ChatHuggingFace(llm=self.llm_huggingface_non_stream,stop=llm_apikey_decrypt_service.extra_config.get('stopSequences',['<|eot_id|>']))
-            self.default_token_dict={"totalCost":"$0.000","promptT":0,"completion":0,"totalUsed":0}
+            self.default_token_dict={"totalCost":0.0,"promptT":0,"completion":0,"totalUsed":0}
 
         except HTTPException as e:
             raise e
@@ -553,22 +553,9 @@ class HFCanvasService():
         cb : Callback
             The callback object containing token usage information.
         tokens_old : dict
-            The old token usage data.
+            Unused, the thread counters are incremented atomically.
         """
-        if 'totalCost' not in tokens_old:
-            tokens_old = self.default_token_dict
-        total_old_cost = float(tokens_old['totalCost'].replace("$", ""))
-        total_new_cost = total_old_cost + cb.total_cost
-
-        token_data = {
-            "$set": {
-                "tokens.totalUsed": tokens_old['totalUsed'] + cb.total_tokens,
-                "tokens.promptT": tokens_old['promptT'] + cb.prompt_tokens,
-                "tokens.completion": tokens_old['completion'] + cb.completion_tokens,
-                "tokens.totalCost": f"${total_new_cost}"
-            }
-        }
-        new_thread_repo.update_token_fields(token_data)
+        new_thread_repo.update_token_usage(cb)
     
        # Separate async function to handle repository updates and history logging
     async def async_initialize_and_update(self, chat_session_id, chat_collection_name, new_thread_id, collection_name, cb, final_answer,msgCredit,is_paid_user):
@@ -754,7 +741,6 @@ class HFCanvasService():
                     delattr(self, attr)  # Deletes the attribute from the instance
                     cleaned_up.append(attr)  # Adds the attribute name to the cleaned_up list
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
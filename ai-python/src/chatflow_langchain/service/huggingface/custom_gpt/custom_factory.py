@@ -4,8 +4,9 @@ from src.logger.default_logger import logger
 from src.chatflow_langchain.service.huggingface.custom_gpt.doc.rag_conversation import HFCustomGPTStreamingDocChatService
 from src.chatflow_langchain.service.huggingface.custom_gpt.simple_chat.system_conversation import HFCustomGPTStreamingSimpleChatService
 from src.chatflow_langchain.repositories.custom_gpt_repository import CustomGPTRepository
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-custom_gpt_repo=CustomGPTRepository()
+custom_gpt_repo=RequestScoped(CustomGPTRepository)
 
 class HFCustomGPTManager():
     def __init__(self):
@@ -20,7 +20,6 @@ from src.custom_lib.langchain.callbacks.huggingface.streaming.custom_stream_asyn
 from fastapi import status
 from src.chatflow_langchain.service.huggingface.custom_gpt.config import CustomGptDocConfig
 from src.chatflow_langchain.utils.fill_additional_prompt import fill_template,format_website_summary_pairs
-import gc
 from src.chatflow_langchain.repositories.openai_error_messages_config import DEV_MESSAGES_CONFIG,HF_ERROR_MESSAGES_CONFIG
 from src.chatflow_langchain.service.huggingface.custom_gpt.doc.utils import extract_error_message
 from langchain_huggingface import HuggingFaceEndpoint,ChatHuggingFace
@@ -28,13 +27,14 @@ from requests.exceptions import HTTPError
 from huggingface_hub.utils import HfHubHTTPError, EntryNotFoundError, BadRequestError
 from src.chatflow_langchain.repositories.chatdocs_repo import ChatDocsRepository
 from src.chatflow_langchain.service.config.model_config_openai import DefaultGPTTextModelRepository
-chat_docs=ChatDocsRepository()
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-thread_repo = ThreadRepostiory()
-qdrant_vector_store= QdrantVectorStoreService()
-prompt_repo = PromptRepository()
-custom_gpt_repo = CustomGPTRepository()
-user_custom_prompt = UserCustomGPTPrompt()
+from src.chatflow_langchain.utils.request_context import RequestScoped
+chat_docs=RequestScoped(ChatDocsRepository)
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+thread_repo = RequestScoped(ThreadRepostiory)
+qdrant_vector_store= RequestScoped(QdrantVectorStoreService)
+prompt_repo = RequestScoped(PromptRepository)
+custom_gpt_repo = RequestScoped(CustomGPTRepository)
+user_custom_prompt = RequestScoped(UserCustomGPTPrompt)
 
 class HFCustomGPTStreamingDocChatService(AbstractConversationService):
     def Initilization_custom_gpt(self,custom_gpt_id:str=None,customgptmodel:str=None):
@@ -572,7 +572,6 @@ class HFCustomGPTStreamingDocChatService(AbstractConversationService):
                     delattr(self, attr)  # Deletes the attribute from the instance
                     cleaned_up.append(attr)  # Adds the attribute name to the cleaned_up list
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
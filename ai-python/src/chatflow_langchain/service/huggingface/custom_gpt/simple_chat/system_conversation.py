@@ -18,19 +18,19 @@ from src.custom_lib.langchain.chain.custom_conversation_chain import CustomConve
 from fastapi import status, HTTPException
 from src.chatflow_langchain.service.huggingface.custom_gpt.config import CustomGptChatConfig
 from src.chatflow_langchain.utils.fill_additional_prompt import fill_template,format_website_summary_pairs
-import gc
 from src.chatflow_langchain.repositories.openai_error_messages_config import DEV_MESSAGES_CONFIG,HF_ERROR_MESSAGES_CONFIG
 from src.chatflow_langchain.service.huggingface.custom_gpt.simple_chat.utils import extract_error_message
 from langchain_huggingface import HuggingFaceEndpoint,ChatHuggingFace
 from requests.exceptions import HTTPError
 from huggingface_hub.utils import HfHubHTTPError, EntryNotFoundError, BadRequestError
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
 
-thread_repo = ThreadRepostiory()
-prompt_repo = PromptRepository()
-custom_gpt_repo = CustomGPTRepository()
-user_custom_prompt = UserCustomGPTPrompt()
+thread_repo = RequestScoped(ThreadRepostiory)
+prompt_repo = RequestScoped(PromptRepository)
+custom_gpt_repo = RequestScoped(CustomGPTRepository)
+user_custom_prompt = RequestScoped(UserCustomGPTPrompt)
 
 class HFCustomGPTStreamingSimpleChatService(AbstractConversationService):
     def Initilization_custom_gpt(self,custom_gpt_id:str=None,customgptmodel:str=None):
@@ -507,7 +507,6 @@ class HFCustomGPTStreamingSimpleChatService(AbstractConversationService):
                     delattr(self, attr)  # Deletes the attribute from the instance
                     cleaned_up.append(attr)  # Adds the attribute name to the cleaned_up list
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
@@ -19,7 +19,6 @@ from src.custom_lib.langchain.callbacks.openai.streaming.custom_stream_async_han
 from src.chatflow_langchain.service.huggingface.doc.config import DocConfig
 from src.chatflow_langchain.utils.fill_additional_prompt import fill_template,format_website_summary_pairs
 from fastapi import status, HTTPException
-import gc
 from src.chatflow_langchain.repositories.openai_error_messages_config import DEV_MESSAGES_CONFIG,HF_ERROR_MESSAGES_CONFIG
 from src.chatflow_langchain.service.huggingface.doc.utils import extract_error_message,custom_parse_datetime
 from langchain_huggingface.chat_models.huggingface import ChatHuggingFace 
@@ -28,14 +27,15 @@ from requests.exceptions import HTTPError
 from huggingface_hub.utils import HfHubHTTPError, EntryNotFoundError, BadRequestError
 from src.chatflow_langchain.repositories.file_repository import FileRepository
 from huggingface_hub import _inference_endpoints
+from src.chatflow_langchain.utils.request_context import RequestScoped
 _inference_endpoints.parse_datetime = custom_parse_datetime
 
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-thread_repo = ThreadRepostiory()
-qdrant_vector_store= QdrantVectorStoreService()
-prompt_repo = PromptRepository()
-chat_docs = ChatDocsRepository()
-file_repo = FileRepository()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+thread_repo = RequestScoped(ThreadRepostiory)
+qdrant_vector_store= RequestScoped(QdrantVectorStoreService)
+prompt_repo = RequestScoped(PromptRepository)
+chat_docs = RequestScoped(ChatDocsRepository)
+file_repo = RequestScoped(FileRepository)
 class HFStreamingDocumentedChatService(AbstractConversationService):
     def initialize_llm(self, api_key_id: str = None, companymodel: str = None,thread_id:str=None,thread_model:str=None):
         """
@@ -571,7 +571,6 @@ class HFStreamingDocumentedChatService(AbstractConversationService):
             if cleaned_up:
                 logger.info(f"Successfully cleaned up: {', '.join(cleaned_up)}.")
             
-            gc.collect()  # Force garbage collection to free memory
 
         except Exception as e:
             logger.error(
@@ -8,13 +8,13 @@ from src.celery_worker_hub.web_scraper.tasks.db_dump import dump_to_db
 from src.celery_worker_hub.web_scraper.tasks.notify import on_task_success,on_task_failed
 from celery import chain 
 from src.chatflow_langchain.service.huggingface.scraper.config import ScraperConfig
-import gc
 from src.chatflow_langchain.service.huggingface.image.utils import extract_error_message
 from src.chatflow_langchain.repositories.openai_error_messages_config import OPENAI_MESSAGES_CONFIG,DEV_MESSAGES_CONFIG
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
 # Initialize your repositories and services
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-prompt_repo = PromptRepository()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+prompt_repo = RequestScoped(PromptRepository)
 class HFScrapUrlService():
 
     def initialize_llm(self, company_id: str = None, companymodel: str = None,llm_api_key_id:str=None):
@@ -136,7 +136,6 @@ class HFScrapUrlService():
                     delattr(self, attr)  # Deletes the attribute from the instance
                     cleaned_up.append(attr)  # Adds the attribute name to the cleaned_up list
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
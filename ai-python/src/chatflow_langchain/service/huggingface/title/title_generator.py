@@ -14,7 +14,6 @@ from src.chatflow_langchain.repositories.chat_session_repository import ChatSess
 from src.chatflow_langchain.repositories.chat_member_repository import ChatMemberRepository
 from fastapi import HTTPException, status
 from src.chatflow_langchain.service.huggingface.title.config import REFORMED_QUERY
-import gc
 from src.chatflow_langchain.service.huggingface.title.utils import extract_error_message, get_default_title,get_default_image_title
 from src.chatflow_langchain.repositories.openai_error_messages_config import DEV_MESSAGES_CONFIG, HF_ERROR_MESSAGES_CONFIG
 from src.crypto_hub.utils.crypto_utils import MessageEncryptor,MessageDecryptor
@@ -23,11 +22,12 @@ import os
 from langchain_huggingface import HuggingFaceEndpoint,ChatHuggingFace
 from requests.exceptions import HTTPError
 from huggingface_hub.utils import HfHubHTTPError, EntryNotFoundError, BadRequestError
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-thread_repo = ThreadRepostiory()
-chat_repo = ChatSessionRepository()
-chat_member_repo = ChatMemberRepository()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+thread_repo = RequestScoped(ThreadRepostiory)
+chat_repo = RequestScoped(ChatSessionRepository)
+chat_member_repo = RequestScoped(ChatMemberRepository)
 
 load_dotenv()
 
@@ -84,7 +84,7 @@ class HFTitleGenerationService(AbstractTitleGeneration):
                         max_tokens=60
                     )
             self.llm_huggingface = ChatHuggingFace(llm=self.llm_huggingface_endpoint)
-            self.default_token_dict={"totalCost":"$0.000","promptT":0,"completion":0,"totalUsed":0}
+            self.default_token_dict={"totalCost":0.0,"promptT":0,"completion":0,"totalUsed":0}
 
         except HTTPException as e:
             raise e
@@ -191,22 +191,9 @@ class HFTitleGenerationService(AbstractTitleGeneration):
         cb : Callback
             The callback object containing token usage information.
         tokens_old : dict
-            The old token usage data.
-        """
-        if 'totalCost' not in tokens_old:
-            tokens_old = self.default_token_dict
-        total_old_cost = float(tokens_old['totalCost'].replace("$", ""))
-        total_new_cost = total_old_cost + cb.total_cost
-
-        token_data = {
-            "$set": {
-                "tokens.totalUsed": tokens_old['totalUsed'] + cb.total_tokens,
-                "tokens.promptT": tokens_old['promptT'] + cb.prompt_tokens,
-                "tokens.completion": tokens_old['completion'] + cb.completion_tokens,
-                "tokens.totalCost": f"${total_new_cost}"
-            }
-        }
-        thread_repo.update_token_fields(token_data)
+            Unused, the thread counters are incremented atomically.
+        """
+        thread_repo.update_token_usage(cb)
 
     def run_chain(self, chat_session_id: str = None, collection_name: str = None, collection_chatmember: str = None):
         """
@@ -364,7 +351,6 @@ class HFTitleGenerationService(AbstractTitleGeneration):
                     delattr(self, attr)  # Deletes the attribute from the instance
                     cleaned_up.append(attr)  # Adds the attribute name to the cleaned_up list
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
@@ -419,7 +405,7 @@ class HFTitleImageGenerationService(AbstractTitleGeneration):
         try:
             llm_apikey_decrypt_service.initialization(api_key_id, companymodel)
             self.task_type=llm_apikey_decrypt_service.task_type
-            self.default_token_dict={"totalCost":"$0.000","promptT":0,"completion":0,"totalUsed":0}
+            self.default_token_dict={"totalCost":0.0,"promptT":0,"completion":0,"totalUsed":0}
 
         except HTTPException as e:
             raise e
@@ -526,22 +512,9 @@ class HFTitleImageGenerationService(AbstractTitleGeneration):
         cb : Callback
             The callback object containing token usage information.
         tokens_old : dict
-            The old token usage data.
-        """
-        if 'totalCost' not in tokens_old:
-            tokens_old = self.default_token_dict
-        total_old_cost = float(tokens_old['totalCost'].replace("$", ""))
-        total_new_cost = total_old_cost + cb.total_cost
-
-        token_data = {
-            "$set": {
-                "tokens.totalUsed": tokens_old['totalUsed'] + cb.total_tokens,
-                "tokens.promptT": tokens_old['promptT'] + cb.prompt_tokens,
-                "tokens.completion": tokens_old['completion'] + cb.completion_tokens,
-                "tokens.totalCost": f"${total_new_cost}"
-            }
-        }
-        thread_repo.update_token_fields(token_data)
+            Unused, the thread counters are incremented atomically.
+        """
+        thread_repo.update_token_usage(cb)
 
     def run_chain(self, chat_session_id: str = None, collection_name: str = None, collection_chatmember: str = None):
         """
@@ -683,7 +656,6 @@ class HFTitleImageGenerationService(AbstractTitleGeneration):
                     delattr(self, attr)  # Deletes the attribute from the instance
                     cleaned_up.append(attr)  # Adds the attribute name to the cleaned_up list
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
@@ -30,9 +30,10 @@ from openai import RateLimitError,APIConnectionError,APITimeoutError,APIStatusEr
 from src.gateway.openai_exceptions import LengthFinishReasonError,ContentFilterFinishReasonError
 from src.chatflow_langchain.service.huggingface.tool_functions.utils import delete_resources, convert_image_to_bytes
 from src.chatflow_langchain.service.huggingface.config.hf_tool_description import HfToolDescription
-thread_repo = ThreadRepostiory()
-cost_callback = CostCalculator()
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
+from src.chatflow_langchain.utils.request_context import RequestScoped
+thread_repo = RequestScoped(ThreadRepostiory)
+cost_callback = RequestScoped(CostCalculator)
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
 
 async_handler = async_streaming_handler()
 
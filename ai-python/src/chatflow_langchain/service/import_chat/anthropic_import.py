@@ -13,10 +13,11 @@ from src.chatflow_langchain.repositories.import_chat_repository import ImportCha
 from src.chatflow_langchain.service.import_chat.config import ImportChatConfig
 import os
 from src.chatflow_langchain.service.openai.title.utils import get_default_title
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
 BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE',5))
-import_chat_repository = ImportChatRepository()
-anthropic_llm_apikey_decrypt_service = AnthropicDecryptionHandler()
+import_chat_repository = RequestScoped(ImportChatRepository)
+anthropic_llm_apikey_decrypt_service = RequestScoped(AnthropicDecryptionHandler)
 
 class ImportAnthropicProcessor:
 
@@ -5,8 +5,9 @@ from src.chatflow_langchain.repositories.import_chat_repository import ImportCha
 from src.celery_worker_hub.import_worker.tasks.file_upload import zip_process_and_upload_files
 from fastapi import HTTPException,status
 from src.logger.default_logger import logger
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-import_chat_repository = ImportChatRepository() 
+import_chat_repository = RequestScoped(ImportChatRepository) 
 class ImportData:
     def __init__(self, import_id, zip_file_bytes,config,brain_id):
         self.import_id = import_id
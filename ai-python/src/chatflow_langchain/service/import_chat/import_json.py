@@ -2,8 +2,9 @@ import json
 from src.chatflow_langchain.repositories.import_chat_repository import ImportChatRepository
 from fastapi import HTTPException,status
 from src.logger.default_logger import logger
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-import_chat_repository = ImportChatRepository() 
+import_chat_repository = RequestScoped(ImportChatRepository) 
 class ImportDataJson:
     def __init__(self, import_id, json_file_bytes,config,brain_id):
         self.import_id = import_id
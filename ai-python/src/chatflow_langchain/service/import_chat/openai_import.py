@@ -12,9 +12,10 @@ from src.chatflow_langchain.service.config.model_config_openai import DefaultGPT
 from src.chatflow_langchain.repositories.import_chat_repository import ImportChatRepository
 from src.chatflow_langchain.service.import_chat.config import ImportChatConfig
 import os
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-import_chat_repository = ImportChatRepository()
-openai_llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
+import_chat_repository = RequestScoped(ImportChatRepository)
+openai_llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
 BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE',5))
 class ImportOpenAIProcessor:
 
@@ -22,20 +22,20 @@ from src.custom_lib.langchain.callbacks.weam_router.open_router.streaming.custom
 from openai import RateLimitError,APIConnectionError,APITimeoutError,APIStatusError, NotFoundError
 from src.chatflow_langchain.service.multimodal_router.custom_gpt.config import CustomGptDocConfig,GetLLMkey,DEFAULTMODEL
 from src.chatflow_langchain.utils.fill_additional_prompt import fill_template, format_website_summary_pairs
-import gc
 from src.gateway.openai_exceptions import LengthFinishReasonError,ContentFilterFinishReasonError
 from src.chatflow_langchain.repositories.openai_error_messages_config import DEV_MESSAGES_CONFIG, WEAM_ROUTER_MESSAGES_CONFIG
 from src.chatflow_langchain.service.multimodal_router.custom_gpt.doc.utils import extract_error_message
 from src.chatflow_langchain.repositories.chatdocs_repo import ChatDocsRepository
 from langchain.chains import LLMChain
 from src.chatflow_langchain.service.config.model_config_router import DefaultGPTTextModelRepository,ROUTERMODEL
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-thread_repo = ThreadRepostiory()
-qdrant_vector_store= QdrantVectorStoreService()
-prompt_repo = PromptRepository()
-custom_gpt_repo = CustomGPTRepository()
-user_custom_prompt = UserCustomGPTPrompt()
-chat_docs = ChatDocsRepository()
+from src.chatflow_langchain.utils.request_context import RequestScoped
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+thread_repo = RequestScoped(ThreadRepostiory)
+qdrant_vector_store= RequestScoped(QdrantVectorStoreService)
+prompt_repo = RequestScoped(PromptRepository)
+custom_gpt_repo = RequestScoped(CustomGPTRepository)
+user_custom_prompt = RequestScoped(UserCustomGPTPrompt)
+chat_docs = RequestScoped(ChatDocsRepository)
 
 class RouterCustomGPTDocChatService(AbstractConversationService):
     def Initilization_custom_gpt(self,custom_gpt_id:str=None,customgptmodel:str=None):
@@ -527,7 +527,6 @@ class RouterCustomGPTDocChatService(AbstractConversationService):
                     delattr(self, attr)  # Deletes the attribute from the instance
                     cleaned_up.append(attr)  # Adds the attribute name to the cleaned_up list
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
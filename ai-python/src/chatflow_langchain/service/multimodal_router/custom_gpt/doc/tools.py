@@ -22,10 +22,11 @@ from src.custom_lib.langchain.callbacks.weam_router.open_router.image_cost.conte
 from src.gateway.openai_exceptions import LengthFinishReasonError,ContentFilterFinishReasonError
 from src.chatflow_langchain.repositories.openai_error_messages_config import DEV_MESSAGES_CONFIG, WEAM_ROUTER_MESSAGES_CONFIG
 from src.crypto_hub.services.openai.llm_api_key_decryption import LLMAPIKeyDecryptionHandler
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-thread_repo = ThreadRepostiory()
-cost_callback = CostCalculator()
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
+thread_repo = RequestScoped(ThreadRepostiory)
+cost_callback = RequestScoped(CostCalculator)
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
 
 async_handler = async_streaming_handler()
 
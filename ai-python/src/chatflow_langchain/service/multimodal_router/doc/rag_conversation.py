@@ -22,20 +22,20 @@ from src.chatflow_langchain.service.multimodal_router.doc.config import DocConfi
 from src.chatflow_langchain.utils.fill_additional_prompt import fill_template, format_website_summary_pairs
 from openai import RateLimitError,APIConnectionError,APITimeoutError,APIStatusError, NotFoundError
 from fastapi import HTTPException, status
-import gc
 from src.gateway.openai_exceptions import LengthFinishReasonError,ContentFilterFinishReasonError
 from src.chatflow_langchain.repositories.openai_error_messages_config import DEV_MESSAGES_CONFIG,WEAM_ROUTER_MESSAGES_CONFIG
 from src.chatflow_langchain.service.multimodal_router.doc.utils import extract_error_message
 from src.chatflow_langchain.service.config.model_config_router import DefaultGPTTextModelRepository,ROUTERMODEL
 from src.custom_lib.langchain.callbacks.weam_router.open_router.cost.context_manager import openrouter_async_callback
 from langchain.chains import LLMChain
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-thread_repo = ThreadRepostiory()
-qdrant_vector_store= QdrantVectorStoreService()
-prompt_repo = PromptRepository()
-file_repo = FileRepository()
-chat_docs = ChatDocsRepository()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+thread_repo = RequestScoped(ThreadRepostiory)
+qdrant_vector_store= RequestScoped(QdrantVectorStoreService)
+prompt_repo = RequestScoped(PromptRepository)
+file_repo = RequestScoped(FileRepository)
+chat_docs = RequestScoped(ChatDocsRepository)
 
 class RouterDocumentedService(AbstractConversationService):
     def initialize_llm(self, api_key_id: str = None, companymodel: str = None,thread_id:str=None,thread_model:str=None):
@@ -521,7 +521,6 @@ class RouterDocumentedService(AbstractConversationService):
             if cleaned_up:
                 logger.info(f"Successfully cleaned up: {', '.join(cleaned_up)}.")
             
-            gc.collect()  # Force garbage collection to free memory
 
         except Exception as e:
             logger.error(
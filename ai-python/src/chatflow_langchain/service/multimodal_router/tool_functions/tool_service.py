@@ -18,7 +18,6 @@ from openai import RateLimitError,APIConnectionError,APITimeoutError,APIStatusEr
 from src.celery_worker_hub.extraction.utils import map_file_url, validate_file_url
 from src.chatflow_langchain.utils.fill_additional_prompt import fill_template,format_website_summary_pairs
 from src.chatflow_langchain.service.multimodal_router.tool_functions.tools import simple_chat_v2,website_analysis
-import gc
 from src.chatflow_langchain.service.multimodal_router.tool_functions.utils import extract_error_message
 from src.gateway.openai_exceptions import LengthFinishReasonError,ContentFilterFinishReasonError
 from src.gateway.utils import SyncHTTPClientSingleton, AsyncHTTPClientSingleton
@@ -37,15 +36,17 @@ from langchain_mcp_adapters.client import MultiServerMCPClient
 from dotenv import load_dotenv
 import os
 from src.MCP.utils import create_mcp_client
+from src.MCP.tool_cache import mcp_tool_cache
 from src.chatflow_langchain.service.openai.tool_functions.utils import encode_image_to_base64
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
 load_dotenv()
 mcp_url = os.getenv("MCP_URL", "http://mcp:8000/sse")
 # Service Initilization
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-thread_repo = ThreadRepostiory()
-prompt_repo = PromptRepository()
-cost_callback = CostCalculator()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+thread_repo = RequestScoped(ThreadRepostiory)
+prompt_repo = RequestScoped(PromptRepository)
+cost_callback = RequestScoped(CostCalculator)
 
 class RouterServiceTool(AbstractConversationService):
     async def initialize_llm(self, api_key_id: str = None, companymodel: str = None, dalle_wrapper_size: str = None, dalle_wrapper_quality: str = None, dalle_wrapper_style: str = None, thread_id: str = None, thread_model: str = None, imageT=0,company_id:str=None,mcp_data:dict=None,mcp_tools:dict=None,mcp_request:dict=None):
@@ -97,7 +98,7 @@ class RouterServiceTool(AbstractConversationService):
                 self.client = create_mcp_client(self.jwt_token, self.origin)
                 # Get tools directly without using context manager
                 try:
-                    self.mcp_tools_list = await self.client.get_tools()
+                    self.mcp_tools_list = await mcp_tool_cache.get_tools(user_id=self.mcp_data or self.jwt_token, mcp_tools=mcp_tools, client=self.client)
                     logger.info(f"MCP tools loaded successfully: {self.mcp_tools_list}")
                     # Add MCP tools to the existing tools list
                     if self.mcp_tools_list:
@@ -679,7 +680,6 @@ class RouterServiceTool(AbstractConversationService):
                     # Adds the attribute name to the cleaned_up list
                     cleaned_up.append(attr)
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
@@ -29,9 +29,10 @@ from src.celery_worker_hub.web_scraper.tasks.scraping_sitemap import crawler_scr
 import re
 from src.chatflow_langchain.service.multimodal_router.config.multmodel_tool_description import ToolDescription
 from datetime import datetime
-thread_repo = ThreadRepostiory()
-cost_callback = CostCalculator()
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
+from src.chatflow_langchain.utils.request_context import RequestScoped
+thread_repo = RequestScoped(ThreadRepostiory)
+cost_callback = RequestScoped(CostCalculator)
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
 
 async_handler = async_streaming_handler()
 
@@ -5,8 +5,9 @@ from src.chatflow_langchain.service.o1.custom_gpt.simple_chat.system_conversatio
 from src.chatflow_langchain.service.o1.custom_gpt.doc.rag_conversation_img import O1CustomGPTStreamingDocChatServiceImg
 from src.chatflow_langchain.service.o1.custom_gpt.simple_chat.system_conversation_img import O1CustomGPTStreamingSimpleChatServiceImg
 from src.chatflow_langchain.repositories.custom_gpt_repository import CustomGPTRepository
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-custom_gpt_repo=CustomGPTRepository()
+custom_gpt_repo=RequestScoped(CustomGPTRepository)
 
 class O1CustomGPTManager():
     def __init__(self):
@@ -31,10 +31,11 @@ import re
 from src.round_robin.llm_key_manager import APIKeyUsageService
 from src.celery_worker_hub.extraction.utils import map_file_url
 from src.chatflow_langchain.service.o1.config.o1_tool_description import ToolDescritpion
-thread_repo = ThreadRepostiory()
-company_repo=CompanyRepostiory()
-cost_callback = CostCalculator()
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
+from src.chatflow_langchain.utils.request_context import RequestScoped
+thread_repo = RequestScoped(ThreadRepostiory)
+company_repo=RequestScoped(CompanyRepostiory)
+cost_callback = RequestScoped(CostCalculator)
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
 
 async_handler = async_streaming_handler()
 
@@ -23,18 +23,18 @@ from src.chatflow_langchain.service.o1.doc.config import DocConfig
 from src.chatflow_langchain.utils.fill_additional_prompt import fill_template, format_website_summary_pairs
 from openai import RateLimitError,APIConnectionError,APITimeoutError,APIStatusError, NotFoundError
 from fastapi import HTTPException, status
-import gc
 from src.gateway.openai_exceptions import LengthFinishReasonError,ContentFilterFinishReasonError
 from src.chatflow_langchain.repositories.openai_error_messages_config import OPENAI_MESSAGES_CONFIG,DEV_MESSAGES_CONFIG
 from src.chatflow_langchain.service.o1.doc.utils import extract_error_message
 from src.chatflow_langchain.service.config.model_config_openai import DefaultGPTTextModelRepository,OPENAIMODEL
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-thread_repo = ThreadRepostiory()
-qdrant_vector_store= QdrantVectorStoreService()
-prompt_repo = PromptRepository()
-file_repo = FileRepository()
-chat_docs = ChatDocsRepository()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+thread_repo = RequestScoped(ThreadRepostiory)
+qdrant_vector_store= RequestScoped(QdrantVectorStoreService)
+prompt_repo = RequestScoped(PromptRepository)
+file_repo = RequestScoped(FileRepository)
+chat_docs = RequestScoped(ChatDocsRepository)
 
 class O1StreamingDocumentedChatService(AbstractConversationService):
     def initialize_llm(self, api_key_id: str = None, companymodel: str = None,thread_id:str=None,thread_model:str=None):
@@ -527,7 +527,6 @@ class O1StreamingDocumentedChatService(AbstractConversationService):
             if cleaned_up:
                 logger.info(f"Successfully cleaned up: {', '.join(cleaned_up)}.")
             
-            gc.collect()  # Force garbage collection to free memory
 
         except Exception as e:
             logger.error(
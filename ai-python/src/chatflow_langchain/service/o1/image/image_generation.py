@@ -5,7 +5,8 @@ from langchain.memory import ConversationSummaryBufferMemory
 from langchain_community.callbacks.manager import get_openai_callback
 from langchain_community.utilities.dalle_image_generator import DallEAPIWrapper
 from langchain_community.tools.openai_dalle_image_generation import OpenAIDALLEImageGenerationTool
-from src.chatflow_langchain.utils.upload_image import upload_image_to_s3,generate_random_file_name
+from src.chatflow_langchain.utils.upload_image import generate_random_file_name
+from src.chatflow_langchain.utils.image_transfer import image_transfer
 from src.chatflow_langchain.service.o1.image.chat_prompt_factory import ImagePrompt
 from src.custom_lib.langchain.chain.custom_conversation_chain import CustomConversationChain
 from src.crypto_hub.services.openai.llm_api_key_decryption import LLMAPIKeyDecryptionHandler
@@ -24,16 +25,16 @@ from src.chatflow_langchain.utils.fill_additional_prompt import fill_template,fo
 #Abstract library
 from src.chat.repositories.abstract_image_generation_repository import ImageGenerationAbstractRepository
 from src.chatflow_langchain.service.o1.image.utils import extract_error_message
-import gc
 from src.gateway.openai_exceptions import LengthFinishReasonError,ContentFilterFinishReasonError
 from src.chatflow_langchain.repositories.openai_error_messages_config import OPENAI_MESSAGES_CONFIG,DEV_MESSAGES_CONFIG
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
 # Service Initilization 
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-chat_repository_history = CustomAIMongoDBChatMessageHistory()
-thread_repo = ThreadRepostiory()
-prompt_repo = PromptRepository()
-img_prompt = ImagePrompt()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+chat_repository_history = RequestScoped(CustomAIMongoDBChatMessageHistory)
+thread_repo = RequestScoped(ThreadRepostiory)
+prompt_repo = RequestScoped(PromptRepository)
+img_prompt = RequestScoped(ImagePrompt)
 
 class OpenAIImageGenerationService(ImageGenerationAbstractRepository):
     """
@@ -255,10 +256,13 @@ class OpenAIImageGenerationService(ImageGenerationAbstractRepository):
         try:
             cost=CostCalculator()
             async with dalle_callback_handler(llm_model=self.llm_model_name, cost = cost,dalle_model=self.llm_image_name,thread_id=thread_id,collection_name=collection_name,image_quality = self.image_quality,image_size=self.image_size,image_style=self.image_style) as asynchandler:
-                response = self.dalle_generational_tool.run(self.conversation.run(self._get_inputs(),callbacks=[asynchandler]),callbacks=[asynchandler])
-                s3_file_name=generate_random_file_name()
-                upload_image_to_s3(image_url=response,s3_file_name=s3_file_name)
-                self.save_image_to_db(s3_file_name,thread_id,collection_name)
+                async with image_transfer.slot():
+                    image_prompt = await self.conversation.arun(self._get_inputs(),callbacks=[asynchandler])
+                    # The image API client is synchronous, the tool runs it in a worker thread
+                    response = await self.dalle_generational_tool.arun(image_prompt,callbacks=[asynchandler])
+                    s3_file_name=generate_random_file_name()
+                    await image_transfer.upload_from_url(image_url=response,s3_file_name=s3_file_name)
+                await asyncio.to_thread(self.save_image_to_db,s3_file_name,thread_id,collection_name)
                 yield json.dumps({"status": status.HTTP_200_OK, "message": s3_file_name}),status.HTTP_200_OK
                 
         except NotFoundError as e:
@@ -398,7 +402,6 @@ class OpenAIImageGenerationService(ImageGenerationAbstractRepository):
                     delattr(self, attr)  # Deletes the attribute from the instance
                     cleaned_up.append(attr)  # Adds the attribute name to the cleaned_up list
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
@@ -16,7 +16,6 @@ from src.chatflow_langchain.repositories.chat_member_repository import ChatMembe
 from fastapi import HTTPException, status
 from src.chatflow_langchain.service.o1.title.config import REFORMED_QUERY
 from src.chatflow_langchain.service.config.model_config_openai import OPENAIMODEL
-import gc
 from src.chatflow_langchain.service.o1.title.utils import extract_error_message, get_default_title
 from src.gateway.openai_exceptions import LengthFinishReasonError,ContentFilterFinishReasonError
 from src.chatflow_langchain.repositories.openai_error_messages_config import OPENAI_MESSAGES_CONFIG
@@ -26,11 +25,12 @@ from dotenv import load_dotenv
 import os
 from src.round_robin.llm_key_manager import APIKeySelectorService,APIKeyUsageService
 from src.chatflow_langchain.service.config.model_config_openai import Functionality
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-thread_repo = ThreadRepostiory()
-chat_repo = ChatSessionRepository()
-chat_member_repo = ChatMemberRepository()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+thread_repo = RequestScoped(ThreadRepostiory)
+chat_repo = RequestScoped(ChatSessionRepository)
+chat_member_repo = RequestScoped(ChatMemberRepository)
 
 load_dotenv()
 
@@ -83,7 +83,7 @@ class OpenAITitleGenerationService(AbstractTitleGeneration):
                 use_responses_api=True,
                 max_tokens=35
             )
-            self.default_token_dict={"totalCost":"$0.000","promptT":0,"completion":0,"totalUsed":0}
+            self.default_token_dict={"totalCost":0.0,"promptT":0,"completion":0,"totalUsed":0}
         except Exception as e:
             logger.error(f"Failed to initialize LLM: {e}",
                          extra={"tags": {"method": "OpenAITitleGenerationService.initialize_llm"}})
@@ -174,22 +174,9 @@ class OpenAITitleGenerationService(AbstractTitleGeneration):
         cb : Callback
             The callback object containing token usage information.
         tokens_old : dict
-            The old token usage data.
+            Unused, the thread counters are incremented atomically.
         """
-        if 'totalCost' not in tokens_old:
-            tokens_old = self.default_token_dict
-        total_old_cost = float(tokens_old['totalCost'].replace("$", ""))
-        total_new_cost = total_old_cost + cb.total_cost
-
-        token_data = {
-            "$set": {
-                "tokens.totalUsed": tokens_old['totalUsed'] + cb.total_tokens,
-                "tokens.promptT": tokens_old['promptT'] + cb.prompt_tokens,
-                "tokens.completion": tokens_old['completion'] + cb.completion_tokens,
-                "tokens.totalCost": f"${total_new_cost}"
-            }
-        }
-        thread_repo.update_token_fields(token_data)
+        thread_repo.update_token_usage(cb)
 
     def run_chain(self, chat_session_id: str = None, collection_name: str = None, collection_chatmember: str = None):
         """
@@ -393,7 +380,6 @@ class OpenAITitleGenerationService(AbstractTitleGeneration):
                     delattr(self, attr)  # Deletes the attribute from the instance
                     cleaned_up.append(attr)  # Adds the attribute name to the cleaned_up list
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
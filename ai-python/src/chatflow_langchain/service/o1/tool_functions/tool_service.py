@@ -23,7 +23,6 @@ from src.celery_worker_hub.extraction.utils import map_file_url, validate_file_u
 from src.chatflow_langchain.utils.fill_additional_prompt import fill_template,format_website_summary_pairs
 from src.chatflow_langchain.service.o1.tool_functions.tools import simple_chat_v2, image_generate,website_analysis
 from src.chatflow_langchain.service.o1.tool_functions.utils import extract_error_message
-import gc
 from langchain_community.tools.openai_dalle_image_generation import OpenAIDALLEImageGenerationTool
 from src.custom_lib.langchain.chat_models.openai.dalle_wrapper import MyDallEAPIWrapper
 from langgraph.prebuilt import ToolNode
@@ -44,15 +43,17 @@ from langchain_mcp_adapters.client import MultiServerMCPClient
 from dotenv import load_dotenv
 import os
 from src.MCP.utils import create_mcp_client
+from src.MCP.tool_cache import mcp_tool_cache
 from src.chatflow_langchain.service.openai.tool_functions.utils import encode_image_to_base64
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
 load_dotenv()
 mcp_url = os.getenv("MCP_URL", "http://mcp:8000/sse")
 
 # Service Initilization
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-thread_repo = ThreadRepostiory()
-prompt_repo = PromptRepository()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+thread_repo = RequestScoped(ThreadRepostiory)
+prompt_repo = RequestScoped(PromptRepository)
 
 @tool(description=ToolDescritpion.IMAGE_GENERATION)
 async def image_generate(query:str=None,image_size:str='1024x1024',
@@ -121,7 +122,7 @@ class O1ToolServiceOpenai(AbstractConversationService):
                 self.client = create_mcp_client(self.jwt_token, self.origin)
                 # Get tools directly without using context manager
                 try:
-                    self.mcp_tools_list = await self.client.get_tools()
+                    self.mcp_tools_list = await mcp_tool_cache.get_tools(user_id=self.mcp_data or self.jwt_token, mcp_tools=mcp_tools, client=self.client)
                     logger.info(f"MCP tools loaded successfully: {self.mcp_tools_list}")
                     # Add MCP tools to the existing tools list
                     if self.mcp_tools_list:
@@ -717,7 +718,6 @@ class O1ToolServiceOpenai(AbstractConversationService):
                     # Adds the attribute name to the cleaned_up list
                     cleaned_up.append(attr)
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
@@ -1,7 +1,6 @@
 import json
 import asyncio
 from src.custom_lib.langchain.chat_models.openai.chatopenai_cache import MyChatOpenAI as ChatOpenAI
-from langchain.chains import LLMChain
 from langchain.memory import ConversationSummaryBufferMemory
 from src.chatflow_langchain.service.openai.canvas.chat_prompt_factory import create_chat_prompt_canvas
 from src.chatflow_langchain.service.openai.canvas.chat_prompt_factory import chat_prompt_with_code_canvas,chat_prompt_with_customgpt,chat_prompt_with_doc_canvas,chat_prompt_with_customgpt_doc
@@ -17,8 +16,7 @@ from src.chatflow_langchain.repositories.custom_gpt_repository import CustomGPTR
 from fastapi import HTTPException, status
 from src.chatflow_langchain.service.openai.canvas.config import CanvasConfig
 from src.chatflow_langchain.service.config.model_config_openai import DefaultGPTTextModelRepository,OPENAIMODEL
-import gc
-from src.chatflow_langchain.service.openai.canvas.utils import extract_error_message,extract_languages,get_word_boundary_substring,regex_replace,regex_replace_v2
+from src.chatflow_langchain.service.openai.canvas.utils import extract_error_message,extract_languages,get_word_boundary_substring,regex_replace,regex_replace_v2,completed_tool_calls
 from src.gateway.openai_exceptions import LengthFinishReasonError,ContentFilterFinishReasonError
 from src.chatflow_langchain.repositories.openai_error_messages_config import OPENAI_MESSAGES_CONFIG,DEV_MESSAGES_CONFIG
 from openai import RateLimitError,APIConnectionError,APITimeoutError,APIStatusError,NotFoundError
@@ -29,13 +27,14 @@ from src.chatflow_langchain.repositories.chatdocs_repo import ChatDocsRepository
 from src.chatflow_langchain.repositories.company_repository import CompanyRepostiory
 from src.round_robin.llm_key_manager import APIKeySelectorService,APIKeyUsageService
 from src.chatflow_langchain.service.config.model_config_openai import Functionality
-company_repo=CompanyRepostiory()
-chat_docs = ChatDocsRepository()
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-thread_repo = ThreadRepostiory()
-new_thread_repo = ThreadRepostiory()
-custom_gpt_repo=CustomGPTRepository()
-qdrant_vector_store= QdrantVectorStoreService()
+from src.chatflow_langchain.utils.request_context import RequestScoped
+company_repo=RequestScoped(CompanyRepostiory)
+chat_docs = RequestScoped(ChatDocsRepository)
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+thread_repo = RequestScoped(ThreadRepostiory)
+new_thread_repo = RequestScoped(ThreadRepostiory)
+custom_gpt_repo=RequestScoped(CustomGPTRepository)
+qdrant_vector_store= RequestScoped(QdrantVectorStoreService)
 
 load_dotenv()
 
@@ -125,7 +124,7 @@ class OpenAICanvasService():
                 verbose=False,
                 use_responses_api=True
             )
-            self.default_token_dict={"totalCost":"$0.000","promptT":0,"completion":0,"totalUsed":0}
+            self.default_token_dict={"totalCost":0.0,"promptT":0,"completion":0,"totalUsed":0}
         except Exception as e:
             logger.error(f"Failed to initialize LLM: {e}",
                          extra={"tags": {"method": "OpenAICanvasService.initialize_llm"}})
@@ -261,16 +260,17 @@ class OpenAICanvasService():
             
             # Get the initialized vector store
             self.vectorstore = qdrant_vector_store.get_lot_retiver_namespace(top_k=CanvasConfig.TOP_K,tag_list=self.tag,namespace_list=namespace_list, query=self.user_query, companymodel=self.company_model_collection, company_id=self.company_id)
-            chunks=qdrant_vector_store.multi_doc_query(query_text=self.selected_text_part)
-            
-
-            self.prompt_list = chat_prompt_with_doc_canvas(general_user_template=f"context: {self.ai_answer}\nselected_text: {self.selected_text_part}\nQuery::{self.user_query}\nchunks:{chunks}")
-            self.query_arguments={"original_text":self.ai_answer,'selected_text':self.selected_text_part,"chunks":chunks}
+            # The chunks are retrieved asynchronously by run_chain, which then builds the prompt
+            self.prompt_builder = self.build_doc_prompt
         except Exception as e:
             logger.error(f"Error occurred during data fetching: {e}",
                          extra={"tags": {"method": "OpenAICanvasService.fetch_data_doc"}})
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,detail=f"Failed to fetch data from thread repository: {e}")
 
+    def build_doc_prompt(self, chunks: str):
+        self.prompt_list = chat_prompt_with_doc_canvas(general_user_template=f"context: {self.ai_answer}\nselected_text: {self.selected_text_part}\nQuery::{self.user_query}\nchunks:{chunks}")
+        self.query_arguments={"original_text":self.ai_answer,'selected_text':self.selected_text_part,"chunks":chunks}
+
     def fetch_data_custom_gpt_doc(self):
         try:
             # Fetch data from old_thread_repo
@@ -320,11 +320,11 @@ class OpenAICanvasService():
 
                 # Get the initialized vector store
                 self.vectorstore = qdrant_vector_store.get_lot_retiver_namespace(top_k=CanvasConfig.TOP_K,tag_list=self.tag,namespace_list=namespace_list, query=self.user_query, companymodel=self.company_model_collection, company_id=self.company_id)
-                chunks=qdrant_vector_store.multi_doc_query(query_text=self.selected_text_part)
-                self.query_arguments={"original_text":self.ai_answer,'selected_text':self.selected_text_part,
-                                    "chunks":chunks,"user_agent_name":user_agent_name,"user_system_prompt":user_system_prompt,
-                                    "user_goals":user_goals,"user_instructions":user_instructions}
-                
+                self.custom_gpt_profile={"user_agent_name":user_agent_name,"user_system_prompt":user_system_prompt,
+                                         "user_goals":user_goals,"user_instructions":user_instructions}
+                # The chunks are retrieved asynchronously by run_chain, which then builds the prompt
+                self.prompt_builder = self.build_custom_gpt_doc_prompt
+            else:
                 user_template_string=f"""
                                         Context: {self.ai_answer}
                                         Selected Text: {self.selected_text_part}
@@ -335,14 +335,25 @@ class OpenAICanvasService():
                                         System Prompt: {user_system_prompt}
                                         Goals: {user_goals}
                                         Instructions: {user_instructions}
-
-                                        # Additional Chunks Information
-                                        Chunks: {chunks}
                                     """
-                
-                self.prompt_list = chat_prompt_with_customgpt_doc(general_ai_template=user_template_string)
-            else:
-                user_template_string=f"""
+           
+                self.prompt_list = chat_prompt_with_customgpt(general_user_template=user_template_string)
+                self.query_arguments={"original_text":self.ai_answer,'selected_text':self.selected_text_part,
+                            "user_agent_name":user_agent_name,"user_system_prompt":user_system_prompt,
+                            "user_goals":user_goals,"user_instructions":user_instructions}
+        except Exception as e:
+            logger.error(f"Error occurred during data fetching of custom gpt with doc: {e}",extra={"tags": {"method": "OpenAICanvasService.fetch_data_custom_gpt_doc"}})
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,detail=f"Failed to fetch data of custom gpt with doc: {e}")
+
+    def build_custom_gpt_doc_prompt(self, chunks: str):
+        user_agent_name=self.custom_gpt_profile["user_agent_name"]
+        user_system_prompt=self.custom_gpt_profile["user_system_prompt"]
+        user_goals=self.custom_gpt_profile["user_goals"]
+        user_instructions=self.custom_gpt_profile["user_instructions"]
+        self.query_arguments={"original_text":self.ai_answer,'selected_text':self.selected_text_part,
+                            "chunks":chunks,"user_agent_name":user_agent_name,"user_system_prompt":user_system_prompt,
+                            "user_goals":user_goals,"user_instructions":user_instructions}
+        user_template_string=f"""
                                         Context: {self.ai_answer}
                                         Selected Text: {self.selected_text_part}
                                         Query: {self.user_query}
@@ -352,21 +363,18 @@ class OpenAICanvasService():
                                         System Prompt: {user_system_prompt}
                                         Goals: {user_goals}
                                         Instructions: {user_instructions}
+
+                                        # Additional Chunks Information
+                                        Chunks: {chunks}
                                     """
-           
-                self.prompt_list = chat_prompt_with_customgpt(general_user_template=user_template_string)
-                self.query_arguments={"original_text":self.ai_answer,'selected_text':self.selected_text_part,
-                            "user_agent_name":user_agent_name,"user_system_prompt":user_system_prompt,
-                            "user_goals":user_goals,"user_instructions":user_instructions}
-        except Exception as e:
-            logger.error(f"Error occurred during data fetching of custom gpt with doc: {e}",extra={"tags": {"method": "OpenAICanvasService.fetch_data_custom_gpt_doc"}})
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,detail=f"Failed to fetch data of custom gpt with doc: {e}")
+        self.prompt_list = chat_prompt_with_customgpt_doc(general_ai_template=user_template_string)
 
     def fetch_data(self,api_key_id:str=None,company_id:str=None,companypinecone_collection: str=None, companymodel: str=None, custom_gpt_collection:str=None,text_field: str='text',chat_doc_collection:str="chatdocs"):
         # Define the different API types and their associated methods
         # Initialize an empty dictionary for data fetch methods
         try:
             self.chat_doc_collection = chat_doc_collection
+            self.prompt_builder = None
             self.data_fetch_methods = {
                 CanvasConfig.OPEN_AI_WITH_DOC: self.fetch_data_doc,
                 CanvasConfig.OPEN_AI: self.fetch_openai,
@@ -391,9 +399,9 @@ class OpenAICanvasService():
         Sets up the conversation chain with the LLM and prompt, and initializes the output parser.
         """
         try:
-            if len(self.extracted_code)>0:
-                self.llm_chain = LLMChain(llm=self.llm, prompt=self.prompt_list)
-            pass
+            # Doc canvases build their prompt once run_chain retrieved the chunks, and create the chain then
+            if len(self.extracted_code)>0 and self.prompt_builder is None:
+                self.llm_chain = self.prompt_list | self.llm
         except Exception as e:
             logger.error(f"Failed to create chain: {e}",
                          extra={"tags": {"method": "OpenAICanvasService.create_chain"}})
@@ -407,22 +415,9 @@ class OpenAICanvasService():
         cb : Callback
             The callback object containing token usage information.
         tokens_old : dict
-            The old token usage data.
+            Unused, the thread counters are incremented atomically.
         """
-        if 'totalCost' not in tokens_old:
-            tokens_old = self.default_token_dict
-        total_old_cost = float(tokens_old['totalCost'].replace("$", ""))
-        total_new_cost = total_old_cost + cb.total_cost
-
-        token_data = {
-            "$set": {
-                "tokens.totalUsed": tokens_old['totalUsed'] + cb.total_tokens,
-                "tokens.promptT": tokens_old['promptT'] + cb.prompt_tokens,
-                "tokens.completion": tokens_old['completion'] + cb.completion_tokens,
-                "tokens.totalCost": f"${total_new_cost}"
-            }
-        }
-        new_thread_repo.update_token_fields(token_data)
+        new_thread_repo.update_token_usage(cb)
     
        # Separate async function to handle repository updates and history logging
     async def async_initialize_and_update(self, chat_session_id, chat_collection_name, new_thread_id, collection_name, cb, final_answer,msgCredit,is_paid_user):
@@ -464,6 +459,30 @@ class OpenAICanvasService():
                          extra={"tags": {"method": "OpenAICanvasService.async_initialize_and_update"}})
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,detail=f"Failed to initialize and update chat thread: {e}")
 
+    async def retrieve_chunks(self):
+        """
+        Retrieves the document chunks of doc canvases without blocking the event loop, then builds
+        their prompt and chain.
+        """
+        if self.prompt_builder is None:
+            return
+        chunks = await qdrant_vector_store.amulti_doc_query(query_text=self.selected_text_part)
+        self.prompt_builder(chunks)
+        if len(self.extracted_code)>0:
+            self.llm_chain = self.prompt_list | self.llm
+
+    def apply_edit(self, call: dict, answer: str) -> str:
+        """
+        Applies the regex replacement of one `regex_replace` tool call to the answer.
+        """
+        if call is None:
+            return answer
+        return regex_replace_v2(
+            regex_pattern=call['regex_pattern'],
+            replacement_string=call['replacement_string'],
+            original_string=answer  # Use the updated answer as original string
+        )
+
     async def run_chain(self, query:str=None,new_thread_id:str=None,chat_session_id: str = None, chat_collection_name: str = None,collection_name:str=None,delay_chunk:int=0,msgCredit:float=0,is_paid_user:bool=False):
         """
         Executes a conversation and updates the token usage and conversation history.
@@ -476,51 +495,43 @@ class OpenAICanvasService():
         try:
             if query =='Ask Weam':
                 query = 'Enhance This'
+            await self.retrieve_chunks()
             self.query_arguments.update({'query':query})
             with get_openai_callback() as cb :
                     if len(self.extracted_code)>0:
-                        response = self.llm_chain.run(self.query_arguments)
-                        final_answer=response
+                        # The rewritten answer is streamed token by token as the model generates it
+                        answer_parts = []
+                        async for chunk in self.llm_chain.astream(self.query_arguments):
+                            token = chunk.text()
+                            if token:
+                                answer_parts.append(token)
+                                yield f"data: {token.encode('utf-8')}\n\n", 200
+                        final_answer = "".join(answer_parts)
                     else:
-                        response = self.llm_with_tools.invoke(self.prompt_list)
-                        tool_call = response.tool_calls
-
                         final_answer = self.ai_answer  # Start with the initial answer
-
-                        # Loop through each tool call
-
-                    
-                        for call in tool_call:
-                            regex_pattern = call['args']['regex_pattern']
-                            replacement_string = call['args']['replacement_string']
-                            # Perform the regex replacement and update final_answer
-                            final_answer = regex_replace_v2(
-                                regex_pattern=regex_pattern,
-                                replacement_string=replacement_string,
-                                original_string=final_answer  # Use the updated answer as original string
-                            )
+                        response = None
+                        applied = 0
+                        # Each edit is applied as soon as the model starts the next tool call
+                        async for chunk in self.llm_with_tools.astream(self.prompt_list):
+                            response = chunk if response is None else response + chunk
+                            for call in completed_tool_calls(response.tool_call_chunks, applied):
+                                final_answer = self.apply_edit(call, final_answer)
+                                applied += 1
+                        for call in completed_tool_calls(response.tool_call_chunks if response else [], applied, final=True):
+                            final_answer = self.apply_edit(call, final_answer)
+
+                        # A later edit may rewrite any part of the answer, so it is sent once the last one is applied
+                        chunk_size = 5  # Adjust the size of each streamed chunk
+                        for i in range(0, len(final_answer), chunk_size):
+                            token = final_answer[i:i + chunk_size]
+                            # Yield each chunk of the final answer with HTTP 200 status
+                            token = token.encode("utf-8")
+                            yield f"data: {token}\n\n", 200
+                            await asyncio.sleep(delay_chunk)
             # await self.api_usage_service.update_usage(provider=llm_apikey_decrypt_service.bot_data.get('code', 'OPEN_AI'),tokens_used= cb.total_tokens, model=self.model_name, api_key=llm_apikey_decrypt_service.apikey,functionality=Functionality.CHAT,company_id=self.companyRedis_id)
 
-
-
-            # Define a task to run async initialization and update concurrently
-            update_task = asyncio.create_task(
-                self.async_initialize_and_update(chat_session_id, chat_collection_name, 
-                                                new_thread_id, collection_name, cb, final_answer,msgCredit,is_paid_user))
-            try:
-            # Stream the final answer in chunks while updates run in parallel
-                chunk_size = 5  # Adjust the size of each streamed chunk
-                for i in range(0, len(final_answer), chunk_size):
-                    token = final_answer[i:i + chunk_size]
-                    # Yield each chunk of the final answer with HTTP 200 status
-                    token = token.encode("utf-8")
-                    yield f"data: {token}\n\n", 200
-                    # Add a small delay to simulate streaming and avoid blocking
-                    await asyncio.sleep(delay_chunk)
-        
-            finally:
-            # Ensure the update task completes regardless of success or failure in streaming
-                await update_task
+            await self.async_initialize_and_update(chat_session_id, chat_collection_name,
+                                                   new_thread_id, collection_name, cb, final_answer,msgCredit,is_paid_user)
 
         except NotFoundError as e:
             error_content,error_code = extract_error_message(str(e))
@@ -657,7 +668,6 @@ class OpenAICanvasService():
                     delattr(self, attr)  # Deletes the attribute from the instance
                     cleaned_up.append(attr)  # Adds the attribute name to the cleaned_up list
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
@@ -1,4 +1,5 @@
 import ast
+import json
 from src.logger.default_logger import logger
 from src.chatflow_langchain.service.openai.title.config import QUOTES
 import re
@@ -45,6 +46,23 @@ def regex_replace_v2(regex_pattern, replacement_string, original_string, multipl
     
     return updated_string
 
+def completed_tool_calls(tool_call_chunks, applied, final=False):
+    """
+    Arguments of the streamed tool calls after the first `applied` ones that are complete: a call
+    is complete once the model started the next one, the last call once the stream has ended.
+
+    Calls with unparsable arguments are returned as None, `AIMessage.tool_calls` leaves them out too.
+    """
+    ready = tool_call_chunks if final else tool_call_chunks[:-1]
+    calls = []
+    for chunk in ready[applied:]:
+        try:
+            calls.append(json.loads(chunk.get('args') or '{}'))
+        except json.JSONDecodeError as e:
+            logger.warning(f"Skipping tool call with invalid arguments: {e}")
+            calls.append(None)
+    return calls
+
 def extract_error_message(error_message):
     try:
         # Split the error message to isolate the dictionary part
@@ -5,7 +5,8 @@ from src.chatflow_langchain.service.openai.custom_gpt.simple_chat.system_convers
 from src.chatflow_langchain.service.openai.custom_gpt.simple_chat.system_conversation_img import OpenAICustomGPTStreamingSimpleChatServiceImg
 from src.chatflow_langchain.repositories.custom_gpt_repository import CustomGPTRepository
 from src.chatflow_langchain.service.openai.custom_gpt.doc.rag_conversation_img import OpenAICustomGPTStreamingDocChatServiceImg
-custom_gpt_repo=CustomGPTRepository()
+from src.chatflow_langchain.utils.request_context import RequestScoped
+custom_gpt_repo=RequestScoped(CustomGPTRepository)
 
 class OpenAICustomGPTManager():
     def __init__(self):
@@ -31,10 +31,11 @@ import re
 from src.chatflow_langchain.service.openai.config.openai_tool_description import ToolServiceDescription
 from src.round_robin.llm_key_manager import APIKeyUsageService
 from src.celery_worker_hub.extraction.utils import map_file_url
-company_repo=CompanyRepostiory()
-thread_repo = ThreadRepostiory()
-cost_callback = CostCalculator()
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
+from src.chatflow_langchain.utils.request_context import RequestScoped
+company_repo=RequestScoped(CompanyRepostiory)
+thread_repo = RequestScoped(ThreadRepostiory)
+cost_callback = RequestScoped(CostCalculator)
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
 async_handler = async_streaming_handler()
 
 
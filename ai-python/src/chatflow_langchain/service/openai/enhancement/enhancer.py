@@ -8,7 +8,6 @@ from src.logger.default_logger import logger
 ## Custom Library Imports
 from src.crypto_hub.services.openai.llm_api_key_decryption import LLMAPIKeyDecryptionHandler
 from fastapi import HTTPException, status
-import gc
 from src.chatflow_langchain.service.openai.title.utils import extract_error_message
 from src.gateway.openai_exceptions import LengthFinishReasonError,ContentFilterFinishReasonError
 from src.chatflow_langchain.repositories.openai_error_messages_config import OPENAI_MESSAGES_CONFIG,DEV_MESSAGES_CONFIG
@@ -22,7 +21,8 @@ from dotenv import load_dotenv
 import os
 from datetime import datetime
 import pytz
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
+from src.chatflow_langchain.utils.request_context import RequestScoped
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
 
 load_dotenv()
 
@@ -97,7 +97,7 @@ class OpenAIQueryEnhancerService():
                 max_tokens=1400,
                 use_responses_api=True,
                 api_key=llm_apikey_decrypt_service.decrypt())
-            self.default_token_dict={"totalCost":"$0.000","promptT":0,"completion":0,"totalUsed":0}
+            self.default_token_dict={"totalCost":0.0,"promptT":0,"completion":0,"totalUsed":0}
         except Exception as e:
             logger.error(f"Failed to initialize LLM: {e}",
                          extra={"tags": {"method": "OpenAIQueryEnhancerService.initialize_llm"}})
@@ -158,7 +158,7 @@ class OpenAIQueryEnhancerService():
                 "completion":cb.completion_tokens,
                 "promptT": cb.prompt_tokens,
                 "totalUsed": cb.total_tokens,
-                "totalCost": f"${cb.total_cost}"
+                "totalCost": cb.total_cost
             },
             "model": {
                 "title": "Open AI",
@@ -386,7 +386,6 @@ class OpenAIQueryEnhancerService():
                     delattr(self, attr)  # Deletes the attribute from the instance
                     cleaned_up.append(attr)  # Adds the attribute name to the cleaned_up list
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
@@ -11,14 +11,14 @@ from celery import chain
 from src.chatflow_langchain.service.openai.scraper.config import ScraperConfig
 from src.chatflow_langchain.service.openai.scraper.config import GetLLMkey,DEFAULTMODEL
 from src.chatflow_langchain.service.config.model_config_openai import OPENAIMODEL
-import gc
 from src.chatflow_langchain.service.openai.image.utils import extract_error_message
 from src.chatflow_langchain.repositories.openai_error_messages_config import OPENAI_MESSAGES_CONFIG
 from bson.objectid import ObjectId
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
 # Initialize your repositories and services
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-prompt_repo = PromptRepository()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+prompt_repo = RequestScoped(PromptRepository)
 
 class OpenAIScrapUrlService():
 
@@ -156,7 +156,6 @@ class OpenAIScrapUrlService():
                     delattr(self, attr)  # Deletes the attribute from the instance
                     cleaned_up.append(attr)  # Adds the attribute name to the cleaned_up list
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
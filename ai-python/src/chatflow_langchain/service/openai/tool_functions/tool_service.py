@@ -1,5 +1,6 @@
 import json
 import asyncio
+import functools
 from typing import AsyncGenerator
 from src.custom_lib.langchain.chat_models.openai.chatopenai_cache import MyChatOpenAI as ChatOpenAI
 from langchain.memory import ConversationSummaryBufferMemory
@@ -23,7 +24,6 @@ from src.celery_worker_hub.extraction.utils import map_file_url, validate_file_u
 from src.chatflow_langchain.utils.fill_additional_prompt import fill_template,format_website_summary_pairs
 from src.chatflow_langchain.service.openai.tool_functions.tools import simple_chat_v2, web_search_preview,website_analysis, get_current_time
 from src.chatflow_langchain.service.openai.tool_functions.utils import extract_error_message
-import gc
 from src.gateway.openai_exceptions import LengthFinishReasonError,ContentFilterFinishReasonError
 from src.chatflow_langchain.repositories.openai_error_messages_config import OPENAI_MESSAGES_CONFIG,DEV_MESSAGES_CONFIG
 from src.chatflow_langchain.service.config.model_config_openai import OPENAIMODEL 
@@ -47,15 +47,18 @@ from src.chatflow_langchain.utils.playwright_info_fetcher import LogoFetcherServ
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from dotenv import load_dotenv
 from src.MCP.utils import create_mcp_client
+from src.MCP.tool_cache import mcp_tool_cache
+from src.chatflow_langchain.utils.graph_cache import compiled_graph_cache, tool_set_signature
 from src.chatflow_langchain.service.openai.tool_functions.utils import encode_image_to_base64
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
 load_dotenv()
 mcp_url = os.getenv("MCP_URL", "http://mcp:8000/sse")
 
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-thread_repo = ThreadRepostiory()
-prompt_repo = PromptRepository()
-cost_callback = CostCalculator()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+thread_repo = RequestScoped(ThreadRepostiory)
+prompt_repo = RequestScoped(PromptRepository)
+cost_callback = RequestScoped(CostCalculator)
 
 @tool(description=ToolServiceDescription.IMAGE_GENERATION)
 async def image_generate(query:str=None,image_size:str='1024x1024',
@@ -119,7 +122,7 @@ class OpenAIToolServiceOpenai(AbstractConversationService):
                 self.client = create_mcp_client(self.jwt_token, self.origin)
                 # Get tools directly without using context manager
                 try:
-                    self.mcp_tools_list = await self.client.get_tools()
+                    self.mcp_tools_list = await mcp_tool_cache.get_tools(user_id=self.mcp_data or self.jwt_token, mcp_tools=mcp_tools, client=self.client)
                     logger.info(f"MCP tools loaded successfully: {self.mcp_tools_list}")
                     # Add MCP tools to the existing tools list
                     if self.mcp_tools_list:
@@ -155,7 +158,8 @@ class OpenAIToolServiceOpenai(AbstractConversationService):
             )
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                                 detail=f"Failed to initialize LLM: {e}")
-    def should_continue(self,state: MessagesState):
+    @staticmethod
+    def should_continue(state: MessagesState):
         messages = state["messages"]
         last_message = messages[-1]
         if last_message.tool_calls:
@@ -174,17 +178,24 @@ class OpenAIToolServiceOpenai(AbstractConversationService):
                 self.image_gen_prompt = new_message.tool_calls[0]['args']['query']
             new_message.tool_calls[0]['args']['mcp_data'] = self.mcp_data
         return {"messages": [new_message]}
-    
-    async def create_graph_node(self):
-        # memory = MemorySaver()
-        async def node(state: MessagesState,config: RunnableConfig): 
-            new_message = await self.chatbot(state=state,config=config)
-            return new_message
 
-
-        builder = StateGraph(MessagesState).add_node("chatbot",node).add_node("tools",self.tool_node).add_conditional_edges(
+    @staticmethod
+    async def _chatbot_node(state: MessagesState, config: RunnableConfig):
+        return await config["configurable"]["service"].chatbot(state=state, config=config)
+
+    @staticmethod
+    async def _tools_node(state: MessagesState, config: RunnableConfig):
+        # MCP tools carry the caller's connection, the request's own ToolNode runs them
+        return await config["configurable"]["service"].tool_node.ainvoke(state, config)
+
+    @classmethod
+    def _compile_graph(cls, with_tools: bool = True):
+        if not with_tools:
+            # Models without tool support answer in a single LLM call
+            return StateGraph(MessagesState).add_node("chatbot",cls._chatbot_node).add_edge(START, "chatbot").add_edge("chatbot", END).compile()
+        builder = StateGraph(MessagesState).add_node("chatbot",cls._chatbot_node).add_node("tools",cls._tools_node).add_conditional_edges(
             "chatbot",
-            self.should_continue,
+            cls.should_continue,
             # The following dictionary lets you tell the graph to interpret the condition's outputs as a specific node
             # It defaults to the identity function, but if you
             # want to use a node named something else apart from "tools",
@@ -196,7 +207,19 @@ class OpenAIToolServiceOpenai(AbstractConversationService):
                 "Builder created Starting Compilation",
                 extra={"tags": {"endpoint": "/stream-tool-chat-with-openai"}}
             )
-        self.graph = builder.compile()
+        return builder.compile()
+
+    async def create_graph_node(self):
+        """
+        Attach the compiled tool-agent graph for this request's tool set.
+
+        Graphs are compiled once per tool-set signature and shared, request state (this service,
+        its LLM and ToolNode) is passed in `configurable` when the graph is invoked.
+        """
+        signature = () if self.llm_with_tools is self.llm else tool_set_signature(self.tools)
+        self.graph = compiled_graph_cache.get_or_compile(
+            ("openai_tool_agent", signature), functools.partial(self._compile_graph, with_tools=bool(signature))
+        )
         logger.info(
                 "Graph Compiled Successfully",
                 extra={"tags": {"endpoint": "/stream-tool-chat-with-openai"}}
@@ -468,7 +491,7 @@ class OpenAIToolServiceOpenai(AbstractConversationService):
                         async_handler_ref.append(cancellation_event)
                     
                     # Create the graph streaming task
-                    graph_stream = self.graph.astream_events(self.query,{'callbacks':[cb,mongo_handler],"configurable":{'thread_id':'1'}},stream_mode='messages',version='v2')
+                    graph_stream = self.graph.astream_events(self.query,{'callbacks':[cb,mongo_handler],"configurable":{'thread_id':'1','service':self}},stream_mode='messages',version='v2')
                     
                     async for event in graph_stream:
                         # Check for cancellation
@@ -812,7 +835,6 @@ class OpenAIToolServiceOpenai(AbstractConversationService):
                     # Adds the attribute name to the cleaned_up list
                     cleaned_up.append(attr)
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
@@ -47,11 +47,12 @@ from src.celery_worker_hub.extraction.utils import map_file_url
 from src.gateway.utils import AsyncHTTPClientSingleton, SyncHTTPClientSingleton
 from langchain_experimental.tools.python.tool import PythonREPLTool
 import os
-thread_repo = ThreadRepostiory()
-company_repo=CompanyRepostiory()
-cost_callback = CostCalculator()
+from src.chatflow_langchain.utils.request_context import RequestScoped
+thread_repo = RequestScoped(ThreadRepostiory)
+company_repo=RequestScoped(CompanyRepostiory)
+cost_callback = RequestScoped(CostCalculator)
 scraping_service=CrawlerService()
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
 
 async_handler = async_streaming_handler()
 
@@ -22,7 +22,6 @@ from src.chatflow_langchain.service.perplexity.browser_chat.config import Browse
 from src.chatflow_langchain.utils.fill_additional_prompt import fill_template, format_website_summary_pairs
 from openai import RateLimitError,APIConnectionError,APITimeoutError,APIStatusError, NotFoundError
 from fastapi import HTTPException, status
-import gc
 from src.gateway.openai_exceptions import LengthFinishReasonError,ContentFilterFinishReasonError
 from src.chatflow_langchain.repositories.openai_error_messages_config import OPENAI_MESSAGES_CONFIG,DEV_MESSAGES_CONFIG
 from src.chatflow_langchain.service.perplexity.browser_chat.utils import extract_error_message,chat_perplexity_exception_handler
@@ -33,13 +32,14 @@ from src.chatflow_langchain.service.perplexity.browser_chat.utils import replace
 from src.gateway.exceptions import  ChatPerplexityException
 from src.chatflow_langchain.service.perplexity.browser_chat.utils import perplexity_manager
 from langchain_core.messages import HumanMessage
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-openai_llm_apikey_decrypt_service = OpenAILLMAPIKeyDecryptionHandler()
-thread_repo = ThreadRepostiory()
-qdrant_vector_store= QdrantVectorStoreService()
-prompt_repo = PromptRepository()
-file_repo = FileRepository()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+openai_llm_apikey_decrypt_service = RequestScoped(OpenAILLMAPIKeyDecryptionHandler)
+thread_repo = RequestScoped(ThreadRepostiory)
+qdrant_vector_store= RequestScoped(QdrantVectorStoreService)
+prompt_repo = RequestScoped(PromptRepository)
+file_repo = RequestScoped(FileRepository)
       
 class PerplexityChatService(AbstractConversationService):
     def initialize_llm(self, api_key_id: str = None, companymodel: str = None,thread_id:str=None,thread_model:str=None,company_id:str=None):
@@ -454,7 +454,6 @@ class PerplexityChatService(AbstractConversationService):
             if cleaned_up:
                 logger.info(f"Successfully cleaned up: {', '.join(cleaned_up)}.")
             
-            gc.collect()  # Force garbage collection to free memory
 
         except Exception as e:
             logger.error(
@@ -13,8 +13,9 @@ import os
 import time
 import aiohttp
 import asyncio
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-thread_repo = ThreadRepostiory()
+thread_repo = RequestScoped(ThreadRepostiory)
 
 key = os.getenv("SECURITY_KEY").encode("utf-8")
 decryptor = MessageDecryptor(key)
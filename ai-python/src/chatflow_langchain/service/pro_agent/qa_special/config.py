@@ -1,3 +1,5 @@
+import os
+
 class ChatHistoryConfig:
     MAX_TOKEN_LIMIT = 10000
     TOP_K = 18
@@ -8,4 +10,8 @@ class BatchConfig:
     PAGESPEED_PATH="./src/chatflow_langchain/service/pro_agent/qa_special/data/pageSpeedChecklist.json"
     BATCH_TOKEN_LIMIT = 9_00_000
     MAX_SOURCE_LIMIT = 1_000_000
+    # Checklist batches and source chunk summaries sent to the LLM at once per audit
+    EVALUATION_CONCURRENCY = int(os.environ.get("QA_EVALUATION_CONCURRENCY", 4))
+    # Requests per minute sent with one API key across all audits of the process, 0 disables the limit
+    REQUESTS_PER_MINUTE_PER_KEY = int(os.environ.get("QA_REQUESTS_PER_MINUTE_PER_KEY", 60))
   
\ No newline at end of file
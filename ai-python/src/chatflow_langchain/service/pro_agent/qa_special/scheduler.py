@@ -0,0 +1,84 @@
+import asyncio
+import hashlib
+import threading
+import time
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+from src.chatflow_langchain.service.pro_agent.qa_special.config import BatchConfig
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class KeyRateLimiter:
+    """
+    Sliding-window limit of the requests sent with one API key, shared by every audit of the process
+    so concurrent audits on the same key do not exceed the provider's per-minute quota together.
+    """
+
+    def __init__(self, requests_per_window: int = BatchConfig.REQUESTS_PER_MINUTE_PER_KEY, window: float = 60):
+        self.requests_per_window = requests_per_window
+        self.window = window
+        self._sent: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    async def acquire(self, api_key: str) -> None:
+        """
+        Waits until a request may be sent with `api_key` and records it.
+        """
+        if self.requests_per_window <= 0:
+            return
+        # Keys are tracked by digest, the limiter never holds a decrypted key
+        key = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+        while True:
+            with self._lock:
+                sent = self._sent.setdefault(key, deque())
+                now = time.monotonic()
+                while sent and now - sent[0] >= self.window:
+                    sent.popleft()
+                if len(sent) < self.requests_per_window:
+                    sent.append(now)
+                    return
+                wait = self.window - (now - sent[0])
+            await asyncio.sleep(wait)
+
+
+gemini_rate_limiter = KeyRateLimiter()
+
+
+async def evaluate_in_order(items: List[T], evaluate: Callable[[T], Awaitable[R]],
+                            concurrency: int = BatchConfig.EVALUATION_CONCURRENCY,
+                            rate_limiter: Optional[KeyRateLimiter] = None,
+                            api_key: Optional[str] = None) -> AsyncIterator[Tuple[T, Optional[R], Optional[Exception]]]:
+    """
+    Evaluates `items` concurrently, at most `concurrency` at once and within the rate limit of
+    `api_key`, and yields `(item, result, error)` in the order of `items`: each one as soon as it and
+    every item before it are done. A failed evaluation is yielded with its exception so the caller
+    handles it in place, the others keep running.
+
+    Evaluations not started yet are cancelled when the caller stops iterating.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(item: T) -> R:
+        async with semaphore:
+            if rate_limiter is not None and api_key:
+                await rate_limiter.acquire(api_key)
+            return await evaluate(item)
+
+    tasks = [asyncio.ensure_future(run(item)) for item in items]
+    try:
+        for item, task in zip(items, tasks):
+            try:
+                result = await task
+            except Exception as e:
+                yield item, None, e
+            else:
+                yield item, result, None
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                # Retrieved so failures after the point the caller stopped are not reported as unhandled
+                task.exception()
@@ -8,7 +8,7 @@ from langchain.chains.llm import LLMChain
 from fastapi import status, HTTPException
 import pandas as pd
 import aiohttp
-from langchain_google_genai import ChatGoogleGenerativeAI
+from src.custom_lib.langchain.chat_models.gemini.chatgemini_cache import MyChatGoogleGenerativeAI as ChatGoogleGenerativeAI
 from src.chatflow_langchain.service.pro_agent.qa_special.utils import attach_status_icon_list,get_user_agents,upload_df_to_s3,scrape_whole_website,extract_data,extract_metrics,extract_json_block
 from src.crypto_hub.services.openai.llm_api_key_decryption import LLMAPIKeyDecryptionHandler
 from src.chatflow_langchain.repositories.tool_history import CustomAIMongoDBChatMessageHistory
@@ -33,12 +33,13 @@ from src.db.config import get_field_by_name
 from src.crypto_hub.utils.crypto_utils import MessageDecryptor
 from dotenv import load_dotenv
 import pandas as pd
-import gc
 from langchain_core.exceptions import OutputParserException
 from src.chatflow_langchain.service.pro_agent.qa_special.utils import gemini_key_manager
 from src.chatflow_langchain.utils.crawler4ai_scrapper import CrawlerService
 from src.chatflow_langchain.service.pro_agent.qa_special.utils import split_and_write_text_by_token_limit
 from src.celery_worker_hub.web_scraper.tasks.scraping_sitemap import crawler_scraper_task_qa
+from src.chatflow_langchain.service.pro_agent.qa_special.scheduler import evaluate_in_order,gemini_rate_limiter
+from contextlib import aclosing
 load_dotenv()
 security_key = os.getenv("SECURITY_KEY").encode("utf-8")
 decryptor = MessageDecryptor(security_key)
@@ -250,21 +251,24 @@ class WebQASpecialService:
 
                 try:
                     with gemini_sync_cost_handler(model_name=self.llm_apikey_decrypt_service.model_name) as cb:
-                        for i in range(1, len(self.chunks)):
-                            self.temp_prompt=create_context_prompt()
-                            self.temp_chain = LLMChain(llm=self.llm,prompt=self.temp_prompt)
-                            temp_result = await asyncio.to_thread(
-                                self.temp_chain.invoke,
-                                {'source_code_chunk': self.chunks[i]}
-                            )
-                            temp_text= temp_result['text']
-                            temp_token += len(encoding.encode(temp_text))
-                            logger.info(f"Token count for chunk {i}: {temp_token}")
-
-                            if (BatchConfig.BATCH_TOKEN_LIMIT+temp_token) > BatchConfig.MAX_SOURCE_LIMIT:
-                                logger.info(f"Token limit exceeded for chunk {i}, stopping segmentation.")
-                                break
-                            self.external_sources += temp_text + "\n\n"
+                        self.temp_prompt=create_context_prompt()
+                        self.temp_chain = LLMChain(llm=self.llm,prompt=self.temp_prompt)
+                        # Chunks are summarised concurrently and added in order until the source limit
+                        async with aclosing(evaluate_in_order(
+                                list(range(1, len(self.chunks))),
+                                lambda i: asyncio.to_thread(self.temp_chain.invoke, {'source_code_chunk': self.chunks[i]}),
+                                rate_limiter=gemini_rate_limiter, api_key=self.api_key)) as summaries:
+                            async for i, temp_result, error in summaries:
+                                if error is not None:
+                                    raise error
+                                temp_text= temp_result['text']
+                                temp_token += len(encoding.encode(temp_text))
+                                logger.info(f"Token count for chunk {i}: {temp_token}")
+
+                                if (BatchConfig.BATCH_TOKEN_LIMIT+temp_token) > BatchConfig.MAX_SOURCE_LIMIT:
+                                    logger.info(f"Token limit exceeded for chunk {i}, stopping segmentation.")
+                                    break
+                                self.external_sources += temp_text + "\n\n"
                         self.thread_repo.initialization(thread_id=self.thread_id, collection_name=self.thread_model)
                         self.thread_repo.update_token_usage(cb)
 
@@ -458,6 +462,35 @@ class WebQASpecialService:
             logger.error(f"Critical error in merge_and_s3_upload: {e}",
                         extra={"tags": {"method": "WebQASpecialService.merge_and_s3_upload"}})
 
+    async def _evaluate_batch(self, chain, inputs: dict, item: list) -> dict:
+        """
+        Evaluates one checklist batch. An answer that is not valid JSON falls back to the JSON block
+        it contains, or to "empty" results for every item of the batch.
+        """
+        try:
+            return await asyncio.to_thread(chain.invoke, inputs)
+        except OutputParserException as e:
+            results = {'checklist_item':item,'source_code':self.source_code}
+            results['text'] = extract_json_block(str(e))
+            if results['text'] == None:
+                text_results = []
+                ids_list = [list(i.keys())[0] for i in item]
+                for i in ids_list:
+                    text_results.append({
+                        'id': i,
+                        'status': "empty",
+                        'note': "We were unable to validate the specified checklist due to certain discrepancies. Further review or adjustments may be required."
+                    })
+
+                # Now update the `results` dictionary with the new structure
+                results.update({
+                    'text': {
+                        'results': text_results
+                    }
+                })
+                logger.info('Raised and handled OuputParserException')
+            return results
+
     async def _enqueue_checklist_items(self, queue: asyncio.Queue):
         """
         Process checklist items, push each processed chunk into the queue,
@@ -468,120 +501,98 @@ class WebQASpecialService:
         try:
             with gemini_sync_cost_handler(model_name=self.llm_apikey_decrypt_service.model_name) as cb:
                 self.final_ai_message=''
-                for item in self.checklist_items:
-                    try:
-                        # Invoke the llm_chain for the current checklist item
+                # Batches are evaluated concurrently and handled here in checklist order
+                async with aclosing(evaluate_in_order(
+                        self.checklist_items,
+                        lambda item: self._evaluate_batch(self.llm_chain, {'source_code': self.source_code, 'checklist_item': item}, item),
+                        rate_limiter=gemini_rate_limiter, api_key=self.api_key)) as evaluations:
+                    async for item, results, error in evaluations:
                         try:
-                            results = await asyncio.to_thread(
-                                self.llm_chain.invoke,
-                                {
-                                    'source_code': self.source_code, 
-                                    'checklist_item': item
-                                }
-                            )
-                        except OutputParserException as e:
-                            results = {'checklist_item':item,'source_code':self.source_code}
-                            results['text'] = extract_json_block(str(e))
-                            if results['text'] == None:
-                                text_results = []
-                                ids_list = [list(i.keys())[0] for i in item]
-                                for i in ids_list:
-                                    text_results.append({
-                                        'id': i,
-                                        'status': "empty",
-                                        'note': "We were unable to validate the specified checklist due to certain discrepancies. Further review or adjustments may be required."
-                                    })
-
-                                # Now update the `results` dictionary with the new structure
-                                results.update({
-                                    'text': {
-                                        'results': text_results
-                                    }
-                                })
-                                logger.info('Raised and handled OuputParserException')
-                        # Attach status icons or any additional formatting
-
-                        data,results,self.category_dict = attach_status_icon_list(results,self.category_dict)
-                        self.evaluate_list=self.evaluate_list+results
-
-                        self.final_ai_message+=data
-                        logger.info(data)
+                            if error is not None:
+                                raise error
+                            # Attach status icons or any additional formatting
+
+                            data,results,self.category_dict = attach_status_icon_list(results,self.category_dict)
+                            self.evaluate_list=self.evaluate_list+results
+
+                            self.final_ai_message+=data
+                            logger.info(data)
                
-                        # Put the processed chunk into the queue
-                        update_task = await self.async_initialize_and_update(self.chat_session_id, self.thread_model,self.thread_id, cb, queue_type='checklist')
-                        if self.is_paid_user and count < 1:
-                            self.thread_repo.update_credits(msgCredit=self.msgCredit)
-                            count+=1
-                        self.chat_repository_history.add_ai_message(
-                            message=self.final_ai_message,
-                            thread_id=self.thread_id
-                        )
-                        self.chat_repository_history.add_message_system(
-                            message=self.memory.moving_summary_buffer,
-                            thread_id=self.thread_id)
+                            # Put the processed chunk into the queue
+                            update_task = await self.async_initialize_and_update(self.chat_session_id, self.thread_model,self.thread_id, cb, queue_type='checklist')
+                            if self.is_paid_user and count < 1:
+                                self.thread_repo.update_credits(msgCredit=self.msgCredit)
+                                count+=1
+                            self.chat_repository_history.add_ai_message(
+                                message=self.final_ai_message,
+                                thread_id=self.thread_id
+                            )
+                            self.chat_repository_history.add_message_system(
+                                message=self.memory.moving_summary_buffer,
+                                thread_id=self.thread_id)
                
-                        await queue.put((data, 200))
-
-                    except ResourceExhausted as e:
-                        error_content = extract_google_error_message(str(e))
-                        logger.error(
-                            f"🚨 Google API Error: {error_content}",
-                            extra={"tags": {"method": "WebQASpecialService.process_checklist_items.ResourceExhausted"}})
-                        self.thread_repo.initialization(self.thread_id, self.thread_model)
-                        self.thread_repo.add_message_gemini("resource_exhausted_error")
-
-                        # llm_apikey_decrypt_service.update_deprecated_status(True)
-                        content = GENAI_ERROR_MESSAGES_CONFIG.get("resource_exhausted_error", GENAI_ERROR_MESSAGES_CONFIG.get("common_response"))
-                        await queue.put((json.dumps({"status": status.HTTP_417_EXPECTATION_FAILED, "message": error_content, "data": content}), status.HTTP_417_EXPECTATION_FAILED))
+                            await queue.put((data, 200))
+
+                        except ResourceExhausted as e:
+                            error_content = extract_google_error_message(str(e))
+                            logger.error(
+                                f"🚨 Google API Error: {error_content}",
+                                extra={"tags": {"method": "WebQASpecialService.process_checklist_items.ResourceExhausted"}})
+                            self.thread_repo.initialization(self.thread_id, self.thread_model)
+                            self.thread_repo.add_message_gemini("resource_exhausted_error")
+
+                            # llm_apikey_decrypt_service.update_deprecated_status(True)
+                            content = GENAI_ERROR_MESSAGES_CONFIG.get("resource_exhausted_error", GENAI_ERROR_MESSAGES_CONFIG.get("common_response"))
+                            await queue.put((json.dumps({"status": status.HTTP_417_EXPECTATION_FAILED, "message": error_content, "data": content}), status.HTTP_417_EXPECTATION_FAILED))
                     
-                    except GoogleAPICallError as e:
-                        error_content = extract_google_error_message(str(e))
-                        logger.error(
-                            f"🚨 Google API Error: {error_content}",
-                            extra={"tags": {"method": "WebQASpecialService.process_checklist_items.GoogleAPICallError"}})
-                        self.thread_repo.initialization(self.thread_id, self.thread_model)
-                        self.thread_repo.add_message_gemini("google_api_call_error")
-
-                        # llm_apikey_decrypt_service.update_deprecated_status(True)
-                        content = GENAI_ERROR_MESSAGES_CONFIG.get("google_api_call_error", GENAI_ERROR_MESSAGES_CONFIG.get("common_response"))
-                        await queue.put((json.dumps({"status": status.HTTP_417_EXPECTATION_FAILED, "message": error_content, "data": content}), status.HTTP_417_EXPECTATION_FAILED))
-
-                    # Handle GoogleAPIError
-                    except GoogleAPIError as e:
-                        error_content = extract_google_error_message(str(e))
-                        logger.error(
-                            f"🚨 Google API Error: {error_content}",
-                            extra={"tags": {"method": "WebQASpecialService.process_checklist_items.GoogleAPIError"}})
-                        self.thread_repo.initialization(self.thread_id, self.thread_model)
-                        self.thread_repo.add_message_gemini("google_api_error")
-
-                        # llm_apikey_decrypt_service.update_deprecated_status(True)
-                        content = GENAI_ERROR_MESSAGES_CONFIG.get("google_api_error", GENAI_ERROR_MESSAGES_CONFIG.get("common_response"))
-                        await queue.put((json.dumps({"status": status.HTTP_417_EXPECTATION_FAILED, "message": error_content, "data": content}), status.HTTP_417_EXPECTATION_FAILED))
-
-                    except GoogleGenerativeAIError as e:
-                        error_content = extract_google_genai_error_message(str(e))
-                        logger.error(
-                            f"🚨 Google API Error: {error_content}",
-                            extra={"tags": {"method": "WebQASpecialService.process_checklist_items.GoogleGenerativeAIError"}})
-                        self.thread_repo.initialization(self.thread_id, self.thread_model)
-                        self.thread_repo.add_message_gemini("google_genai_error")
-
-                        # llm_apikey_decrypt_service.update_deprecated_status(True)
-                        content = GENAI_ERROR_MESSAGES_CONFIG.get("google_genai_error", GENAI_ERROR_MESSAGES_CONFIG.get("common_response"))
-                        await queue.put((json.dumps({"status": status.HTTP_417_EXPECTATION_FAILED, "message": error_content, "data": content}), status.HTTP_417_EXPECTATION_FAILED))
-                    except Exception as e:
-                        logger.error(
-                            f"🚨 Failed to process checklist items: {str(e)}",
-                            extra={"tags": {"method": "WebQASpecialService.process_checklist_items.Exception_Except"}})
-                        self.thread_repo.initialization(self.thread_id, self.thread_model)
-                        self.thread_repo.add_message_gemini("common_response")
-                        content = GENAI_ERROR_MESSAGES_CONFIG.get("common_response")
-                        # yield json.dumps({"status": status.HTTP_400_BAD_REQUEST, "message": DEV_MESSAGES_CONFIG.get("genai_message"), "data": content}), status.HTTP_400_BAD_REQUEST
-                        await queue.put((json.dumps({
-                            "status": status.HTTP_400_BAD_REQUEST,
-                            "message": DEV_MESSAGES_CONFIG.get("genai_message"), "data": content
-                        }), 400))
+                        except GoogleAPICallError as e:
+                            error_content = extract_google_error_message(str(e))
+                            logger.error(
+                                f"🚨 Google API Error: {error_content}",
+                                extra={"tags": {"method": "WebQASpecialService.process_checklist_items.GoogleAPICallError"}})
+                            self.thread_repo.initialization(self.thread_id, self.thread_model)
+                            self.thread_repo.add_message_gemini("google_api_call_error")
+
+                            # llm_apikey_decrypt_service.update_deprecated_status(True)
+                            content = GENAI_ERROR_MESSAGES_CONFIG.get("google_api_call_error", GENAI_ERROR_MESSAGES_CONFIG.get("common_response"))
+                            await queue.put((json.dumps({"status": status.HTTP_417_EXPECTATION_FAILED, "message": error_content, "data": content}), status.HTTP_417_EXPECTATION_FAILED))
+
+                        # Handle GoogleAPIError
+                        except GoogleAPIError as e:
+                            error_content = extract_google_error_message(str(e))
+                            logger.error(
+                                f"🚨 Google API Error: {error_content}",
+                                extra={"tags": {"method": "WebQASpecialService.process_checklist_items.GoogleAPIError"}})
+                            self.thread_repo.initialization(self.thread_id, self.thread_model)
+                            self.thread_repo.add_message_gemini("google_api_error")
+
+                            # llm_apikey_decrypt_service.update_deprecated_status(True)
+                            content = GENAI_ERROR_MESSAGES_CONFIG.get("google_api_error", GENAI_ERROR_MESSAGES_CONFIG.get("common_response"))
+                            await queue.put((json.dumps({"status": status.HTTP_417_EXPECTATION_FAILED, "message": error_content, "data": content}), status.HTTP_417_EXPECTATION_FAILED))
+
+                        except GoogleGenerativeAIError as e:
+                            error_content = extract_google_genai_error_message(str(e))
+                            logger.error(
+                                f"🚨 Google API Error: {error_content}",
+                                extra={"tags": {"method": "WebQASpecialService.process_checklist_items.GoogleGenerativeAIError"}})
+                            self.thread_repo.initialization(self.thread_id, self.thread_model)
+                            self.thread_repo.add_message_gemini("google_genai_error")
+
+                            # llm_apikey_decrypt_service.update_deprecated_status(True)
+                            content = GENAI_ERROR_MESSAGES_CONFIG.get("google_genai_error", GENAI_ERROR_MESSAGES_CONFIG.get("common_response"))
+                            await queue.put((json.dumps({"status": status.HTTP_417_EXPECTATION_FAILED, "message": error_content, "data": content}), status.HTTP_417_EXPECTATION_FAILED))
+                        except Exception as e:
+                            logger.error(
+                                f"🚨 Failed to process checklist items: {str(e)}",
+                                extra={"tags": {"method": "WebQASpecialService.process_checklist_items.Exception_Except"}})
+                            self.thread_repo.initialization(self.thread_id, self.thread_model)
+                            self.thread_repo.add_message_gemini("common_response")
+                            content = GENAI_ERROR_MESSAGES_CONFIG.get("common_response")
+                            # yield json.dumps({"status": status.HTTP_400_BAD_REQUEST, "message": DEV_MESSAGES_CONFIG.get("genai_message"), "data": content}), status.HTTP_400_BAD_REQUEST
+                            await queue.put((json.dumps({
+                                "status": status.HTTP_400_BAD_REQUEST,
+                                "message": DEV_MESSAGES_CONFIG.get("genai_message"), "data": content
+                            }), 400))
 
                 # Signal that processing is complete
                 await queue.put((None,200))
@@ -609,41 +620,21 @@ class WebQASpecialService:
                 self.desktop_metrics = await extract_metrics(data=self.desktop_pageSpeed_analysis,device_type='desktop')
                 self.mobile_metrics = await extract_metrics(data=self.mobile_pageSpeed_analysis,device_type='mobile')
                 with gemini_sync_cost_handler(model_name=self.llm_apikey_decrypt_service.model_name) as cb:
-                    for item in self.pagespeed_checklist:
-                        try:
-                            results = await asyncio.to_thread(
-                                self.llm_chain_page_speed.invoke,
-                                {
-                                    'desktop_page_speed_analysis': self.desktop_checklist_data,
-                                    'mobile_page_speed_analysis':self.mobile_checklist_data,
-                                    'checklist_item': item
-                                }
-                            )
-                        except OutputParserException as e:
-                            results = {'checklist_item':item,'source_code':self.source_code}
-                            results['text'] = extract_json_block(str(e))
-                            if results['text'] == None:
-                                text_results = []
-                                ids_list = [list(i.keys())[0] for i in item]
-                                for i in ids_list:
-                                    text_results.append({
-                                        'id': i,
-                                        'status': "empty",
-                                        'note': "We were unable to validate the specified checklist due to certain discrepancies. Further review or adjustments may be required."
-                                    })
-
-                                # Now update the `results` dictionary with the new structure
-                                results.update({
-                                    'text': {
-                                        'results': text_results
-                                    }
-                                })                        
-                                logger.info('Raised and handled OuputParserException')
-
-                        data,results,self.category_dict = attach_status_icon_list(results,self.category_dict)
-                        self.evaluate_list += results
-                        self.final_ai_message += data
-                        await queue.put((data, 200))
+                    async with aclosing(evaluate_in_order(
+                            self.pagespeed_checklist,
+                            lambda item: self._evaluate_batch(self.llm_chain_page_speed, {
+                                'desktop_page_speed_analysis': self.desktop_checklist_data,
+                                'mobile_page_speed_analysis': self.mobile_checklist_data,
+                                'checklist_item': item
+                            }, item),
+                            rate_limiter=gemini_rate_limiter, api_key=self.api_key)) as evaluations:
+                        async for item, results, error in evaluations:
+                            if error is not None:
+                                raise error
+                            data,results,self.category_dict = attach_status_icon_list(results,self.category_dict)
+                            self.evaluate_list += results
+                            self.final_ai_message += data
+                            await queue.put((data, 200))
                 update_task = await self.async_initialize_and_update(self.chat_session_id, self.thread_model,self.thread_id, cb, queue_type='pagespeed') 
                 self.final_flag=True
 
@@ -894,7 +885,6 @@ class WebQASpecialService:
                     # Adds the attribute name to the cleaned_up list
                     cleaned_up.append(attr)
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
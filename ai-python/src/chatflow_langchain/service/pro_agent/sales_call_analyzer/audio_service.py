@@ -4,7 +4,7 @@ from langchain.memory import ConversationSummaryBufferMemory
 from langchain_core.output_parsers import JsonOutputParser
 from langchain.chains.llm import LLMChain
 from fastapi import status, HTTPException
-from langchain_google_genai import ChatGoogleGenerativeAI
+from src.custom_lib.langchain.chat_models.gemini.chatgemini_cache import MyChatGoogleGenerativeAI as ChatGoogleGenerativeAI
 from src.crypto_hub.services.openai.llm_api_key_decryption import LLMAPIKeyDecryptionHandler
 from src.chatflow_langchain.repositories.tool_history import CustomAIMongoDBChatMessageHistory
 from src.chatflow_langchain.repositories.thread_repository import ThreadRepostiory
@@ -33,7 +33,6 @@ from src.celery_worker_hub.extraction.tasks import extract_text_task
 from src.custom_lib.langchain.callbacks.gemini.cost.cost_calc_handler import _get_gemini_claude_token_cost
 from src.celery_worker_hub.extraction.utils import map_file_url,validate_file_url
 from src.gateway.utils import delete_file_from_s3
-import gc
 from src.chatflow_langchain.service.pro_agent.qa_special.utils import URLCheckerService
 from src.gateway.exceptions import AudioTooLargeException
 from src.celery_worker_hub.web_scraper.tasks.scraping_sitemap import crawler_scraper_task_sales
@@ -455,7 +454,6 @@ class SalesAudioService:
             if cleaned_up:
                 logger.info(f"Successfully cleaned up: {', '.join(cleaned_up)}.")
             
-            gc.collect()  # Force garbage collection to free memory
 
         except Exception as e:
             logger.error(
@@ -4,7 +4,7 @@ from langchain.memory import ConversationSummaryBufferMemory
 from langchain_core.output_parsers import JsonOutputParser
 from langchain.chains.llm import LLMChain
 from fastapi import status, HTTPException
-from langchain_google_genai import ChatGoogleGenerativeAI
+from src.custom_lib.langchain.chat_models.gemini.chatgemini_cache import MyChatGoogleGenerativeAI as ChatGoogleGenerativeAI
 from src.crypto_hub.services.openai.llm_api_key_decryption import LLMAPIKeyDecryptionHandler
 from src.chatflow_langchain.repositories.tool_history import CustomAIMongoDBChatMessageHistory
 from src.chatflow_langchain.repositories.thread_repository import ThreadRepostiory
@@ -33,7 +33,6 @@ from src.celery_worker_hub.extraction.utils import map_file_url,validate_file_ur
 from src.gateway.utils import delete_file_from_s3
 from src.chatflow_langchain.service.pro_agent.qa_special.utils import URLCheckerService
 from src.celery_worker_hub.web_scraper.tasks.scraping_sitemap import crawler_scraper_task_sales
-import gc
 load_dotenv()
 security_key = os.getenv("SECURITY_KEY").encode("utf-8")
 decryptor = MessageDecryptor(security_key)
@@ -358,7 +357,6 @@ class SalesTranscriptService:
             if cleaned_up:
                 logger.info(f"Successfully cleaned up: {', '.join(cleaned_up)}.")
             
-            gc.collect()  # Force garbage collection to free memory
 
         except Exception as e:
             logger.error(
@@ -4,7 +4,6 @@ from src.custom_lib.langchain.chat_models.openai.chatopenai_cache import MyChatO
 from fastapi import HTTPException, status
 from langchain.memory import ConversationSummaryBufferMemory
 from langchain.chains.llm import LLMChain
-import gc
 import json
 import asyncio
 from src.logger.default_logger import logger
@@ -389,7 +388,6 @@ class ArticleGeneratorService:
             if cleaned_up:
                 logger.info(f"Successfully cleaned up: {', '.join(cleaned_up)}.")
             
-            gc.collect()  # Force garbage collection to free memory
 
         except Exception as e:
             logger.error(
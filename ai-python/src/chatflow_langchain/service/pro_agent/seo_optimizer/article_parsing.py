@@ -0,0 +1,79 @@
+"""
+Competitor article HTML parsed into the Markdown the SEO article prompts are built from.
+
+Kept free of service imports: the pool workers of `scraper_articles.ArticleFetcher` are spawned
+processes that import only this module.
+"""
+from typing import Tuple
+from newspaper import Article
+from bs4 import BeautifulSoup
+import pyhtml2md
+
+
+def article_markdown(url: str, html: str) -> Tuple[str, str]:
+    """
+    Title and body Markdown of an article, as extracted by newspaper.
+    """
+    article = Article(url)
+    article.download(input_html=html)
+    article.parse()
+    soup = BeautifulSoup(article.html, 'html.parser')
+    body = soup.body
+    # Convert HTML to Markdown
+    return article.title, pyhtml2md.convert(str(body))
+
+
+def page_content(url: str, html: str) -> str:
+    """
+    Title, meta tags, head and body of a page as the `Source:` block of the article prompt.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+
+    # Remove unwanted tags
+    for tag in soup.find_all(["script", "style", "header", "footer", "nav", "aside", "svg"]):
+        tag.decompose()
+
+    # Remove inline styles and JS-related attributes
+    for tag in soup.find_all(True):
+        attrs_to_remove = [attr for attr in tag.attrs if attr.lower().startswith("on") or attr.lower() in ("style", "class", "id")]
+        for attr in attrs_to_remove:
+            del tag.attrs[attr]
+
+    # Extract title
+    title = soup.title.string.strip() if soup.title and soup.title.string else "No Title Found"
+
+    # Extract meta description
+    meta_description_tag = soup.find("meta", attrs={"name": "description"})
+    meta_description = meta_description_tag["content"].strip() if meta_description_tag and "content" in meta_description_tag.attrs else "No meta description found"
+
+    # Extract all meta tags
+    meta_tags = soup.find_all('meta')
+    meta_data = {}
+    for tag in meta_tags:
+        if 'name' in tag.attrs:
+            meta_data[tag.attrs['name']] = tag.attrs.get('content', '')
+        elif 'property' in tag.attrs:
+            meta_data[tag.attrs['property']] = tag.attrs.get('content', '')
+
+    # Extract <head> and <body> content
+    head = soup.head
+    body = soup.body
+    head_md = pyhtml2md.convert(str(head)) if head else "No head content"
+    body_md = pyhtml2md.convert(str(body)) if body else "No body content"
+
+    # Prepare output
+    content = (
+        f"Source: {url}\n"
+        f"Title: {title}\n"
+        f"Meta Description: {meta_description}\n"
+        f"Meta Tags:\n"
+    )
+
+    for key, value in meta_data.items():
+        content += f"{key}: {value}\n"
+
+    content += (
+        f"\nHead Content:\n{head_md}\n\n"
+        f"Body Content:\n{body_md}\n\n"
+    )
+    return content
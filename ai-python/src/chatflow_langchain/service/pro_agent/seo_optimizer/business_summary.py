@@ -1,6 +1,6 @@
 import openai
 import os
-from langchain_openai import ChatOpenAI
+from src.custom_lib.langchain.chat_models.openai.chatopenai_cache import MyChatOpenAI as ChatOpenAI
 from fastapi import HTTPException, status
 from langchain.memory import ConversationSummaryBufferMemory
 from langchain.chains.llm import LLMChain
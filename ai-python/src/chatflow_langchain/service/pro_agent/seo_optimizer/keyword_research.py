@@ -1,4 +1,4 @@
-from src.chatflow_langchain.service.pro_agent.seo_optimizer.seo_client import RestClient
+from src.chatflow_langchain.service.pro_agent.seo_optimizer.seo_client import seo_client
 from src.chatflow_langchain.repositories.thread_repository import ThreadRepostiory
 import os
 from fastapi import HTTPException, status
@@ -20,7 +20,7 @@ class KeywordResearchService:
         if not SEO_USER_ID or not SEO_PASSWORD:
             raise ValueError("Missing SEO credentials: 'seoUserId' or 'SeoPassword' not found in the settings collection.")
 
-        self.client = RestClient(SEO_USER_ID, SEO_PASSWORD)
+        self.client = seo_client
         self.thread_repo = ThreadRepostiory()
 
 
@@ -57,7 +57,7 @@ class KeywordResearchService:
                 "limit": limit
             }
         }
-        response = self.client.post("/v3/keywords_data/google_ads/keywords_for_keywords/live", post_data)
+        response = await self.client.post("/v3/keywords_data/google_ads/keywords_for_keywords/live", post_data)
         
         if response["status_code"] == 20000:
             recommended_keywords = []
@@ -88,7 +88,7 @@ class KeywordResearchService:
                 "language_name": self.language
             }
         }
-        response = self.client.post("/v3/keywords_data/google_ads/search_volume/live", post_data)
+        response = await self.client.post("/v3/keywords_data/google_ads/search_volume/live", post_data)
         
         if response["status_code"] == 20000:
             tasks = response.get("tasks", [])
@@ -1,30 +1,59 @@
-import requests
 from typing import List, Dict, Tuple
 import os
 import openai
 import json
-from typing import List, Optional
-from newspaper import Article
-from bs4 import BeautifulSoup
-import pyhtml2md
+from typing import Any, Callable, List, Optional
+import multiprocessing
+from concurrent.futures.process import BrokenProcessPool
 import statistics
+from src.chatflow_langchain.utils.process_pool import SpawnPool
 from src.chatflow_langchain.utils.user_agents import get_user_agents
 import aiohttp
 import asyncio
 from src.logger.default_logger import logger
 from src.chatflow_langchain.service.pro_agent.seo_optimizer.utils import is_probable_blog_url
+from src.chatflow_langchain.service.pro_agent.seo_optimizer.seo_client import seo_client,SEO_API_SUCCESS
+from src.chatflow_langchain.service.pro_agent.seo_optimizer.article_parsing import article_markdown,page_content
 from dotenv import load_dotenv
 import tiktoken
-import gc
 load_dotenv()
 
+# Competitor pages downloaded at once per article generation
+ARTICLE_FETCH_CONCURRENCY = int(os.environ.get("ARTICLE_FETCH_CONCURRENCY", 8))
+# Seconds one site gets across all its attempts, a slow site is reported as failed instead of holding up the article
+ARTICLE_FETCH_SITE_TIMEOUT = float(os.environ.get("ARTICLE_FETCH_SITE_TIMEOUT", 45))
+ARTICLE_FETCH_REQUEST_TIMEOUT = float(os.environ.get("ARTICLE_FETCH_REQUEST_TIMEOUT", 30))
+ARTICLE_FETCH_CONNECT_TIMEOUT = float(os.environ.get("ARTICLE_FETCH_CONNECT_TIMEOUT", 10))
+# Pages are cut at this many bytes before parsing, past it a page is mostly inline scripts and markup
+ARTICLE_MAX_BYTES = int(os.environ.get("ARTICLE_MAX_BYTES", 2 * 1024 * 1024))
+# Processes parsing pages and converting them to Markdown. 0 parses in a worker thread, where the
+# pure-Python parse still holds the GIL the event loop needs, so even one process keeps the loop responsive
+ARTICLE_PARSE_WORKERS = int(os.environ.get("ARTICLE_PARSE_WORKERS", min(4, os.cpu_count() or 1)))
+_READ_CHUNK_SIZE = 64 * 1024
+
+# Spawned workers import only article_parsing
+_pool = SpawnPool()
+
+
+async def parse_off_loop(parser: Callable[..., Any], *args) -> Any:
+    """
+    Runs a parser of `article_parsing` in the parse pool, or in a worker thread where the pool
+    cannot run, without blocking the event loop.
+    """
+    # Daemonic processes (e.g. prefork pool children) cannot start the pool's processes
+    if ARTICLE_PARSE_WORKERS < 1 or multiprocessing.current_process().daemon:
+        return await asyncio.to_thread(parser, *args)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_pool.get(ARTICLE_PARSE_WORKERS), parser, *args)
+    except BrokenProcessPool as e:
+        logger.warning(f"Article parse pool failed, parsing in a thread: {e}", extra={"tags": {"method": "parse_off_loop"}})
+        _pool.reset()
+        return await asyncio.to_thread(parser, *args)
+
 class ArticleFetcher:
     def __init__(self):
-        self.username=os.environ.get("SEO_USER_ID")
-        self.password=os.environ.get("SEO_PASSWORD")
-        self.serp_api_url = "https://api.dataforseo.com/v3/serp/google/organic/live/regular"
-        self.word_count_api_url = "https://api.dataforseo.com/v3/on_page/instant_pages"
-        self.headers = {"Content-Type": "application/json"}
+        self.serp_api_path = "/v3/serp/google/organic/live/regular"
+        self.word_count_api_path = "/v3/on_page/instant_pages"
         self.response_headers='text/html'
 
     async def initialize_data(self, title: str=None, location: list=None, language: str=None):
@@ -41,10 +70,12 @@ class ArticleFetcher:
             "depth":5
         }]
 
-        
-        response = requests.post(self.serp_api_url, auth=(self.username, self.password), json=payload, headers=self.headers)
-        if response.status_code == 200:
-            results = response.json()
+        try:
+            results = await seo_client.post(self.serp_api_path, payload)
+        except Exception as e:
+            logger.error(f"Error fetching SERP results for {title}: {e}")
+            return []
+        if results.get("status_code") == SEO_API_SUCCESS:
             article_urls = [
                 item["url"]
                 for item in results.get("tasks", [])[0].get("result", [])[0].get("items", [])
@@ -52,7 +83,7 @@ class ArticleFetcher:
             ]
             return article_urls
         else:
-            print(f"Error: {response.status_code}, {response.text}")
+            logger.error(f"Error: {results.get('status_code')}, {results.get('status_message')}")
             return []
 
     async def get_word_count(self, url: str) -> int:
@@ -61,28 +92,19 @@ class ArticleFetcher:
             "enable_javascript": True
         }]
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(
-                    self.word_count_api_url,
-                    auth=aiohttp.BasicAuth(self.username, self.password),
-                    json=payload,
-                    headers=self.headers,
-                    timeout=30
-                ) as response:
-                    if response.status == 200:
-                        results = await response.json()
-                        tasks = results.get("tasks", [])
-                        if tasks:
-                            result = tasks[0].get("result", [])
-                            if result:
-                                items = result[0].get("items", [])
-                                if items:
-                                    meta = items[0].get("meta", {})
-                                    content = meta.get("content", {})
-                                    return content.get("plain_text_word_count", 0)
-            except Exception as e:
-                logger.error(f"Error fetching word count for {url}: {e}")
+        try:
+            results = await seo_client.post(self.word_count_api_path, payload)
+            tasks = results.get("tasks", [])
+            if tasks:
+                result = tasks[0].get("result", [])
+                if result:
+                    items = result[0].get("items", [])
+                    if items:
+                        meta = items[0].get("meta", {})
+                        content = meta.get("content", {})
+                        return content.get("plain_text_word_count", 0)
+        except Exception as e:
+            logger.error(f"Error fetching word count for {url}: {e}")
 
         return 0
 
@@ -111,35 +133,49 @@ class ArticleFetcher:
 
         return median_length, self.top_articles
 
+    def _session(self) -> aiohttp.ClientSession:
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=ARTICLE_FETCH_CONCURRENCY),
+            timeout=aiohttp.ClientTimeout(total=ARTICLE_FETCH_REQUEST_TIMEOUT, connect=ARTICLE_FETCH_CONNECT_TIMEOUT),
+        )
+
+    async def fetch_html(self, session: aiohttp.ClientSession, url: str, headers: dict = None) -> Optional[str]:
+        """
+        HTML of `url`, at most ARTICLE_MAX_BYTES of it, or None when the site did not answer with a page.
+        """
+        async with session.get(url, headers=headers) as response:
+            if response.status != 200 or not response.headers.get('Content-Type', '').startswith(self.response_headers):
+                logger.error(f"❌ Status {response.status} for {url}")
+                return None
+            body = bytearray()
+            async for chunk in response.content.iter_chunked(_READ_CHUNK_SIZE):
+                body += chunk
+                if len(body) >= ARTICLE_MAX_BYTES:
+                    logger.warning(f"⚠️ Truncated {url} at {ARTICLE_MAX_BYTES} bytes")
+                    del body[ARTICLE_MAX_BYTES:]
+                    break
+            return body.decode(response.charset or "utf-8", errors="replace")
+
     async def fetch_article_content(self) -> str:
         """Fetch article content from multiple URLs."""
-        all_articles = []
-        formatted_articles=[]
-        for url in self.top_articles:
-            try:
-                article = Article(url)
-                article.download()
-                article.parse()
-                soup = BeautifulSoup(article.html, 'html.parser')
-                body = soup.body
-                # extracted_html = soup.prettify()  # Cleaned HTML
-                
-
-                # Convert HTML to Markdown
-                markdown_text = pyhtml2md.convert(str(body))
-
-                all_articles.append({
-                    "URL": url,
-                    "Title": article.title,
-                    "Body Content": markdown_text
-                })
-                content=f"Source: {url}\nTitle: {article.title}\nContent: {markdown_text}\n\n"
-                formatted_articles.append(content)
-        
-            except Exception as e:
-                error_content=str(e)
-                error_content=f"Source: {url}\n \Error: {error_content}\n\n"
-                formatted_articles.append(error_content)
+        semaphore = asyncio.Semaphore(ARTICLE_FETCH_CONCURRENCY)
+        headers = get_user_agents()[0]
+
+        async def fetch_article(session: aiohttp.ClientSession, url: str) -> str:
+            async with semaphore:
+                try:
+                    html = await asyncio.wait_for(self.fetch_html(session, url, headers), ARTICLE_FETCH_SITE_TIMEOUT)
+                    if html is None:
+                        raise ValueError(f"No article page at {url}")
+                    title, markdown_text = await parse_off_loop(article_markdown, url, html)
+                    return f"Source: {url}\nTitle: {title}\nContent: {markdown_text}\n\n"
+                except Exception as e:
+                    error_content=str(e) or type(e).__name__
+                    return f"Source: {url}\n \\Error: {error_content}\n\n"
+
+        async with self._session() as session:
+            # Sites are fetched at once and kept in SERP order
+            formatted_articles = await asyncio.gather(*(fetch_article(session, url) for url in self.top_articles))
 
         combined_content="\n".join(formatted_articles)
 
@@ -150,73 +186,33 @@ class ArticleFetcher:
         user_agents = get_user_agents()
         combined_tokens = 0
         MAX_CONTENT_LENGTH = 100000  # 100k limit
-        async def fetch_content(url: str):
+        semaphore = asyncio.Semaphore(ARTICLE_FETCH_CONCURRENCY)
+
+        async def try_user_agents(session: aiohttp.ClientSession, url: str) -> str:
             for headers in user_agents:
                 try:
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(url, headers=headers, timeout=30) as response:
-                            if response.status == 200 and response.headers.get('Content-Type', '').startswith('text/html'):
-                                text = await response.text()
-                                soup = BeautifulSoup(text, "html.parser")
-
-                                # Remove unwanted tags
-                                for tag in soup.find_all(["script", "style", "header", "footer", "nav", "aside", "svg"]):
-                                    tag.decompose()
-
-                                # Remove inline styles and JS-related attributes
-                                for tag in soup.find_all(True):
-                                    attrs_to_remove = [attr for attr in tag.attrs if attr.lower().startswith("on") or attr.lower() in ("style", "class", "id")]
-                                    for attr in attrs_to_remove:
-                                        del tag.attrs[attr]
-
-                                # Extract title
-                                title = soup.title.string.strip() if soup.title and soup.title.string else "No Title Found"
-
-                                # Extract meta description
-                                meta_description_tag = soup.find("meta", attrs={"name": "description"})
-                                meta_description = meta_description_tag["content"].strip() if meta_description_tag and "content" in meta_description_tag.attrs else "No meta description found"
-
-                                # Extract all meta tags
-                                meta_tags = soup.find_all('meta')
-                                meta_data = {}
-                                for tag in meta_tags:
-                                    if 'name' in tag.attrs:
-                                        meta_data[tag.attrs['name']] = tag.attrs.get('content', '')
-                                    elif 'property' in tag.attrs:
-                                        meta_data[tag.attrs['property']] = tag.attrs.get('content', '')
-
-                                # Extract <head> and <body> content
-                                head = soup.head
-                                body = soup.body
-                                head_md = pyhtml2md.convert(str(head)) if head else "No head content"
-                                body_md = pyhtml2md.convert(str(body)) if body else "No body content"
-
-                                # Prepare output
-                                content = (
-                                    f"Source: {url}\n"
-                                    f"Title: {title}\n"
-                                    f"Meta Description: {meta_description}\n"
-                                    f"Meta Tags:\n"
-                                )
-
-                                for key, value in meta_data.items():
-                                    content += f"{key}: {value}\n"
-
-                                content += (
-                                    f"\nHead Content:\n{head_md}\n\n"
-                                    f"Body Content:\n{body_md}\n\n"
-                                )
-                                return content
-                            else:
-                                logger.error(f"❌ Status {response.status} for {url}")
+                    html = await self.fetch_html(session, url, headers)
+                    if html is not None:
+                        return await parse_off_loop(page_content, url, html)
                 except Exception as inner_e:
                     logger.error(f"⚠️ Failed UA {headers['User-Agent']} for {url}: {inner_e}")
             return f"Source: {url}\nError: All User-Agents failed\n\n"
 
+        async def fetch_content(session: aiohttp.ClientSession, url: str) -> str:
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(try_user_agents(session, url), ARTICLE_FETCH_SITE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    logger.error(f"⚠️ Timed out after {ARTICLE_FETCH_SITE_TIMEOUT}s fetching {url}")
+                    return f"Source: {url}\nError: Timed out\n\n"
+
+        async with self._session() as session:
+            # Sites are fetched at once, the token budget below still admits them in SERP order
+            contents = await asyncio.gather(*(fetch_content(session, url) for url in self.top_articles))
+
         encoding = tiktoken.get_encoding("cl100k_base")
 
-        for url in self.top_articles:
-            article_content = await fetch_content(url)
+        for url, article_content in zip(self.top_articles, contents):
             content_tokens = len(encoding.encode(article_content))
             proposed_total = combined_tokens + content_tokens
 
@@ -244,5 +240,4 @@ class ArticleFetcher:
         logger.info(f"✅ Successfully fetched content with total tokens: {combined_tokens}")
 
         del encoding
-        gc.collect()
         return combined_filtered_content
\ No newline at end of file
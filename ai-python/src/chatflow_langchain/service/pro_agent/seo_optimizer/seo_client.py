@@ -1,34 +1,135 @@
-from http.client import HTTPSConnection
-from base64 import b64encode
-from json import loads
+import asyncio
+import copy
+import os
 from json import dumps
+from typing import Any, Dict, Optional, Tuple
+import aiohttp
+from dotenv import load_dotenv
+from src.chatflow_langchain.utils.ttl_cache import SingleFlight, TTLCache
+from src.logger.default_logger import logger
 
-class RestClient:
-    domain = "api.dataforseo.com"
-
-    def __init__(self, username, password):
-        self.username = username
-        self.password = password
-
-    def request(self, path, method, data=None):
-        connection = HTTPSConnection(self.domain)
-        try:
-            base64_bytes = b64encode(
-                ("%s:%s" % (self.username, self.password)).encode("ascii")
-                ).decode("ascii")
-            headers = {'Authorization' : 'Basic %s' %  base64_bytes, 'Content-Encoding' : 'gzip'}
-            connection.request(method, path, headers=headers, body=data)
-            response = connection.getresponse()
-            return loads(response.read().decode())
-        finally:
-            connection.close()
-
-    def get(self, path):
-        return self.request(path, 'GET')
-
-    def post(self, path, data):
-        if isinstance(data, str):
-            data_str = data
-        else:
-            data_str = dumps(data)
-        return self.request(path, 'POST', data_str)
+load_dotenv()
+
+SEO_API_BASE_URL = os.environ.get("SEO_API_BASE_URL", "https://api.dataforseo.com")
+# Connections kept open to the SEO API per process, requests beyond this wait for one
+SEO_API_MAX_CONNECTIONS = int(os.environ.get("SEO_API_MAX_CONNECTIONS", 20))
+SEO_API_KEEPALIVE_TIMEOUT = float(os.environ.get("SEO_API_KEEPALIVE_TIMEOUT", 60))
+# Requests running at once per endpoint, the live endpoints throttle accounts above a few parallel tasks
+SEO_API_ENDPOINT_CONCURRENCY = int(os.environ.get("SEO_API_ENDPOINT_CONCURRENCY", 4))
+SEO_API_TIMEOUT = float(os.environ.get("SEO_API_TIMEOUT", 60))
+# Seconds a successful lookup is served again without a paid API call
+SEO_API_CACHE_TTL = float(os.environ.get("SEO_API_CACHE_TTL", 24 * 60 * 60))
+SEO_API_CACHE_MAX_ENTRIES = int(os.environ.get("SEO_API_CACHE_MAX_ENTRIES", 4096))
+SEO_API_SUCCESS = 20000
+
+
+def _canonical(value: Any) -> str:
+    if isinstance(value, (list, tuple, set)):
+        value = sorted({str(item).strip().lower() for item in value})
+    elif isinstance(value, str):
+        value = value.strip().lower()
+    return dumps(value, sort_keys=True)
+
+
+def lookup_key(path: str, tasks: Any) -> Tuple[str, ...]:
+    """
+    Cache key of a lookup: the endpoint, then per task its keywords (the keyword or URL of
+    single-target endpoints), location and language, and any other option such as the limit.
+    Keyword order and case do not change the key.
+    """
+    if isinstance(tasks, dict):
+        tasks = list(tasks.values())
+    key = [path]
+    for task in tasks:
+        task = dict(task)
+        keywords = task.pop("keywords", None) or task.pop("keyword", None) or task.pop("url", None)
+        location = task.pop("location_name", None) or task.pop("location_code", None)
+        language = task.pop("language_name", None) or task.pop("language_code", None)
+        key.extend((_canonical(keywords), _canonical(location), _canonical(language), dumps(task, sort_keys=True, default=str)))
+    return tuple(key)
+
+
+class SEOClient:
+    """
+    Async DataForSEO client shared by the SEO agents.
+
+    Requests go through one keep-alive connection pool, at most `endpoint_concurrency` at a time per
+    endpoint. Successful lookups are cached for SEO_API_CACHE_TTL under `lookup_key`, so repeated
+    keyword and SERP lookups are neither waited for nor paid again, and concurrent identical lookups
+    share one request. The session belongs to the event loop it was created on.
+    """
+
+    def __init__(self, username: Optional[str] = None, password: Optional[str] = None, base_url: str = SEO_API_BASE_URL,
+                 endpoint_concurrency: int = SEO_API_ENDPOINT_CONCURRENCY, ttl: float = SEO_API_CACHE_TTL,
+                 max_entries: int = SEO_API_CACHE_MAX_ENTRIES):
+        self.username = username if username is not None else os.environ.get("SEO_USER_ID")
+        self.password = password if password is not None else os.environ.get("SEO_PASSWORD")
+        self.base_url = base_url.rstrip("/")
+        self.endpoint_concurrency = endpoint_concurrency
+        self._entries: "TTLCache[Tuple[str, ...], dict]" = TTLCache(ttl, max_entries)
+        # Concurrent identical lookups share one request
+        self._pending: "SingleFlight[Tuple[str, ...], dict]" = SingleFlight("SEO API lookup was cancelled")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._endpoints: Dict[str, asyncio.Semaphore] = {}
+
+    def _bind(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._session is None or self._session.closed:
+            self._loop = loop
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=SEO_API_MAX_CONNECTIONS, keepalive_timeout=SEO_API_KEEPALIVE_TIMEOUT),
+                timeout=aiohttp.ClientTimeout(total=SEO_API_TIMEOUT),
+                auth=aiohttp.BasicAuth(self.username or "", self.password or ""),
+            )
+            self._endpoints = {}
+        return self._session
+
+    async def _request(self, method: str, path: str, data: Any = None) -> dict:
+        session = self._bind()
+        slots = self._endpoints.get(path)
+        if slots is None:
+            slots = self._endpoints[path] = asyncio.Semaphore(self.endpoint_concurrency)
+        async with slots:
+            async with session.request(method, f"{self.base_url}{path}", json=data) as response:
+                # Errors come back as JSON with a status_code of their own, as with the REST client
+                return await response.json(content_type=None)
+
+    async def post(self, path: str, data: Any, cache: bool = True) -> dict:
+        """
+        Posts `data`, a list or index-keyed dict of tasks, to `path` and returns the parsed response.
+        """
+        if isinstance(data, dict):
+            data = list(data.values())
+        if not cache:
+            return await self._request("POST", path, data)
+        key = lookup_key(path, data)
+        cached = self._entries.get(key)
+        if cached is not None:
+            logger.info(f"SEO API cache hit for {path}", extra={"tags": {"method": "SEOClient.post"}})
+            return copy.deepcopy(cached)
+        return copy.deepcopy(await self._pending.run(key, lambda: self._lookup(key, path, data)))
+
+    async def _lookup(self, key: Tuple[str, ...], path: str, data: Any) -> dict:
+        response = await self._request("POST", path, data)
+        # Failed lookups are not cached, neither are responses where any task failed
+        if response.get("status_code") == SEO_API_SUCCESS and all(
+                task.get("status_code") == SEO_API_SUCCESS for task in response.get("tasks") or []):
+            self._entries.set(key, response)
+        return response
+
+    async def get(self, path: str) -> dict:
+        return await self._request("GET", path)
+
+    def invalidate(self) -> None:
+        self._entries.clear()
+
+    async def aclose(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._loop = None
+        self._session = None
+        self._endpoints = {}
+
+
+seo_client = SEOClient()
@@ -1,5 +1,5 @@
 import asyncio
-from langchain_openai import ChatOpenAI
+from src.custom_lib.langchain.chat_models.openai.chatopenai_cache import MyChatOpenAI as ChatOpenAI
 from langchain.chains.llm import LLMChain
 from fastapi.responses import JSONResponse
 from src.logger.default_logger import logger
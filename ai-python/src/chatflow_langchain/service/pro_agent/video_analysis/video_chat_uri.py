@@ -1,7 +1,6 @@
 from fastapi import HTTPException, status
 from langchain.memory import ConversationSummaryBufferMemory
 from langchain.chains.llm import LLMChain
-import gc
 import os
 import json
 import asyncio
@@ -27,7 +26,7 @@ from src.chatflow_langchain.repositories.openai_error_messages_config import DEV
 from src.chatflow_langchain.service.gemini.doc.utils import extract_google_error_message,extract_google_genai_error_message
 from langchain_google_genai._common import GoogleGenerativeAIError
 from google.api_core.exceptions import GoogleAPIError, ResourceExhausted, GoogleAPICallError
-from langchain_google_genai import ChatGoogleGenerativeAI
+from src.custom_lib.langchain.chat_models.gemini.chatgemini_cache import MyChatGoogleGenerativeAI as ChatGoogleGenerativeAI
 from src.db.config import get_field_by_name
 security_key = os.getenv("SECURITY_KEY").encode("utf-8")
 decryptor = MessageDecryptor(security_key)
@@ -408,7 +407,6 @@ class VideoChatUriService:
             if cleaned_up:
                 logger.info(f"Successfully cleaned up: {', '.join(cleaned_up)}.")
             
-            gc.collect()  # Force garbage collection to free memory
 
         except Exception as e:
             logger.error(
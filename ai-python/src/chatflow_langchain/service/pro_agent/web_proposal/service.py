@@ -5,7 +5,6 @@ import json
 import docx
 from langchain.chains.llm import LLMChain
 from fastapi import status, HTTPException
-from langchain_google_genai import ChatGoogleGenerativeAI
 from src.crypto_hub.services.openai.llm_api_key_decryption import LLMAPIKeyDecryptionHandler
 from src.chatflow_langchain.repositories.tool_history import CustomAIMongoDBChatMessageHistory
 from src.chatflow_langchain.repositories.thread_repository import ThreadRepostiory
@@ -27,7 +26,6 @@ from openai import RateLimitError,APIConnectionError,APITimeoutError,APIStatusEr
 from src.chatflow_langchain.service.openai.image.utils import extract_error_message
 from src.chatflow_langchain.repositories.openai_error_messages_config import OPENAI_MESSAGES_CONFIG,DEV_MESSAGES_CONFIG
 from src.gateway.openai_exceptions import LengthFinishReasonError,ContentFilterFinishReasonError
-import gc
 load_dotenv()
 security_key = os.getenv("SECURITY_KEY").encode("utf-8")
 decryptor = MessageDecryptor(security_key)
@@ -437,7 +435,6 @@ class WebProposalService:
             if cleaned_up:
                 logger.info(f"Successfully cleaned up: {', '.join(cleaned_up)}.")
             
-            gc.collect()  # Force garbage collection to free memory
 
         except Exception as e:
             logger.error(
@@ -21,7 +21,6 @@ from src.celery_worker_hub.extraction.utils import map_file_url, validate_file_u
 from src.chatflow_langchain.utils.fill_additional_prompt import fill_template,format_website_summary_pairs
 from src.chatflow_langchain.service.sdxl.tool_functions.tools import huggingface_image_generation
 from src.chatflow_langchain.service.huggingface.tool_functions.utils import extract_error_message
-import gc
 from src.chatflow_langchain.repositories.openai_error_messages_config import DEV_MESSAGES_CONFIG,HF_ERROR_MESSAGES_CONFIG,OPENAI_MESSAGES_CONFIG
 from openai import RateLimitError,APIConnectionError,APITimeoutError,APIStatusError, NotFoundError
 from src.gateway.openai_exceptions import LengthFinishReasonError,ContentFilterFinishReasonError
@@ -29,12 +28,13 @@ from langchain_huggingface import HuggingFaceEndpoint,ChatHuggingFace
 from requests.exceptions import HTTPError
 from huggingface_hub.utils import HfHubHTTPError, EntryNotFoundError, BadRequestError
 from src.chatflow_langchain.service.huggingface.config.model_config import DefaultGPT4oMiniModelRepository
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
 # Service Initilization
-openai_llm_apikey_decrypt_service = OpenAILLMAPIKeyDecryptionHandler()
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-thread_repo = ThreadRepostiory()
-prompt_repo = PromptRepository()
+openai_llm_apikey_decrypt_service = RequestScoped(OpenAILLMAPIKeyDecryptionHandler)
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+thread_repo = RequestScoped(ThreadRepostiory)
+prompt_repo = RequestScoped(PromptRepository)
 
 class SdxlServiceOpenai(AbstractConversationService):
     def initialize_llm(self, api_key_id: str = None, companymodel: str = None, dalle_wrapper_size: str = None, dalle_wrapper_quality: str = None, dalle_wrapper_style: str = None, thread_id: str = None, thread_model: str = None, imageT=0,company_id:str=None):
@@ -686,7 +686,6 @@ class SdxlServiceOpenai(AbstractConversationService):
                     # Adds the attribute name to the cleaned_up list
                     cleaned_up.append(attr)
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
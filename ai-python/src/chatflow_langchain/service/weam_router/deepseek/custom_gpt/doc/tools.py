@@ -25,9 +25,10 @@ from src.chatflow_langchain.repositories.openai_error_messages_config import DEV
 from src.crypto_hub.services.openai.llm_api_key_decryption import LLMAPIKeyDecryptionHandler
 from src.chatflow_langchain.service.config.model_config_openai import OPENAIMODEL
 from src.chatflow_langchain.service.weam_router.deepseek.config.deepseek_tool_description import DEEPSEEK_TOOL_DESCRIPTION
-thread_repo = ThreadRepostiory()
-cost_callback = CostCalculator()
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
+from src.chatflow_langchain.utils.request_context import RequestScoped
+thread_repo = RequestScoped(ThreadRepostiory)
+cost_callback = RequestScoped(CostCalculator)
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
 
 async_handler = async_streaming_handler()
 
@@ -10,14 +10,14 @@ from src.celery_worker_hub.web_scraper.tasks.notify import on_task_success,on_ta
 from celery import chain 
 from src.chatflow_langchain.service.weam_router.deepseek.scraper.config import ScraperConfig
 from src.chatflow_langchain.service.weam_router.deepseek.scraper.config import GetLLMkey,DEFAULTMODEL
-import gc
 from src.chatflow_langchain.service.weam_router.deepseek.image.utils import extract_error_message
 from src.chatflow_langchain.repositories.openai_error_messages_config import DEV_MESSAGES_CONFIG, WEAM_ROUTER_MESSAGES_CONFIG
 from bson.objectid import ObjectId
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
 # Initialize your repositories and services
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-prompt_repo = PromptRepository()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+prompt_repo = RequestScoped(PromptRepository)
 
 class OpenAIScrapUrlService():
 
@@ -154,7 +154,6 @@ class OpenAIScrapUrlService():
                     delattr(self, attr)  # Deletes the attribute from the instance
                     cleaned_up.append(attr)  # Adds the attribute name to the cleaned_up list
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
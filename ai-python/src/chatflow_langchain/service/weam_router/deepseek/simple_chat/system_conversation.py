@@ -21,16 +21,16 @@ from src.custom_lib.langchain.callbacks.openai.streaming.context_manager import
 from openai import RateLimitError,APIConnectionError,APITimeoutError,APIStatusError,NotFoundError
 from src.celery_worker_hub.extraction.utils import map_file_url,validate_file_url
 from src.chatflow_langchain.utils.fill_additional_prompt import fill_template
-import gc
 from src.chatflow_langchain.service.weam_router.deepseek.simple_chat.utils import extract_error_message
 from src.gateway.openai_exceptions import LengthFinishReasonError,ContentFilterFinishReasonError
 from src.chatflow_langchain.repositories.openai_error_messages_config import DEV_MESSAGES_CONFIG, WEAM_ROUTER_MESSAGES_CONFIG
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
 # Service Initilization 
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-chat_repository_history = CustomAIMongoDBChatMessageHistory()
-thread_repo = ThreadRepostiory()
-prompt_repo = PromptRepository()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+chat_repository_history = RequestScoped(CustomAIMongoDBChatMessageHistory)
+thread_repo = RequestScoped(ThreadRepostiory)
+prompt_repo = RequestScoped(PromptRepository)
 class OpenAISimpleStreamingChatService(AbstractConversationService):
     def initialize_llm(self, api_key_id: str = None, companymodel: str = None):
         """
@@ -531,7 +531,6 @@ class OpenAISimpleStreamingChatService(AbstractConversationService):
                     delattr(self, attr)  # Deletes the attribute from the instance
                     cleaned_up.append(attr)  # Adds the attribute name to the cleaned_up list
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
@@ -13,7 +13,6 @@ from src.chatflow_langchain.repositories.chat_session_repository import ChatSess
 from src.chatflow_langchain.repositories.chat_member_repository import ChatMemberRepository
 from fastapi import HTTPException, status
 from src.chatflow_langchain.service.weam_router.deepseek.title.config import REFORMED_QUERY
-import gc
 from src.chatflow_langchain.service.weam_router.deepseek.title.utils import extract_error_message, get_default_title
 from src.gateway.openai_exceptions import LengthFinishReasonError,ContentFilterFinishReasonError
 from src.chatflow_langchain.repositories.openai_error_messages_config import WEAM_ROUTER_MESSAGES_CONFIG
@@ -22,11 +21,12 @@ from src.crypto_hub.utils.crypto_utils import MessageEncryptor,MessageDecryptor
 from dotenv import load_dotenv
 from src.custom_lib.langchain.callbacks.weam_router.deep_seek.cost.context_manager import deepseek_sync_callback
 import os
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-thread_repo = ThreadRepostiory()
-chat_repo = ChatSessionRepository()
-chat_member_repo = ChatMemberRepository()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+thread_repo = RequestScoped(ThreadRepostiory)
+chat_repo = RequestScoped(ChatSessionRepository)
+chat_member_repo = RequestScoped(ChatMemberRepository)
 
 load_dotenv()
 
@@ -81,7 +81,7 @@ class WeamDeepSeekTitleGenerationService(AbstractTitleGeneration):
                     model="gpt-4.1-mini",
                     max_tokens=35
                 )
-            self.default_token_dict={"totalCost":"$0.000","promptT":0,"completion":0,"totalUsed":0}
+            self.default_token_dict={"totalCost":0.0,"promptT":0,"completion":0,"totalUsed":0}
         except Exception as e:
             logger.error(f"Failed to initialize LLM: {e}",
                          extra={"tags": {"method": "OpenAITitleGenerationService.initialize_llm"}})
@@ -172,22 +172,9 @@ class WeamDeepSeekTitleGenerationService(AbstractTitleGeneration):
         cb : Callback
             The callback object containing token usage information.
         tokens_old : dict
-            The old token usage data.
+            Unused, the thread counters are incremented atomically.
         """
-        if 'totalCost' not in tokens_old:
-            tokens_old = self.default_token_dict
-        total_old_cost = float(tokens_old['totalCost'].replace("$", ""))
-        total_new_cost = total_old_cost + cb.total_cost
-
-        token_data = {
-            "$set": {
-                "tokens.totalUsed": tokens_old['totalUsed'] + cb.total_tokens,
-                "tokens.promptT": tokens_old['promptT'] + cb.prompt_tokens,
-                "tokens.completion": tokens_old['completion'] + cb.completion_tokens,
-                "tokens.totalCost": f"${total_new_cost}"
-            }
-        }
-        thread_repo.update_token_fields(token_data)
+        thread_repo.update_token_usage(cb)
 
     def run_chain(self, chat_session_id: str = None, collection_name: str = None, collection_chatmember: str = None):
         """
@@ -392,7 +379,6 @@ class WeamDeepSeekTitleGenerationService(AbstractTitleGeneration):
                     delattr(self, attr)  # Deletes the attribute from the instance
                     cleaned_up.append(attr)  # Adds the attribute name to the cleaned_up list
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
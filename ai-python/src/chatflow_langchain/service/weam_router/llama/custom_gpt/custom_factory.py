@@ -3,8 +3,9 @@ from src.logger.default_logger import logger
 from src.chatflow_langchain.service.weam_router.llama.custom_gpt.doc.rag_conversation import WeamLlamaCustomGPTDocChatService
 from src.chatflow_langchain.service.weam_router.llama.custom_gpt.simple_chat.system_conversation import WeamLlamaCustomGPTSimpleChatService
 from src.chatflow_langchain.repositories.custom_gpt_repository import CustomGPTRepository
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-custom_gpt_repo=CustomGPTRepository()
+custom_gpt_repo=RequestScoped(CustomGPTRepository)
 
 class WeamLlamaCustomGPTManager():
     def __init__(self):
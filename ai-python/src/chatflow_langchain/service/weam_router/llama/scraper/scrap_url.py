@@ -9,14 +9,14 @@ from src.celery_worker_hub.web_scraper.tasks.db_dump import dump_to_db
 from src.celery_worker_hub.web_scraper.tasks.notify import on_task_success,on_task_failed
 from celery import chain 
 from src.chatflow_langchain.service.weam_router.llama.scraper.config import ScraperConfig, GetLLMkey, DEFAULTMODEL
-import gc
 from src.chatflow_langchain.service.weam_router.llama.image.utils import extract_error_message
 from src.chatflow_langchain.repositories.openai_error_messages_config import DEV_MESSAGES_CONFIG, WEAM_ROUTER_MESSAGES_CONFIG
 from bson.objectid import ObjectId
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
 # Initialize your repositories and services
-llm_apikey_decrypt_service = LLMAPIKeyDecryptionHandler()
-prompt_repo = PromptRepository()
+llm_apikey_decrypt_service = RequestScoped(LLMAPIKeyDecryptionHandler)
+prompt_repo = RequestScoped(PromptRepository)
 
 class OpenAIScrapUrlService():
 
@@ -153,7 +153,6 @@ class OpenAIScrapUrlService():
                     delattr(self, attr)  # Deletes the attribute from the instance
                     cleaned_up.append(attr)  # Adds the attribute name to the cleaned_up list
 
-            gc.collect()  # Force garbage collection to free memory
 
             # Log a single message with the list of cleaned-up attributes
             if cleaned_up:
@@ -0,0 +1,126 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
+from dotenv import load_dotenv
+from src.logger.default_logger import logger
+
+load_dotenv()
+
+# Browsers kept open per event loop, callers beyond this wait for one to be released
+CRAWLER_POOL_SIZE = int(os.environ.get("CRAWLER_POOL_SIZE", 2))
+# A browser is restarted after crawling this many pages, Chromium grows with every page it loads
+CRAWLER_MAX_PAGES_PER_BROWSER = int(os.environ.get("CRAWLER_MAX_PAGES_PER_BROWSER", 200))
+# Browsers idle for longer than this are checked before being handed out again
+CRAWLER_HEALTH_CHECK_INTERVAL = float(os.environ.get("CRAWLER_HEALTH_CHECK_INTERVAL", 60))
+CRAWLER_HEALTH_CHECK_TIMEOUT = float(os.environ.get("CRAWLER_HEALTH_CHECK_TIMEOUT", 15))
+_HEALTH_CHECK_URL = "raw:<html><body>ok</body></html>"
+
+
+class PooledCrawler:
+    def __init__(self, crawler: AsyncWebCrawler):
+        self.crawler = crawler
+        self.pages = 0
+        self.last_used = time.monotonic()
+        # Set when a crawl raised, the browser may have crashed under it
+        self.suspect = False
+
+
+class CrawlerPool:
+    """
+    Started `AsyncWebCrawler`s reused across crawls instead of launching Chromium for each one.
+
+    Playwright browsers belong to the event loop that started them: the pool binds to the first loop
+    it is used on (the worker loop of a Celery process, the server loop of the API) and crawls from
+    any other loop get a browser of their own as before. A browser is restarted after
+    `max_pages` pages, and checked with a crawl of an inline page when it sat idle or a crawl
+    failed on it.
+    """
+
+    def __init__(self, size: int = CRAWLER_POOL_SIZE, max_pages: int = CRAWLER_MAX_PAGES_PER_BROWSER,
+                 health_check_interval: float = CRAWLER_HEALTH_CHECK_INTERVAL):
+        self.size = size
+        self.max_pages = max_pages
+        self.health_check_interval = health_check_interval
+        self._idle: List[PooledCrawler] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._health_check_config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS)
+
+    @asynccontextmanager
+    async def crawler(self, pages: int = 1) -> AsyncIterator[AsyncWebCrawler]:
+        """
+        A started crawler for `pages` pages, returned to the pool on exit.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is None or self._loop.is_closed():
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.size)
+            self._idle = []
+        if self._loop is not loop:
+            async with AsyncWebCrawler() as crawler:
+                yield crawler
+            return
+        async with self._semaphore:
+            pooled = await self._checkout()
+            try:
+                yield pooled.crawler
+            except BaseException:
+                pooled.suspect = True
+                raise
+            finally:
+                pooled.pages += pages
+                pooled.last_used = time.monotonic()
+                await self._checkin(pooled)
+
+    async def _checkout(self) -> PooledCrawler:
+        while self._idle:
+            pooled = self._idle.pop()
+            idle_for = time.monotonic() - pooled.last_used
+            if not pooled.suspect and idle_for < self.health_check_interval:
+                return pooled
+            if await self.healthy(pooled.crawler):
+                pooled.suspect = False
+                return pooled
+            logger.warning("Discarding a crawler that failed its health check", extra={"tags": {"method": "CrawlerPool._checkout"}})
+            await self._close(pooled)
+        crawler = AsyncWebCrawler()
+        await crawler.start()
+        return PooledCrawler(crawler)
+
+    async def _checkin(self, pooled: PooledCrawler) -> None:
+        if pooled.pages >= self.max_pages:
+            logger.info(f"Recycling a crawler after {pooled.pages} pages", extra={"tags": {"method": "CrawlerPool._checkin"}})
+            await self._close(pooled)
+            return
+        self._idle.append(pooled)
+
+    async def healthy(self, crawler: AsyncWebCrawler) -> bool:
+        """
+        Whether the browser of `crawler` still renders a page.
+        """
+        try:
+            result = await asyncio.wait_for(crawler.arun(url=_HEALTH_CHECK_URL, config=self._health_check_config), CRAWLER_HEALTH_CHECK_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Crawler health check failed: {e}", extra={"tags": {"method": "CrawlerPool.healthy"}})
+            return False
+        return bool(result and result.success)
+
+    async def _close(self, pooled: PooledCrawler) -> None:
+        try:
+            await pooled.crawler.close()
+        except Exception as e:
+            logger.warning(f"Failed to close crawler: {e}", extra={"tags": {"method": "CrawlerPool._close"}})
+
+    async def aclose(self) -> None:
+        """
+        Closes the idle browsers, on the loop the pool is bound to.
+        """
+        idle, self._idle = self._idle, []
+        for pooled in idle:
+            await self._close(pooled)
+
+
+crawler_pool = CrawlerPool()
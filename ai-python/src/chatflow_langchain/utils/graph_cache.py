@@ -0,0 +1,68 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, Tuple
+from dotenv import load_dotenv
+from src.logger.default_logger import logger
+
+load_dotenv()
+
+# Distinct tool sets compiled at once, one graph per (graph name, tool-set signature)
+COMPILED_GRAPH_CACHE_MAX_ENTRIES = int(os.environ.get("COMPILED_GRAPH_CACHE_MAX_ENTRIES", 256))
+
+
+def tool_set_signature(tools: Iterable[Any]) -> Tuple[str, ...]:
+    """
+    Order-independent signature of the tools bound to a model.
+
+    LangChain tools are identified by name, provider-native tools (e.g. `{"type": "web_search_preview"}`)
+    by their type.
+    """
+    names = []
+    for tool in tools:
+        if isinstance(tool, dict):
+            names.append(tool.get("name") or tool.get("type", ""))
+        else:
+            names.append(getattr(tool, "name", type(tool).__name__))
+    return tuple(sorted(names))
+
+
+class CompiledGraphCache:
+    """
+    Process-wide LRU of compiled LangGraph graphs.
+
+    Graphs are compiled once per key and shared by every request, so they must not capture request
+    state: nodes read what they need (the service, its LLM and ToolNode) from
+    `config["configurable"]` at invoke time.
+    """
+
+    def __init__(self, max_entries: int = COMPILED_GRAPH_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._graphs: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compile(self, key: Hashable, compile_graph: Callable[[], Any]) -> Any:
+        with self._lock:
+            graph = self._graphs.get(key)
+            if graph is not None:
+                self._graphs.move_to_end(key)
+                return graph
+        # Compiled outside the lock, two first requests for a key may both compile and one is kept
+        graph = compile_graph()
+        with self._lock:
+            graph = self._graphs.setdefault(key, graph)
+            self._graphs.move_to_end(key)
+            while len(self._graphs) > self.max_entries:
+                self._graphs.popitem(last=False)
+        logger.info(
+            f"Compiled graph for {key}",
+            extra={"tags": {"method": "CompiledGraphCache.get_or_compile"}}
+        )
+        return graph
+
+    def clear(self) -> None:
+        with self._lock:
+            self._graphs.clear()
+
+
+compiled_graph_cache = CompiledGraphCache()
@@ -0,0 +1,160 @@
+import asyncio
+import concurrent.futures
+import os
+from typing import Any, Optional
+import httpx
+from boto3.s3.transfer import TransferConfig
+from dotenv import load_dotenv
+from src.aws.storageClient_service import ClientService
+from src.logger.default_logger import logger
+
+load_dotenv()
+
+# Image generations running at once per process, later ones wait for a slot
+IMAGE_GENERATION_CONCURRENCY = int(os.environ.get("IMAGE_GENERATION_CONCURRENCY", 8))
+IMAGE_TRANSFER_CHUNK_SIZE = int(os.environ.get("IMAGE_TRANSFER_CHUNK_SIZE", 256 * 1024))
+# Downloaded chunks waiting for the upload, the download pauses when they are all taken
+IMAGE_TRANSFER_BUFFER_CHUNKS = int(os.environ.get("IMAGE_TRANSFER_BUFFER_CHUNKS", 8))
+# Bytes the object store client holds per upload part, S3 parts are 5 MiB at least
+IMAGE_TRANSFER_PART_SIZE = int(os.environ.get("IMAGE_TRANSFER_PART_SIZE", 8 * 1024 * 1024))
+IMAGE_TRANSFER_TIMEOUT = float(os.environ.get("IMAGE_TRANSFER_TIMEOUT", 60))
+IMAGE_TRANSFER_CONNECT_TIMEOUT = float(os.environ.get("IMAGE_TRANSFER_CONNECT_TIMEOUT", 10))
+
+# Parts are uploaded one at a time from the calling thread, so one part is in memory per upload
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=IMAGE_TRANSFER_PART_SIZE,
+    multipart_chunksize=IMAGE_TRANSFER_PART_SIZE,
+    use_threads=False,
+)
+
+
+class StreamingBody:
+    """
+    Non-seekable file object over the chunks a download puts in an asyncio queue, read by the
+    object store client in a worker thread while the event loop keeps downloading.
+    """
+
+    def __init__(self, chunks: asyncio.Queue, loop: asyncio.AbstractEventLoop):
+        self._chunks = chunks
+        self._loop = loop
+        self._pending = bytearray()
+        self._eof = False
+        self._closed = False
+        self._waiting: Optional[concurrent.futures.Future] = None
+
+    def _next_chunk(self) -> bytes:
+        if self._closed:
+            raise ValueError("I/O operation on closed image stream")
+        self._waiting = asyncio.run_coroutine_threadsafe(self._chunks.get(), self._loop)
+        try:
+            chunk = self._waiting.result()
+        except concurrent.futures.CancelledError:
+            raise OSError("Image transfer was cancelled")
+        if isinstance(chunk, Exception):
+            raise chunk
+        return chunk
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._eof and (size is None or size < 0 or len(self._pending) < size):
+            chunk = self._next_chunk()
+            if not chunk:
+                self._eof = True
+            self._pending += chunk
+        if size is None or size < 0:
+            size = len(self._pending)
+        data = bytes(self._pending[:size])
+        del self._pending[:size]
+        return data
+
+    def readable(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        self._closed = True
+        if self._waiting is not None:
+            self._waiting.cancel()
+
+
+class ImageTransfer:
+    """
+    Generated images copied from the provider's URL to the object store without blocking the
+    event loop: the body is downloaded with an async client and handed chunk by chunk to an
+    upload running in a worker thread, so at most IMAGE_TRANSFER_BUFFER_CHUNKS chunks and one
+    upload part of an image are in memory.
+
+    Also holds the slots bounding how many image generations run at once. Both the client and the
+    slots belong to the event loop they were created on.
+    """
+
+    def __init__(self, concurrency: int = IMAGE_GENERATION_CONCURRENCY):
+        self.concurrency = concurrency
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _bind(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(IMAGE_TRANSFER_TIMEOUT, connect=IMAGE_TRANSFER_CONNECT_TIMEOUT),
+                follow_redirects=True,
+            )
+            self._slots = asyncio.Semaphore(self.concurrency)
+
+    def slot(self) -> asyncio.Semaphore:
+        """
+        Semaphore an image generation holds from the prompt refinement to the upload.
+        """
+        self._bind()
+        return self._slots
+
+    async def upload_from_url(self, image_url: str, s3_file_name: str, s3_client: Any = None, bucket_name: str = None) -> bool:
+        """
+        Streams the image at `image_url` to `s3_file_name` in the configured bucket, False when the
+        image could not be downloaded.
+        """
+        self._bind()
+        if s3_client is None:
+            client_service = ClientService()
+            s3_client = client_service.client_type.client
+            bucket_name = client_service.client_type.bucket_name
+        loop = asyncio.get_running_loop()
+        async with self._client.stream("GET", image_url) as response:
+            if response.status_code != 200:
+                logger.error(f"Failed to download image from {image_url}", extra={"tags": {"method": "ImageTransfer.upload_from_url"}})
+                return False
+            chunks = asyncio.Queue(maxsize=IMAGE_TRANSFER_BUFFER_CHUNKS)
+
+            async def download():
+                try:
+                    async for chunk in response.aiter_bytes(IMAGE_TRANSFER_CHUNK_SIZE):
+                        await chunks.put(chunk)
+                    await chunks.put(b"")
+                except Exception as e:
+                    await chunks.put(e)
+
+            downloader = asyncio.create_task(download())
+            body = StreamingBody(chunks, loop)
+            try:
+                await asyncio.to_thread(
+                    s3_client.upload_fileobj, body, bucket_name, s3_file_name,
+                    ExtraArgs={"ContentType": response.headers.get("content-type", "image/png")},
+                    Config=_TRANSFER_CONFIG,
+                )
+            finally:
+                # Unblocks an upload still reading when the transfer is cancelled or the upload failed
+                body.close()
+                downloader.cancel()
+        logger.info(f"\nImage successfully uploaded to S3 bucket:{bucket_name} as :{s3_file_name}", extra={"tags": {"method": "ImageTransfer.upload_from_url"}})
+        return True
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+        self._loop = None
+        self._client = None
+        self._slots = None
+
+
+image_transfer = ImageTransfer()
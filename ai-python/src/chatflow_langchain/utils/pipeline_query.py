@@ -1,10 +1,23 @@
 from bson.objectid import ObjectId
-from typing import List, Dict
+from typing import List, Dict, Sequence
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+# Fields returned for each history row, in the order the message history expects them
+HISTORY_FIELDS = ["system", "img_gen_prompt", "message", "ai", "chat_session_id", "sumhistory_checkpoint", "createdAt"]
+HISTORY_REQUIRED_FIELDS = ["system", "message", "ai", "createdAt"]
+
+HISTORY_INDEXES = [
+    IndexModel([("chat_session_id", ASCENDING), ("createdAt", DESCENDING)], name="chat_session_id_createdAt"),
+    IndexModel([("chat_session_id", ASCENDING), ("sumhistory_checkpoint", ASCENDING)], name="chat_session_id_sumhistory_checkpoint"),
+]
 
 def get_latest_checkpoint(chat_session_id: str, db) -> int:
     """
     Get the latest sumhistory_checkpoint value for a given chat session ID.
 
+    The newest message is the turn being answered, so the checkpoint is read from the one before it.
+    Only that single row is read, through the (chat_session_id, createdAt) index.
+
     Args:
         chat_session_id (str): Chat session identifier.
         db (Database): MongoDB database object.
@@ -12,25 +25,95 @@ def get_latest_checkpoint(chat_session_id: str, db) -> int:
     Returns:
         int: Latest sumhistory_checkpoint value.
     """
-    latest_checkpoint_pipeline = [
-        {
-            "$match": {
-                "chat_session_id": ObjectId(chat_session_id),
-            }
-        },
-        {
-            "$project": {
-                "_id": 0,
-                "sumhistory_checkpoint": 1,
-                "createdAt": 1
-            }
-        },
-        {
-            "$sort": { "createdAt": -1 }
-        },
+    cursor = db.messages.find(
+        {"chat_session_id": ObjectId(chat_session_id)},
+        {"_id": 0, "sumhistory_checkpoint": 1}
+    ).sort("createdAt", DESCENDING).skip(1).limit(1)
+    result = list(cursor)
+    return result[0].get("sumhistory_checkpoint",None) if result else None
+
+
+def get_history_since_checkpoint_pipeline(chat_session_id: str, collection_name: str = "messages",
+                                          fields: Sequence[str] = HISTORY_FIELDS,
+                                          required_fields: Sequence[str] = HISTORY_REQUIRED_FIELDS,
+                                          skip_missing_checkpoint: bool = False) -> List[Dict]:
+    """
+    Generate a pipeline that resolves the latest checkpoint and the messages recorded under it in one round trip.
+
+    Args:
+        chat_session_id (str): Chat session identifier.
+        collection_name (str): Messages collection, used for the self $lookup.
+        fields (Sequence[str]): Fields to return for each history row.
+        required_fields (Sequence[str]): Fields that must be set for a row to be part of the history.
+        skip_missing_checkpoint (bool): Return no history when the session has no checkpoint yet.
+
+    Returns:
+        List[Dict]: Aggregation pipeline producing at most one document with a `history` array.
+    """
+    session_id = ObjectId(chat_session_id)
+    history_match = {"chat_session_id": session_id}
+    history_match.update({field: {"$ne": None} for field in required_fields})
+
+    pipeline = [
+        {"$match": {"chat_session_id": session_id}},
+        {"$sort": {"createdAt": -1}},
+        {"$skip": 1},
+        {"$limit": 1},
+        {"$project": {"_id": 0, "sumhistory_checkpoint": 1}},
     ]
-    result = list(db.messages.aggregate(latest_checkpoint_pipeline))
-    return result[1].get("sumhistory_checkpoint",None) if len(result) > 1 else None
+    if skip_missing_checkpoint:
+        pipeline.append({"$match": {"sumhistory_checkpoint": {"$ne": None}}})
+    pipeline.append({
+        "$lookup": {
+            "from": collection_name,
+            "localField": "sumhistory_checkpoint",
+            "foreignField": "sumhistory_checkpoint",
+            "pipeline": [
+                {"$match": history_match},
+                {"$sort": {"createdAt": 1}},
+                {"$project": {field: 1 for field in fields}},
+            ],
+            "as": "history"
+        }
+    })
+    return pipeline
+
+
+def load_history_since_checkpoint(collection, chat_session_id: str, fields: Sequence[str] = HISTORY_FIELDS,
+                                  **kwargs) -> List[Dict]:
+    """
+    Load the history rows of the latest checkpoint with a single aggregate.
+
+    Args:
+        collection (Collection): MongoDB messages collection.
+        chat_session_id (str): Chat session identifier.
+        fields (Sequence[str]): Fields to return for each history row.
+
+    Returns:
+        List[Dict]: History rows ordered by createdAt, with every field of `fields` present.
+    """
+    pipeline = get_history_since_checkpoint_pipeline(chat_session_id, collection.name, fields=fields, **kwargs)
+    result = list(collection.aggregate(pipeline))
+    if not result:
+        return []
+    return [
+        {"_id": row["_id"], **{field: row.get(field) for field in fields}}
+        for row in result[0].get("history", [])
+    ]
+
+
+def ensure_history_indexes(db, collection_name: str = "messages") -> List[str]:
+    """
+    Create the indexes used by the checkpoint lookup and the history load. Safe to call repeatedly.
+
+    Args:
+        db (Database): MongoDB database object.
+        collection_name (str): Messages collection.
+
+    Returns:
+        List[str]: Names of the ensured indexes.
+    """
+    return db[collection_name].create_indexes(HISTORY_INDEXES)
 
 
 def get_pipeline_v2(chat_session_id: str, latest_checkpoint: int) -> List[Dict]:
@@ -0,0 +1,88 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+# Instances created by RequestScoped proxies for the request being served, keyed by proxy
+_request_scope: ContextVar[Optional[Dict["RequestScoped", Any]]] = ContextVar("request_scope", default=None)
+# A scope is shared by the threads its request starts, two of them may resolve the same proxy at once
+_scope_lock = threading.Lock()
+
+
+@contextmanager
+def request_scope():
+    """
+    Open a fresh request scope for the current context.
+
+    Tasks and threads started from inside the scope (asyncio.create_task, asyncio.to_thread,
+    the streaming response body, LangChain callbacks) inherit it, so a request and its
+    callbacks see the same instances while concurrent requests never share one.
+    """
+    token = _request_scope.set({})
+    try:
+        yield
+    finally:
+        _request_scope.reset(token)
+
+
+class RequestScoped:
+    """
+    Module-level stand-in for a stateful service or repository.
+
+    Services keep per-request state on module-level objects (`thread_repo.initialization(...)`,
+    `llm_apikey_decrypt_service.model_name`, ...). The proxy forwards every attribute access to
+    an instance created with `factory` for the current request scope, so that state is no longer
+    shared between interleaved requests. Outside a request scope (Celery tasks, scripts) one
+    instance is kept per context, i.e. per worker thread.
+
+    The proxy reports the class of the instance it resolves to, so it can be passed wherever an
+    instance is expected (e.g. `ConversationSummaryBufferMemory(chat_memory=...)`).
+    """
+
+    __slots__ = ("_factory", "_fallback")
+
+    def __init__(self, factory: Callable[[], Any]):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_fallback", ContextVar(f"request_scoped_{factory.__name__}", default=None))
+
+    def _resolve(self) -> Any:
+        scope = _request_scope.get()
+        if scope is None:
+            instance = self._fallback.get()
+            if instance is None:
+                instance = self._factory()
+                self._fallback.set(instance)
+            return instance
+
+        instance = scope.get(self)
+        if instance is None:
+            with _scope_lock:
+                instance = scope.get(self)
+                if instance is None:
+                    instance = scope[self] = self._factory()
+        return instance
+
+    @property
+    def __class__(self):
+        return type(self._resolve())
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._resolve(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(self._resolve(), name)
+
+    def __str__(self) -> str:
+        return str(self._resolve())
+
+    def __repr__(self) -> str:
+        return f"RequestScoped({self._factory.__name__})"
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
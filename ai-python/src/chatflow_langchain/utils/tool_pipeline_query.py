@@ -1,37 +1,23 @@
 from bson.objectid import ObjectId
 from typing import List, Dict
+from src.chatflow_langchain.utils.pipeline_query import load_history_since_checkpoint
 
-def get_latest_checkpoint(chat_session_id: str, db) -> int:
+# Tool history rows also carry uploaded media, and have no required fields
+TOOL_HISTORY_FIELDS = ["system", "media", "img_gen_prompt", "message", "ai", "chat_session_id", "sumhistory_checkpoint", "createdAt"]
+
+def load_tool_history_since_checkpoint(collection, chat_session_id: str) -> List[Dict]:
     """
-    Get the latest sumhistory_checkpoint value for a given chat session ID.
+    Load the tool history rows of the latest checkpoint with a single aggregate.
 
     Args:
+        collection (Collection): MongoDB messages collection.
         chat_session_id (str): Chat session identifier.
-        db (Database): MongoDB database object.
 
     Returns:
-        int: Latest sumhistory_checkpoint value.
+        List[Dict]: History rows ordered by createdAt, empty when the session has no checkpoint yet.
     """
-    latest_checkpoint_pipeline = [
-        {
-            "$match": {
-                "chat_session_id": ObjectId(chat_session_id),
-            }
-        },
-        {
-            "$project": {
-                "_id": 0,
-                "sumhistory_checkpoint": 1,
-                "createdAt": 1
-            }
-        },
-        {
-            "$sort": { "createdAt": -1 }
-        },
-    ]
-    result = list(db.messages.aggregate(latest_checkpoint_pipeline))
-
-    return result[1].get("sumhistory_checkpoint",None) if len(result) > 1 else None
+    return load_history_since_checkpoint(collection, chat_session_id, fields=TOOL_HISTORY_FIELDS,
+                                         required_fields=[], skip_missing_checkpoint=True)
 
 
 def get_pipeline_v2(chat_session_id: str, latest_checkpoint: str) -> List[Dict]:
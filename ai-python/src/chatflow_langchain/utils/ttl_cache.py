@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Thread-safe map whose entries expire `ttl` seconds after they are set, holding at most
+    `max_entries` and dropping the least recently used first.
+
+    `generation` changes on every removal: a value loaded before an invalidation is passed to `set`
+    with the generation read before loading and is not cached.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.generation = 0
+        self._entries: "OrderedDict[K, Tuple[V, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._entries.pop(key, None)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: K, value: V, generation: Optional[int] = None) -> None:
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, predicate: Callable[[K, V], bool]) -> int:
+        """
+        Drops the entries `predicate(key, value)` is true for and returns how many were dropped.
+        """
+        with self._lock:
+            self.generation += 1
+            stale = [key for key, (value, _) in self._entries.items() if predicate(key, value)]
+            for key in stale:
+                self._entries.pop(key, None)
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+
+class SingleFlight(Generic[K, V]):
+    """
+    Concurrent loads of the same key on one event loop share the first caller's load.
+
+    When the first caller is cancelled the others fail with `RuntimeError(cancelled_message)`
+    instead of being cancelled with it.
+    """
+
+    def __init__(self, cancelled_message: str):
+        self.cancelled_message = cancelled_message
+        self._pending: Dict[K, asyncio.Future] = {}
+
+    async def run(self, key: K, load: Callable[[], Awaitable[V]]) -> V:
+        loop = asyncio.get_running_loop()
+        future = self._pending.get(key)
+        if future is not None and future.get_loop() is loop:
+            return await asyncio.shield(future)
+        future = loop.create_future()
+        self._pending[key] = future
+        try:
+            result = await load()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.set_exception(RuntimeError(self.cancelled_message))
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieved so a failure nobody else waited on is not reported as unhandled
+            future.exception()
+            raise
+        finally:
+            if self._pending.get(key) is future:
+                del self._pending[key]
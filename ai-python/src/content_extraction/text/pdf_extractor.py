@@ -2,9 +2,60 @@ from src.content_extraction.text.extractor_base import TextExtractor
 from PyPDF2 import PdfReader
 from typing import Union, List
 from src.content_extraction.text.s3_extractor import S3TextExtractor,LocalStackTextExtractor,MinioTextExtractor
+from src.content_extraction.text.pdf_pages import extract_page_range, page_text
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+import multiprocessing
+import tempfile
 import time
+import os
+from src.chatflow_langchain.utils.process_pool import SpawnPool
 from src.logger.default_logger import logger
 
+# Processes pages are sharded across, 1 extracts every page in the calling process
+PDF_EXTRACTION_WORKERS = int(os.environ.get("PDF_EXTRACTION_WORKERS", min(4, os.cpu_count() or 1)))
+# Smaller documents are extracted in process, the pool only pays off past a few dozen pages
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("PDF_PARALLEL_MIN_PAGES", 32))
+PDF_PAGES_PER_SHARD = int(os.environ.get("PDF_PAGES_PER_SHARD", 16))
+
+# Spawned workers import only pdf_pages
+_pool = SpawnPool()
+
+
+def extract_pdf_pages(content: Union[bytes, BytesIO]) -> List[str]:
+    """
+    Text of every page of a PDF, linked words followed by their URI.
+
+    Documents of PDF_PARALLEL_MIN_PAGES pages or more are split into shards of PDF_PAGES_PER_SHARD
+    pages, extracted by a pool of PDF_EXTRACTION_WORKERS processes and reassembled in page order.
+    """
+    import pymupdf
+
+    data = content.getvalue() if isinstance(content, BytesIO) else content
+    with pymupdf.open(stream=data, filetype="pdf") as doc:
+        page_count = doc.page_count
+        # Daemonic processes (e.g. prefork pool children) cannot start the pool's processes
+        if (PDF_EXTRACTION_WORKERS <= 1 or page_count < PDF_PARALLEL_MIN_PAGES
+                or multiprocessing.current_process().daemon):
+            return [page_text(page) for page in doc]
+
+    # Workers open the document from a file instead of receiving its bytes with every shard
+    with tempfile.NamedTemporaryFile(suffix=".pdf") as pdf_file:
+        pdf_file.write(data)
+        pdf_file.flush()
+        shards = [(start, min(start + PDF_PAGES_PER_SHARD, page_count)) for start in range(0, page_count, PDF_PAGES_PER_SHARD)]
+        try:
+            pool = _pool.get(PDF_EXTRACTION_WORKERS)
+            futures = [pool.submit(extract_page_range, pdf_file.name, start, stop) for start, stop in shards]
+            return [text for future in futures for text in future.result()]
+        except BrokenProcessPool as e:
+            logger.warning(
+                f"PDF extraction pool failed, extracting in process: {e}",
+                extra={"tags": {"method": "extract_pdf_pages"}}
+            )
+            _pool.reset()
+            return extract_page_range(pdf_file.name, 0, page_count)
+
 class PDFTextExtractor(TextExtractor):
     def extract_text(self, page_wise: bool = False) -> Union[str, List[str]]:
         """Extracts text from a PDF content, can return either all text at once or page-by-page."""
@@ -29,36 +80,8 @@ class PDFTextExtractor(TextExtractor):
 class S3PDFTextExtractor(S3TextExtractor):
     def extract_text(self, page_wise: bool = False) -> Union[str, List[str]]:
         """Extracts text from PDF, appending hyperlinks immediately after the linked word."""
-        import pymupdf
-       
         start_time = time.time()
-        doc = pymupdf.open(stream=self.content, filetype="pdf")
-        result_pages = []
-
-        for page in doc:
-            words = page.get_text("words")
-            links = page.get_links()
-            
-            page_text = []
-            
-            for word in words:
-                word_rect = pymupdf.Rect(word[:4])
-                text = word[4]
-                
-                # Check if this word has a hyperlink
-                for link in links:
-                    if 'uri' in link and word_rect.intersects(link['from']):
-                        text = f"{text}({link['uri']})"
-                        break
-                
-                
-                page_text.append(text)
-            result_pages.append(" ".join(page_text))
-
-
-
-        doc.close()
-        del doc
+        result_pages = extract_pdf_pages(self.content)
         end_time = time.time()
         logger.info(f"Time taken to extract text from PDF: {end_time - start_time} seconds",extra={"tags": {"method": "S3PDFTextExtractor.extract_text"}})
         return result_pages if page_wise else ' '.join(result_pages)
@@ -72,36 +95,8 @@ class S3PDFTextExtractor(S3TextExtractor):
 class LSTACKPDFTextExtractor(LocalStackTextExtractor):
     def extract_text(self, page_wise: bool = False) -> Union[str, List[str]]:
         """Extracts text from PDF, appending hyperlinks immediately after the linked word."""
-        import pymupdf
-       
         start_time = time.time()
-        doc = pymupdf.open(stream=self.content, filetype="pdf")
-        result_pages = []
-
-        for page in doc:
-            words = page.get_text("words")
-            links = page.get_links()
-            
-            page_text = []
-            
-            for word in words:
-                word_rect = pymupdf.Rect(word[:4])
-                text = word[4]
-                
-                # Check if this word has a hyperlink
-                for link in links:
-                    if 'uri' in link and word_rect.intersects(link['from']):
-                        text = f"{text}({link['uri']})"
-                        break
-                
-                
-                page_text.append(text)
-            result_pages.append(" ".join(page_text))
-
-
-
-        doc.close()
-        del doc
+        result_pages = extract_pdf_pages(self.content)
         end_time = time.time()
         logger.info(f"Time taken to extract text from PDF: {end_time - start_time} seconds",extra={"tags": {"method": "LSTACKPDFTextExtractor.extract_text"}})
         return result_pages if page_wise else ' '.join(result_pages)
@@ -110,36 +105,8 @@ class LSTACKPDFTextExtractor(LocalStackTextExtractor):
 class MINIOPDFTextExtractor(MinioTextExtractor):
     def extract_text(self, page_wise: bool = False) -> Union[str, List[str]]:
         """Extracts text from PDF, appending hyperlinks immediately after the linked word."""
-        import pymupdf
-       
         start_time = time.time()
-        doc = pymupdf.open(stream=self.content, filetype="pdf")
-        result_pages = []
-
-        for page in doc:
-            words = page.get_text("words")
-            links = page.get_links()
-            
-            page_text = []
-            
-            for word in words:
-                word_rect = pymupdf.Rect(word[:4])
-                text = word[4]
-                
-                # Check if this word has a hyperlink
-                for link in links:
-                    if 'uri' in link and word_rect.intersects(link['from']):
-                        text = f"{text}({link['uri']})"
-                        break
-                
-                
-                page_text.append(text)
-            result_pages.append(" ".join(page_text))
-
-
-
-        doc.close()
-        del doc
+        result_pages = extract_pdf_pages(self.content)
         end_time = time.time()
         logger.info(f"Time taken to extract text from PDF: {end_time - start_time} seconds",extra={"tags": {"method": "MINIOPDFTextExtractor.extract_text"}})
         return result_pages if page_wise else ' '.join(result_pages)
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""
+Page-level PDF text extraction with hyperlinks appended after the linked word.
+
+Kept free of service imports: the pool workers of `pdf_extractor.extract_pdf_pages` are spawned
+processes that import only this module.
+"""
+import math
+from typing import Dict, List, Optional
+import pymupdf
+
+# Height in points of the horizontal bands links are bucketed into, about a line of body text
+LINK_BAND_HEIGHT = 12.0
+# Links spanning more bands than this (page-sized or malformed rects) are checked against every word
+MAX_LINK_BANDS = 64
+
+
+class LinkIndex:
+    """
+    URI links of a page bucketed by horizontal band, so each word is only tested against the links
+    sharing one of its bands instead of every link of the page.
+
+    Candidates are tested in page order with `Rect.intersects`, the first match wins as before.
+    """
+
+    def __init__(self, links: List[Dict]):
+        self.links = [link for link in links if 'uri' in link]
+        self.rects = [pymupdf.Rect(link['from']) for link in self.links]
+        self.bands: Dict[int, List[int]] = {}
+        self.unbanded: List[int] = []
+        for position, rect in enumerate(self.rects):
+            bands = self._bands(rect.y0, rect.y1)
+            if bands is None or len(bands) > MAX_LINK_BANDS:
+                self.unbanded.append(position)
+                continue
+            for band in bands:
+                self.bands.setdefault(band, []).append(position)
+
+    @staticmethod
+    def _bands(y0: float, y1: float) -> Optional[range]:
+        if not (math.isfinite(y0) and math.isfinite(y1)) or y0 > y1:
+            return None
+        return range(math.floor(y0 / LINK_BAND_HEIGHT), math.floor(y1 / LINK_BAND_HEIGHT) + 1)
+
+    def __bool__(self) -> bool:
+        return bool(self.links)
+
+    def find(self, x0: float, y0: float, x1: float, y1: float) -> Optional[Dict]:
+        """
+        The first link of the page intersecting the word rect (x0, y0, x1, y1), or None.
+        """
+        bands = self._bands(y0, y1)
+        candidates = set(self.unbanded)
+        for band in bands or ():
+            candidates.update(self.bands.get(band, ()))
+        word_rect = None
+        for position in sorted(candidates):
+            rect = self.rects[position]
+            # Rects that do not overlap cannot intersect, only overlapping ones pay for a Rect
+            if not (x0 < rect.x1 and rect.x0 < x1 and y0 < rect.y1 and rect.y0 < y1):
+                continue
+            if word_rect is None:
+                word_rect = pymupdf.Rect(x0, y0, x1, y1)
+            if word_rect.intersects(rect):
+                return self.links[position]
+        return None
+
+
+def page_text(page: pymupdf.Page) -> str:
+    """
+    Words of a page joined by spaces, each linked word followed by `(uri)`.
+    """
+    links = LinkIndex(page.get_links())
+    texts = []
+    for word in page.get_text("words"):
+        text = word[4]
+        if links:
+            link = links.find(*word[:4])
+            if link is not None:
+                text = f"{text}({link['uri']})"
+        texts.append(text)
+    return " ".join(texts)
+
+
+def extract_page_range(path: str, start: int, stop: int) -> List[str]:
+    """
+    Texts of pages [start, stop) of the PDF at `path`, run in a pool worker.
+    """
+    with pymupdf.open(path) as doc:
+        return [page_text(doc[number]) for number in range(start, stop)]
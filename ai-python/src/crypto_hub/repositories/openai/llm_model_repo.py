@@ -3,6 +3,7 @@ from bson.objectid import ObjectId
 from pymongo.errors import PyMongoError
 from src.crypto_hub.repositories.openai.base_company_model_repo import AbstractCompanyModelRepository
 from src.logger.default_logger import logger
+from src.crypto_hub.utils.model_config_cache import model_config_cache
 
 class LLMModelRepository(AbstractCompanyModelRepository):
     """
@@ -28,7 +29,8 @@ class LLMModelRepository(AbstractCompanyModelRepository):
         """
         self.api_key_id = api_key_id
         self.instance = self.db_instance.get_collection(collection_name)
-        self.result = self._fetch_company_model_data()
+        # Served from the shared cache, title/tool/doc services resolve the same model per request
+        self.result = model_config_cache.get_record(collection_name, api_key_id, self._fetch_company_model_data)
         self.collection_name = collection_name
 
     def _fetch_company_model_data(self):
@@ -1,13 +1,15 @@
 from src.crypto_hub.repositories.openai.llm_model_repo import LLMModelRepository
 from src.logger.default_logger import logger
 from src.crypto_hub.utils.crypto_utils import MessageDecryptor
+from src.crypto_hub.utils.model_config_cache import model_config_cache
 from dotenv import load_dotenv
 import os
 from bson.objectid import ObjectId
 from pymongo.errors import PyMongoError
 from src.db.config import db_instance
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-llm_model_repo = LLMModelRepository()
+llm_model_repo = RequestScoped(LLMModelRepository)
 
 load_dotenv()
 
@@ -42,6 +44,7 @@ class LLMAPIKeyDecryptionHandler:
         try:
             self.apikey=None
             self.repository = llm_model_repo.initialization(api_key_id, collection_name)
+            self.collection_name = collection_name
             self.__encrypted_data = llm_model_repo._get_config_data()
             self.cred_config=self.__encrypted_data
             self.model_name = llm_model_repo.get_model_name()
@@ -101,7 +104,7 @@ class LLMAPIKeyDecryptionHandler:
                     extra={"tags": {"method": "LLMAPIKeyDecryptionHandler.decrypt"}}
                 )
                 raise ValueError("Decryptor not properly initialized")
-            return self.decryptor.decrypt(self.apikey)
+            return model_config_cache.decrypt_api_key(self.collection_name, self.api_key_id, self.apikey, self.decryptor)
         except ValueError as e:
             logger.error(
                 f"Value error: {e}",
@@ -123,6 +126,7 @@ class LLMAPIKeyDecryptionHandler:
         }
         try:
             self.instance.update_one(query, data)
+            model_config_cache.publish_invalidation(self.api_key_id)
             logger.info(
                 f"Successfully updated is_deprecated status to {is_deprecated} for Llm key ID: {self.api_key_id}",
                 extra={"tags": {
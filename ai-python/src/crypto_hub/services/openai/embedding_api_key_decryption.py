@@ -3,12 +3,14 @@ from src.logger.default_logger import logger
 from dotenv import load_dotenv
 import os
 from src.crypto_hub.utils.crypto_utils import MessageDecryptor
+from src.crypto_hub.utils.model_config_cache import model_config_cache
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
 load_dotenv()
 
 security_key = os.getenv("SECURITY_KEY").encode("utf-8")
 
-embedding_model_repo = EmbeddingModelRepository()
+embedding_model_repo = RequestScoped(EmbeddingModelRepository)
 
 
 class EmbeddingAPIKeyDecryptionHandler:
@@ -38,6 +40,8 @@ class EmbeddingAPIKeyDecryptionHandler:
         """
         try:
             self.repository = embedding_model_repo.initialization(api_key_id, collection_name)
+            self.api_key_id = api_key_id
+            self.collection_name = collection_name
             self.__encrypted_data = embedding_model_repo._get_config_data()
             self.model_name = embedding_model_repo.get_model_name()
             self.dimensions = embedding_model_repo.get_dimensions()
@@ -87,7 +91,7 @@ class EmbeddingAPIKeyDecryptionHandler:
                     "Decryptor not properly initialized",
                     extra={"tags": {"method": "EmbeddingAPIKeyDecryptionHandler.decrypt"}})
                 raise ValueError("Decryptor not properly initialized")
-            return self.decryptor.decrypt(self.apikey)
+            return model_config_cache.decrypt_api_key(self.collection_name, self.api_key_id, self.apikey, self.decryptor)
         except ValueError as e:
             logger.error(
                 f"Value error: {e}",
@@ -0,0 +1,87 @@
+import copy
+import os
+from typing import Callable, Optional, Tuple
+from dotenv import load_dotenv
+from src.chatflow_langchain.utils.ttl_cache import TTLCache
+from src.db.redis_invalidation import INVALIDATE_ALL, InvalidationListener
+
+load_dotenv()
+
+# Seconds a resolved company model is served without going back to Mongo
+MODEL_CONFIG_CACHE_TTL = float(os.environ.get("MODEL_CONFIG_CACHE_TTL", 60))
+MODEL_CONFIG_CACHE_MAX_ENTRIES = int(os.environ.get("MODEL_CONFIG_CACHE_MAX_ENTRIES", 1024))
+# The Node API publishes a companymodel id here on every update, "*" when the ids are not known
+COMPANY_MODEL_INVALIDATION_CHANNEL = os.environ.get("COMPANY_MODEL_INVALIDATION_CHANNEL", "companymodel:invalidate")
+
+
+class _ResolvedModelConfig:
+    __slots__ = ("record", "ciphertext", "apikey")
+
+    def __init__(self, record: dict):
+        self.record = record
+        self.ciphertext: Optional[str] = None
+        self.apikey: Optional[str] = None
+
+
+class ModelConfigCache:
+    """
+    Process-wide cache of resolved company models: the companymodel record (model name, bot/provider,
+    config, extraConfig) and its decrypted API key.
+
+    Entries live for MODEL_CONFIG_CACHE_TTL and are dropped as soon as an invalidation for their id
+    is received on COMPANY_MODEL_INVALIDATION_CHANNEL. The listener runs in a daemon thread started
+    by the first lookup, so the gateway and the Celery workers both subscribe.
+    """
+
+    def __init__(self, ttl: float = MODEL_CONFIG_CACHE_TTL, max_entries: int = MODEL_CONFIG_CACHE_MAX_ENTRIES):
+        self._entries: "TTLCache[Tuple[str, str], _ResolvedModelConfig]" = TTLCache(ttl, max_entries)
+        self._listener = InvalidationListener(COMPANY_MODEL_INVALIDATION_CHANNEL, self.invalidate, "model-config-invalidation")
+
+    def get_record(self, collection_name: str, api_key_id: str, loader: Callable[[], Optional[dict]]) -> Optional[dict]:
+        """
+        Return the company model record, loading it with `loader` on a miss.
+
+        Records are copied on the way out, callers are free to modify what they get.
+        """
+        self._listener.ensure_started()
+        key = (collection_name, str(api_key_id))
+        entry = self._entries.get(key)
+        if entry is None:
+            generation = self._entries.generation
+            record = loader()
+            if not record:
+                # Lookup errors are not cached, the next request retries
+                return record
+            entry = _ResolvedModelConfig(record)
+            self._entries.set(key, entry, generation)
+        return copy.deepcopy(entry.record)
+
+    def decrypt_api_key(self, collection_name: str, api_key_id: str, ciphertext: str, decryptor) -> str:
+        """
+        Return the decrypted API key of a cached company model, decrypting it once per entry.
+        """
+        entry = self._entries.get((collection_name, str(api_key_id)))
+        if entry is not None and entry.apikey is not None and entry.ciphertext == ciphertext:
+            return entry.apikey
+        apikey = decryptor.decrypt(ciphertext)
+        if entry is not None:
+            entry.ciphertext, entry.apikey = ciphertext, apikey
+        return apikey
+
+    def invalidate(self, api_key_id: Optional[str] = None) -> None:
+        """
+        Drop one company model from every collection, or every entry when no id is given.
+        """
+        if api_key_id is None or api_key_id == INVALIDATE_ALL:
+            self._entries.clear()
+        else:
+            self._entries.discard(lambda key, entry: key[1] == str(api_key_id))
+
+    def publish_invalidation(self, api_key_id: Optional[str] = None) -> None:
+        """
+        Invalidate locally and in every other process subscribed to the channel.
+        """
+        self.invalidate(api_key_id)
+        self._listener.publish(api_key_id)
+
+model_config_cache = ModelConfigCache()
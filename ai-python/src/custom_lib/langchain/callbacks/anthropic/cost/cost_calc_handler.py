@@ -10,7 +10,9 @@ from langchain_core.messages import AIMessage
 from langchain_core.outputs import ChatGeneration, LLMResult
 from src.round_robin.llm_key_manager import APIKeySelectorService,APIKeyUsageService
 from src.chatflow_langchain.service.config.model_config_anthropic import Functionality
-thread_repo=ThreadRepostiory()
+from src.chatflow_langchain.utils.request_context import RequestScoped
+from src.vector_store.qdrant.langchain_lib.embedding_cache import query_embedding_usage
+thread_repo=RequestScoped(ThreadRepostiory)
 
 MODEL_COST_PER_1K_INPUT_TOKENS = {
     "claude-instant-1.2": 0.0008,
@@ -148,7 +150,8 @@ class AnthropicTokenUsageCallbackAsync(AsyncCallbackHandler):
         }
         # await self.api_usage_service.update_usage_anthropic(provider='ANTHROPIC',tokens_used= token_data, model=self.model_name, api_key=self.encrypted_key,functionality=Functionality.CHAT,company_id=self.companyRedis_id)
         additional_data = {"imageT":self.imageT,"isMedia":self.isMedia}
-        thread_repo.initialization(self.thread_id, self.collection_name)
+        additional_data.update(query_embedding_usage.report())
+        thread_repo.initialization_for_update(self.thread_id, self.collection_name)
         thread_repo.update_tools_token_data(token_data,additional_data=additional_data)
         logger.info("Updated token data in database in on_llm_end",
             extra={"tags": {"method": "CostCalcCallbackHandler.on_llm_end"}})
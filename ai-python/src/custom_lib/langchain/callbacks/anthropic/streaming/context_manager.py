@@ -1,4 +1,4 @@
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 from contextlib import asynccontextmanager
 from src.logger.default_logger import logger
 from src.custom_lib.langchain.callbacks.anthropic.streaming.stream_async_handler import AsyncStreamingStdOutCallbackHandler
@@ -14,8 +14,8 @@ async def streaming_stdout_callback()-> AsyncGenerator[AsyncStreamingStdOutCallb
 
 
 @asynccontextmanager
-async def async_streaming_handler()-> AsyncGenerator[CustomAsyncIteratorCallbackHandler, None]:
-    handler = CustomAsyncIteratorCallbackHandler()
+async def async_streaming_handler(flush_interval: Optional[float] = None)-> AsyncGenerator[CustomAsyncIteratorCallbackHandler, None]:
+    handler = CustomAsyncIteratorCallbackHandler(flush_interval=flush_interval)
     try:
         yield handler
     except Exception as e:
@@ -23,6 +23,8 @@ async def async_streaming_handler()-> AsyncGenerator[CustomAsyncIteratorCallback
             f"Failed to async context manager: {e}",
             extra={"tags": {"method": "streaming.async_streaming_handler"}}
         )
+        # Cancel handler on exception
+        handler.cancel()
         raise e
     finally:
         logger.info(
@@ -13,8 +13,10 @@ from src.round_robin.llm_key_manager import APIKeySelectorService,APIKeyUsageSer
 from src.chatflow_langchain.service.config.model_config_gemini import Functionality
 import threading
 from typing import Union,Any
+from src.chatflow_langchain.utils.request_context import RequestScoped
+from src.vector_store.qdrant.langchain_lib.embedding_cache import query_embedding_usage
 
-thread_repo=ThreadRepostiory()
+thread_repo=RequestScoped(ThreadRepostiory)
 
 MODEL_COST_PER_1K_INPUT_TOKENS = {
     "gemini-1.5-flash": 0.000075,
@@ -134,7 +136,8 @@ class GeminiTokenUsageCallbackAsync(AsyncCallbackHandler):
             "totalCost": self.total_cost
         }
         additional_data = {"imageT":self.imageT,"isMedia":self.isMedia}
-        thread_repo.initialization(self.thread_id, self.collection_name)
+        additional_data.update(query_embedding_usage.report())
+        thread_repo.initialization_for_update(self.thread_id, self.collection_name)
         thread_repo.update_tools_token_data(token_data,additional_data=additional_data)
         logger.info("Updated token data in database in on_llm_end",
             extra={"tags": {"method": "CostCalcCallbackHandler.on_llm_end"}})        
@@ -2,7 +2,6 @@ from typing import AsyncGenerator
 from src.custom_lib.langchain.callbacks.anthropic.image_cost.dalle_cost import DalleCostcallback
 from contextlib import asynccontextmanager
 from src.logger.default_logger import logger
-import gc
 
 @asynccontextmanager
 async def dalle_callback_handler(llm_model,dalle_model,cost=None,thread_id:str=None, collection_name:str=None,**kwargs) -> AsyncGenerator[DalleCostcallback, None]:
@@ -16,6 +15,5 @@ async def dalle_callback_handler(llm_model,dalle_model,cost=None,thread_id:str=N
             extra={"tags": {"method": "streaming.async_streaming_handler"}})
         raise e
     finally:
-        gc.collect()
         # Clean up or finalize if necessary
         logger.info("==DalleCostcallback==") 
\ No newline at end of file
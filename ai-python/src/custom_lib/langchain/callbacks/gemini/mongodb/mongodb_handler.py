@@ -5,13 +5,14 @@ import msgpack
 from src.logger.default_logger import logger
 from langchain.schema import LLMResult
 from src.chatflow_langchain.repositories.thread_repository import ThreadRepostiory
+from src.custom_lib.langchain.memory.summary_pool import schedule_summary
 from src.custom_lib.langchain.callbacks.gemini.cost.context_manager import gemini_sync_cost_handler
 from src.chatflow_langchain.repositories.company_repository import CompanyRepostiory
 from src.round_robin.llm_key_manager import APIKeyUsageService
 from src.chatflow_langchain.service.config.model_config_gemini import Functionality
-import re
-company_repo=CompanyRepostiory()
-thread_repo=ThreadRepostiory()
+from src.chatflow_langchain.utils.request_context import RequestScoped
+company_repo=RequestScoped(CompanyRepostiory)
+thread_repo=RequestScoped(ThreadRepostiory)
 
 class MongoDBCallbackHandler(AsyncCallbackHandler):
     def __init__(self, thread_id: str = None, chat_history: str = None, memory=None,collection_name=None,regenerated_flag=False,model_name=None,msgCredit=0,is_paid_user=False,*args, **kwargs):
@@ -57,23 +58,22 @@ class MongoDBCallbackHandler(AsyncCallbackHandler):
                         message=self.messages,
                         thread_id=self.thread_id
                     )
-                thread_repo.initialization(thread_id=self.thread_id,collection_name=self.collection_name)
+                thread_repo.initialization_for_update(thread_id=self.thread_id,collection_name=self.collection_name)
                 if self.is_paid_user:
                     thread_repo.update_credits(msgCredit=self.msgCredit)
                 else:
-                    company_repo.initialization(company_id=str(thread_repo.result['companyId']),collection_name='company')
+                    company_repo.initialization_for_update(company_id=thread_repo.get_company_id(),collection_name='company')
                     company_repo.update_free_messages(model_code='GEMINI')
                 if not self.regenerated_flag:
-                    with gemini_sync_cost_handler(model_name=self.model_name) as cb:
-                        self.memory.prune()
-                    match = re.search(r'(?<=\/)[^\/]+$', self.memory.llm.model)
-                    # await self.api_usage_service.update_usage(provider='GEMINI',tokens_used= cb.total_tokens, model=match.group(), api_key=self.encrypted_key,functionality=Functionality.CHAT,company_id=self.companyRedis_id)
-
-                    thread_repo.update_token_usage_summary(cb=cb)
-                    self.chat_history.add_message_system(
-                        message=self.memory.moving_summary_buffer,
-                        thread_id=self.thread_id
+                    schedule_summary(
+                        memory=self.memory,
+                        chat_history=self.chat_history,
+                        thread_id=self.thread_id,
+                        collection_name=self.collection_name,
+                        cost_callback=lambda: gemini_sync_cost_handler(model_name=self.model_name)
                     )
+                    # match = re.search(r'(?<=\/)[^\/]+$', self.memory.llm.model)
+                    # await self.api_usage_service.update_usage(provider='GEMINI',tokens_used= cb.total_tokens, model=match.group(), api_key=self.encrypted_key,functionality=Functionality.CHAT,company_id=self.companyRedis_id)
                 else: 
                         thread_repo.update_response_model(responseModel=self.model_name,model_code='GEMINI')
                 logger.info(
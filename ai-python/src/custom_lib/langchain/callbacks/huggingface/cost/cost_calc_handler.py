@@ -9,8 +9,10 @@ from langchain_core.messages import BaseMessage
 from langchain.schema import LLMResult
 from src.chatflow_langchain.repositories.thread_repository import ThreadRepostiory
 from src.logger.default_logger import logger
+from src.chatflow_langchain.utils.request_context import RequestScoped
+from src.vector_store.qdrant.langchain_lib.embedding_cache import query_embedding_usage
 
-thread_repo=ThreadRepostiory()
+thread_repo=RequestScoped(ThreadRepostiory)
 class CostCalculator():
     def __init__(self, total_cost=0, total_tokens=0, prompt_tokens=0, completion_tokens=0):
         self.total_cost = total_cost
@@ -105,7 +107,8 @@ class CostCalcCallbackHandler(AsyncCallbackHandler):
             "totalCost": self.cost.total_cost
         }
         additional_data = {"imageT":self.imageT,"isMedia":self.isMedia}
-        thread_repo.initialization(self.thread_id, self.collection_name)
+        additional_data.update(query_embedding_usage.report())
+        thread_repo.initialization_for_update(self.thread_id, self.collection_name)
         thread_repo.update_tools_token_data(token_data,additional_data=additional_data)
         logger.info("Updated token data in database in on_llm_end",
             extra={"tags": {"method": "CostCalcCallbackHandler.on_llm_end"}})
@@ -9,8 +9,9 @@ from typing import Dict, List, Any
 from langchain_core.messages import BaseMessage
 from langchain.schema import LLMResult
 from src.chatflow_langchain.repositories.thread_repository import ThreadRepostiory
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-thread_repo=ThreadRepostiory()
+thread_repo=RequestScoped(ThreadRepostiory)
 DALLE_COST_PER_IMAGE  ={
     'dall-e-2': {
         'standard':{
@@ -129,7 +130,7 @@ class DalleCostcallback(AsyncCallbackHandler):
             "totalCost": self.cost.total_cost
         }
         additional_data = {"imageT":self.imageT,"isMedia":self.isMedia}
-        thread_repo.initialization(self.thread_id, self.collection_name)
+        thread_repo.initialization_for_update(self.thread_id, self.collection_name)
         thread_repo.update_tools_token_data(token_data,additional_data=additional_data)
         
     async def on_llm_error(self, error: Exception, **kwargs: Any) -> None:
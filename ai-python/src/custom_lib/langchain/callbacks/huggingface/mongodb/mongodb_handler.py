@@ -3,10 +3,12 @@ from langchain.callbacks.base import AsyncCallbackHandler
 from src.logger.default_logger import logger
 from langchain.schema import LLMResult
 from src.chatflow_langchain.repositories.thread_repository import ThreadRepostiory
+from src.custom_lib.langchain.memory.summary_pool import schedule_summary
 from src.custom_lib.langchain.callbacks.huggingface.cost.context_manager import get_huggingface_callback
 from src.chatflow_langchain.repositories.company_repository import CompanyRepostiory
-company_repo=CompanyRepostiory()
-thread_repo=ThreadRepostiory()
+from src.chatflow_langchain.utils.request_context import RequestScoped
+company_repo=RequestScoped(CompanyRepostiory)
+thread_repo=RequestScoped(ThreadRepostiory)
 
 class MongoDBCallbackHandler(AsyncCallbackHandler):
     def __init__(self, thread_id: str = None, chat_history: str = None, memory=None,collection_name=None,regenerated_flag=False,msgCredit=0,is_paid_user=False):
@@ -37,20 +39,19 @@ class MongoDBCallbackHandler(AsyncCallbackHandler):
                     message=self.messages,
                     thread_id=self.thread_id
                 )
-                thread_repo.initialization(thread_id=self.thread_id,collection_name=self.collection_name)
+                thread_repo.initialization_for_update(thread_id=self.thread_id,collection_name=self.collection_name)
                 if self.is_paid_user:
                     thread_repo.update_credits(msgCredit=self.msgCredit)
                 else:
-                    company_repo.initialization(company_id=str(thread_repo.result['companyId']),collection_name='company')
+                    company_repo.initialization_for_update(company_id=thread_repo.get_company_id(),collection_name='company')
                     company_repo.update_free_messages(model_code='HUGGING_FACE')
                 if not self.regenerated_flag:
-                    with get_huggingface_callback() as cb:
-                        self.memory.prune()
-
-                    thread_repo.update_token_usage_summary(cb=cb)
-                    self.chat_history.add_message_system(
-                        message=self.memory.moving_summary_buffer,
-                        thread_id=self.thread_id
+                    schedule_summary(
+                        memory=self.memory,
+                        chat_history=self.chat_history,
+                        thread_id=self.thread_id,
+                        collection_name=self.collection_name,
+                        cost_callback=get_huggingface_callback
                     )
                 logger.info(
                     "Successfully stored the response",
@@ -14,12 +14,14 @@ from src.logger.default_logger import logger
 import threading
 from src.round_robin.llm_key_manager import APIKeySelectorService,APIKeyUsageService
 from src.chatflow_langchain.service.config.model_config_openai import Functionality
+from src.chatflow_langchain.utils.request_context import RequestScoped
+from src.vector_store.qdrant.langchain_lib.embedding_cache import query_embedding_usage
 
 MODEL_COST_PER_1K_TOKENS['chatgpt-4o-latest']=0.005
 MODEL_COST_PER_1K_TOKENS['chatgpt-4o-latest-completion']=0.015
 
 
-thread_repo=ThreadRepostiory()
+thread_repo=RequestScoped(ThreadRepostiory)
 
 class CostCalculator():
     def __init__(self, total_cost=0, total_tokens=0, prompt_tokens=0, completion_tokens=0):
@@ -178,7 +180,8 @@ class CostCalcCallbackHandler(AsyncCallbackHandler):
  
         if self.search_context_size:
             additional_data['webCost'] =cost_per_request.get(self.model_name,{}).get(self.search_context_size,0)
-        thread_repo.initialization(self.thread_id, self.collection_name)
+        additional_data.update(query_embedding_usage.report())
+        thread_repo.initialization_for_update(self.thread_id, self.collection_name)
         thread_repo.update_tools_token_data(token_data,additional_data=additional_data)
         logger.info("Updated token data in database in on_llm_end",
             extra={"tags": {"method": "CostCalcCallbackHandler.on_llm_end"}})
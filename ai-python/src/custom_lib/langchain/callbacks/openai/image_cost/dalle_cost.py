@@ -15,8 +15,9 @@ from langchain_core.messages import BaseMessage, AIMessage
 from src.round_robin.llm_key_manager import APIKeyUsageService
 from src.chatflow_langchain.service.config.model_config_openai import Functionality
 import threading
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-thread_repo=ThreadRepostiory()
+thread_repo=RequestScoped(ThreadRepostiory)
 INPUT_COST_PER_1M_TOKENS = {'text_tokens':0.000005,'image_tokens':0.00001}
 DALLE_COST_PER_IMAGE  ={
     'dall-e-2': {
@@ -226,7 +227,7 @@ class DalleCostcallback(AsyncCallbackHandler):
             "totalCost": self.total_cost
         }
         additional_data = {"imageT":self.imageT,"isMedia":self.isMedia}
-        thread_repo.initialization(self.thread_id, self.collection_name)
+        thread_repo.initialization_for_update(self.thread_id, self.collection_name)
         thread_repo.update_tools_token_data(token_data,additional_data=additional_data)
         
     async def on_llm_error(self, error: Exception, **kwargs: Any) -> None:
@@ -3,14 +3,16 @@ from langchain.callbacks.base import AsyncCallbackHandler
 from src.logger.default_logger import logger
 from langchain.schema import LLMResult
 from src.chatflow_langchain.repositories.thread_repository import ThreadRepostiory
+from src.custom_lib.langchain.memory.summary_pool import schedule_summary
 from src.chatflow_langchain.repositories.company_repository import CompanyRepostiory
 from langchain_community.callbacks.manager import get_openai_callback
 from src.chatflow_langchain.utils.playwright_info_fetcher import LogoFetcherService
 from src.round_robin.llm_key_manager import APIKeySelectorService,APIKeyUsageService
 from src.chatflow_langchain.service.config.model_config_openai import Functionality
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-thread_repo=ThreadRepostiory()
-company_repo = CompanyRepostiory()
+thread_repo=RequestScoped(ThreadRepostiory)
+company_repo = RequestScoped(CompanyRepostiory)
 fetcher = LogoFetcherService()
 MODEL_VERSIONS = {
                     'gpt-4o-2024-11-20': 'gpt-4o',
@@ -72,24 +74,21 @@ class MongoDBCallbackHandler(AsyncCallbackHandler):
                 
                     
                     model_name=generation.message.response_metadata['model_name']
-                    thread_repo.initialization(thread_id=self.thread_id,collection_name=self.collection_name)
+                    thread_repo.initialization_for_update(thread_id=self.thread_id,collection_name=self.collection_name)
                     if self.is_paid_user:
                         thread_repo.update_credits(msgCredit=self.msgCredit)
                     else:
-                        company_repo.initialization(company_id=str(thread_repo.result['companyId']),collection_name='company')
+                        company_repo.initialization_for_update(company_id=thread_repo.get_company_id(),collection_name='company')
                         company_repo.update_free_messages(model_code='OPEN_AI')
                     if not self.regenerated_flag:
-                        with get_openai_callback() as cb:
-                            self.memory.prune()
-
-                        thread_repo.update_token_usage_summary(cb=cb)
-                        # await self.api_usage_service.update_usage(provider='OPEN_AI',tokens_used= cb.total_tokens, model=self.memory.llm.model_name, api_key=self.encrypted_key,functionality=Functionality.CHAT,company_id=self.companyRedis_id)
-                            
-
-                        self.chat_history.add_message_system(
-                            message=self.memory.moving_summary_buffer,
-                            thread_id=self.thread_id
+                        schedule_summary(
+                            memory=self.memory,
+                            chat_history=self.chat_history,
+                            thread_id=self.thread_id,
+                            collection_name=self.collection_name,
+                            cost_callback=get_openai_callback
                         )
+                        # await self.api_usage_service.update_usage(provider='OPEN_AI',tokens_used= cb.total_tokens, model=self.memory.llm.model_name, api_key=self.encrypted_key,functionality=Functionality.CHAT,company_id=self.companyRedis_id)
                     else: 
                         if model_name in MODEL_VERSIONS:
                             model_name = MODEL_VERSIONS[model_name]
@@ -1,12 +1,39 @@
 import asyncio
-from typing import Any, Dict, List
+import os
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
 from langchain.callbacks.base import AsyncCallbackHandler
 from langchain_core.outputs import LLMResult
+from prometheus_client import Histogram
 from src.logger.default_logger import logger
 
+# Default per-stream flush interval in seconds. 0 means tokens are flushed as soon as
+# they are read, coalescing only what is already queued.
+STREAM_FLUSH_INTERVAL = float(os.environ.get("STREAM_FLUSH_INTERVAL", "0"))
+# Maximum idle time without a token before the iterator gives up (was 800 x 0.1s polls).
+STREAM_IDLE_TIMEOUT = float(os.environ.get("STREAM_IDLE_TIMEOUT", "80"))
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+STREAM_TIME_TO_FIRST_TOKEN = Histogram(
+    'llm_stream_time_to_first_token_seconds',
+    'Time from LLM start to the first streamed token',
+    ['provider'],
+    buckets=_LATENCY_BUCKETS
+)
+STREAM_INTER_TOKEN_LATENCY = Histogram(
+    'llm_stream_inter_token_latency_seconds',
+    'Time between consecutive streamed tokens',
+    ['provider'],
+    buckets=_LATENCY_BUCKETS
+)
+
+
 class CustomAsyncIteratorCallbackHandler(AsyncCallbackHandler):
     """Callback handler that returns an async iterator."""
 
+    provider: str = "openai"
+
     queue: asyncio.Queue[str]
     done: asyncio.Event
     cancelled: asyncio.Event
@@ -15,25 +42,31 @@ class CustomAsyncIteratorCallbackHandler(AsyncCallbackHandler):
     def always_verbose(self) -> bool:
         return True
 
-    def __init__(self) -> None:
+    def __init__(self, flush_interval: Optional[float] = None) -> None:
         self.queue = asyncio.Queue()
         self.done = asyncio.Event()
         self.cancelled = asyncio.Event()
+        self.flush_interval = STREAM_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self._start_time: Optional[float] = None
+        self._last_token_time: Optional[float] = None
 
     async def on_llm_start(
         self, serialized: Dict[str, Any], prompts: List[str], **kwargs: Any
     ) -> None:
-        # Reset the state for a new conversation
-        self.queue = asyncio.Queue()
+        # Reset the state for a new conversation. The queue object is drained rather than
+        # replaced because aiter() may already be waiting on it.
+        self._drain_queue()
         self.done.clear()
         self.cancelled.clear()
+        self._start_time = time.perf_counter()
+        self._last_token_time = None
         logger.info("LLM Start", extra={"tags": {"method": "CustomAsyncIteratorCallbackHandler.on_llm_start"}})
 
-
     async def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
         if token is not None and token != "":
-            await self.queue.put(token)
-        
+            self._observe_token_latency()
+            self.queue.put_nowait(token)
+
     async def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
         logger.info("LLM End", extra={"tags": {"method": "CustomAsyncIteratorCallbackHandler.on_llm_end"}})
         self.done.set()
@@ -43,7 +76,9 @@ class CustomAsyncIteratorCallbackHandler(AsyncCallbackHandler):
         self.done.set()
 
     async def on_chat_model_start(self, *args: Any, **kwargs: Any) -> None:
-        pass
+        # Chat models do not go through on_llm_start, start the TTFT clock here instead.
+        self._start_time = time.perf_counter()
+        self._last_token_time = None
 
     def cancel(self) -> None:
         """Cancel the streaming process."""
@@ -51,38 +86,75 @@ class CustomAsyncIteratorCallbackHandler(AsyncCallbackHandler):
         self.cancelled.set()
         self.done.set()
 
-    # TODO implement the other methods if necessary
+    def _drain_queue(self) -> None:
+        while not self.queue.empty():
+            self.queue.get_nowait()
 
-    async def aiter(self):
+    def _observe_token_latency(self) -> None:
+        now = time.perf_counter()
+        if self._last_token_time is not None:
+            STREAM_INTER_TOKEN_LATENCY.labels(provider=self.provider).observe(now - self._last_token_time)
+        elif self._start_time is not None:
+            STREAM_TIME_TO_FIRST_TOKEN.labels(provider=self.provider).observe(now - self._start_time)
+        self._last_token_time = now
+
+    async def _wait_for_token(self, timeout: Optional[float]) -> Optional[str]:
+        """Block until a token is queued, the stream is done/cancelled or the timeout expires."""
+        if not self.queue.empty():
+            return self.queue.get_nowait()
+        if self.done.is_set():
+            return None
+        get_token = asyncio.ensure_future(self.queue.get())
+        wait_done = asyncio.ensure_future(self.done.wait())
+        try:
+            await asyncio.wait({get_token, wait_done}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            wait_done.cancel()
+            if not get_token.done():
+                get_token.cancel()
+        if get_token.done() and not get_token.cancelled():
+            return get_token.result()
+        return None
+
+    async def aiter(self, flush_interval: Optional[float] = None) -> AsyncIterator[str]:
+        """Yield streamed text, coalescing tokens that arrive in a burst into a single chunk.
+
+        With a flush interval, tokens are buffered for up to that many seconds after the first
+        one of a chunk so a caller emits at most one SSE frame per interval.
+        """
+        flush_interval = self.flush_interval if flush_interval is None else flush_interval
+        loop = asyncio.get_running_loop()
         try:
-            retries = 0  # To avoid infinite loop
-            max_retries = 800  # Max retries or introduce a timeout
             while True:
-                # Check if cancelled
                 if self.cancelled.is_set():
                     logger.info("Streaming cancelled, stopping iteration", extra={"tags": {"method": "CustomAsyncIteratorCallbackHandler.aiter"}})
                     break
-                    
-                if self.done.is_set() and self.queue.empty():
+
+                token = await self._wait_for_token(STREAM_IDLE_TIMEOUT)
+                if token is None:
+                    if not self.done.is_set():
+                        logger.warning("Stream idle timeout exceeded, breaking loop.", extra={"tags": {"method": "CustomAsyncIteratorCallbackHandler.aiter"}})
                     break
-                try:
-                    token = self.queue.get_nowait()
-                    # Double check for cancellation before yielding
-                    if self.cancelled.is_set():
-                        logger.info("Streaming cancelled before yielding token", extra={"tags": {"method": "CustomAsyncIteratorCallbackHandler.aiter"}})
-                        break
-                    yield token
-                    retries = 0  # Reset retries on success
-                except asyncio.QueueEmpty:
-                    retries += 1
-                    if self.done.is_set() and self.queue.empty():
-                        break
-                    if retries > max_retries:
-                        logger.warning("Max retries exceeded, breaking loop.")
-                        break
-                    await asyncio.sleep(0.1)
+
+                chunk = [token]
+                if flush_interval > 0:
+                    deadline = loop.time() + flush_interval
+                    while not self.done.is_set() or not self.queue.empty():
+                        remaining = deadline - loop.time()
+                        if remaining <= 0:
+                            break
+                        token = await self._wait_for_token(remaining)
+                        if token is None:
+                            break
+                        chunk.append(token)
+                while not self.queue.empty():
+                    chunk.append(self.queue.get_nowait())
+
+                # Double check for cancellation before yielding
+                if self.cancelled.is_set():
+                    logger.info("Streaming cancelled before yielding token", extra={"tags": {"method": "CustomAsyncIteratorCallbackHandler.aiter"}})
+                    break
+                yield "".join(chunk)
         except Exception as e:
             logger.error(f"Exception in aiter: {e}", extra={"tags": {"method": "CustomAsyncIteratorCallbackHandler.aiter"}})
             raise
-
-
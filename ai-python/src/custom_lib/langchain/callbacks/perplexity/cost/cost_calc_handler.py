@@ -15,7 +15,9 @@ from typing import Any, Dict, List, Union
 from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.messages import AIMessage
 from langchain_core.outputs import ChatGeneration, LLMResult
-thread_repo=ThreadRepostiory()
+from src.chatflow_langchain.utils.request_context import RequestScoped
+from src.vector_store.qdrant.langchain_lib.embedding_cache import query_embedding_usage
+thread_repo=RequestScoped(ThreadRepostiory)
 
 from langchain_core.callbacks import BaseCallbackHandler,AsyncCallbackHandler
 from langchain_core.messages import AIMessage
@@ -141,7 +143,8 @@ class PerplexityTokenUsageCallbackAsync(AsyncCallbackHandler):
         if self.search_context_size:
             additional_data['webCost'] =COST_PER_REQUEST.get(self.model_name,{}).get(self.search_context_size,0)
         # await api_usage_service.update_usage(provider='PERPLEXITY',tokens_used= self.total_tokens, model=self.model_name, api_key=self.encrypted_key,functionality=Functionality.CHAT,company_id=self.companyRedis_id)
-        thread_repo.initialization(self.thread_id, self.collection_name)
+        additional_data.update(query_embedding_usage.report())
+        thread_repo.initialization_for_update(self.thread_id, self.collection_name)
         thread_repo.update_tools_token_data(token_data,additional_data=additional_data)
         logger.info("Updated token data in database in on_llm_end",
             extra={"tags": {"method": "CostCalcCallbackHandler.on_llm_end"}})
@@ -8,8 +8,9 @@ from langchain_community.callbacks.openai_info import (
 from langchain_core.messages import BaseMessage
 from langchain.schema import LLMResult
 from src.chatflow_langchain.repositories.thread_repository import ThreadRepostiory
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-thread_repo=ThreadRepostiory()
+thread_repo=RequestScoped(ThreadRepostiory)
 DALLE_COST_PER_IMAGE  ={
     'dall-e-2': {
         'standard':{
@@ -128,7 +129,7 @@ class DalleCostcallback(AsyncCallbackHandler):
             "totalCost": self.cost.total_cost
         }
         additional_data = {"imageT":self.imageT,"isMedia":self.isMedia}
-        thread_repo.initialization(self.thread_id, self.collection_name)
+        thread_repo.initialization_for_update(self.thread_id, self.collection_name)
         thread_repo.update_tools_token_data(token_data,additional_data=additional_data)
         
     async def on_llm_error(self, error: Exception, **kwargs: Any) -> None:
@@ -4,14 +4,16 @@ import msgpack
 from src.logger.default_logger import logger
 from langchain.schema import LLMResult
 from src.chatflow_langchain.repositories.thread_repository import ThreadRepostiory
+from src.custom_lib.langchain.memory.summary_pool import schedule_summary
 from src.custom_lib.langchain.callbacks.perplexity.mongodb.utils import replace_citations
 from langchain_community.callbacks.manager import get_openai_callback
 from src.chatflow_langchain.service.perplexity.browser_chat.utils import filter_valid_images
 from src.chatflow_langchain.repositories.company_repository import CompanyRepostiory
 from src.round_robin.llm_key_manager import APIKeySelectorService,APIKeyUsageService
 from src.chatflow_langchain.service.config.model_config_openai import Functionality
-company_repo=CompanyRepostiory()
-thread_repo=ThreadRepostiory()
+from src.chatflow_langchain.utils.request_context import RequestScoped
+company_repo=RequestScoped(CompanyRepostiory)
+thread_repo=RequestScoped(ThreadRepostiory)
 class MongoDBCallbackHandler(AsyncCallbackHandler):
     def __init__(self, thread_id: str = None, chat_history: str = None, memory=None,collection_name=None,regenerated_flag=False,model_name=None,msgCredit=0,is_paid_user=False,**kwargs):
         self.thread_id = thread_id
@@ -51,21 +53,21 @@ class MongoDBCallbackHandler(AsyncCallbackHandler):
                     citations=citations,
                     images=valid_images
                 )
-                thread_repo.initialization(thread_id=self.thread_id,collection_name=self.collection_name)
+                thread_repo.initialization_for_update(thread_id=self.thread_id,collection_name=self.collection_name)
                 if self.is_paid_user:
                     thread_repo.update_credits(msgCredit=self.msgCredit)
                 else:
-                    company_repo.initialization(company_id=str(thread_repo.result['companyId']),collection_name='company')
+                    company_repo.initialization_for_update(company_id=thread_repo.get_company_id(),collection_name='company')
                     company_repo.update_free_messages(model_code='PERPLEXITY')
                 if not self.regenerated_flag:
-                    with get_openai_callback() as cb:
-                        self.memory.prune()
-                    # await api_usage_service.update_usage(provider='OPEN_AI',tokens_used= cb.total_tokens, model=self.memory.llm.model_name, api_key=self.encrypted_key,functionality=Functionality.CHAT,company_id=self.companyRedis_id)    
-                    thread_repo.update_token_usage_summary(cb=cb)
-                    self.chat_history.add_message_system(
-                        message=self.memory.moving_summary_buffer,
-                        thread_id=self.thread_id
+                    schedule_summary(
+                        memory=self.memory,
+                        chat_history=self.chat_history,
+                        thread_id=self.thread_id,
+                        collection_name=self.collection_name,
+                        cost_callback=get_openai_callback
                     )
+                    # await api_usage_service.update_usage(provider='OPEN_AI',tokens_used= cb.total_tokens, model=self.memory.llm.model_name, api_key=self.encrypted_key,functionality=Functionality.CHAT,company_id=self.companyRedis_id)    
                 else: 
                     thread_repo.update_response_model(responseModel=self.model_name,model_code='PERPLEXITY')
                 logger.info(
@@ -3,11 +3,13 @@ from langchain.callbacks.base import AsyncCallbackHandler
 from src.logger.default_logger import logger
 from langchain.schema import LLMResult
 from src.chatflow_langchain.repositories.thread_repository import ThreadRepostiory
+from src.custom_lib.langchain.memory.summary_pool import schedule_summary
 from src.custom_lib.langchain.callbacks.weam_router.deep_seek.cost.context_manager import deepseek_sync_callback
 from src.chatflow_langchain.repositories.company_repository import CompanyRepostiory
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
-company_repo = CompanyRepostiory()
-thread_repo=ThreadRepostiory()
+company_repo = RequestScoped(CompanyRepostiory)
+thread_repo=RequestScoped(ThreadRepostiory)
 
 class MongoDBCallbackHandler(AsyncCallbackHandler):
     def __init__(self, thread_id: str = None, chat_history: str = None, memory=None,collection_name=None,regenerated_flag=False,model_name=None,msgCredit:float=0,is_paid_user:bool=False):
@@ -40,22 +42,21 @@ class MongoDBCallbackHandler(AsyncCallbackHandler):
                     message=self.messages,
                     thread_id=self.thread_id
                 )
-                thread_repo.initialization(thread_id=self.thread_id,collection_name=self.collection_name)
+                thread_repo.initialization_for_update(thread_id=self.thread_id,collection_name=self.collection_name)
                 if self.is_paid_user:
                     thread_repo.update_credits(msgCredit=self.msgCredit)
                 else:
-                    company_repo.initialization(company_id=str(thread_repo.result['companyId']),collection_name='company')
+                    company_repo.initialization_for_update(company_id=thread_repo.get_company_id(),collection_name='company')
                     company_repo.update_free_messages(model_code='DEEPSEEK')
                 if len(self.memory.chat_memory.messages) > 0:
                     if not self.regenerated_flag:
-                        with deepseek_sync_callback(model_name=self.model_name) as cb:
-                            self.memory.prune()
-                        self.chat_history.add_message_system(
-                            message=self.memory.moving_summary_buffer,
-                            thread_id=self.thread_id
+                        schedule_summary(
+                            memory=self.memory,
+                            chat_history=self.chat_history,
+                            thread_id=self.thread_id,
+                            collection_name=self.collection_name,
+                            cost_callback=lambda: deepseek_sync_callback(model_name=self.model_name)
                         )
-
-                        thread_repo.update_token_usage_summary(cb=cb)
                     else: 
                         thread_repo.update_response_model(responseModel=self.model_name,model_code='DEEPSEEK')
                 else:
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import gc
 import logging
 import os
 import sys
@@ -21,6 +20,8 @@ from typing import (
     Union,
 )
 
+from functools import cached_property
+import anthropic
 from langchain_anthropic.chat_models import ChatAnthropic,_format_messages,convert_to_anthropic_tool
 from langchain_core.messages import BaseMessage
 from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
@@ -28,10 +29,26 @@ from langchain_core.runnables import Runnable
 from langchain_core.tools import BaseTool
 import tiktoken as tiktoken_
 from src.custom_lib.langchain.tiktoken_load.encoding_cache import get_cached_encoding
+from src.custom_lib.langchain.chat_models.client_pool import llm_client_pool
 if TYPE_CHECKING:
     import tiktoken
 
 class MyChatAnthropic(ChatAnthropic):
+    @cached_property
+    def _client(self) -> anthropic.Client:
+        """Anthropic client on the pooled keep-alive HTTP client of this api key and base url."""
+        client_params = self._client_params
+        http_client = llm_client_pool.get_http_client("anthropic", client_params["api_key"], client_params["base_url"])
+        return anthropic.Client(**client_params, http_client=http_client)
+
+    @cached_property
+    def _async_client(self) -> anthropic.AsyncClient:
+        client_params = self._client_params
+        http_client = llm_client_pool.get_async_http_client("anthropic", client_params["api_key"], client_params["base_url"])
+        if http_client is None:
+            return super()._async_client
+        return anthropic.AsyncClient(**client_params, http_client=http_client)
+
     def get_num_tokens_from_messages(
         self,
         messages: list[BaseMessage],
@@ -130,9 +147,4 @@ class MyChatAnthropic(ChatAnthropic):
                 num_tokens += len(encoding.encode(str(value)))
                 if key == "name":
                     num_tokens += tokens_per_name
-        try:
-            del encoding
-            gc.collect()
-        except Exception as e:
-            pass
         return num_tokens
\ No newline at end of file
@@ -0,0 +1,180 @@
+import asyncio
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional, Tuple
+import httpx
+from dotenv import load_dotenv
+from src.logger.default_logger import logger
+
+load_dotenv()
+
+LLM_CLIENT_POOL_MAX_ENTRIES = int(os.environ.get("LLM_CLIENT_POOL_MAX_ENTRIES", 256))
+# Clients not checked out for this long are dropped from the pool
+LLM_CLIENT_IDLE_TIMEOUT = float(os.environ.get("LLM_CLIENT_IDLE_TIMEOUT", 900))
+LLM_CLIENT_MAX_CONNECTIONS = int(os.environ.get("LLM_CLIENT_MAX_CONNECTIONS", 100))
+LLM_CLIENT_MAX_KEEPALIVE = int(os.environ.get("LLM_CLIENT_MAX_KEEPALIVE", 20))
+LLM_CLIENT_KEEPALIVE_EXPIRY = float(os.environ.get("LLM_CLIENT_KEEPALIVE_EXPIRY", 30))
+LLM_CLIENT_TIMEOUT = float(os.environ.get("LLM_CLIENT_TIMEOUT", 600))
+LLM_CLIENT_CONNECT_TIMEOUT = float(os.environ.get("LLM_CLIENT_CONNECT_TIMEOUT", 10))
+
+
+def _http_client_options() -> dict:
+    return {
+        "timeout": httpx.Timeout(LLM_CLIENT_TIMEOUT, connect=LLM_CLIENT_CONNECT_TIMEOUT),
+        "limits": httpx.Limits(
+            max_connections=LLM_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_CLIENT_MAX_KEEPALIVE,
+            keepalive_expiry=LLM_CLIENT_KEEPALIVE_EXPIRY
+        ),
+        "follow_redirects": True,
+    }
+
+
+def hash_api_key(api_key: Any) -> str:
+    """
+    Digest used to key pooled clients, so decrypted API keys are never kept as cache keys.
+    """
+    if hasattr(api_key, "get_secret_value"):
+        api_key = api_key.get_secret_value()
+    return hashlib.sha256(str(api_key or "").encode("utf-8")).hexdigest()
+
+
+class _PooledClient:
+    __slots__ = ("client", "loop", "last_used")
+
+    def __init__(self, client: Any, loop: Optional[asyncio.AbstractEventLoop]):
+        self.client = client
+        self.loop = loop
+        self.last_used = time.monotonic()
+
+
+class LLMClientPool:
+    """
+    Process-wide pool of the HTTP/SDK clients used by the chat models.
+
+    Clients are keyed by (provider, kind, api key hash, base url), so requests for the same
+    provider account reuse warm keep-alive connections instead of a TLS handshake per request.
+    Async clients are bound to the event loop they were created on. The pool is bounded in
+    entries, and clients idle for LLM_CLIENT_IDLE_TIMEOUT are dropped. Chat models, module-level
+    tool LLMs and running streams may still hold a dropped client, so it is closed once the pool
+    holds its last reference.
+    """
+
+    def __init__(self, max_entries: int = LLM_CLIENT_POOL_MAX_ENTRIES, idle_timeout: float = LLM_CLIENT_IDLE_TIMEOUT):
+        self.max_entries = max_entries
+        self.idle_timeout = idle_timeout
+        self._entries: "OrderedDict[Tuple, _PooledClient]" = OrderedDict()
+        # Dropped clients still referenced elsewhere, closed once they are not
+        self._retired: List[_PooledClient] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+    def get_client(self, provider: str, api_key: Any, base_url: Optional[str], factory: Callable[[], Any],
+                   kind: str = "sdk", loop_bound: bool = False) -> Any:
+        """
+        Return the pooled client for the key, creating it with `factory` when missing.
+
+        Args:
+            provider (str): Provider code, e.g. "openai", "anthropic".
+            api_key: The API key the client authenticates with, only its hash is kept.
+            base_url (Optional[str]): The API base url.
+            factory (Callable): Builds a new client.
+            kind (str): Distinguishes several clients of one provider account.
+            loop_bound (bool): The client belongs to the running event loop.
+        """
+        loop = self._running_loop() if loop_bound else None
+        key = (provider, kind, hash_api_key(api_key), base_url or "", id(loop) if loop_bound else None)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.loop is not loop:
+                # Same id() reused by a new event loop, the old client cannot be used there
+                self._entries.pop(key)
+                entry = None
+            if entry is None:
+                entry = _PooledClient(factory(), loop)
+                self._entries[key] = entry
+            entry.last_used = time.monotonic()
+            self._entries.move_to_end(key)
+            # Held while evicting, so the client being handed out is never closed under the caller
+            client = entry.client
+            self._evict()
+        return client
+
+    def get_http_client(self, provider: str, api_key: Any, base_url: Optional[str] = None) -> httpx.Client:
+        return self.get_client(provider, api_key, base_url, lambda: httpx.Client(**_http_client_options()), kind="http")
+
+    def get_async_http_client(self, provider: str, api_key: Any, base_url: Optional[str] = None) -> Optional[httpx.AsyncClient]:
+        """
+        Return the pooled async client of the running event loop, or None outside an event loop.
+        """
+        if self._running_loop() is None:
+            return None
+        return self.get_client(provider, api_key, base_url, lambda: httpx.AsyncClient(**_http_client_options()),
+                               kind="async_http", loop_bound=True)
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        for key in list(self._entries):
+            entry = self._entries[key]
+            if len(self._entries) > self.max_entries or now - entry.last_used > self.idle_timeout:
+                del self._entries[key]
+                self._retired.append(entry)
+            else:
+                # Entries are kept in last-used order, the rest is more recent
+                break
+        retired, self._retired = self._retired, []
+        for entry in retired:
+            # Referenced by the entry and the getrefcount argument only: nobody else holds it
+            if sys.getrefcount(entry.client) <= 2:
+                self._close(entry)
+            else:
+                self._retired.append(entry)
+
+    @staticmethod
+    def _close(entry: _PooledClient) -> None:
+        try:
+            if hasattr(entry.client, "aclose"):
+                # Async clients are closed on their own loop, a closed loop took their connections with it
+                if entry.loop is not None and not entry.loop.is_closed():
+                    entry.loop.call_soon_threadsafe(entry.loop.create_task, entry.client.aclose())
+            elif hasattr(entry.client, "close"):
+                entry.client.close()
+        except Exception as e:
+            logger.warning(
+                f"Failed to close pooled LLM client: {e}",
+                extra={"tags": {"method": "LLMClientPool._close"}}
+            )
+
+    async def aclose(self) -> None:
+        """
+        Close every pooled client, used on shutdown.
+        """
+        with self._lock:
+            entries = list(self._entries.values()) + self._retired
+            self._entries.clear()
+            self._retired = []
+        for entry in entries:
+            try:
+                if hasattr(entry.client, "aclose"):
+                    if entry.loop is None or entry.loop is self._running_loop():
+                        await entry.client.aclose()
+                elif hasattr(entry.client, "close"):
+                    entry.client.close()
+            except Exception as e:
+                logger.warning(
+                    f"Failed to close pooled LLM client: {e}",
+                    extra={"tags": {"method": "LLMClientPool.aclose"}}
+                )
+
+
+llm_client_pool = LLMClientPool()
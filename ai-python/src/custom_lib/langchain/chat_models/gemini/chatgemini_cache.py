@@ -0,0 +1,27 @@
+from langchain_google_genai import ChatGoogleGenerativeAI
+from pydantic import model_validator
+from typing_extensions import Self
+from src.custom_lib.langchain.chat_models.client_pool import llm_client_pool
+
+
+class MyChatGoogleGenerativeAI(ChatGoogleGenerativeAI):
+    @model_validator(mode="after")
+    def use_pooled_clients(self) -> Self:
+        """
+        Share the generative service clients per api key and transport.
+
+        The parent validator builds a new client (and channel) per instance, it is swapped for the
+        pooled one of the same account so warm connections are reused across requests. Channels
+        connect lazily, the discarded client never opens a connection.
+        """
+        if self.credentials is not None:
+            return self
+        api_key = self.google_api_key
+        self.client = llm_client_pool.get_client("gemini", api_key, self.transport, lambda: self.client)
+        if llm_client_pool._running_loop() is not None:
+            # Built lazily by the async_client property, grpc.aio channels belong to the running loop
+            self.async_client_running = llm_client_pool.get_client(
+                "gemini", api_key, self.transport, lambda: self.async_client,
+                kind="async", loop_bound=True
+            )
+        return self
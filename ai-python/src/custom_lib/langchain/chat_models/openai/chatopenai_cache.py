@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-import gc
 import logging
 import os
 import sys
 import warnings
+from urllib.parse import urlparse
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -27,13 +27,39 @@ from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResu
 from langchain_core.runnables import Runnable
 from langchain_core.tools import BaseTool
 from langchain_community.adapters.openai import convert_message_to_dict
+from pydantic import model_validator
+from src.custom_lib.langchain.chat_models.client_pool import llm_client_pool
 
 import tiktoken as tiktoken_
 from src.custom_lib.langchain.tiktoken_load.encoding_cache import get_cached_encoding
 if TYPE_CHECKING:
     import tiktoken
 
+def pool_provider(base_url: Optional[str]) -> str:
+    """
+    Provider pooled clients are attributed to: the API host of an OpenAI-compatible base url
+    (OpenRouter, DeepSeek, Qwen, ...), "openai" for the OpenAI API itself.
+    """
+    host = urlparse(base_url).hostname if base_url else None
+    return "openai" if host in (None, "api.openai.com") else host
+
+
 class MyChatOpenAI(ChatOpenAI):
+    @model_validator(mode="before")
+    @classmethod
+    def use_pooled_http_clients(cls, values: Any) -> Any:
+        """Share keep-alive HTTP clients per (provider, api key, base url) instead of one pool per instance."""
+        if not isinstance(values, dict):
+            return values
+        values = dict(values)
+        api_key = values.get("api_key") or values.get("openai_api_key") or os.environ.get("OPENAI_API_KEY")
+        base_url = values.get("base_url") or values.get("openai_api_base") or os.environ.get("OPENAI_API_BASE")
+        if values.get("http_client") is None:
+            values["http_client"] = llm_client_pool.get_http_client(pool_provider(base_url), api_key, base_url)
+        if values.get("http_async_client") is None:
+            values["http_async_client"] = llm_client_pool.get_async_http_client(pool_provider(base_url), api_key, base_url)
+        return values
+
     def get_num_tokens_from_messages(
         self,
         messages: List[BaseMessage],
@@ -87,11 +113,5 @@ class MyChatOpenAI(ChatOpenAI):
                 num_tokens += len(encoding.encode(str(value)))
                 if key == "name":
                     num_tokens += tokens_per_name
-        # Account for the priming of every reply.
-        try:
-            del encoding
-            gc.collect()
-        except Exception as e:
-            pass
         return num_tokens
         
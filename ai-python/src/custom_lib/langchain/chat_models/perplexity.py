@@ -1,5 +1,6 @@
 from __future__ import annotations
 from src.logger.default_logger import logger
+from src.custom_lib.langchain.chat_models.client_pool import llm_client_pool
 from typing import (
     Any,
     Dict,
@@ -130,7 +131,8 @@ class ChatPerplexity(BaseChatModel):
             )
         try:
             self.client = openai.OpenAI(
-                api_key=self.pplx_api_key, base_url="https://api.perplexity.ai"
+                api_key=self.pplx_api_key, base_url="https://api.perplexity.ai",
+                http_client=llm_client_pool.get_http_client("perplexity", self.pplx_api_key, "https://api.perplexity.ai")
             )
         except AttributeError:
             raise ValueError(
@@ -0,0 +1,128 @@
+import asyncio
+import os
+from typing import Callable, ContextManager, Dict, Optional, Set
+from dotenv import load_dotenv
+from src.chatflow_langchain.repositories.thread_repository import ThreadRepostiory
+from src.logger.default_logger import logger
+
+load_dotenv()
+
+SUMMARY_MAX_CONCURRENCY = int(os.environ.get("SUMMARY_MAX_CONCURRENCY", 8))
+
+_summary_semaphore: Optional[asyncio.Semaphore] = None
+_summary_tasks: Set[asyncio.Task] = set()
+# Latest summary task of each chat session, the next turn of the session is chained onto it
+_session_summaries: Dict[str, asyncio.Task] = {}
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _summary_semaphore
+    if _summary_semaphore is None:
+        _summary_semaphore = asyncio.Semaphore(SUMMARY_MAX_CONCURRENCY)
+    return _summary_semaphore
+
+
+def _prune_and_store(memory, chat_history, thread_id: str, collection_name: str,
+                     cost_callback: Callable[[], ContextManager], rejoin: bool = False) -> bool:
+    if rejoin:
+        # Moves the turn to the checkpoint of the summary written by the previous turn
+        chat_history.add_message_system(message=memory.moving_summary_buffer, thread_id=thread_id)
+    # Same pruning as ConversationSummaryBufferMemory.prune(), with the history read only once
+    buffer = list(memory.chat_memory.messages)
+    curr_buffer_length = memory.llm.get_num_tokens_from_messages(buffer)
+    if curr_buffer_length <= memory.max_token_limit:
+        return False
+
+    pruned_memory = []
+    while buffer and curr_buffer_length > memory.max_token_limit:
+        pruned_memory.append(buffer.pop(0))
+        curr_buffer_length = memory.llm.get_num_tokens_from_messages(buffer)
+
+    with cost_callback() as cb:
+        memory.moving_summary_buffer = memory.predict_new_summary(pruned_memory, memory.moving_summary_buffer)
+
+    # system and sumhistory_checkpoint are written together in one $set
+    chat_history.add_message_system(message=memory.moving_summary_buffer, thread_id=thread_id)
+    # A repository per summary, the handlers' module-level thread_repo is shared across requests
+    thread_repo = ThreadRepostiory()
+    thread_repo.initialization_for_update(thread_id=thread_id, collection_name=collection_name)
+    thread_repo.update_token_usage_summary(cb=cb)
+    return True
+
+
+async def _run_summary(memory, chat_history, thread_id: str, collection_name: str, cost_callback,
+                       previous: Optional[asyncio.Task] = None) -> Optional[str]:
+    try:
+        rejoin = False
+        if previous is not None:
+            # The turn was answered with the summary the previous turn started from, it is stored
+            # again under the previous turn's new summary before its own pruning reads the history
+            summary = await previous
+            if summary is not None and summary != memory.moving_summary_buffer:
+                memory.moving_summary_buffer = summary
+                rejoin = True
+        async with _get_semaphore():
+            updated = await asyncio.to_thread(_prune_and_store, memory, chat_history, thread_id, collection_name, cost_callback, rejoin)
+        if updated:
+            logger.info(
+                "Moving summary updated",
+                extra={"tags": {"method": "summary_pool._run_summary", "thread_id": thread_id}}
+            )
+        return memory.moving_summary_buffer
+    except Exception as e:
+        logger.error(
+            f"Failed to update moving summary: {e}",
+            exc_info=True,
+            extra={"tags": {"method": "summary_pool._run_summary", "thread_id": thread_id}}
+        )
+        return None
+
+
+def schedule_summary(memory, chat_history, thread_id: str, collection_name: str,
+                     cost_callback: Callable[[], ContextManager]) -> asyncio.Task:
+    """
+    Record the turn under the current summary and compute the moving summary in the background.
+
+    The system message is stored right away with the summary the turn was answered with, so the
+    thread joins the history of the current checkpoint before the response is closed. Pruning then
+    runs on a bounded pool; nothing is summarised while the buffer is under max_token_limit, otherwise
+    the system message is rewritten with the new summary, which moves the checkpoint.
+
+    Summaries of one chat session run in turn order: when the previous turn's summary is still
+    pending, this one waits for it and, if it moved the checkpoint, stores the turn again under it,
+    so a turn is never left behind on the checkpoint it was answered from.
+
+    Args:
+        memory: The ConversationSummaryBufferMemory of the request.
+        chat_history: The chat message history the memory reads from.
+        thread_id (str): The thread the summary belongs to.
+        collection_name (str): The thread collection, where the summary token usage is recorded.
+        cost_callback: Factory of the provider's sync cost callback context manager.
+
+    Returns:
+        asyncio.Task: The background summary task, resolving to the summary it left on the thread.
+    """
+    chat_history.add_message_system(message=memory.moving_summary_buffer, thread_id=thread_id)
+    chat_session_id = str(chat_history.chat_session_id)
+    previous = _session_summaries.get(chat_session_id)
+    if previous is not None and (previous.done() or previous.get_loop() is not asyncio.get_running_loop()):
+        previous = None
+    task = asyncio.create_task(_run_summary(memory, chat_history, thread_id, collection_name, cost_callback, previous))
+    _session_summaries[chat_session_id] = task
+    _summary_tasks.add(task)
+    task.add_done_callback(_summary_tasks.discard)
+    task.add_done_callback(lambda done: _forget_session(chat_session_id, done))
+    return task
+
+
+def _forget_session(chat_session_id: str, task: asyncio.Task) -> None:
+    if _session_summaries.get(chat_session_id) is task:
+        del _session_summaries[chat_session_id]
+
+
+async def drain_summary_tasks(timeout: Optional[float] = None) -> None:
+    """
+    Wait for the pending background summaries, used on shutdown.
+    """
+    if _summary_tasks:
+        await asyncio.wait(set(_summary_tasks), timeout=timeout)
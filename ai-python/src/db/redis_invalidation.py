@@ -0,0 +1,61 @@
+import threading
+import time
+from typing import Callable, Optional
+import redis
+from src.db.redis_config import redis_url
+from src.logger.default_logger import logger
+
+# Published instead of an id when every entry must be dropped
+INVALIDATE_ALL = "*"
+_LISTENER_RETRY_DELAY = 5
+
+
+class InvalidationListener:
+    """
+    Daemon thread passing every id published on a Redis channel to `invalidate`.
+
+    Started by the first `ensure_started`, so each process using a cache subscribes on its own.
+    Invalidations published while disconnected are lost: `invalidate(None)` is called on every
+    (re)connection and disconnection.
+    """
+
+    def __init__(self, channel: str, invalidate: Callable[[Optional[str]], None], name: str):
+        self.channel = channel
+        self.invalidate = invalidate
+        self.name = name
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._listen, name=self.name, daemon=True)
+                self._thread.start()
+
+    def publish(self, entry_id: Optional[str] = None) -> None:
+        try:
+            redis.Redis.from_url(redis_url).publish(self.channel, str(entry_id or INVALIDATE_ALL))
+        except redis.RedisError as e:
+            logger.warning(
+                f"Failed to publish invalidation on {self.channel}: {e}",
+                extra={"tags": {"method": "InvalidationListener.publish", "id": entry_id}}
+            )
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = redis.Redis.from_url(redis_url, decode_responses=True).pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                self.invalidate(None)
+                for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.invalidate(message["data"])
+            except Exception as e:
+                logger.warning(
+                    f"Invalidation listener of {self.channel} disconnected: {e}",
+                    extra={"tags": {"method": "InvalidationListener._listen"}}
+                )
+                self.invalidate(None)
+                time.sleep(_LISTENER_RETRY_DELAY)
@@ -1,6 +1,8 @@
 from typing import List, Dict, Any
 import requests
 import json
+import sys
+from array import array
 from src.embedder.base_node_embedder.pinecone_base import AbstractEmbedder
 from src.logger.default_logger import logger
 from src.embedder.config import RayConfig
@@ -48,15 +50,30 @@ class NodeTextEmbedderRayServe(AbstractEmbedder):
         Returns:
             List[Any]: A list of embeddings, one for each input text document.
         """
-        data = {"input": texts, "model_kwargs": self.model_kwargs, "encode_kwargs": self.encode_kwargs}
+        data = {"input": texts, "model_kwargs": self.model_kwargs, "encode_kwargs": self.encode_kwargs, "encoding": "float32"}
         try:
             response = requests.post(self.api_url, json=data, headers=self.headers,timeout=RayConfig.TIMEOUT)
             response.raise_for_status()
+            if response.headers.get("Content-Type", "").startswith("application/octet-stream"):
+                return self.decode_float32(response.content, int(response.headers["X-Embedding-Dimensions"]))
+            # Deployments without binary responses ignore "encoding" and answer JSON
             return json.loads(response.text).get("data", [])
         except requests.exceptions.RequestException as e:
             logger.error(f"An error occurred during document embedding: {e}", exc_info=True)
             return []
 
+    @staticmethod
+    def decode_float32(content: bytes, dimensions: int) -> List[List[float]]:
+        """
+        Splits a little-endian float32 response body into one embedding per input text.
+        """
+        values = array("f")
+        values.frombytes(content)
+        if sys.byteorder != "little":
+            values.byteswap()
+        values = values.tolist()
+        return [values[start:start + dimensions] for start in range(0, len(values), dimensions)]
+
     def __call__(self, node_batch: Dict) -> Dict[str, List[Dict]]:
         """
         Processes a batch of nodes, embedding the text data contained within each node's metadata.
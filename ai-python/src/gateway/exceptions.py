@@ -8,12 +8,13 @@ from src.gateway.utils import map_error, handle_initialization
 from src.chatflow_langchain.repositories.openai_error_messages_config import OPENAI_MESSAGES_CONFIG,DEV_MESSAGES_CONFIG,HF_ERROR_MESSAGES_CONFIG,ANTHROPIC_ERROR_MESSAGES_CONFIG,GENAI_ERROR_MESSAGES_CONFIG
 from src.chatflow_langchain.service.openai.title.title_generator import OpenAITitleGenerationService
 from src.chatflow_langchain.service.openai.title.utils import get_default_title
+from src.chatflow_langchain.utils.request_context import RequestScoped
 
 # FastAPI app instance
 ERROR_PLATFORM={"ANTHROPIC":ANTHROPIC_ERROR_MESSAGES_CONFIG,"HUGGING_FACE":HF_ERROR_MESSAGES_CONFIG,"OPEN_AI":OPENAI_MESSAGES_CONFIG,"GEMINI":GENAI_ERROR_MESSAGES_CONFIG}
 app = FastAPI()
 
-title_service = OpenAITitleGenerationService()
+title_service = RequestScoped(OpenAITitleGenerationService)
 class CustomTitleHttpException(HTTPException):
     def __init__(self, status_code: int, detail: str, data: dict = None):
         super().__init__(status_code=status_code, detail=detail)
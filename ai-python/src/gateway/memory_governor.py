@@ -0,0 +1,165 @@
+import asyncio
+import gc
+import os
+import resource
+import time
+from typing import Optional
+from dotenv import load_dotenv
+from prometheus_client import Counter, Gauge, Histogram
+from src.logger.default_logger import logger
+
+load_dotenv()
+
+# Automatic collection thresholds, CPython defaults are (700, 10, 10)
+GC_GEN0_THRESHOLD = int(os.environ.get("GC_GEN0_THRESHOLD", 10000))
+GC_GEN1_THRESHOLD = int(os.environ.get("GC_GEN1_THRESHOLD", 10))
+GC_GEN2_THRESHOLD = int(os.environ.get("GC_GEN2_THRESHOLD", 100))
+# Full collection when RSS is above the soft limit or has grown this much since the last one
+GC_GOVERNOR_RSS_SOFT_LIMIT_MB = float(os.environ.get("GC_GOVERNOR_RSS_SOFT_LIMIT_MB", 2048))
+GC_GOVERNOR_RSS_GROWTH_MB = float(os.environ.get("GC_GOVERNOR_RSS_GROWTH_MB", 256))
+# Young (gen 0/1) collection when this many container objects were allocated since the last one,
+# counted across the automatic gen 0 collections
+GC_GOVERNOR_ALLOC_THRESHOLD = int(os.environ.get("GC_GOVERNOR_ALLOC_THRESHOLD", 50000))
+GC_GOVERNOR_FULL_MIN_INTERVAL = float(os.environ.get("GC_GOVERNOR_FULL_MIN_INTERVAL", 60))
+GC_GOVERNOR_YOUNG_MIN_INTERVAL = float(os.environ.get("GC_GOVERNOR_YOUNG_MIN_INTERVAL", 5))
+GC_GOVERNOR_CHECK_INTERVAL = float(os.environ.get("GC_GOVERNOR_CHECK_INTERVAL", 5))
+
+_MB = 1024 * 1024
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+GC_PAUSE_SECONDS = Histogram(
+    'python_gc_pause_seconds',
+    'Stop-the-world pause of each garbage collection',
+    ['generation'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+GC_GOVERNOR_COLLECTIONS = Counter(
+    'python_gc_governor_collections_total',
+    'Collections triggered by the memory governor',
+    ['generation', 'reason']
+)
+GC_GOVERNOR_RSS_BYTES = Gauge(
+    'python_gc_governor_rss_bytes',
+    'Resident set size seen by the last memory governor check'
+)
+
+
+def rss_bytes() -> int:
+    """Current resident set size, peak RSS where /proc is not available."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class MemoryGovernor:
+    """
+    Process-wide owner of garbage collection for the gateway.
+
+    Automatic thresholds are raised so full collections are rare, objects alive after startup are
+    frozen out of the collector, and a periodic check runs a generational collection only when RSS
+    or pending allocations cross their thresholds, at most once per min interval. Every collection,
+    automatic or not, is timed into `python_gc_pause_seconds`.
+    """
+
+    def __init__(self):
+        self._gc_started: Optional[float] = None
+        self._last_full = self._last_young = time.monotonic()
+        self._rss_after_full = 0
+        self._young_allocations = 0
+        self._task: Optional[asyncio.Task] = None
+        self._configured = False
+
+    def _on_gc(self, phase: str, info: dict) -> None:
+        if phase == "start":
+            # Every collection resets the gen 0 count, the allocations it held are kept for the young threshold
+            self._young_allocations += gc.get_count()[0]
+            self._gc_started = time.perf_counter()
+        elif self._gc_started is not None:
+            GC_PAUSE_SECONDS.labels(generation=str(info.get("generation"))).observe(time.perf_counter() - self._gc_started)
+            self._gc_started = None
+
+    def configure(self) -> None:
+        """
+        Tune the collector and freeze startup objects, call once the app is loaded.
+        """
+        if self._configured:
+            return
+        gc.set_threshold(GC_GEN0_THRESHOLD, GC_GEN1_THRESHOLD, GC_GEN2_THRESHOLD)
+        gc.callbacks.append(self._on_gc)
+        gc.collect()
+        # Modules, routers and settings live for the whole process, full collections skip them
+        gc.freeze()
+        self._rss_after_full = rss_bytes()
+        self._configured = True
+        logger.info(
+            f"Memory governor configured, thresholds {gc.get_threshold()}, {gc.get_freeze_count()} objects frozen",
+            extra={"tags": {"method": "MemoryGovernor.configure"}}
+        )
+
+    def _collect(self, generation: int, reason: str) -> int:
+        collected = gc.collect(generation)
+        self._young_allocations = 0
+        GC_GOVERNOR_COLLECTIONS.labels(generation=str(generation), reason=reason).inc()
+        return collected
+
+    def allocations_since_young(self) -> int:
+        """Container objects allocated since the last governor collection."""
+        return self._young_allocations + gc.get_count()[0]
+
+    def maybe_collect(self) -> Optional[int]:
+        """
+        Run a collection if a threshold is crossed, returns the generation collected or None.
+        """
+        now = time.monotonic()
+        rss = rss_bytes()
+        GC_GOVERNOR_RSS_BYTES.set(rss)
+        if now - self._last_full >= GC_GOVERNOR_FULL_MIN_INTERVAL:
+            reason = None
+            if rss >= GC_GOVERNOR_RSS_SOFT_LIMIT_MB * _MB:
+                reason = "rss_limit"
+            elif rss - self._rss_after_full >= GC_GOVERNOR_RSS_GROWTH_MB * _MB:
+                reason = "rss_growth"
+            if reason:
+                collected = self._collect(2, reason)
+                self._last_full = self._last_young = time.monotonic()
+                self._rss_after_full = rss_bytes()
+                logger.info(
+                    f"Full collection ({reason}) freed {collected} objects, RSS {rss // _MB} -> {self._rss_after_full // _MB} MB",
+                    extra={"tags": {"method": "MemoryGovernor.maybe_collect"}}
+                )
+                return 2
+        if now - self._last_young >= GC_GOVERNOR_YOUNG_MIN_INTERVAL and self.allocations_since_young() >= GC_GOVERNOR_ALLOC_THRESHOLD:
+            self._collect(1, "allocations")
+            self._last_young = time.monotonic()
+            return 1
+        return None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(GC_GOVERNOR_CHECK_INTERVAL)
+            try:
+                self.maybe_collect()
+            except Exception as e:
+                logger.error(f"Memory governor check failed: {e}", extra={"tags": {"method": "MemoryGovernor._run"}})
+
+    def start(self) -> None:
+        """
+        Configure the collector and start the periodic check on the running loop.
+        """
+        self.configure()
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+memory_governor = MemoryGovernor()
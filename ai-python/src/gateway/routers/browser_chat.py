@@ -9,7 +9,6 @@ from src.chatflow_langchain.controller.browser import BrowserController
 import os
 from dotenv import load_dotenv
 from src.gateway.utils import log_api_call
-import gc
 
 load_dotenv()
 
@@ -84,5 +83,3 @@ async def browser_chat(
             }
         )
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error") 
-    finally:
-        gc.collect()
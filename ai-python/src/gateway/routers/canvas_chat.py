@@ -9,7 +9,6 @@ from src.gateway.custom_fastapi.streaming_response import StreamingResponseWithS
 import os
 from dotenv import load_dotenv
 from src.gateway.utils import log_api_call
-import gc
 
 load_dotenv()
 
@@ -63,6 +62,4 @@ async def canvas_chat_generate(
             extra={"tags": {"endpoint": "/canvas-chat-generate", "thread_id": canvas_input.old_thread_id}}
         )
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
-    
-    finally:
-        gc.collect()
\ No newline at end of file
+    
\ No newline at end of file
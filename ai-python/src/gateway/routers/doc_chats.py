@@ -9,7 +9,6 @@ from src.gateway.custom_fastapi.streaming_response import StreamingResponseWithS
 import os
 from dotenv import load_dotenv
 from src.gateway.utils import log_api_call
-import gc
 
 load_dotenv()
 
@@ -84,6 +83,3 @@ async def stream_chat_with_doc(
             }
         )
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
-
-    finally:
-        gc.collect()
\ No newline at end of file
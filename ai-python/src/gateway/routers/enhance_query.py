@@ -8,7 +8,6 @@ from src.logger.default_logger import logger
 import os
 from dotenv import load_dotenv
 from src.gateway.utils import log_api_call
-import gc
 
 load_dotenv()
 
@@ -65,6 +64,4 @@ async def enhance_query_generate(
         raise HTTPException(        
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Failed to generate title and store text")
-   
-    finally:
-        gc.collect()
\ No newline at end of file
+   
\ No newline at end of file
@@ -3,19 +3,22 @@ from celery import chain
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from src.celery_worker_hub.extraction.tasks import extract_text_task
-from src.gateway.schema.store_multiVector import StoreVectorResponse,OpenAIMultiVectorStore
+from src.gateway.schema.store_multiVector import StoreVectorResponse,OpenAIMultiVectorStore,IngestionJobStatusResponse
 from src.celery_service.openai.embed_task import data_preparation, start_embedding_openai
 from src.celery_service.qdrant.insertion_task import insert_into_vector_db
 from src.celery_service.mongodb.task_status import log_task_status
 from src.celery_service.vectors_chain import VECTOR_DB_TASK_CHAINS
+from src.celery_service.ingestion_job import register_ingestion_job,get_ingestion_job_status,stream_ingestion_job_status,finalize_ingestion_job,fail_ingestion_job
+from src.gateway.custom_fastapi.streaming_response import StreamingResponseWithStatusCode
+import asyncio
 from src.gateway.jwt_decode import get_user_data
 from src.logger.default_logger import logger
 import os
 from dotenv import load_dotenv
 from src.gateway.utils import log_api_call
 import redis
-from celery import chain, group
-import gc
+from celery import chain, chord
+from celery.utils import uuid
 load_dotenv()
 
 limit_vector = os.getenv("LIM_VECTORS", "5/minute")
@@ -31,7 +34,7 @@ redis_client = redis.StrictRedis.from_url(redis_url)
     "/general-multi-store-vector",
     summary="OpenAI Multi Store Vector",
     description="Endpoint to process and store text data as vectors using OpenAI embedding and storage logic.",
-    response_description="Task chain ID for tracking the process.",
+    response_description="Ingestion job ID for tracking the process.",
     response_model=StoreVectorResponse,
 )
 # @limiter.limit(limit_vector)
@@ -51,7 +54,8 @@ async def process_and_store_text_openai(
       Embedding and Qdrant Vector Insertion:
 
     Returns:
-    - str: The ID of the created task chain, allowing for later tracking and monitoring.
+    - StoreVectorResponse: The ID of the ingestion job. The request returns as soon as the chains are queued;
+      progress is available from `/general-multi-store-vector/{job_id}/status` and `/general-multi-store-vector/{job_id}/events`.
 
     Raises:
     - HTTPException: If there's an error during task chain initialization or processing.
@@ -69,6 +73,7 @@ async def process_and_store_text_openai(
     TASK_CHAIN_DICT = VECTOR_DB_TASK_CHAINS.get("qdrant", None)
     try:
         task_chains = []
+        job_id = uuid()
         for input in openai_input.payload_list:
             task_chain = chain(
                 TASK_CHAIN_DICT['extract'].s(
@@ -113,7 +118,7 @@ async def process_and_store_text_openai(
                     "task_id": task_chain.id,
                     "status": "PENDING",
                     "task_progress": "QUEUE",
-                    "collection": "file",
+                    "collection": openai_input.file,
                 }
             )
             logger.info(
@@ -121,31 +126,32 @@ async def process_and_store_text_openai(
                 extra={"tags": {"endpoint": "/openai-multi-store-vector", "file_id": input.id}},
             )
 
-        # Execute all chains as a group
-        group_result = group(task_chains).apply_async()
-        group_id = group_result.id
-
-        # Wait for all chains to complete
-        group_result.join()
-
-        # Check for any failures
-        if group_result.failed():
-            failed_tasks = [res for res in group_result.results if res.state == 'FAILURE']
-            errors = [res.result for res in failed_tasks]
-            raise Exception(f"One or more tasks failed: {errors}")
-
-        # Collect results for all chains
-        # final_results = [res.get() for res in group_result.results]
+        # Execute all chains as a chord, its callbacks record the outcome and release the group results,
+        # the job is tracked through the status endpoints instead of join()
+        callback = finalize_ingestion_job.si(job_id=job_id)
+        callback.link_error(fail_ingestion_job.s(job_id=job_id))
+        ingestion = chord(task_chains, callback)
+        group_result = ingestion.freeze().parent
+        group_result.save()
+        # Registered before the chains are queued, so the callbacks always find the job
+        await asyncio.to_thread(
+            register_ingestion_job,
+            job_id,
+            group_result.id,
+            [input.id for input in openai_input.payload_list],
+            openai_input.file,
+        )
+        ingestion.apply_async()
 
-        group_result.forget()
-        group_result = None
         del task_chains
         task_chains = None
-        gc.collect()
 
-        logger.info("All files processed successfully.")
-        return StoreVectorResponse(task_chain_id=group_id)         
-        
+        logger.info(
+            "Ingestion job queued",
+            extra={"tags": {"endpoint": "/openai-multi-store-vector", "job_id": job_id}},
+        )
+        return StoreVectorResponse(task_chain_id=job_id, job_id=job_id)
+
 
     except HTTPException as he:
         logger.error(
@@ -163,12 +169,46 @@ async def process_and_store_text_openai(
         if 'group_result' in locals():
             group_result.forget()
         
-            # Clean up resources
-            del task_chains
-        gc.collect()
-        
         logger.error(
             f"Error executing task: {e}",
             extra={"tags": {"endpoint": "/openai-multi-store-vector"}}
         )
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get(
+    "/general-multi-store-vector/{job_id}/status",
+    summary="OpenAI Multi Store Vector Job Status",
+    description="Endpoint to poll the progress of an ingestion job.",
+    response_model=IngestionJobStatusResponse,
+)
+async def get_ingestion_status(job_id: str, current_user=Depends(get_user_data)):
+    """
+    Returns the aggregated status of an ingestion job and the `log_task_status` record of each of its files.
+    Failed chains are reported in `errors` once the chord callbacks have released the Celery group.
+    """
+    log_api_call("/general-multi-store-vector/status")
+    try:
+        snapshot = await get_ingestion_job_status(job_id)
+    except Exception as e:
+        logger.error(
+            f"Error fetching ingestion job status: {e}",
+            extra={"tags": {"endpoint": "/general-multi-store-vector/status", "job_id": job_id}}
+        )
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if snapshot is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ingestion job not found")
+    return IngestionJobStatusResponse(**snapshot)
+
+
+@router.get(
+    "/general-multi-store-vector/{job_id}/events",
+    summary="OpenAI Multi Store Vector Job Events",
+    description="Server-sent events stream of the progress of an ingestion job.",
+)
+async def stream_ingestion_status(job_id: str, current_user=Depends(get_user_data)):
+    """
+    Streams a job snapshot every time it changes and closes the stream once the job is SUCCESS or FAILURE.
+    """
+    log_api_call("/general-multi-store-vector/events")
+    return StreamingResponseWithStatusCode(stream_ingestion_job_status(job_id), media_type="text/event-stream")
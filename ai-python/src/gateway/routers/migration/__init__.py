@@ -5,6 +5,7 @@ from src.gateway.routers.migration.company_migration import router as migrate_co
 from src.gateway.routers.migration.model_migration import router as migrate_model
 from src.gateway.routers.migration.Delete_Record.delete_record import router as delete_import_chat_dependent
 from src.gateway.routers.migration.dynamic_migration import router as dynamic_migration
+from src.gateway.routers.migration.token_cost_migration import router as migrate_token_cost
 
 migration_router = APIRouter()
 
@@ -14,3 +15,4 @@ migration_router.include_router(migrate_model, prefix="/model", tags=["Model Mig
 migration_router.include_router(migrate_setting, prefix="/setting", tags=["Setting Migration"])
 migration_router.include_router(delete_import_chat_dependent, prefix="/delete", tags=["Delete Records"])
 migration_router.include_router(dynamic_migration, prefix="/dynamic", tags=["Dynamic Migration"])
+migration_router.include_router(migrate_token_cost, prefix="/tokens", tags=["Token Cost Migration"])
@@ -0,0 +1,38 @@
+from typing import List
+from fastapi import HTTPException, status, Depends, APIRouter
+from pydantic import BaseModel
+from src.db.async_config import async_db_instance
+from src.logger.default_logger import logger
+from src.gateway.jwt_decode import get_user_data
+from src.chatflow_langchain.repositories.accounting_sink import LEGACY_COST_FIELDS, numeric_cost_expression
+
+router = APIRouter()
+
+class TokenCostMigrationRequest(BaseModel):
+    collections: List[str] = ["messages"]
+
+@router.post("/migrate-token-cost", summary="Convert legacy \"$\" string token costs to numbers")
+async def migrate_token_cost(request: TokenCostMigrationRequest, current_user=Depends(get_user_data)):
+    try:
+        migrated = {}
+        for collection_name in request.collections:
+            collection = async_db_instance[collection_name]
+            total_migrated_count = 0
+            for field in LEGACY_COST_FIELDS:
+                # Only string values are rewritten, numeric and missing costs are left as they are
+                result = await collection.update_many(
+                    {field: {"$type": "string"}},
+                    [{"$set": {field: numeric_cost_expression(field)}}]
+                )
+                total_migrated_count += result.modified_count
+            migrated[collection_name] = total_migrated_count
+            logger.info(f"Token cost migration converted {total_migrated_count} fields in '{collection_name}'.")
+
+        return {
+            "message": "Migration for token cost completed successfully.",
+            "migratedCount": migrated
+        }
+
+    except Exception as e:
+        logger.error(f"Migration error: {e}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Migration process encountered an error.")
@@ -14,7 +14,6 @@ from dotenv import load_dotenv
 from src.gateway.utils import log_api_call
 import redis
 from celery import chain, group
-import gc
 load_dotenv()
 
 limit_vector = os.getenv("LIM_VECTORS", "5/minute")
@@ -143,7 +142,6 @@ async def process_and_store_text_openai(
         group_result = None
         del task_chains
         task_chains = None
-        gc.collect()
 
         logger.info("All files processed successfully.")
         return StoreVectorResponse(task_chain_id=group_id)         
@@ -167,7 +165,6 @@ async def process_and_store_text_openai(
         
             # Clean up resources
             del task_chains
-        gc.collect()
         
         logger.error(
             f"Error executing task: {e}",
@@ -9,7 +9,6 @@ import os
 from src.gateway.custom_fastapi.streaming_response import StreamingResponseWithStatusCode
 from dotenv import load_dotenv
 from src.gateway.utils import log_api_call
-import gc
 
 load_dotenv()
 
@@ -82,6 +81,4 @@ async def pro_agent(
             }
         )
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Internal server error")
-    
-    finally:
-        gc.collect()
\ No newline at end of file
+    
\ No newline at end of file
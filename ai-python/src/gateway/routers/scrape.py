@@ -8,7 +8,6 @@ from src.gateway.schema.scrape import ScrapeRequest,ScrapeResponse
 import os
 from dotenv import load_dotenv
 from src.gateway.utils import log_api_call
-import gc
 
 load_dotenv()
 
@@ -80,6 +79,4 @@ async def scrape_url(
             }
         )
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
-    
-    finally:
-        gc.collect()
\ No newline at end of file
+    
\ No newline at end of file
@@ -13,7 +13,6 @@ from src.gateway.custom_fastapi.streaming_response import StreamingResponseWithS
 from dotenv import load_dotenv
 from src.gateway.utils import log_api_call
 from src.chatflow_langchain.utils.url_validator import URLCheckerService
-import gc
 
 load_dotenv()
 
@@ -101,8 +100,6 @@ async def summary_service(
         )
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Failed to generate business summary")
     
-    finally:
-        gc.collect()
 
 
 
@@ -172,8 +169,6 @@ async def keyword_research_service(
         )
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Failed to generate keyword research")
     
-    finally:
-        gc.collect()
 
 
 @router.post(
@@ -226,8 +221,6 @@ async def topic_generation_service(
         logger.error("Error in topic generation", extra={"tags": {"endpoint": "/topic-generation", "error": str(e)}})
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Failed to generate topic")
 
-    finally:
-        gc.collect()
 
 
 @router.post(
@@ -282,6 +275,4 @@ async def article_generation(
     except Exception as e:
         logger.error("Error in topic generation", extra={"tags": {"endpoint": "/topic-generation", "error": str(e)}})
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Failed to generate article")
-    
-    finally:
-        gc.collect()
\ No newline at end of file
+    
\ No newline at end of file
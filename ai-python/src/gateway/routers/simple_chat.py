@@ -8,7 +8,6 @@ from src.gateway.custom_fastapi.streaming_response import StreamingResponseWithS
 import os
 from dotenv import load_dotenv
 from src.gateway.utils import log_api_call
-import gc
 from src.chatflow_langchain.service.openai.simple_chat.system_conversation import OpenAISimpleStreamingChatService
 
 load_dotenv()
@@ -99,8 +98,6 @@ async def chat_with_ai(
             }
         )
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error") 
-    finally:
-        gc.collect()
         
 @router.post(
     "/mock-stream-chat-with-openai",
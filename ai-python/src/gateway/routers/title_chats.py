@@ -8,7 +8,6 @@ from src.logger.default_logger import logger
 import os
 from dotenv import load_dotenv
 from src.gateway.utils import log_api_call
-import gc
 from src.gateway.exceptions import CustomTitleHttpException
 
 load_dotenv()
@@ -73,6 +72,4 @@ async def title_chat_generate(
         raise CustomTitleHttpException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Title generating was interrupted by an issue.",
-            data={"chat_session_id":title_input.chat_session_id,"chatmodel":title_input.chatmodel,"chatmembermodel":title_input.chatmembermodel})
-    finally:
-        gc.collect()
\ No newline at end of file
+            data={"chat_session_id":title_input.chat_session_id,"chatmodel":title_input.chatmodel,"chatmembermodel":title_input.chatmembermodel})
\ No newline at end of file
@@ -9,7 +9,6 @@ from src.chatflow_langchain.controller.tool_hub import ToolController
 import os
 from dotenv import load_dotenv
 from src.gateway.utils import log_api_call
-import gc
 
 load_dotenv()
 
@@ -96,8 +95,6 @@ async def too_chat_with_ai(
             }
         )
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error") 
-    finally:
-        gc.collect()
 
 
 
@@ -192,5 +189,3 @@ async def too_chat_with_ai(
             }
         )
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error") 
-    finally:
-        gc.collect()
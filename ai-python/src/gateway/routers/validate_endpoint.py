@@ -5,7 +5,6 @@ from src.logger.default_logger import logger
 import os
 from dotenv import load_dotenv
 from src.gateway.utils import log_api_call
-import gc
 from huggingface_hub import get_inference_endpoint
 from fastapi.responses import JSONResponse
 from src.gateway.schema.endpoint_validation import EndpointValidationBase
@@ -71,6 +70,4 @@ async def validate_huggingface_endpoint(
             extra={"tags": {"endpoint": "/validate-huggingface-endpoint"}}
         )
         return JSONResponse(content={"message": f"Validation Failed:{e}","data":False}, status_code=status.HTTP_200_OK)
-    
-    finally:
-        gc.collect()
\ No newline at end of file
+    
\ No newline at end of file
@@ -9,7 +9,6 @@ import os
 from dotenv import load_dotenv
 from src.gateway.utils import log_api_call
 from src.chatflow_langchain.utils.url_validator import URLCheckerService
-import gc
 
 load_dotenv()
 
@@ -90,5 +89,3 @@ async def upload_file_service(
         )
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Failed to Upload Gemini")
     
-    finally:
-        gc.collect()
@@ -124,4 +124,19 @@ class OpenAIMultiVectorStore(BaseModel):
     provider:str=Field(None,description="Provider to decide which llm to use for response")
 class StoreVectorResponse(BaseModel):
     task_chain_id: str
+    job_id: str = Field(None, description="Ingestion job id used to poll or stream the progress of the files.")
+
+class IngestionFileStatus(BaseModel):
+    file_id: str = Field(..., description="File id which is belong from mongodb.")
+    task_id: str = Field(None, description="Task chain id of the file.")
+    status: str = Field("PENDING", description="Status logged for the file (PENDING, STARTED, SUCCESS, FAILURE).")
+    progress: str = Field("QUEUE", description="Stage logged for the file (QUEUE, EXTRACTION, OPENAI_EMBEDDING, ...).")
+
+class IngestionJobStatusResponse(BaseModel):
+    job_id: str
+    status: str = Field(..., description="Aggregated status of the job (PENDING, STARTED, SUCCESS, FAILURE).")
+    completed: int = Field(..., description="Number of files that reached SUCCESS or FAILURE.")
+    total: int = Field(..., description="Number of files in the job.")
+    errors: List[str] = Field(default_factory=list, description="Errors of the failed task chains.")
+    files: List[IngestionFileStatus]
 
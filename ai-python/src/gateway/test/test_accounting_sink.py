@@ -0,0 +1,148 @@
+import asyncio
+import pytest
+from bson.objectid import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import AutoReconnect, BulkWriteError
+from src.chatflow_langchain.repositories import accounting_sink
+from src.chatflow_langchain.repositories.accounting_sink import AccountingSink, _legacy_pipeline, numeric_cost_expression
+
+THREAD_ID = ObjectId()
+COMPANY_ID = ObjectId()
+USER_ID = ObjectId()
+
+
+class FakeCollection:
+    """Collection recording every bulk write, raising the queued failures first."""
+    def __init__(self):
+        self.writes = []
+        self.failures = []
+
+    def bulk_write(self, requests, ordered=True):
+        self.writes.append((list(requests), ordered))
+        if self.failures:
+            raise self.failures.pop(0)
+
+
+class AsyncFakeCollection(FakeCollection):
+    async def bulk_write(self, requests, ordered=True):
+        return super().bulk_write(requests, ordered)
+
+
+class FakeDatabase(dict):
+    def __init__(self, collection_class):
+        super().__init__()
+        self.collection_class = collection_class
+
+    def __missing__(self, name):
+        collection = self[name] = self.collection_class()
+        return collection
+
+    def get_collection(self, name):
+        return self[name]
+
+
+def type_mismatch(index):
+    return {"index": index, "code": 14, "errmsg": "Cannot apply $inc to a value of non-numeric type string"}
+
+
+@pytest.fixture
+def databases(monkeypatch):
+    sync_db, async_db = FakeDatabase(FakeCollection), FakeDatabase(AsyncFakeCollection)
+    monkeypatch.setattr(accounting_sink, "db_instance", sync_db)
+    monkeypatch.setattr(accounting_sink, "async_db_instance", async_db)
+    monkeypatch.setattr(accounting_sink, "ACCOUNTING_FLUSH_INTERVAL", 0.01)
+    return sync_db, async_db
+
+
+@pytest.mark.anyio
+async def test_turn_counters_are_merged_into_one_update_per_document(databases):
+    _, async_db = databases
+    sink = AccountingSink()
+    sink.add("messages", str(THREAD_ID), inc={"tokens.totalUsed": 100, "tokens.totalCost": 0.5})
+    sink.add("messages", THREAD_ID, inc={"tokens.totalUsed": 20}, set_fields={"responseModel": "gpt-4o"})
+    sink.add("company", COMPANY_ID, inc={"freeCredit": -1})
+    sink.add("user", USER_ID, inc={"msgCredit": -1})
+    sink.add("user", USER_ID, inc={"msgCredit": -2})
+    await asyncio.sleep(0.05)
+
+    assert async_db["messages"].writes == [([UpdateOne(
+        {"_id": THREAD_ID},
+        {"$inc": {"tokens.totalUsed": 120, "tokens.totalCost": 0.5}, "$set": {"responseModel": "gpt-4o"}},
+    )], False)]
+    assert async_db["company"].writes == [([UpdateOne({"_id": COMPANY_ID}, {"$inc": {"freeCredit": -1}})], False)]
+    assert async_db["user"].writes == [([UpdateOne({"_id": USER_ID}, {"$inc": {"msgCredit": -3}})], False)]
+
+
+@pytest.mark.anyio
+async def test_set_overrides_buffered_increments_and_later_increments_add_to_it(databases):
+    _, async_db = databases
+    sink = AccountingSink()
+    sink.add("messages", THREAD_ID, inc={"tokens.totalUsed": 100})
+    sink.add("messages", THREAD_ID, set_fields={"tokens.totalUsed": 10})
+    sink.add("messages", THREAD_ID, inc={"tokens.totalUsed": 5})
+    await sink.flush()
+
+    assert async_db["messages"].writes == [([UpdateOne({"_id": THREAD_ID}, {"$set": {"tokens.totalUsed": 15}})], False)]
+
+
+@pytest.mark.anyio
+async def test_legacy_string_costs_are_converted_by_a_pipeline_retry(databases):
+    _, async_db = databases
+    legacy_id = ObjectId()
+    async_db["messages"].failures.append(BulkWriteError({"writeErrors": [type_mismatch(1)]}))
+    sink = AccountingSink()
+    sink.add("messages", THREAD_ID, inc={"tokens.totalCost": 0.5})
+    sink.add("messages", legacy_id, inc={"tokens.totalCost": 0.25, "tokens.totalUsed": 10}, set_fields={"responseModel": "$gpt-4o"})
+    await sink.flush()
+
+    first, retry = async_db["messages"].writes
+    assert len(first[0]) == 2
+    assert retry == ([UpdateOne(
+        {"_id": legacy_id},
+        _legacy_pipeline({"tokens.totalCost": 0.25, "tokens.totalUsed": 10}, {"responseModel": "$gpt-4o"}),
+    )], False)
+    (stage,) = retry[0][0]._doc
+    # Only legacy cost fields are parsed, "$"-prefixed values are written as literals
+    assert stage["$set"]["tokens.totalCost"] == {"$add": [numeric_cost_expression("tokens.totalCost"), 0.25]}
+    assert stage["$set"]["tokens.totalUsed"] == {"$add": [{"$ifNull": ["$tokens.totalUsed", 0]}, 10]}
+    assert stage["$set"]["responseModel"] == {"$literal": "$gpt-4o"}
+
+
+@pytest.mark.anyio
+async def test_other_write_errors_are_not_retried(databases):
+    _, async_db = databases
+    error = {"index": 0, "code": 121, "errmsg": "Document failed validation"}
+    async_db["messages"].failures.append(BulkWriteError({"writeErrors": [error]}))
+    sink = AccountingSink()
+    sink.add("messages", THREAD_ID, inc={"tokens.totalUsed": 10})
+    await sink.flush()
+    await sink.flush()
+
+    assert len(async_db["messages"].writes) == 1
+
+
+@pytest.mark.anyio
+async def test_updates_are_restored_when_the_write_fails(databases):
+    _, async_db = databases
+    async_db["messages"].failures.append(AutoReconnect("primary stepped down"))
+    sink = AccountingSink()
+    sink.add("messages", THREAD_ID, inc={"tokens.totalUsed": 10})
+    await sink.flush()
+    sink.add("messages", THREAD_ID, inc={"tokens.totalUsed": 5})
+    await sink.flush()
+
+    _, written = async_db["messages"].writes
+    assert written == ([UpdateOne({"_id": THREAD_ID}, {"$inc": {"tokens.totalUsed": 15}})], False)
+
+
+def test_counters_added_without_a_loop_are_written_synchronously(databases):
+    sync_db, async_db = databases
+    sync_db["company"].failures.append(BulkWriteError({"writeErrors": [type_mismatch(0)]}))
+    sink = AccountingSink()
+    sink.add("company", COMPANY_ID, inc={"tokens.totalCost": 0.5})
+
+    assert sync_db["company"].writes == [
+        ([UpdateOne({"_id": COMPANY_ID}, {"$inc": {"tokens.totalCost": 0.5}})], False),
+        ([UpdateOne({"_id": COMPANY_ID}, _legacy_pipeline({"tokens.totalCost": 0.5}, {}))], False),
+    ]
+    assert not async_db
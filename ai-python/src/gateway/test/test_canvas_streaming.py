@@ -0,0 +1,136 @@
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, List, Optional
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.prompts import ChatPromptTemplate
+from src.chatflow_langchain.service.openai.canvas import canvas_manager
+from src.chatflow_langchain.service.openai.canvas.canvas_manager import OpenAICanvasService
+from src.chatflow_langchain.service.openai.canvas.utils import regex_replace_v2
+
+TOKENS = [f"token{index} " for index in range(20)]
+TOKEN_DELAY = 0.05
+EDITS = [
+    {"regex_pattern": r"quick", "replacement_string": "slow"},
+    {"regex_pattern": r"brown fox", "replacement_string": "red panda"},
+    {"regex_pattern": r"lazy dog", "replacement_string": "sleepy cat"},
+]
+ANSWER = "The quick brown fox jumps over the lazy dog."
+
+
+class SlowStreamingChatModel(BaseChatModel):
+    """Chat model streaming each token, or each piece of a tool call, after a provider delay."""
+    chunks: List[Any]
+
+    @property
+    def _llm_type(self) -> str:
+        return "slow-streaming"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(TOKEN_DELAY * len(self.chunks))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="".join(TOKENS)))])
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        for chunk in self.chunks:
+            await asyncio.sleep(TOKEN_DELAY)
+            yield ChatGenerationChunk(message=chunk)
+
+
+def tool_call_chunks() -> List[AIMessageChunk]:
+    """Each edit streamed in two halves of its arguments, as OpenAI sends them."""
+    chunks = []
+    for index, edit in enumerate(EDITS):
+        args = json.dumps(edit)
+        middle = len(args) // 2
+        chunks.append(AIMessageChunk(content="", tool_call_chunks=[{"name": "regex_replace", "args": args[:middle], "id": f"call_{index}", "index": index}]))
+        chunks.append(AIMessageChunk(content="", tool_call_chunks=[{"name": None, "args": args[middle:], "id": None, "index": index}]))
+    return chunks
+
+
+@pytest.fixture
+def canvas_service(monkeypatch):
+    service = OpenAICanvasService()
+    service.thread_id = "thread"
+    service.query_arguments = {}
+    service.prompt_builder = None
+    service.saved = None
+
+    async def save_answer(chat_session_id, chat_collection_name, new_thread_id, collection_name, cb, final_answer, msgCredit, is_paid_user):
+        service.saved = final_answer
+
+    monkeypatch.setattr(service, "async_initialize_and_update", save_answer)
+    return service
+
+
+async def collect(service: OpenAICanvasService):
+    frames = []
+    first_frame = None
+    start = time.perf_counter()
+    async for frame, status_code in service.run_chain(query="Rewrite this"):
+        assert status_code == 200
+        if first_frame is None:
+            first_frame = time.perf_counter() - start
+        frames.append(frame)
+    return frames, first_frame, time.perf_counter() - start
+
+
+@pytest.mark.anyio
+async def test_code_edits_stream_tokens_as_they_are_generated(canvas_service, max_loop_lag):
+    canvas_service.extracted_code = ["print('hello')"]
+    model = SlowStreamingChatModel(chunks=[AIMessageChunk(content=token) for token in TOKENS])
+    canvas_service.llm_chain = ChatPromptTemplate.from_messages([("human", "{query}")]) | model
+
+    stop = asyncio.Event()
+    probe = asyncio.create_task(max_loop_lag(stop))
+    try:
+        frames, first_frame, total = await collect(canvas_service)
+    finally:
+        stop.set()
+        lag = await probe
+
+    assert frames == [f"data: {token.encode('utf-8')}\n\n" for token in TOKENS]
+    assert canvas_service.saved == "".join(TOKENS)
+    # The first token is sent when the model produced it, not once the whole answer is known
+    assert first_frame < total / 4
+    assert lag < TOKEN_DELAY
+
+
+@pytest.mark.anyio
+async def test_tool_edits_are_applied_in_order(canvas_service):
+    canvas_service.extracted_code = []
+    canvas_service.ai_answer = ANSWER
+    canvas_service.prompt_list = ChatPromptTemplate.from_messages([("human", "Rewrite this")]).format_messages()
+    canvas_service.llm_with_tools = SlowStreamingChatModel(chunks=tool_call_chunks())
+
+    frames, _, _ = await collect(canvas_service)
+
+    expected = ANSWER
+    for edit in EDITS:
+        expected = regex_replace_v2(regex_pattern=edit["regex_pattern"], replacement_string=edit["replacement_string"], original_string=expected)
+    assert canvas_service.saved == expected
+    assert "".join(frames) == "".join(f"data: {expected[i:i + 5].encode('utf-8')}\n\n" for i in range(0, len(expected), 5))
+
+
+@pytest.mark.anyio
+async def test_doc_chunks_are_retrieved_before_the_chain_runs(canvas_service, monkeypatch):
+    class AsyncVectorStore:
+        async def amulti_doc_query(self, query_text):
+            await asyncio.sleep(TOKEN_DELAY)
+            return f"chunks for {query_text}"
+
+    def build_prompt(chunks):
+        canvas_service.prompt_list = ChatPromptTemplate.from_messages([("system", chunks), ("human", "{query}")])
+
+    monkeypatch.setattr(canvas_manager, "qdrant_vector_store", AsyncVectorStore())
+    canvas_service.extracted_code = ["print('hello')"]
+    canvas_service.selected_text_part = "hello"
+    canvas_service.prompt_builder = build_prompt
+    canvas_service.llm = SlowStreamingChatModel(chunks=[AIMessageChunk(content=token) for token in TOKENS[:3]])
+
+    frames, _, _ = await collect(canvas_service)
+
+    assert canvas_service.prompt_list.messages[0].prompt.template == "chunks for hello"
+    assert canvas_service.saved == "".join(TOKENS[:3])
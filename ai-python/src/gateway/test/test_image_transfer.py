@@ -0,0 +1,139 @@
+import asyncio
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from src.chatflow_langchain.utils.image_transfer import ImageTransfer, IMAGE_TRANSFER_CHUNK_SIZE
+
+IMAGE = os.urandom(2 * 1024 * 1024)
+SERVED_CHUNK = 64 * 1024
+CONCURRENT_IMAGES = 6
+# Longest the event loop may go without running a ready callback while images are transferred
+MAX_LOOP_LAG = 0.1
+
+
+class SlowImageHandler(BaseHTTPRequestHandler):
+    """Image provider CDN sending the image in small delayed chunks."""
+    def do_GET(self):
+        if self.path != "/image.png":
+            self.send_response(404)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(IMAGE)))
+        self.end_headers()
+        for start in range(0, len(IMAGE), SERVED_CHUNK):
+            self.wfile.write(IMAGE[start:start + SERVED_CHUNK])
+            time.sleep(0.005)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SlowObjectStore:
+    """Stand-in for the MinIO/S3 client, reading upload bodies with blocking network waits."""
+    def __init__(self):
+        self.objects = {}
+        self.content_types = {}
+        self.max_read = 0
+        self._lock = threading.Lock()
+
+    def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None, Config=None):
+        data = bytearray()
+        while True:
+            chunk = fileobj.read(Config.multipart_chunksize)
+            with self._lock:
+                self.max_read = max(self.max_read, len(chunk))
+            if not chunk:
+                break
+            data += chunk
+            time.sleep(0.05)
+        with self._lock:
+            self.objects[(bucket, key)] = bytes(data)
+            self.content_types[(bucket, key)] = ExtraArgs["ContentType"]
+
+
+@pytest.fixture
+def image_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowImageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+@pytest.mark.anyio
+async def test_concurrent_transfers_do_not_block_the_loop(image_server, max_loop_lag):
+    transfer = ImageTransfer()
+    store = SlowObjectStore()
+    # Creates the HTTP client, and its SSL context, before measuring
+    transfer.slot()
+    stop = asyncio.Event()
+    probe = asyncio.create_task(max_loop_lag(stop))
+    try:
+        results = await asyncio.gather(*(
+            transfer.upload_from_url(f"{image_server}/image.png", f"images/{index}.png", s3_client=store, bucket_name="bucket")
+            for index in range(CONCURRENT_IMAGES)
+        ))
+    finally:
+        stop.set()
+        lag = await probe
+        await transfer.aclose()
+
+    assert results == [True] * CONCURRENT_IMAGES
+    for index in range(CONCURRENT_IMAGES):
+        assert store.objects[("bucket", f"images/{index}.png")] == IMAGE
+        assert store.content_types[("bucket", f"images/{index}.png")] == "image/png"
+    assert lag < MAX_LOOP_LAG
+    # The image is smaller than a part, so it reached the store in one read of the whole body
+    assert store.max_read == len(IMAGE)
+
+
+@pytest.mark.anyio
+async def test_download_failure_is_reported_without_upload(image_server):
+    transfer = ImageTransfer()
+    store = SlowObjectStore()
+    try:
+        assert await transfer.upload_from_url(f"{image_server}/missing.png", "images/missing.png", s3_client=store, bucket_name="bucket") is False
+    finally:
+        await transfer.aclose()
+    assert store.objects == {}
+
+
+@pytest.mark.anyio
+async def test_failed_upload_stops_the_download(image_server):
+    class FailingObjectStore:
+        def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None, Config=None):
+            fileobj.read(IMAGE_TRANSFER_CHUNK_SIZE)
+            raise ConnectionError("object store unavailable")
+
+    transfer = ImageTransfer()
+    try:
+        with pytest.raises(ConnectionError):
+            await asyncio.wait_for(
+                transfer.upload_from_url(f"{image_server}/image.png", "images/0.png", s3_client=FailingObjectStore(), bucket_name="bucket"),
+                timeout=10,
+            )
+    finally:
+        await transfer.aclose()
+
+
+@pytest.mark.anyio
+async def test_slots_bound_concurrent_generations():
+    transfer = ImageTransfer(concurrency=2)
+    running = 0
+    peak = 0
+
+    async def generate():
+        nonlocal running, peak
+        async with transfer.slot():
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(generate() for _ in range(10)))
+    await transfer.aclose()
+    assert peak == 2
+
@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+from src.custom_lib.langchain.chat_models.client_pool import LLMClientPool
+from src.custom_lib.langchain.chat_models.openai.chatopenai_cache import pool_provider
+
+
+class FakeClient:
+    def __init__(self, name, closed):
+        self.name = name
+        self.closed = closed
+
+    def close(self):
+        self.closed.append(self.name)
+
+
+class FakeAsyncClient(FakeClient):
+    async def aclose(self):
+        self.closed.append(self.name)
+
+
+def test_clients_evicted_over_the_entry_limit_stay_open_for_their_holders():
+    pool = LLMClientPool(max_entries=1)
+    held = pool.get_http_client("openai", "key-1")
+    other = pool.get_http_client("openai", "key-2")
+
+    assert not held.is_closed
+    # The evicted client is rebuilt for the next caller, the holder keeps its own
+    assert pool.get_http_client("openai", "key-1") is not held
+    assert pool.get_http_client("openai", "key-2") is not other
+    held.close()
+
+
+def test_evicted_clients_are_closed_once_nobody_holds_them():
+    pool, closed = LLMClientPool(max_entries=1), []
+    held = pool.get_client("openai", "key-1", None, lambda: FakeClient("key-1", closed))
+    pool.get_client("openai", "key-2", None, lambda: FakeClient("key-2", closed))
+    assert closed == []
+
+    del held
+    pool.get_client("openai", "key-3", None, lambda: FakeClient("key-3", closed))
+    assert closed == ["key-1", "key-2"]
+
+
+@pytest.mark.anyio
+async def test_idle_async_clients_are_closed_on_their_loop_once_released():
+    pool, closed = LLMClientPool(idle_timeout=0), []
+    streaming = pool.get_client("anthropic", "key", None, lambda: FakeAsyncClient("key", closed), loop_bound=True)
+    pool.get_client("anthropic", "other-key", None, lambda: FakeAsyncClient("other-key", closed), loop_bound=True)
+    await asyncio.sleep(0.01)
+    assert closed == []
+
+    del streaming
+    pool.get_client("anthropic", "third-key", None, lambda: FakeAsyncClient("third-key", closed), loop_bound=True)
+    await asyncio.sleep(0.01)
+    assert sorted(closed) == ["key", "other-key"]
+    await pool.aclose()
+
+
+def test_openai_compatible_providers_are_pooled_under_their_host():
+    assert pool_provider(None) == "openai"
+    assert pool_provider("https://api.openai.com/v1") == "openai"
+    assert pool_provider("https://openrouter.ai/api/v1") == "openrouter.ai"
+    assert pool_provider("https://api.deepseek.com") == "api.deepseek.com"
@@ -0,0 +1,62 @@
+import httpx
+import pytest
+from src.MCP import http_client
+from src.MCP.http_client import IntegrationHTTPClients
+
+BASE_URL = "https://slack.com/api"
+
+
+def integration_clients(responses):
+    """Clients whose Slack integration answers `responses` in turn, with every request recorded."""
+    sent = []
+
+    def answer(request):
+        sent.append(request.method)
+        status, headers = responses[min(len(sent), len(responses)) - 1]
+        return httpx.Response(status, headers=headers)
+
+    clients = IntegrationHTTPClients()
+    clients._clients[BASE_URL] = httpx.AsyncClient(transport=httpx.MockTransport(answer))
+    return clients, sent
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(http_client, "MCP_RETRY_BASE_DELAY", 0)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("status", [502, 503, 504])
+async def test_gateway_error_on_a_write_is_not_sent_again(status):
+    clients, sent = integration_clients([(status, {}), (200, {})])
+    response = await clients.request("SLACK", BASE_URL, "POST", f"{BASE_URL}/chat.postMessage", json={"text": "hi"})
+    assert response.status_code == status
+    assert sent == ["POST"]
+
+
+@pytest.mark.anyio
+async def test_gateway_error_on_a_read_is_retried():
+    clients, sent = integration_clients([(502, {}), (200, {})])
+    response = await clients.request("SLACK", BASE_URL, "GET", f"{BASE_URL}/conversations.list")
+    assert response.status_code == 200
+    assert sent == ["GET", "GET"]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("status, headers", [
+    (429, {"retry-after": "0"}),
+    (403, {"x-ratelimit-remaining": "0", "retry-after": "0"}),
+])
+async def test_rate_limited_write_is_retried(status, headers):
+    clients, sent = integration_clients([(status, headers), (201, {})])
+    response = await clients.request("GITHUB", BASE_URL, "POST", f"{BASE_URL}/issues", json={"title": "bug"})
+    assert response.status_code == 201
+    assert sent == ["POST", "POST"]
+
+
+@pytest.mark.anyio
+async def test_retry_after_beyond_the_longest_wait_is_returned():
+    clients, sent = integration_clients([(429, {"retry-after": "3600"}), (200, {})])
+    response = await clients.request("SLACK", BASE_URL, "POST", f"{BASE_URL}/chat.postMessage")
+    assert response.status_code == 429
+    assert sent == ["POST"]
@@ -0,0 +1,34 @@
+import gc
+import pytest
+from src.gateway import memory_governor as governor_module
+from src.gateway.memory_governor import MemoryGovernor
+
+GEN0_THRESHOLD = 1000
+
+
+@pytest.fixture
+def governor(monkeypatch):
+    # The young threshold is well above gen 0, as with the defaults
+    monkeypatch.setattr(governor_module, "GC_GOVERNOR_ALLOC_THRESHOLD", 5 * GEN0_THRESHOLD)
+    monkeypatch.setattr(governor_module, "GC_GOVERNOR_YOUNG_MIN_INTERVAL", 0)
+    governor = MemoryGovernor()
+    thresholds = gc.get_threshold()
+    gc.set_threshold(GEN0_THRESHOLD, 10, 10)
+    gc.callbacks.append(governor._on_gc)
+    yield governor
+    gc.callbacks.remove(governor._on_gc)
+    gc.set_threshold(*thresholds)
+
+
+def test_young_collection_runs_once_allocations_cross_the_threshold(governor):
+    gc.collect()
+    governor._young_allocations = 0
+    assert governor.maybe_collect() is None
+
+    kept = [[] for _ in range(6 * GEN0_THRESHOLD)]
+    # Gen 0 never holds more than its own threshold, the allocations are counted across its collections
+    assert gc.get_count()[0] <= GEN0_THRESHOLD
+    assert governor.allocations_since_young() >= 6 * GEN0_THRESHOLD
+    assert governor.maybe_collect() == 1
+    assert governor.maybe_collect() is None
+    assert len(kept) == 6 * GEN0_THRESHOLD
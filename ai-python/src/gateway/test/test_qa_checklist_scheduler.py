@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+from contextlib import aclosing
+import pytest
+from src.chatflow_langchain.service.pro_agent.qa_special.scheduler import KeyRateLimiter, evaluate_in_order
+
+LATENCY = 0.1
+BATCHES = 12
+
+
+class FakeChecklistChain:
+    """Blocking LLM chain answering every checklist batch after an injected latency."""
+    def __init__(self, latencies=None, failing=()):
+        self.latencies = latencies or {}
+        self.failing = set(failing)
+        self.running = 0
+        self.peak = 0
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def invoke(self, inputs):
+        batch = inputs['checklist_item']
+        with self._lock:
+            self.calls.append(batch)
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        try:
+            time.sleep(self.latencies.get(batch, LATENCY))
+            if batch in self.failing:
+                raise RuntimeError(f"quota exceeded for batch {batch}")
+            return {'checklist_item': batch, 'text': {'results': [{'id': f'QA_{batch:03d}', 'status': 'pass'}]}}
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+def evaluate_with(chain):
+    return lambda batch: asyncio.to_thread(chain.invoke, {'source_code': '<html></html>', 'checklist_item': batch})
+
+
+@pytest.mark.anyio
+async def test_batches_run_concurrently_and_are_emitted_in_checklist_order():
+    chain = FakeChecklistChain()
+    start = time.perf_counter()
+    emitted = [batch async for batch, _, _ in evaluate_in_order(list(range(BATCHES)), evaluate_with(chain), concurrency=4)]
+    elapsed = time.perf_counter() - start
+
+    assert emitted == list(range(BATCHES))
+    assert chain.peak == 4
+    # Three rounds of four batches instead of twelve batches one after another
+    assert elapsed < BATCHES * LATENCY / 2
+
+
+@pytest.mark.anyio
+async def test_each_result_is_emitted_once_its_prefix_is_done():
+    # The first batch is slow, the second waits for it, the third is slower than both
+    chain = FakeChecklistChain(latencies={0: 0.3, 1: 0.05, 2: 0.6})
+    start = time.perf_counter()
+    emitted_at = {}
+    async for batch, result, error in evaluate_in_order([0, 1, 2], evaluate_with(chain), concurrency=3):
+        emitted_at[batch] = time.perf_counter() - start
+        assert error is None and result['checklist_item'] == batch
+
+    assert 0.3 <= emitted_at[0] < 0.45
+    assert emitted_at[1] - emitted_at[0] < 0.05
+    assert emitted_at[2] >= 0.6
+
+
+@pytest.mark.anyio
+async def test_a_failed_batch_is_yielded_in_place_and_the_others_complete():
+    chain = FakeChecklistChain(failing={3})
+    outcomes = [(batch, result, error) async for batch, result, error in evaluate_in_order(list(range(6)), evaluate_with(chain), concurrency=3)]
+
+    assert [batch for batch, _, _ in outcomes] == list(range(6))
+    assert isinstance(outcomes[3][2], RuntimeError) and outcomes[3][1] is None
+    assert all(error is None and result['checklist_item'] == batch for batch, result, error in outcomes if batch != 3)
+
+
+@pytest.mark.anyio
+async def test_stopping_early_cancels_batches_not_started():
+    chain = FakeChecklistChain()
+    async with aclosing(evaluate_in_order(list(range(BATCHES)), evaluate_with(chain), concurrency=2)) as evaluations:
+        async for batch, _, _ in evaluations:
+            if batch == 1:
+                break
+    await asyncio.sleep(2 * LATENCY)
+    assert len(chain.calls) < BATCHES
+
+
+@pytest.mark.anyio
+async def test_requests_per_key_are_rate_limited():
+    limiter = KeyRateLimiter(requests_per_window=3, window=0.3)
+    chain = FakeChecklistChain(latencies={batch: 0 for batch in range(7)})
+    started = []
+
+    async def evaluate(batch):
+        started.append(time.perf_counter())
+        return await evaluate_with(chain)(batch)
+
+    other_key_start = time.perf_counter()
+    await limiter.acquire("other-key")
+    assert time.perf_counter() - other_key_start < 0.05
+
+    start = time.perf_counter()
+    emitted = [batch async for batch, _, _ in evaluate_in_order(list(range(7)), evaluate, concurrency=7, rate_limiter=limiter, api_key="gemini-key")]
+
+    assert emitted == list(range(7))
+    offsets = sorted(moment - start for moment in started)
+    # Three requests per window: the 4th waits for the first window, the 7th for the second
+    assert offsets[2] < 0.1
+    assert offsets[3] >= 0.29
+    assert offsets[6] >= 0.59
@@ -0,0 +1,104 @@
+import asyncio
+import contextvars
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from src.chatflow_langchain.utils.request_context import RequestScoped, request_scope
+from src.gateway.utils import RequestContextMiddleware
+
+CONCURRENT_STREAMS = 300
+CHUNKS_PER_STREAM = 20
+
+
+class SessionRepository:
+    """Stateful repository shaped like the services' module-level repositories."""
+    def initialization(self, chat_session_id: str, model_name: str):
+        self.chat_session_id = chat_session_id
+        self.model_name = model_name
+
+
+session_repo = RequestScoped(SessionRepository)
+
+
+async def interleave():
+    await asyncio.sleep(random.random() / 1000)
+
+
+async def stream_session(chat_session_id: str):
+    for _ in range(CHUNKS_PER_STREAM):
+        await interleave()
+        # Resolved from worker threads as well, like the sync repository calls do
+        seen = await asyncio.to_thread(lambda: (session_repo.chat_session_id, session_repo.model_name))
+        yield f"{seen[0]}:{seen[1]}\n"
+
+
+app = FastAPI()
+app.add_middleware(RequestContextMiddleware)
+
+
+@app.get("/stream/{chat_session_id}")
+async def stream(chat_session_id: str):
+    session_repo.initialization(chat_session_id=chat_session_id, model_name=f"model-{chat_session_id}")
+    await interleave()
+    return StreamingResponse(stream_session(chat_session_id), media_type="text/plain")
+
+
+@pytest.mark.anyio
+async def test_concurrent_streams_do_not_share_state():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        async def consume(chat_session_id: str):
+            response = await client.get(f"/stream/{chat_session_id}")
+            return chat_session_id, response.text.splitlines()
+
+        results = await asyncio.gather(*(consume(str(i)) for i in range(CONCURRENT_STREAMS)))
+
+    for chat_session_id, lines in results:
+        assert len(lines) == CHUNKS_PER_STREAM
+        assert set(lines) == {f"{chat_session_id}:model-{chat_session_id}"}
+
+
+@pytest.mark.anyio
+async def test_request_scope_is_inherited_by_tasks():
+    async def request(chat_session_id: str):
+        with request_scope():
+            session_repo.initialization(chat_session_id=chat_session_id, model_name="model")
+            await interleave()
+            # Work started by the request, e.g. callbacks and background summaries
+            return await asyncio.create_task(_read_session())
+
+    async def _read_session():
+        await interleave()
+        return session_repo.chat_session_id
+
+    results = await asyncio.gather(*(request(str(i)) for i in range(CONCURRENT_STREAMS)))
+    assert results == [str(i) for i in range(CONCURRENT_STREAMS)]
+
+
+def test_proxy_passes_isinstance_checks():
+    with request_scope():
+        assert isinstance(session_repo, SessionRepository)
+        assert session_repo.__class__ is SessionRepository
+
+
+def test_threads_of_a_request_resolve_one_instance():
+    created = []
+
+    class SlowRepository:
+        def __init__(self):
+            created.append(self)
+            time.sleep(0.01)
+
+    repo = RequestScoped(SlowRepository)
+    with request_scope():
+        # Each thread runs in a copy of the request's context, as asyncio.to_thread does
+        with ThreadPoolExecutor(max_workers=8) as threads:
+            futures = [threads.submit(contextvars.copy_context().run, repo._resolve) for _ in range(8)]
+        resolved = [future.result() for future in futures]
+
+    assert len(created) == 1
+    assert all(instance is created[0] for instance in resolved)
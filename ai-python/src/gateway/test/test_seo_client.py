@@ -0,0 +1,148 @@
+import asyncio
+import base64
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from src.chatflow_langchain.service.pro_agent.seo_optimizer.seo_client import SEOClient, lookup_key
+
+KEYWORDS_PATH = "/v3/keywords_data/google_ads/search_volume/live"
+SERP_PATH = "/v3/serp/google/organic/live/regular"
+RESPONSE_DELAY = 0.05
+CREDENTIALS = ("seo-user", "seo-password")
+
+
+class MockSEOServer(ThreadingHTTPServer):
+    """DataForSEO stand-in counting requests, connections and parallel requests per endpoint."""
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), MockSEOHandler)
+        self.lock = threading.Lock()
+        self.requests = []
+        self.connections = set()
+        self.running = {}
+        self.peak = {}
+        self.fail_paths = set()
+
+
+class MockSEOHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        tasks = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        expected = "Basic " + base64.b64encode(":".join(CREDENTIALS).encode()).decode()
+        with server.lock:
+            server.requests.append((self.path, tasks))
+            server.connections.add(self.client_address)
+            server.running[self.path] = server.running.get(self.path, 0) + 1
+            server.peak[self.path] = max(server.peak.get(self.path, 0), server.running[self.path])
+        time.sleep(RESPONSE_DELAY)
+        with server.lock:
+            server.running[self.path] -= 1
+        if self.headers.get("Authorization") != expected:
+            body = {"status_code": 40100, "status_message": "You are not authorized", "tasks": []}
+        elif self.path in server.fail_paths:
+            body = {"status_code": 20000, "tasks": [{"status_code": 40501, "status_message": "Invalid Field", "result": None}]}
+        else:
+            body = {"status_code": 20000, "tasks": [{"status_code": 20000, "cost": 0.05, "result": [{"keyword": keyword} for keyword in task.get("keywords", [])]} for task in tasks]}
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def seo_server():
+    server = MockSEOServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+async def client(seo_server):
+    client = SEOClient(*CREDENTIALS, base_url=f"http://127.0.0.1:{seo_server.server_port}", endpoint_concurrency=2)
+    yield client
+    await client.aclose()
+
+
+def keyword_task(keywords, location="United States", language="English"):
+    return {0: {"keywords": keywords, "location_name": location, "language_name": language}}
+
+
+@pytest.mark.anyio
+async def test_repeated_lookups_are_served_from_the_cache(seo_server, client):
+    first = await client.post(KEYWORDS_PATH, keyword_task(["seo", "marketing"]))
+    again = await client.post(KEYWORDS_PATH, keyword_task(["Marketing", "seo"]))
+    other_location = await client.post(KEYWORDS_PATH, keyword_task(["seo", "marketing"], location="India"))
+
+    assert first == again == other_location
+    assert [task for _, task in seo_server.requests] == [
+        [keyword_task(["seo", "marketing"])[0]],
+        [keyword_task(["seo", "marketing"], location="India")[0]],
+    ]
+    # Callers get their own copy of a cached response
+    first["tasks"].clear()
+    assert (await client.post(KEYWORDS_PATH, keyword_task(["seo", "marketing"])))["tasks"]
+
+
+@pytest.mark.anyio
+async def test_concurrent_identical_lookups_share_one_request(seo_server, client):
+    responses = await asyncio.gather(*(client.post(SERP_PATH, [{"keyword": "best crm", "location_name": "United States", "language_name": "English", "depth": 5}]) for _ in range(10)))
+    assert len(seo_server.requests) == 1
+    assert all(response == responses[0] for response in responses)
+
+
+@pytest.mark.anyio
+async def test_failed_lookups_are_not_cached(seo_server, client):
+    seo_server.fail_paths.add(KEYWORDS_PATH)
+    for _ in range(2):
+        response = await client.post(KEYWORDS_PATH, keyword_task(["seo"]))
+        assert response["tasks"][0]["status_code"] == 40501
+    assert len(seo_server.requests) == 2
+
+
+@pytest.mark.anyio
+async def test_cached_lookups_expire(seo_server):
+    client = SEOClient(*CREDENTIALS, base_url=f"http://127.0.0.1:{seo_server.server_port}", ttl=0.1)
+    try:
+        await client.post(KEYWORDS_PATH, keyword_task(["seo"]))
+        await client.post(KEYWORDS_PATH, keyword_task(["seo"]))
+        await asyncio.sleep(0.15)
+        await client.post(KEYWORDS_PATH, keyword_task(["seo"]))
+    finally:
+        await client.aclose()
+    assert len(seo_server.requests) == 2
+
+
+@pytest.mark.anyio
+async def test_requests_are_bounded_per_endpoint_over_kept_alive_connections(seo_server, client):
+    async def serp_lookups():
+        start = time.perf_counter()
+        await asyncio.gather(*(client.post(SERP_PATH, [{"keyword": f"keyword {index}"}]) for index in range(2)))
+        return time.perf_counter() - start
+
+    _, serp_elapsed = await asyncio.gather(
+        asyncio.gather(*(client.post(KEYWORDS_PATH, keyword_task([f"keyword {index}"])) for index in range(6))),
+        serp_lookups(),
+    )
+
+    assert seo_server.peak == {KEYWORDS_PATH: 2, SERP_PATH: 2}
+    # The SERP lookups did not wait behind the keyword ones
+    assert serp_elapsed < 2 * RESPONSE_DELAY
+    for index in range(6):
+        await client.post(KEYWORDS_PATH, keyword_task([f"other {index}"]))
+    # Sequential lookups reuse the connections opened by the concurrent ones
+    assert len(seo_server.connections) <= 4
+
+
+def test_lookup_key_ignores_keyword_order_and_case():
+    assert lookup_key(KEYWORDS_PATH, keyword_task(["SEO", "crm"])) == lookup_key(KEYWORDS_PATH, [keyword_task(["crm", "seo"])[0]])
+    assert lookup_key(KEYWORDS_PATH, keyword_task(["seo"])) != lookup_key(SERP_PATH, keyword_task(["seo"]))
+    assert lookup_key(SERP_PATH, [{"keyword": "crm", "depth": 5}]) != lookup_key(SERP_PATH, [{"keyword": "crm", "depth": 10}])
@@ -0,0 +1,111 @@
+import asyncio
+import time
+from contextlib import contextmanager
+import pytest
+from src.custom_lib.langchain.memory import summary_pool
+
+PRUNE_LATENCY = 0.2
+
+
+class FakeThreadRepository:
+    def initialization_for_update(self, thread_id, collection_name):
+        pass
+
+    def update_token_usage_summary(self, cb):
+        pass
+
+
+class FakeSession:
+    """Messages collection of one chat session: the summary and checkpoint stored on each turn."""
+    def __init__(self):
+        self.summaries = {}
+        self.writes = []
+
+    def history(self, thread_id):
+        # The turns stored under the same checkpoint (summary) as `thread_id`
+        summary = self.summaries[thread_id]
+        return [thread for thread, stored in self.summaries.items() if stored == summary]
+
+
+class FakeChatHistory:
+    def __init__(self, session, thread_id, chat_session_id="session"):
+        self.session = session
+        self.thread_id = thread_id
+        self.chat_session_id = chat_session_id
+
+    @property
+    def messages(self):
+        return self.session.history(self.thread_id)
+
+    def add_message_system(self, message, thread_id):
+        self.session.summaries[thread_id] = message
+        self.session.writes.append((thread_id, message))
+
+
+class FakeLLM:
+    def get_num_tokens_from_messages(self, messages):
+        return len(messages)
+
+
+class FakeMemory:
+    def __init__(self, chat_history, summary, max_token_limit=1):
+        self.chat_memory = chat_history
+        self.moving_summary_buffer = summary
+        self.max_token_limit = max_token_limit
+        self.llm = FakeLLM()
+
+    def predict_new_summary(self, pruned, summary):
+        time.sleep(PRUNE_LATENCY)
+        return f"{summary}+{','.join(pruned)}"
+
+
+@contextmanager
+def no_cost():
+    yield None
+
+
+@pytest.fixture(autouse=True)
+def fake_thread_repository(monkeypatch):
+    monkeypatch.setattr(summary_pool, "ThreadRepostiory", FakeThreadRepository)
+
+
+def schedule(session, thread_id, summary, chat_session_id="session", max_token_limit=1):
+    chat_history = FakeChatHistory(session, thread_id, chat_session_id)
+    memory = FakeMemory(chat_history, summary, max_token_limit)
+    return summary_pool.schedule_summary(memory, chat_history, thread_id, "messages", no_cost)
+
+
+@pytest.mark.anyio
+async def test_turn_answered_before_the_previous_summary_joins_its_checkpoint():
+    session = FakeSession()
+    session.summaries["t0"] = "S0"
+    first = schedule(session, "t1", "S0", max_token_limit=2)
+    # The next turn is answered from the summary the first turn started from
+    second = schedule(session, "t2", "S0", max_token_limit=2)
+    assert session.summaries["t2"] == "S0"
+
+    await asyncio.gather(first, second)
+
+    # The first summary is written before the second turn is stored again under it
+    assert session.writes.index(("t1", "S0+t0")) < session.writes.index(("t2", "S0+t0"))
+    assert session.history("t2") == ["t1", "t2"]
+    assert first.result() == second.result() == "S0+t0"
+
+
+@pytest.mark.anyio
+async def test_turn_stays_on_its_checkpoint_when_the_previous_summary_did_not_move():
+    session = FakeSession()
+    first = schedule(session, "t1", "S0", max_token_limit=10)
+    second = schedule(session, "t2", "S0", max_token_limit=10)
+    await asyncio.gather(first, second)
+    assert session.writes == [("t1", "S0"), ("t2", "S0")]
+
+
+@pytest.mark.anyio
+async def test_sessions_are_summarised_concurrently():
+    sessions = [FakeSession() for _ in range(3)]
+    start = time.perf_counter()
+    await asyncio.gather(*(schedule(session, "t1", "S0", chat_session_id=f"session-{index}")
+                           for index, session in enumerate(sessions)))
+    assert time.perf_counter() - start < 2 * PRUNE_LATENCY
+    assert not summary_pool._session_summaries
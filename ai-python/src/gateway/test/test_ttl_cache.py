@@ -0,0 +1,57 @@
+import asyncio
+import time
+import pytest
+from src.chatflow_langchain.utils.ttl_cache import SingleFlight, TTLCache
+
+
+def test_entries_expire_and_the_least_recently_used_is_dropped():
+    cache = TTLCache(ttl=0.1, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    time.sleep(0.1)
+    assert cache.get("a") is None and len(cache) == 1
+
+
+def test_value_loaded_before_an_invalidation_is_not_cached():
+    cache = TTLCache(ttl=60, max_entries=10)
+    cache.set(("user-1", "gmail"), "token")
+    generation = cache.generation
+    assert cache.discard(lambda key, value: key[0] == "user-1") == 1
+    cache.set(("user-1", "gmail"), "stale token", generation)
+    assert cache.get(("user-1", "gmail")) is None
+
+
+@pytest.mark.anyio
+async def test_concurrent_loads_of_a_key_share_one_call():
+    single_flight = SingleFlight("lookup was cancelled")
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"status_code": 20000}
+
+    results = await asyncio.gather(*(single_flight.run("key", load) for _ in range(5)))
+    assert len(calls) == 1
+    assert all(result == {"status_code": 20000} for result in results)
+
+
+@pytest.mark.anyio
+async def test_waiters_fail_instead_of_being_cancelled_with_the_first_caller():
+    single_flight = SingleFlight("lookup was cancelled")
+
+    async def load():
+        await asyncio.sleep(1)
+
+    first = asyncio.create_task(single_flight.run("key", load))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(single_flight.run("key", load))
+    await asyncio.sleep(0)
+    first.cancel()
+    with pytest.raises(RuntimeError, match="lookup was cancelled"):
+        await second
+    assert first.cancelled()
@@ -0,0 +1,60 @@
+import os
+import pandas as pd
+import pytest
+from src.celery_service.openai import workbook_cache
+from src.celery_service.openai.workbook_cache import WorkbookCache
+
+
+def parsed_sheets():
+    return "xlsx", {
+        "Sales_Q1": pd.DataFrame({"Region": ["North", "South"], "Revenue": [1200.5, 980.0], 2024: [1, 2]}),
+        "Payroll": pd.DataFrame({"Employee": ["Ann", "Bob"], "Salary": [5000, 6200]}),
+    }
+
+
+@pytest.fixture(autouse=True)
+def local_version(monkeypatch):
+    monkeypatch.setattr(workbook_cache, "workbook_version", lambda file_path: "v1")
+
+
+def test_workbook_is_read_back_from_disk_without_pickle(tmp_path):
+    directory = str(tmp_path / "cache")
+    WorkbookCache(directory).get("book.xlsx", parsed_sheets)
+
+    assert os.stat(directory).st_mode & 0o777 == 0o700
+    files = [name for _, _, names in os.walk(directory) for name in names]
+    assert files and all(name.endswith((".parquet", ".json", ".npz")) for name in files)
+
+    def not_parsed():
+        raise AssertionError("workbook parsed again")
+
+    workbook = WorkbookCache(directory).get("book.xlsx", not_parsed)
+    expected = parsed_sheets()[1]
+    assert list(workbook.sheets) == list(expected)
+    for name, df in expected.items():
+        pd.testing.assert_frame_equal(workbook.sheets[name], df)
+    scores = workbook.relevance_scores("employee salary")
+    assert scores["Payroll"] > scores["Sales_Q1"]
+
+
+def test_sheet_parquet_cannot_store_is_kept_in_memory_only(tmp_path):
+    directory = str(tmp_path / "cache")
+    mixed = lambda: ("xlsx", {"Notes": pd.DataFrame({"Value": [1, "n/a"]})})
+    WorkbookCache(directory).get("book.xlsx", mixed)
+    assert os.listdir(directory) == []
+
+
+def test_shared_directory_is_not_used(tmp_path):
+    directory = tmp_path / "cache"
+    directory.mkdir(mode=0o777)
+    os.chmod(directory, 0o777)
+    calls = []
+
+    def parse():
+        calls.append(1)
+        return parsed_sheets()
+
+    WorkbookCache(str(directory)).get("book.xlsx", parse)
+    WorkbookCache(str(directory)).get("book.xlsx", parse)
+    assert len(calls) == 2
+    assert os.listdir(directory) == []
@@ -45,8 +45,8 @@ from starlette.requests import Request
 import inspect
 import asyncio
 import base64
-import gc
 from src.aws.storageClient_service import ClientService
+from src.chatflow_langchain.utils.request_context import RequestScoped, request_scope
 load_dotenv()
 
 API_CALL_COUNT_KEY_REDIS = os.environ.get("API_CALL_COUNT_KEY_REDIS","redis_api_call_count")
@@ -55,9 +55,9 @@ redis_client = redis.StrictRedis.from_url(redis_url)
 
 current_environment = os.environ.get("WEAM_ENVIRONMENT", "dev")
 
-thread_repo = ThreadRepostiory()
-prompt_repo = PromptRepository()
-file_repo = FileRepository()
+thread_repo = RequestScoped(ThreadRepostiory)
+prompt_repo = RequestScoped(PromptRepository)
+file_repo = RequestScoped(FileRepository)
 
 IST = pytz.timezone('Asia/Kolkata')
 
@@ -1042,16 +1042,20 @@ def verify_basic_auth(request: Request) -> bool:
 
     logger.info("🛡️✅ Authentication successful!")
     return True
-class ForceCleanupMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next) -> Response:
-        response = await call_next(request)
-        await self.force_cleanup()
-        return response
-
-    async def force_cleanup(self):
-        await asyncio.sleep(0.1)
-        gc.collect()
-        tracemalloc.clear_traces()
+class RequestContextMiddleware:
+    """
+    Pure ASGI middleware opening a request scope around each HTTP request, including the
+    streamed response body, so request-scoped services are isolated between concurrent streams.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        with request_scope():
+            await self.app(scope, receive, send)
 
 class AsyncHTTPClientSingleton:
     _client: httpx.AsyncClient = None
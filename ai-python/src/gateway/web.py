@@ -13,7 +13,7 @@ import os
 from src.gateway.exceptions import (validation_exception_handler,http_exception_handler,mongodb_connection_error_handler,payload_too_large_handler,audio_too_large_handler)
 from src.gateway.exceptions import custom_title_http_exception_handler,CustomTitleHttpException,PayloadTooLargeException,AudioTooLargeException
 from dotenv import load_dotenv
-from src.gateway.utils import RegexCORSMiddleware,get_regex_patterns,get_swagger_redoc_settings,ForceCleanupMiddleware,PyInstrumentMiddleWare, AsyncHTTPClientSingleton, SyncHTTPClientSingleton
+from src.gateway.utils import RegexCORSMiddleware,get_regex_patterns,get_swagger_redoc_settings,PyInstrumentMiddleWare,RequestContextMiddleware, AsyncHTTPClientSingleton, SyncHTTPClientSingleton
 from fastapi.middleware.cors import CORSMiddleware
 # from src.gateway.utils import RegexCORSMiddleware,get_regex_patterns,get_swagger_redoc_settings,APICountMiddleware,APICountMiddlewareRedis,MultiAPICountMiddlewareRedis
 from qdrant_client import QdrantClient, models
@@ -22,9 +22,20 @@ from qdrant_client.models import KeywordIndexParams
 from src.gateway.boto3_localstack import upload_file_to_s3
 from src.db.qdrant_config import qdrant_client
 from src.gateway.seeder.companymodel import CompanyModelSeeder
+from src.chatflow_langchain.utils.pipeline_query import ensure_history_indexes
+from src.custom_lib.langchain.memory.summary_pool import drain_summary_tasks
+from src.custom_lib.langchain.chat_models.client_pool import llm_client_pool
+from src.chatflow_langchain.utils.image_transfer import image_transfer
+from src.chatflow_langchain.service.pro_agent.seo_optimizer.seo_client import seo_client
+from src.round_robin.llm_key_manager import flush_api_key_usage
+from src.gateway.memory_governor import memory_governor
+from src.chatflow_langchain.repositories.accounting_sink import flush_accounting
+from src.db.config import db_instance
+from src.logger.default_logger import logger
 load_dotenv()
 
 seeder_available = os.environ.get("SEEDER_ENABLED", "false").lower() == "true"
+SUMMARY_DRAIN_TIMEOUT = float(os.environ.get("SUMMARY_DRAIN_TIMEOUT", 30))
 
 enable_swagger, enable_redoc = get_swagger_redoc_settings()
 
@@ -49,8 +60,14 @@ async def startup_event():
         seeder = CompanyModelSeeder()
         seeder.seed()
     app.state.regex_patterns = get_regex_patterns()
+    try:
+        await asyncio.to_thread(ensure_history_indexes, db_instance)
+    except pymongo.errors.PyMongoError as e:
+        logger.warning(f"Failed to ensure chat history indexes: {e}", extra={"tags": {"method": "web.startup_event"}})
     await AsyncHTTPClientSingleton.get_client()
     SyncHTTPClientSingleton.get_client()
+    # Collections are run by the governor on RSS/allocation thresholds, not per request
+    memory_governor.start()
 
 # regex_patterns = [r".weam\.ai"]
 # regex_patterns = get_regex_patterns()
@@ -67,14 +84,23 @@ app.add_exception_handler(AudioTooLargeException, audio_too_large_handler)
 app.add_exception_handler(HTTPException, http_exception_handler)
 app.add_exception_handler(pymongo.errors.ServerSelectionTimeoutError, mongodb_connection_error_handler)
 app.add_exception_handler(CustomTitleHttpException, custom_title_http_exception_handler)
-app.add_middleware(ForceCleanupMiddleware)
+# Added last so it is the outermost middleware and wraps the whole request
+app.add_middleware(RequestContextMiddleware)
 # app.add_middleware(PyInstrumentMiddleWare)
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    await memory_governor.stop()
+    await drain_summary_tasks(timeout=SUMMARY_DRAIN_TIMEOUT)
     await AsyncHTTPClientSingleton.close_client()
     SyncHTTPClientSingleton.close_client()
+    await llm_client_pool.aclose()
+    await image_transfer.aclose()
+    await seo_client.aclose()
+    await flush_api_key_usage()
+    # Summaries drained above may have buffered their token counters
+    await flush_accounting()
 
 @app.get("/ping")
 async def ping():
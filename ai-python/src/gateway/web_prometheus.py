@@ -9,7 +9,8 @@ from dotenv import load_dotenv
 from src.gateway.utils import RegexCORSMiddleware,get_regex_patterns,get_swagger_redoc_settings
 from fastapi import FastAPI, Request
 from prometheus_fastapi_instrumentator import Instrumentator
-from src.gateway.utils import PyInstrumentMiddleWare,MemoryLeakMiddleware,ForceCleanupMiddleware
+from src.gateway.utils import PyInstrumentMiddleWare,MemoryLeakMiddleware,RequestContextMiddleware
+from src.gateway.memory_governor import memory_governor
 import os
 
 load_dotenv()
@@ -39,7 +40,10 @@ app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(HTTPException, http_exception_handler)
 app.add_exception_handler(pymongo.errors.ServerSelectionTimeoutError, mongodb_connection_error_handler)
 app.add_exception_handler(CustomTitleHttpException, custom_title_http_exception_handler)
-app.add_middleware(ForceCleanupMiddleware)
+
+@app.on_event("startup")
+async def startup_event():
+    memory_governor.start()
 
 local_environment = os.getenv("WEAM_ENVIRONMENT", "local")
 if local_environment in ["local", "dev"]:
@@ -47,6 +51,8 @@ if local_environment in ["local", "dev"]:
     # app.add_middleware(MemoryLeakMiddleware)
 
 Instrumentator().instrument(app).expose(app)
+# Added last so it is the outermost middleware and wraps the whole request
+app.add_middleware(RequestContextMiddleware)
 
 import asyncio
 async def waypoints_generator():
@@ -1,11 +1,25 @@
 from starlette.requests import Request
+from starlette.responses import Response
 from ray import serve
 from langchain_community.embeddings import HuggingFaceEmbeddings
+from typing import Dict, List, Tuple
+import numpy as np
+import asyncio
 import torch
 import gc
+import os
 from fastapi import APIRouter
 from logger.default_logger import logger
 serve_route=APIRouter()
+
+# Requests merged into one model call, and how long the first request of a batch waits for others
+EMBED_MAX_BATCH_SIZE = int(os.environ.get("EMBED_MAX_BATCH_SIZE", 16))
+EMBED_BATCH_WAIT_TIMEOUT_S = float(os.environ.get("EMBED_BATCH_WAIT_TIMEOUT_S", 0.01))
+DEFAULT_MODEL_NAME = 'sentence-transformers/all-mpnet-base-v2'
+# Requested with {"encoding": "float32"}: little-endian float32 rows, shape in the headers
+FLOAT32_MEDIA_TYPE = "application/octet-stream"
+
+
 @serve.deployment(ray_actor_options={"num_gpus": 0.2, "num_cpus": 0.5}, autoscaling_config={"min_replicas": 1, "max_replicas": 2})
 @serve.ingress(serve_route)
 class ModelDeploymentHeadEMbedHF:
@@ -14,22 +28,67 @@ class ModelDeploymentHeadEMbedHF:
         self.encode_kwargs = {"batch_size": 400}
         self.models_cache = {}
 
+    def reconfigure(self, config: Dict):
+        """
+        Applies the deployment's `user_config`, `max_batch_size` and `batch_wait_timeout_s` tune batching
+        without restarting the replica.
+        """
+        if "max_batch_size" in config:
+            self.embed_batch.set_max_batch_size(int(config["max_batch_size"]))
+        if "batch_wait_timeout_s" in config:
+            self.embed_batch.set_batch_wait_timeout_s(float(config["batch_wait_timeout_s"]))
+
     def get_or_load_model(self, model_name: str):
         if model_name not in self.models_cache:
             self.models_cache[model_name] = HuggingFaceEmbeddings(model_name=model_name, model_kwargs=self.model_kwargs, encode_kwargs=self.encode_kwargs)
             logger.info(f"Loaded model: {model_name}")
+            # Loading leaves temporaries behind, batches reuse the allocator cache so they are not collected
+            gc.collect()
+            torch.cuda.empty_cache()
 
         return self.models_cache[model_name]
-    
+
+    def encode(self, model_name: str, input_texts: List[str]) -> np.ndarray:
+        embedding_model = self.get_or_load_model(model_name)
+        # Same preprocessing as HuggingFaceEmbeddings.embed_documents, without the conversion to lists
+        input_texts = [text.replace("\n", " ") for text in input_texts]
+        embeddings = embedding_model.client.encode(input_texts, convert_to_numpy=True, **embedding_model.encode_kwargs)
+        return embeddings.astype(np.float32, copy=False)
+
+    @serve.batch(max_batch_size=EMBED_MAX_BATCH_SIZE, batch_wait_timeout_s=EMBED_BATCH_WAIT_TIMEOUT_S)
+    async def embed_batch(self, requests: List[Tuple[str, List[str]]]) -> List[np.ndarray]:
+        """
+        Embeds the texts of every request of a batch with one model call per model, run off the
+        event loop so requests keep being accepted while the model works.
+        """
+        by_model = {}
+        for index, (model_name, input_texts) in enumerate(requests):
+            by_model.setdefault(model_name, []).append(index)
+        results = [None] * len(requests)
+        for model_name, indexes in by_model.items():
+            input_texts = [text for index in indexes for text in requests[index][1]]
+            embeddings = await asyncio.to_thread(self.encode, model_name, input_texts)
+            start = 0
+            for index in indexes:
+                end = start + len(requests[index][1])
+                results[index] = embeddings[start:end]
+                start = end
+        return results
+
     @serve_route.post("/")
     async def embedding(self, request: Request):
         data = await request.json()
         input_texts = data.get('input')
-        model_name = data.get('model_name', 'sentence-transformers/all-mpnet-base-v2')
+        model_name = data.get('model_name', DEFAULT_MODEL_NAME)
         if not input_texts:
             return {"error": "No input texts provided."}
-        embedding_model = self.get_or_load_model(model_name)
-        embeddings = embedding_model.embed_documents(input_texts)
-        gc.collect()
-        torch.cuda.empty_cache()
-        return {'data': embeddings}
+        if isinstance(input_texts, str):
+            input_texts = [input_texts]
+        embeddings = await self.embed_batch((model_name, input_texts))
+        if data.get('encoding') == 'float32':
+            return Response(
+                content=embeddings.astype('<f4', copy=False).tobytes(),
+                media_type=FLOAT32_MEDIA_TYPE,
+                headers={"X-Embedding-Count": str(embeddings.shape[0]), "X-Embedding-Dimensions": str(embeddings.shape[1])},
+            )
+        return {'data': embeddings.tolist()}
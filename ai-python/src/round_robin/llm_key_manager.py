@@ -1,7 +1,206 @@
 from fastapi import HTTPException
 import aioredis
+import asyncio
+import atexit
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+from celery.signals import task_postrun, worker_process_shutdown
 from src.db.redis_config import redis_url
+from src.logger.default_logger import logger
 import redis
+
+# Seconds a ZSET head (least used key) is served from the local cache
+BEST_KEY_CACHE_TTL = float(os.environ.get("BEST_KEY_CACHE_TTL", 2))
+# Buffered usage is flushed every interval, or as soon as this many increments are pending
+USAGE_FLUSH_INTERVAL = float(os.environ.get("USAGE_FLUSH_INTERVAL", 1))
+USAGE_FLUSH_BATCH_SIZE = int(os.environ.get("USAGE_FLUSH_BATCH_SIZE", 100))
+REDIS_MAX_CONNECTIONS = int(os.environ.get("ROUND_ROBIN_REDIS_MAX_CONNECTIONS", 50))
+
+_sync_pool = redis.ConnectionPool.from_url(redis_url, decode_responses=True, max_connections=REDIS_MAX_CONNECTIONS)
+_async_clients: Dict[asyncio.AbstractEventLoop, aioredis.Redis] = {}
+
+
+def get_sync_redis() -> redis.Redis:
+    """
+    Redis client on the process-wide connection pool.
+    """
+    return redis.Redis(connection_pool=_sync_pool)
+
+
+def get_async_redis() -> aioredis.Redis:
+    """
+    Pooled aioredis client of the running event loop, aioredis connections cannot be shared across loops.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        for stale in [stale for stale in _async_clients if stale.is_closed()]:
+            _async_clients.pop(stale, None)
+        client = _async_clients[loop] = aioredis.from_url(
+            redis_url, decode_responses=True, max_connections=REDIS_MAX_CONNECTIONS
+        )
+    return client
+
+
+class _BestKeyCache:
+    """Short-lived local copy of the head of each usage ZSET."""
+
+    def __init__(self, ttl: float = BEST_KEY_CACHE_TTL):
+        self.ttl = ttl
+        self._heads: Dict[str, Tuple[Optional[str], float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, usage_zset: str) -> Tuple[bool, Optional[str]]:
+        with self._lock:
+            head = self._heads.get(usage_zset)
+        if head is None or head[1] <= time.monotonic():
+            return False, None
+        return True, head[0]
+
+    def set(self, usage_zset: str, best_keys) -> Optional[str]:
+        best_key = best_keys[0] if best_keys else None
+        with self._lock:
+            self._heads[usage_zset] = (best_key, time.monotonic() + self.ttl)
+        return best_key
+
+
+class _UsageBuffer:
+    """
+    Coalesces ZINCRBY calls per (zset, api key) and writes them in one pipelined round trip.
+
+    The pipeline also reads back the head of every ZSET it touched, so the best key cache is
+    refreshed by the flush itself instead of an extra ZRANGE per selection.
+    """
+
+    def __init__(self, best_key_cache: _BestKeyCache):
+        self.best_key_cache = best_key_cache
+        self._pending: Dict[Tuple[str, str], float] = defaultdict(float)
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._flush_tasks: Dict[asyncio.AbstractEventLoop, asyncio.Task] = {}
+        self._flusher_pid: Optional[int] = None
+
+    def add(self, usage_zset: str, api_key: str, amount: float) -> bool:
+        """
+        Buffer an increment, returns True when the buffer should be flushed now.
+        """
+        with self._lock:
+            self._pending[(usage_zset, api_key)] += amount
+            return len(self._pending) >= USAGE_FLUSH_BATCH_SIZE or time.monotonic() - self._last_flush >= USAGE_FLUSH_INTERVAL
+
+    def _take(self) -> Dict[Tuple[str, str], float]:
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(float)
+            self._last_flush = time.monotonic()
+        return pending
+
+    def _restore(self, pending: Dict[Tuple[str, str], float]) -> None:
+        # Failed increments go back to the buffer, they are retried on the next flush
+        with self._lock:
+            for key, amount in pending.items():
+                self._pending[key] += amount
+
+    @staticmethod
+    def _queue(pipe, pending: Dict[Tuple[str, str], float]):
+        zsets = list(dict.fromkeys(usage_zset for usage_zset, _ in pending))
+        for (usage_zset, api_key), amount in pending.items():
+            pipe.zincrby(usage_zset, amount, api_key)
+        for usage_zset in zsets:
+            pipe.zrange(usage_zset, 0, 0)
+        return zsets
+
+    def _refresh_heads(self, zsets, results) -> None:
+        for usage_zset, best_keys in zip(zsets, results[len(results) - len(zsets):]):
+            self.best_key_cache.set(usage_zset, best_keys)
+
+    def flush_sync(self) -> None:
+        pending = self._take()
+        if not pending:
+            return
+        try:
+            pipe = get_sync_redis().pipeline(transaction=False)
+            zsets = self._queue(pipe, pending)
+            self._refresh_heads(zsets, pipe.execute())
+        except Exception as e:
+            self._restore(pending)
+            logger.error(f"Failed to flush API key usage: {e}", extra={"tags": {"method": "_UsageBuffer.flush_sync"}})
+
+    async def flush(self) -> None:
+        pending = self._take()
+        if not pending:
+            return
+        try:
+            pipe = get_async_redis().pipeline(transaction=False)
+            zsets = self._queue(pipe, pending)
+            self._refresh_heads(zsets, await pipe.execute())
+        except Exception as e:
+            self._restore(pending)
+            logger.error(f"Failed to flush API key usage: {e}", extra={"tags": {"method": "_UsageBuffer.flush"}})
+
+    def schedule_flush(self) -> None:
+        """
+        Make sure a delayed flush is pending on the running loop.
+        """
+        loop = asyncio.get_running_loop()
+        task = self._flush_tasks.get(loop)
+        if task is None or task.done():
+            for stale in [stale for stale in self._flush_tasks if stale.is_closed()]:
+                self._flush_tasks.pop(stale, None)
+            self._flush_tasks[loop] = loop.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self) -> None:
+        await asyncio.sleep(USAGE_FLUSH_INTERVAL)
+        await self.flush()
+
+    def ensure_flusher(self) -> None:
+        """
+        Make sure a daemon thread flushes the buffer every interval in this process.
+
+        Started lazily per process id, a thread started before a fork (Celery prefork pool) does
+        not exist in the children.
+        """
+        pid = os.getpid()
+        if self._flusher_pid == pid:
+            return
+        with self._lock:
+            if self._flusher_pid == pid:
+                return
+            self._flusher_pid = pid
+        threading.Thread(target=self._flush_periodically, name="api-key-usage-flusher", daemon=True).start()
+
+    def _flush_periodically(self) -> None:
+        while True:
+            time.sleep(USAGE_FLUSH_INTERVAL)
+            self.flush_sync()
+
+
+best_key_cache = _BestKeyCache()
+usage_buffer = _UsageBuffer(best_key_cache)
+# Increments buffered by sync callers are written when the process exits
+atexit.register(usage_buffer.flush_sync)
+
+
+@worker_process_shutdown.connect
+def _flush_on_worker_process_shutdown(**kwargs) -> None:
+    # Prefork children leave through os._exit, atexit handlers do not run there
+    usage_buffer.flush_sync()
+
+
+@task_postrun.connect
+def _flush_after_task(**kwargs) -> None:
+    usage_buffer.flush_sync()
+
+
+async def flush_api_key_usage() -> None:
+    """
+    Write every buffered usage increment, used on shutdown.
+    """
+    await usage_buffer.flush()
+
+
 class APIKeySelectorService:
     def __init__(self):
         self.redis_url = redis_url
@@ -9,32 +208,30 @@ class APIKeySelectorService:
 
         try:
             usage_zset = f"token_usage:{functionality}:{provider}:{model}"
-            async with aioredis.from_url(self.redis_url, decode_responses=True) as redis:
-                best_keys = await redis.zrange(usage_zset, 0, 0)
-            
-            self.get_best_api_key_from_redis = best_keys[0]
-            
+            cached, best_key = best_key_cache.get(usage_zset)
+            if not cached:
+                best_key = best_key_cache.set(usage_zset, await get_async_redis().zrange(usage_zset, 0, 0))
+
+            self.get_best_api_key_from_redis = best_key
 
-            return best_keys[0]
+
+            return best_key
         except:
             return None
-    
+
     def sync_get_best_api_key(self, provider: str, model: str, functionality: str,company_id:str) -> str:
         try:
             usage_zset = f"token_usage:{functionality}:{company_id}:{provider}:{model}"
-            
-            # Use redis.Redis (sync version)
-            redis_client = redis.Redis.from_url(self.redis_url, decode_responses=True)
-            
-            # zrange is synchronous here
-            best_keys = redis_client.zrange(usage_zset, 0, 0)
-            
-            self.get_best_api_key_from_redis = best_keys[0] if best_keys else None
-            
-            return best_keys[0] if best_keys else None
+            cached, best_key = best_key_cache.get(usage_zset)
+            if not cached:
+                best_key = best_key_cache.set(usage_zset, get_sync_redis().zrange(usage_zset, 0, 0))
+
+            self.get_best_api_key_from_redis = best_key
+
+            return best_key
         except:
             return None
-    
+
 
 
 
@@ -42,55 +239,48 @@ class APIKeyUsageService:
     def __init__(self):
         self.redis_url = redis_url
         self.anthropic_weights = {'claude-3-7-sonnet-latest':2.5,'claude-opus-4-20250514':2.5,'claude-sonnet-4-20250514':2.5,'claude-3-5-sonnet-latest':5,'claude-3-5-haiku-latest':5,'claude-3-opus-latest':5}
+
+    def _anthropic_tokens(self, model: str, tokens_used) -> float:
+        if type(tokens_used) is dict:
+            if tokens_used['completion']==0:
+                return 0
+            return tokens_used['promptT']+(tokens_used['completion']*self.anthropic_weights.get(model,2.5))
+        if tokens_used.completion_tokens==0:
+            return 0
+        return tokens_used.prompt_tokens+(tokens_used.completion_tokens*self.anthropic_weights.get(model,2.5))
+
+    async def _buffer_usage(self, usage_zset: str, api_key: str, tokens_used: float) -> None:
+        if usage_buffer.add(usage_zset, api_key, tokens_used):
+            await usage_buffer.flush()
+        else:
+            usage_buffer.schedule_flush()
+
+    def _buffer_usage_sync(self, usage_zset: str, api_key: str, tokens_used: float) -> None:
+        # Sync callers have no loop to flush from later, a full batch is written by the call that fills it
+        # and the rest by the flusher thread
+        if usage_buffer.add(usage_zset, api_key, tokens_used):
+            usage_buffer.flush_sync()
+        else:
+            usage_buffer.ensure_flusher()
+
     async def update_usage(self, provider: str, model: str, api_key: str, tokens_used: int,functionality:str,company_id:str) -> dict:
         usage_zset = f"token_usage:{functionality}:{company_id}:{provider}:{model}"
-        async with aioredis.from_url(self.redis_url, decode_responses=True) as redis:
-            await redis.zincrby(usage_zset, tokens_used, api_key)
+        await self._buffer_usage(usage_zset, api_key, tokens_used)
         return {"message": "Usage updated", "api_key": api_key, "tokens_added": tokens_used}
 
     def update_usage_sync(self, provider: str, model: str, api_key: str, tokens_used: int, functionality: str,company_id:str) -> dict:
         usage_zset = f"token_usage:{functionality}:{company_id}:{provider}:{model}"
-        
-        # Use redis.Redis (sync version)
-        redis_client = redis.Redis.from_url(self.redis_url, decode_responses=True)
-        
-        # zincrby is synchronous here
-        redis_client.zincrby(usage_zset, tokens_used, api_key)
-        
+        self._buffer_usage_sync(usage_zset, api_key, tokens_used)
         return {"message": "Usage updated", "api_key": api_key, "tokens_added": tokens_used}
-    
+
     async def update_usage_anthropic(self, provider: str, model: str, api_key: str, tokens_used: dict,functionality:str,company_id:str) -> dict:
         usage_zset = f"token_usage:{functionality}:{company_id}:{provider}:{model}"
-        if type(tokens_used) is dict:
-            if tokens_used['completion']==0:
-                tokens_used = 0
-            else:    
-                tokens_used =tokens_used['promptT']+(tokens_used['completion']*self.anthropic_weights.get(model,2.5))
-        else:
-            if tokens_used.completion_tokens==0:
-                tokens_used = 0
-            else:
-                tokens_used = tokens_used.prompt_tokens+(tokens_used.completion_tokens*self.anthropic_weights.get(model,2.5))
-        async with aioredis.from_url(self.redis_url, decode_responses=True) as redis:
-            await redis.zincrby(usage_zset, tokens_used, api_key)
+        tokens_used = self._anthropic_tokens(model, tokens_used)
+        await self._buffer_usage(usage_zset, api_key, tokens_used)
         return {"message": "Usage updated", "api_key": api_key, "tokens_added": tokens_used}
 
     def update_usage_sync_anthropic(self, provider: str, model: str, api_key: str, tokens_used: dict, functionality: str,company_id:str) -> dict:
         usage_zset = f"token_usage:{functionality}:{company_id}:{provider}:{model}"
-        if type(tokens_used) is dict:
-            if tokens_used['completion']==0:
-                tokens_used = 0
-            else:    
-                tokens_used =tokens_used['promptT']+(tokens_used['completion']*self.anthropic_weights.get(model,2.5))
-        else:
-            if tokens_used.completion_tokens==0:
-                tokens_used = 0
-            else:
-                tokens_used = tokens_used.prompt_tokens+(tokens_used.completion_tokens*self.anthropic_weights.get(model,2.5))
-        # Use redis.Redis (sync version)
-        redis_client = redis.Redis.from_url(self.redis_url, decode_responses=True)
-        
-        # zincrby is synchronous here
-        redis_client.zincrby(usage_zset, tokens_used, api_key)
-        
+        tokens_used = self._anthropic_tokens(model, tokens_used)
+        self._buffer_usage_sync(usage_zset, api_key, tokens_used)
         return {"message": "Usage updated", "api_key": api_key, "tokens_added": tokens_used}
@@ -1,2 +1,18 @@
+import os
+
 class ExcelVectorStoreConfig:
-    TOP_K = 1000
\ No newline at end of file
+    TOP_K = 1000
+
+
+class MultiFileRetrieverConfig:
+    # interleave (previous MergerRetriever order) or score
+    FUSION = os.environ.get("MULTI_FILE_RETRIEVER_FUSION", "interleave")
+
+
+class QueryEmbeddingCacheConfig:
+    MAX_ENTRIES = int(os.environ.get("QUERY_EMBEDDING_CACHE_MAX_ENTRIES", 4096))
+    # Optional shared tier, so regenerations served by another worker still hit
+    REDIS_ENABLED = os.environ.get("QUERY_EMBEDDING_CACHE_REDIS", "false").lower() == "true"
+    REDIS_TTL = int(os.environ.get("QUERY_EMBEDDING_CACHE_REDIS_TTL", 7 * 24 * 3600))
+    REDIS_MAX_CONNECTIONS = int(os.environ.get("QUERY_EMBEDDING_CACHE_REDIS_MAX_CONNECTIONS", 20))
+    REDIS_PREFIX = "query_embedding"
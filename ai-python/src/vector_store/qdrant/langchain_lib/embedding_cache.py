@@ -0,0 +1,186 @@
+import asyncio
+import hashlib
+import re
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import List, Optional
+import redis
+from langchain_core.embeddings import Embeddings
+from src.custom_lib.langchain.tiktoken_load.encoding_cache import get_cached_encoding
+from src.db.redis_config import redis_url
+from src.logger.default_logger import logger
+from src.vector_store.qdrant.langchain_lib.config import QueryEmbeddingCacheConfig
+from src.chatflow_langchain.utils.request_context import RequestScoped
+
+_whitespace = re.compile(r"\s+")
+_redis_pool: Optional[redis.ConnectionPool] = None
+
+
+def normalise_query(text: str) -> str:
+    """Unicode and whitespace normalised question, the cached vector is the embedding of this text."""
+    return _whitespace.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def query_cache_key(model: str, dimensions: Optional[int], text: str) -> str:
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{QueryEmbeddingCacheConfig.REDIS_PREFIX}:{model}:{dimensions or 'default'}:{digest}"
+
+
+def _get_redis() -> redis.Redis:
+    global _redis_pool
+    if _redis_pool is None:
+        # Vectors are stored as raw float32 bytes, responses must not be decoded
+        _redis_pool = redis.ConnectionPool.from_url(
+            redis_url, max_connections=QueryEmbeddingCacheConfig.REDIS_MAX_CONNECTIONS
+        )
+    return redis.Redis(connection_pool=_redis_pool)
+
+
+class _VectorLRU:
+    """Process-wide LRU of query vectors, kept as float32 arrays."""
+
+    def __init__(self, max_entries: int = QueryEmbeddingCacheConfig.MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, array]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[array]:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+            return vector
+
+    def set(self, key: str, vector: array) -> None:
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+query_vector_lru = _VectorLRU()
+
+
+class QueryEmbeddingUsage:
+    """Cache hits, misses and saved embedding tokens of the current request."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.saved_tokens = 0
+        self._lock = threading.Lock()
+
+    def record(self, hit: bool, tokens: int = 0) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+                self.saved_tokens += tokens
+            else:
+                self.misses += 1
+
+    def report(self) -> dict:
+        """
+        Usage not yet reported, as `additional_data` of the cost callbacks.
+        Counters are reset so a request with several LLM calls reports each lookup once.
+        """
+        with self._lock:
+            hits, misses, saved_tokens = self.hits, self.misses, self.saved_tokens
+            self.hits = self.misses = self.saved_tokens = 0
+        if not hits and not misses:
+            return {}
+        return {"embeddingCache": {"hits": hits, "misses": misses, "savedTokens": saved_tokens}}
+
+
+query_embedding_usage = RequestScoped(QueryEmbeddingUsage)
+
+
+class CachedQueryEmbeddings(Embeddings):
+    """
+    Embeddings wrapper caching query vectors by (model, dimensions, normalised text hash).
+
+    Lookups go to the in-process LRU, then to Redis when QUERY_EMBEDDING_CACHE_REDIS is enabled.
+    Document embeddings (ingestion) are passed through uncached.
+    """
+
+    def __init__(self, embeddings: Embeddings, model: str, dimensions: Optional[int] = None,
+                 use_redis: bool = QueryEmbeddingCacheConfig.REDIS_ENABLED):
+        self.embeddings = embeddings
+        self.model = model
+        self.dimensions = dimensions
+        self.use_redis = use_redis
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.embeddings.aembed_documents(texts)
+
+    def _count_tokens(self, text: str) -> int:
+        try:
+            return len(get_cached_encoding(self.model).encode(text))
+        except Exception:
+            return 0
+
+    def _redis_get(self, key: str) -> Optional[array]:
+        try:
+            raw = _get_redis().get(key)
+        except Exception as e:
+            logger.warning(f"Query embedding cache read failed: {e}",
+                           extra={"tags": {"method": "CachedQueryEmbeddings._redis_get"}})
+            return None
+        if raw is None:
+            return None
+        vector = array("f")
+        vector.frombytes(raw)
+        return vector
+
+    def _redis_set(self, key: str, vector: array) -> None:
+        try:
+            _get_redis().set(key, vector.tobytes(), ex=QueryEmbeddingCacheConfig.REDIS_TTL)
+        except Exception as e:
+            logger.warning(f"Query embedding cache write failed: {e}",
+                           extra={"tags": {"method": "CachedQueryEmbeddings._redis_set"}})
+
+    def _hit(self, text: str, vector: array) -> List[float]:
+        query_embedding_usage.record(hit=True, tokens=self._count_tokens(text))
+        return vector.tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        text = normalise_query(text)
+        key = query_cache_key(self.model, self.dimensions, text)
+        vector = query_vector_lru.get(key)
+        if vector is None and self.use_redis:
+            vector = self._redis_get(key)
+            if vector is not None:
+                query_vector_lru.set(key, vector)
+        if vector is not None:
+            return self._hit(text, vector)
+
+        vector = array("f", self.embeddings.embed_query(text))
+        query_embedding_usage.record(hit=False)
+        query_vector_lru.set(key, vector)
+        if self.use_redis:
+            self._redis_set(key, vector)
+        # Cached and fresh vectors both go through float32, a hit returns the same values as the miss did
+        return vector.tolist()
+
+    async def aembed_query(self, text: str) -> List[float]:
+        text = normalise_query(text)
+        key = query_cache_key(self.model, self.dimensions, text)
+        vector = query_vector_lru.get(key)
+        if vector is None and self.use_redis:
+            vector = await asyncio.to_thread(self._redis_get, key)
+            if vector is not None:
+                query_vector_lru.set(key, vector)
+        if vector is not None:
+            return self._hit(text, vector)
+
+        vector = array("f", await self.embeddings.aembed_query(text))
+        query_embedding_usage.record(hit=False)
+        query_vector_lru.set(key, vector)
+        if self.use_redis:
+            await asyncio.to_thread(self._redis_set, key, vector)
+        return vector.tolist()
@@ -0,0 +1,124 @@
+import asyncio
+import re
+from typing import List, Union
+from langchain.docstore.document import Document
+from langchain_core.callbacks import AsyncCallbackManagerForRetrieverRun, CallbackManagerForRetrieverRun
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
+from pydantic import BaseModel, ConfigDict
+from qdrant_client import QdrantClient, models
+from src.vector_store.qdrant.langchain_lib.config import MultiFileRetrieverConfig
+
+chunk_pattern = re.compile(r'chunk:(\d+):')
+
+FUSION_STRATEGIES = ("interleave", "score")
+
+
+class FileSearch(BaseModel):
+    """One file (tag, namespace) searched by the multi-file retriever."""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    filter: models.Filter
+    k: int
+    # Code files are returned as one document, their chunks joined in file order
+    join_chunks: bool = False
+
+
+def file_filter(namespace: str, tag: str) -> models.Filter:
+    return models.Filter(
+        must=[
+            models.FieldCondition(key="brain_id", match=models.MatchValue(value=namespace)),
+            models.FieldCondition(key="tag", match=models.MatchValue(value=tag)),
+        ]
+    )
+
+
+def _chunk_key(doc: Document):
+    match = chunk_pattern.search(doc.page_content)
+    return int(match.group(1)) if match else float('inf')
+
+
+def fuse_documents(results: List[List[Document]], strategy: str = "interleave") -> List[Document]:
+    """
+    Merge the per-file result lists.
+
+    - interleave: rank 1 of every file, then rank 2, ... (MergerRetriever's order)
+    - score: by similarity score across files, whole-file documents (joined code, Excel answers) first
+    """
+    if strategy == "interleave":
+        merged = []
+        for rank in range(max((len(docs) for docs in results), default=0)):
+            merged.extend(docs[rank] for docs in results if rank < len(docs))
+        return merged
+    if strategy == "score":
+        ranked = [doc for docs in results for doc in docs]
+        return sorted(ranked, key=lambda doc: -doc.metadata.get("_score", float('inf')))
+    raise ValueError(f"Unsupported fusion strategy: {strategy}. Expected one of {FUSION_STRATEGIES}")
+
+
+class MultiFileRetriever(BaseRetriever):
+    """
+    Retriever over several files of one Qdrant collection.
+
+    The query is embedded once and every file is searched in a single `query_batch_points` call,
+    one request per file filter, instead of one vector store, embedding and search per file.
+    Sources that do not search vectors (e.g. the Excel agent retriever) are run alongside, and
+    the per-file results are fused in source order.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    client: QdrantClient
+    collection_name: str
+    embedder: Embeddings
+    sources: List[Union[FileSearch, BaseRetriever]]
+    fusion: str = MultiFileRetrieverConfig.FUSION
+    content_payload_key: str = "text"
+    metadata_payload_key: str = "metadata"
+
+    @property
+    def searches(self) -> List[FileSearch]:
+        return [source for source in self.sources if isinstance(source, FileSearch)]
+
+    def _to_documents(self, search: FileSearch, points) -> List[Document]:
+        docs = []
+        for point in points:
+            payload = point.payload or {}
+            metadata = dict(payload.get(self.metadata_payload_key) or {})
+            metadata.update({"_id": point.id, "_collection_name": self.collection_name, "_score": point.score})
+            docs.append(Document(page_content=payload.get(self.content_payload_key) or "", metadata=metadata))
+        if search.join_chunks:
+            docs.sort(key=_chunk_key)
+            return [Document(page_content="".join(doc.page_content for doc in docs))]
+        return docs
+
+    def _search(self, vector: List[float]) -> List[List[Document]]:
+        searches = self.searches
+        if not searches:
+            return []
+        requests = [
+            models.QueryRequest(query=vector, filter=search.filter, limit=search.k, with_payload=True)
+            for search in searches
+        ]
+        responses = self.client.query_batch_points(collection_name=self.collection_name, requests=requests)
+        return [self._to_documents(search, response.points) for search, response in zip(searches, responses)]
+
+    def _in_source_order(self, searched: List[List[Document]], retrieved: List[List[Document]]) -> List[List[Document]]:
+        searched, retrieved = iter(searched), iter(retrieved)
+        return [next(searched) if isinstance(source, FileSearch) else next(retrieved) for source in self.sources]
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        searched = self._search(self.embedder.embed_query(query)) if self.searches else []
+        retrieved = [source.invoke(query) for source in self.sources if not isinstance(source, FileSearch)]
+        return fuse_documents(self._in_source_order(searched, retrieved), self.fusion)
+
+    async def _aget_relevant_documents(self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun) -> List[Document]:
+        async def search() -> List[List[Document]]:
+            if not self.searches:
+                return []
+            vector = await self.embedder.aembed_query(query)
+            return await asyncio.to_thread(self._search, vector)
+
+        searched, *retrieved = await asyncio.gather(
+            search(), *(source.ainvoke(query) for source in self.sources if not isinstance(source, FileSearch))
+        )
+        return fuse_documents(self._in_source_order(searched, retrieved), self.fusion)
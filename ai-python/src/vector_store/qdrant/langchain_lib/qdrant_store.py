@@ -6,7 +6,8 @@ from qdrant_client import models
 from src.vector_store.qdrant.langchain_lib.base import AbstractQdrantVectorStore
 from langchain_community.embeddings import OpenAIEmbeddings
 from src.crypto_hub.services.openai.embedding_api_key_decryption import EmbeddingAPIKeyDecryptionHandler
-from langchain.retrievers import MergerRetriever
+from src.vector_store.qdrant.langchain_lib.multi_file_retriever import MultiFileRetriever, FileSearch, file_filter
+from src.vector_store.qdrant.langchain_lib.embedding_cache import CachedQueryEmbeddings
 from langchain_core.retrievers import BaseRetriever
 from langchain_core.callbacks import CallbackManagerForRetrieverRun
 from typing import List
@@ -17,18 +18,18 @@ from src.vector_store.qdrant.langchain_lib.config import ExcelVectorStoreConfig
 from src.celery_service.openai.excel_agent import run_excel_query
 from src.celery_worker_hub.extraction.utils import map_file_url
 import os
+from src.chatflow_langchain.utils.request_context import RequestScoped
 BUCKET_TYPE_MAP = {
     "LOCALSTACK": "localstack",  # Localstack is used for local development
     "AWS_S3": "s3_url",
     "MINIO": "minio",  # Minio is used for local development
                               # S3 is used for production
 }
-chunk_pattern = re.compile(r'chunk:(\d+):')
 
 IMAGE_SOURCE_BUCKET = BUCKET_TYPE_MAP.get(os.environ.get("BUCKET_TYPE"))
 FILE_SOURCE_BUCKET = BUCKET_TYPE_MAP.get(os.environ.get("BUCKET_TYPE"))
 
-embedding_apikey_decrypt_service=EmbeddingAPIKeyDecryptionHandler()
+embedding_apikey_decrypt_service=RequestScoped(EmbeddingAPIKeyDecryptionHandler)
 class QdrantVectorStoreService(AbstractQdrantVectorStore):
     def initialization(
         self,
@@ -59,9 +60,14 @@ class QdrantVectorStoreService(AbstractQdrantVectorStore):
             api_key_id=embedder_api_key_id,
             collection_name=company_model_collection
         )
-        self.embedder = embedder_class(
+        # Standalone questions repeat across regenerations and follow-ups, their vectors are cached
+        self.embedder = CachedQueryEmbeddings(
+            embedder_class(
+                model=embedding_apikey_decrypt_service.model_name,
+                api_key=embedding_apikey_decrypt_service.decrypt(),
+                dimensions=embedding_apikey_decrypt_service.dimensions
+            ),
             model=embedding_apikey_decrypt_service.model_name,
-            api_key=embedding_apikey_decrypt_service.decrypt(),
             dimensions=embedding_apikey_decrypt_service.dimensions
         )
 
@@ -125,6 +131,17 @@ class QdrantVectorStoreService(AbstractQdrantVectorStore):
             chunk_str+=chunk.page_content
         return chunk_str
 
+    async def amulti_doc_query(self, query_text):
+        """
+        Async `multi_doc_query`, the embedding and the searches do not block the event loop.
+        :param query_text: Query text.
+        """
+        chunk_str= ''
+        description = await self.lotr.ainvoke(query_text)
+        for chunk in description:
+            chunk_str+=chunk.page_content
+        return chunk_str
+
     def get_document(self, document_id):
         """
         Retrieve a document by its identifier from the vector store.
@@ -145,76 +162,38 @@ class QdrantVectorStoreService(AbstractQdrantVectorStore):
         return self.vectorstore
     
     def get_lot_retiver(self,top_k=10,tag_list:list=None):
-        reteriver_list=[]
-        for tag in tag_list:
-            filter = models.Filter(
-                        must=[
-                            models.FieldCondition(
-                                key="brain_id",
-                                match=models.MatchValue(value=self.namespace),
-                            ),
-                            models.FieldCondition(
-                                key="tag",
-                                match=models.MatchValue(value=tag),
-                            ),
-                            # Add more FieldCondition's here as needed
-                        ]
-                    )
-            retriever=self.vectorstore.as_retriever(search_kwargs={'k': top_k, "filter":filter,'with_payload': True})
-            reteriver_list.append(retriever)
-        lotr = MergerRetriever(retrievers=reteriver_list)
+        lotr = MultiFileRetriever(
+            client=self.client,
+            collection_name=self.collection_name,
+            embedder=self.embedder,
+            sources=[FileSearch(filter=file_filter(self.namespace, tag), k=top_k) for tag in tag_list]
+        )
         return lotr
     
     def get_lot_retiver_namespace(self,top_k=10,tag_list:list=None,namespace_list:list=None, query:str=None, companymodel:str=None, company_id:str=None):
-        reteriver_list=[]
+        sources=[]
         pattern = r"\.(sql|php|js|html|htm|css|py)$"
         excel_pattern = r"\.(xlsx?|csv|json)$"
         for tag,namespace in zip(tag_list,namespace_list):
-
-            filter = models.Filter(
-                        must=[
-                            models.FieldCondition(
-                                key="brain_id",
-                                match=models.MatchValue(value=namespace),
-                            ),
-                            models.FieldCondition(
-                                key="tag",
-                                match=models.MatchValue(value=tag),
-                            )
-                            # Add more FieldCondition's here as needed
-                        ]
-                    )
-            temp_vectorstore = QdrantVectorStore(self.client, collection_name=self.collection_name,embedding=self.embedder,content_payload_key="text")
+            filter = file_filter(namespace, tag)
             if re.search(pattern, tag):
-                retriever=CodeRetriever(vectorstore=temp_vectorstore.as_retriever(search_kwargs={'k': ExcelVectorStoreConfig.TOP_K, "filter":filter,'with_payload': True}))
+                sources.append(FileSearch(filter=filter, k=ExcelVectorStoreConfig.TOP_K, join_chunks=True))
             elif re.search(excel_pattern, tag):
-                retriever = ExcelRetriever(vectorstore=temp_vectorstore.as_retriever(search_kwargs={'k': ExcelVectorStoreConfig.TOP_K, "filter": filter,'with_payload': True}),file_path=tag,company_id=company_id, companymodel=companymodel)
+                temp_vectorstore = QdrantVectorStore(self.client, collection_name=self.collection_name,embedding=self.embedder,content_payload_key="text")
+                sources.append(ExcelRetriever(vectorstore=temp_vectorstore.as_retriever(search_kwargs={'k': ExcelVectorStoreConfig.TOP_K, "filter": filter,'with_payload': True}),file_path=tag,company_id=company_id, companymodel=companymodel))
             else:
-                retriever=temp_vectorstore.as_retriever(search_kwargs={'k': top_k, "filter": filter,'with_payload': True})
-            reteriver_list.append(retriever)
-        lotr = MergerRetriever(retrievers=reteriver_list)
+                sources.append(FileSearch(filter=filter, k=top_k))
+        # One query embedding and one batched search for every file
+        lotr = MultiFileRetriever(
+            client=self.client,
+            collection_name=self.collection_name,
+            embedder=self.embedder,
+            sources=sources,
+            content_payload_key="text"
+        )
         self.lotr = lotr
         return lotr
 
-class CodeRetriever(BaseRetriever):
-    vectorstore: BaseRetriever
-    search_type: str = "mmr"
-    search_kwargs: dict = Field(default_factory=dict)
-
-    
-    def _get_relevant_documents(self, query: str,run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
-        results = self.vectorstore.get_relevant_documents(query=query)
-        def chunk_key(doc):
-            match = chunk_pattern.search(doc.page_content)
-            return int(match.group(1)) if match else float('inf')
-
-        results.sort(key=chunk_key)
-
-        # Join sorted content
-        text_content = "".join(doc.page_content for doc in results)
-
-        return [Document(page_content=text_content)]
-    
 class ExcelRetriever(BaseRetriever):
     vectorstore: BaseRetriever
     search_type: str = "mmr"
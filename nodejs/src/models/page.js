@@ -15,8 +15,9 @@ const tokensSchema = {
     completion: {
         type: Number
     },
+    // Numeric, documents written before the accounting migration hold "$0.0123" strings
     totalCost: {
-        type: String
+        type: Schema.Types.Mixed
     },
     imageT: {
         type: Number,
@@ -6,6 +6,8 @@ mongoosePaginate.paginate.options = { customLabels: CUSTOM_PAGINATE_LABELS };
 const { COLLECTION_REF_UPDATE } = require('../config/constants/schemaref');
 const { createJob } = require('../jobs');
 const { fileSchema, companySchema } = require('../utils/commonSchema');
+const { publishMcpToolsInvalidation } = require('../utils/mcpToolInvalidation');
+const { queryTargetId, queryUpdatesPath } = require('../utils/cacheInvalidation');
 
 const Schema = mongoose.Schema;
 
@@ -159,6 +161,20 @@ schema.post(['findOneAndUpdate', 'updateOne'], async function (doc) {
     }
 });
 
+schema.pre('save', function (next) {
+    // Modified paths are reset once saved, recorded here for the post hook
+    this.$locals.mcpdataModified = this.isModified('mcpdata');
+    next();
+});
+
+schema.post('save', async function (doc) {
+    if (doc.$locals.mcpdataModified) await publishMcpToolsInvalidation(doc._id);
+});
+
+schema.post(['findOneAndUpdate', 'updateOne', 'updateMany'], async function (doc) {
+    if (queryUpdatesPath(this, 'mcpdata')) await publishMcpToolsInvalidation(doc?._id || queryTargetId(this));
+});
+
 schema.method('toJSON', function () {
     const { __v, _id, ...object } = this.toObject();
     object.id = _id;
@@ -4,6 +4,8 @@ const { CUSTOM_PAGINATE_LABELS } = require('../config/constants/common');
 mongoosePaginate.paginate.options = { customLabels: CUSTOM_PAGINATE_LABELS };
 const Schema = mongoose.Schema;
 const { companySchema, botSchema } = require('../utils/commonSchema');
+const { publishCompanyModelInvalidation } = require('../utils/modelConfigInvalidation');
+const { queryTargetId } = require('../utils/cacheInvalidation');
 
 // this schema required for python api to fetch query data
 const extraConfigSchema = {
@@ -109,6 +111,18 @@ const schema = new Schema(
     { timestamps: true },
 );
 
+schema.post('save', async function (doc) {
+    await publishCompanyModelInvalidation(doc._id);
+});
+
+schema.post(['findOneAndUpdate', 'findOneAndDelete'], async function (doc) {
+    await publishCompanyModelInvalidation(doc?._id || queryTargetId(this));
+});
+
+schema.post(['updateOne', 'updateMany', 'deleteOne', 'deleteMany'], async function () {
+    await publishCompanyModelInvalidation(queryTargetId(this));
+});
+
 schema.plugin(mongoosePaginate);
 
 const companymodel = mongoose.model('companymodel', schema, 'companymodel');
@@ -286,6 +286,31 @@ const partialUpdate = async (req) => {
     }
 }
 
+const INGESTION_JOB_POLL_INTERVAL = 2000;
+
+const waitForIngestionJob = async (jobId, token, signal) => {
+    while (true) {
+        const response = await fetch(
+            `${LINK.PYTHON_API_URL}/${API.PYTHON_API_PREFIX}/vector/general-multi-store-vector/${jobId}/status`,
+            {
+                method: 'GET',
+                signal,
+                headers: {
+                    Authorization: `${JWT_STRING}${token}`,
+                    Origin: LINK.FRONT_URL
+                },
+            }
+        );
+        if (!response.ok) {
+            logger.error(`openai store vector job ${jobId} status return ${response.status}`);
+            return 'FAILURE';
+        }
+        const { status } = await response.json();
+        if (status === 'SUCCESS' || status === 'FAILURE') return status;
+        await new Promise((resolve) => setTimeout(resolve, INGESTION_JOB_POLL_INTERVAL));
+    }
+}
+
 const storeVectorData = async (req, payloads) => {
     const controller = new AbortController();
     const timeoutId = setTimeout(() => controller.abort(), 300000);
@@ -321,8 +346,13 @@ const storeVectorData = async (req, payloads) => {
             }
         );
         logger.info(`openai store vector return ${response.status}`);
-        if (response.ok) return true;
-        return false;
+        if (!response.ok) return false;
+
+        // The files are embedded in the background, wait for the ingestion job like the request used to
+        const { job_id: jobId } = await response.json();
+        const status = await waitForIngestionJob(jobId, token, controller.signal);
+        logger.info(`openai store vector job ${jobId} finished with ${status}`);
+        return status === 'SUCCESS';
 
     } catch (error) {
         handleError(error, 'Error - storeVectorData');
@@ -0,0 +1,49 @@
+const mongoose = require('mongoose');
+const { createClient } = require('redis');
+const { REDIS } = require('../config/config');
+const logger = require('./logger');
+
+// Published when the updated documents are not known, e.g. updateMany
+const INVALIDATE_ALL = '*';
+
+let publisher;
+
+const getPublisher = async () => {
+    if (!publisher) {
+        publisher = createClient({ url: `redis://${REDIS.HOST}:${REDIS.PORT}` });
+        publisher.on('error', (err) => logger.error('Cache invalidation publisher error:', err));
+        publisher.connecting = publisher.connect();
+    }
+    await publisher.connecting;
+    return publisher;
+};
+
+// Publishes `id` on `channel` for the python services to drop their cached copy, or INVALIDATE_ALL without an id
+const publishInvalidation = async (channel, id) => {
+    try {
+        const client = await getPublisher();
+        await client.publish(channel, id ? id.toString() : INVALIDATE_ALL);
+    } catch (error) {
+        publisher = undefined;
+        logger.error(`Failed to publish invalidation on ${channel}:`, error);
+    }
+};
+
+// Whether an update query sets or unsets `path` or one of its subfields
+const queryUpdatesPath = (query, path) => {
+    const update = query.getUpdate?.() || {};
+    const touches = (fields) => Object.keys(fields || {}).some((key) => key === path || key.startsWith(`${path}.`));
+    return touches(update) || Object.keys(update).some((operator) => operator.startsWith('$') && touches(update[operator]));
+};
+
+// id of the document a query updates, when its filter targets a single _id
+const queryTargetId = (query) => {
+    const id = query.getFilter?.()?._id;
+    return id && mongoose.isValidObjectId(id) ? id : undefined;
+};
+
+module.exports = {
+    publishInvalidation,
+    queryTargetId,
+    queryUpdatesPath,
+};
@@ -0,0 +1,11 @@
+const { publishInvalidation } = require('./cacheInvalidation');
+
+// The python services cache the MCP tools listed for a user and their integration credentials,
+// a user id is published here when their integrations change
+const MCP_TOOLS_INVALIDATION_CHANNEL = process.env.MCP_TOOLS_INVALIDATION_CHANNEL || 'mcp:tools:invalidate';
+
+const publishMcpToolsInvalidation = (userId) => publishInvalidation(MCP_TOOLS_INVALIDATION_CHANNEL, userId);
+
+module.exports = {
+    publishMcpToolsInvalidation,
+};
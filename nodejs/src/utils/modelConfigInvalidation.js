@@ -0,0 +1,11 @@
+const { publishInvalidation } = require('./cacheInvalidation');
+
+// The python services cache resolved company models (decrypted key, name, provider, config) for a short TTL,
+// every companymodel change is published here so they drop their copy right away
+const COMPANY_MODEL_INVALIDATION_CHANNEL = process.env.COMPANY_MODEL_INVALIDATION_CHANNEL || 'companymodel:invalidate';
+
+const publishCompanyModelInvalidation = (id) => publishInvalidation(COMPANY_MODEL_INVALIDATION_CHANNEL, id);
+
+module.exports = {
+    publishCompanyModelInvalidation,
+};
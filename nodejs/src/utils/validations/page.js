@@ -19,7 +19,7 @@ const createPageKeys = joi.object({
         totalUsed: joi.number().optional(),
         promptT: joi.number().optional(),
         completion: joi.number().optional(),
-        totalCost: joi.string().optional(),
+        totalCost: joi.alternatives().try(joi.number(), joi.string()).optional(),
         imageT: joi.number().optional()
     }).optional(),
     responseModel: joi.string().optional(),